@@ -0,0 +1,123 @@
+"""Benchmark harness: measures each benchmark with util.telemetry and compares it against a stored baseline.
+
+A benchmark measures the code run inside the ``benchmark`` fixture and reports how many records it processed:
+
+    def test_something(benchmark):
+        with benchmark("validate", context={"edges": 1000}):
+            validate(...)
+            record_stage_counts(nodes=..., edges=...)
+
+Each benchmark's wall time, CPU time, peak RSS, records and records/sec are written to
+benchmarks/results/latest.json. When benchmarks/baseline.json has a result for the same benchmark with the same
+context (sample size, source version, ...), the benchmark fails if its throughput dropped or its peak memory grew by
+more than the tolerance. ``--benchmark-save-baseline`` stores the results of the run as the new baseline; without
+it, a run fails right away when there is no baseline to compare against, and warns about each benchmark the baseline
+has no result with the same context for.
+"""
+
+import json
+import platform
+import warnings
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from translator_ingest.util.telemetry import StageMetrics, stage_metrics
+
+BENCHMARKS_DIR = Path(__file__).parent
+BASELINE_PATH = BENCHMARKS_DIR / "baseline.json"
+RESULTS_PATH = BENCHMARKS_DIR / "results" / "latest.json"
+
+# Benchmark results of this session, by benchmark name
+_results: dict[str, dict[str, Any]] = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark")
+    group.addoption("--benchmark-edges", type=int, default=1_000_000,
+                    help="Number of edges of the synthetic KGX graph (default: 1,000,000).")
+    group.addoption("--benchmark-sample-rows", type=int, default=10_000,
+                    help="Number of source rows each transform benchmark reads (default: 10,000).")
+    group.addoption("--benchmark-tolerance", type=float, default=0.25,
+                    help="Allowed fractional loss of throughput or growth of peak memory vs. the baseline.")
+    group.addoption("--benchmark-baseline", type=Path, default=BASELINE_PATH,
+                    help=f"Baseline to compare against (default: {BASELINE_PATH.relative_to(BENCHMARKS_DIR.parent)}).")
+    group.addoption("--benchmark-save-baseline", action="store_true",
+                    help="Store the results of this run as the baseline instead of comparing against it.")
+
+
+def pytest_configure(config: pytest.Config):
+    baseline_path: Path = config.getoption("benchmark_baseline")
+    if not config.getoption("benchmark_save_baseline") and not baseline_path.exists():
+        raise pytest.UsageError(f"There is no benchmark baseline at {baseline_path} to compare against, record one "
+                                f"on this machine with --benchmark-save-baseline (see benchmarks/README.md)")
+
+
+def _load_baseline(config: pytest.Config) -> dict[str, dict[str, Any]]:
+    baseline_path: Path = config.getoption("benchmark_baseline")
+    if not baseline_path.exists():
+        return {}
+    return json.loads(baseline_path.read_text())["results"]
+
+
+def _check_against_baseline(result: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    regressions = []
+    if result["records_per_second"] and baseline.get("records_per_second"):
+        minimum = baseline["records_per_second"] * (1 - tolerance)
+        if result["records_per_second"] < minimum:
+            regressions.append(f"throughput {result['records_per_second']:,.0f} records/s is below "
+                               f"{minimum:,.0f} (baseline {baseline['records_per_second']:,.0f})")
+    if result["peak_rss_bytes"] and baseline.get("peak_rss_bytes"):
+        maximum = baseline["peak_rss_bytes"] * (1 + tolerance)
+        if result["peak_rss_bytes"] > maximum:
+            regressions.append(f"peak RSS {result['peak_rss_bytes'] / 2**20:,.0f} MiB is above "
+                               f"{maximum / 2**20:,.0f} MiB (baseline {baseline['peak_rss_bytes'] / 2**20:,.0f} MiB)")
+    return regressions
+
+
+@pytest.fixture
+def benchmark(request, tmp_path) -> Callable[..., AbstractContextManager[StageMetrics]]:
+    """Measure a block of code as a named benchmark and check it against the baseline."""
+    config = request.config
+
+    @contextmanager
+    def measure(name: str, context: dict[str, Any] | None = None) -> Iterator[StageMetrics]:
+        with stage_metrics(name, metrics_file=tmp_path / "metrics.jsonl") as metrics:
+            yield metrics
+
+        result = {**metrics.to_dict(), "context": context or {}}
+        _results[name] = result
+        if config.getoption("benchmark_save_baseline"):
+            return
+        baseline = _load_baseline(config).get(name)
+        if baseline is None or baseline.get("context") != result["context"]:
+            warnings.warn(f"{name} has no baseline with the context {result['context']}, so it was not compared; "
+                          f"record one with --benchmark-save-baseline", pytest.PytestWarning, stacklevel=1)
+            return
+        regressions = _check_against_baseline(result, baseline, config.getoption("benchmark_tolerance"))
+        if regressions:
+            pytest.fail(f"{name} regressed: " + "; ".join(regressions))
+
+    return measure
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _results:
+        return
+    run = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "machine": {"platform": platform.platform(), "python": platform.python_version(),
+                    "processor": platform.processor() or platform.machine()},
+        "results": _results,
+    }
+    RESULTS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    RESULTS_PATH.write_text(json.dumps(run, indent=2))
+    if session.config.getoption("benchmark_save_baseline"):
+        # keep the baseline of benchmarks which were not part of this run
+        baseline_path: Path = session.config.getoption("benchmark_baseline")
+        baseline = {**run, "results": {**_load_baseline(session.config), **_results}}
+        baseline_path.write_text(json.dumps(baseline, indent=2))
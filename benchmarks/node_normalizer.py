@@ -0,0 +1,137 @@
+"""A local stand-in for the Node Normalizer, so normalization can be benchmarked without the network.
+
+It implements the three endpoints ORION uses: ``/status``, ``/openapi.json`` and ``/get_normalized_nodes``. Every
+CURIE normalizes to itself, with the category of its prefix (``biolink:NamedThing`` for unknown prefixes), except
+CURIEs with the prefix ``UNNORMALIZABLE``, which fail to normalize. The time measured is therefore that of ORION
+and translator-ingests plus a local HTTP round trip, not of the real service.
+
+The latency and failures of the real service can be simulated with a ``StandInBehavior``, which also records the
+lookups the stand-in got:
+
+    >>> behavior = StandInBehavior(latency=0.05, fail_every=10)
+    >>> with local_node_normalizer(behavior) as node_normalizer_url:
+    ...     ...
+    >>> behavior.lookups, behavior.max_concurrent_lookups
+"""
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BABEL_VERSION = "local-stand-in"
+NODE_NORMALIZER_VERSION = "0.0.0"
+
+PREFIX_CATEGORIES = {
+    "NCBIGene": "biolink:Gene",
+    "MONDO": "biolink:Disease",
+    "CHEBI": "biolink:SmallMolecule",
+    "HP": "biolink:PhenotypicFeature",
+    "UniProtKB": "biolink:Protein",
+    "GO": "biolink:BiologicalProcess",
+}
+
+
+def normalized_node(curie: str) -> dict | None:
+    prefix = curie.split(":", 1)[0]
+    if prefix == "UNNORMALIZABLE":
+        return None
+    category = PREFIX_CATEGORIES.get(prefix, "biolink:NamedThing")
+    return {
+        "id": {"identifier": curie, "label": curie},
+        "equivalent_identifiers": [{"identifier": curie, "label": curie}],
+        "type": [category] if category == "biolink:NamedThing" else [category, "biolink:NamedThing"],
+        "information_content": 100,
+    }
+
+
+@dataclass
+class StandInBehavior:
+    """How the stand-in simulates the real service, and the get_normalized_nodes lookups it got."""
+
+    # seconds each lookup takes
+    latency: float = 0.0
+    # every fail_every-th lookup fails with a 503, if set
+    fail_every: int = 0
+    # the CURIEs of each lookup, including failed ones
+    lookups: list[list[str]] = field(default_factory=list)
+    max_concurrent_lookups: int = 0
+    _concurrent_lookups: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def start_lookup(self, curies: list[str]) -> bool:
+        """Record the start of a lookup, and return whether it should fail."""
+        with self._lock:
+            self.lookups.append(curies)
+            self._concurrent_lookups += 1
+            self.max_concurrent_lookups = max(self.max_concurrent_lookups, self._concurrent_lookups)
+            return bool(self.fail_every) and len(self.lookups) % self.fail_every == 0
+
+    def end_lookup(self):
+        with self._lock:
+            self._concurrent_lookups -= 1
+
+
+class NodeNormalizerHandler(BaseHTTPRequestHandler):
+    # keeps connections alive, as the real service does
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/status":
+            self._send_json({"status": "running", "babel_version": BABEL_VERSION})
+        elif self.path == "/openapi.json":
+            self._send_json({"info": {"version": NODE_NORMALIZER_VERSION}})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        if self.path != "/get_normalized_nodes":
+            self.send_error(404)
+            return
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        behavior: StandInBehavior = self.server.behavior
+        fail = behavior.start_lookup(request["curies"])
+        try:
+            time.sleep(behavior.latency)
+            if fail:
+                self.send_error(503)
+                return
+            self._send_json({curie: normalized_node(curie) for curie in request["curies"]})
+        finally:
+            behavior.end_lookup()
+
+    def log_message(self, format, *args):
+        # don't log every request to stderr
+        pass
+
+
+@contextmanager
+def local_node_normalizer(behavior: StandInBehavior | None = None) -> Iterator[str]:
+    """Run the stand-in on a free local port for the duration of the context.
+
+    Args:
+        behavior: the simulated latency and failures, none by default
+
+    Yields:
+        The base URL of the stand-in
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), NodeNormalizerHandler)
+    server.behavior = behavior or StandInBehavior()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
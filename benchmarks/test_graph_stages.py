@@ -0,0 +1,101 @@
+"""Benchmark normalization, merging, validation and release packaging on a synthetic KGX graph.
+
+The graph has --benchmark-edges edges (1M by default) and is generated once per session by
+translator_ingest.util.synthetic. Normalization runs against a local stand-in for the Node Normalizer (see
+node_normalizer.py), so it measures our and ORION's code rather than the service.
+"""
+
+import json
+
+import pytest
+
+from benchmarks.node_normalizer import BABEL_VERSION, NODE_NORMALIZER_VERSION, local_node_normalizer
+from translator_ingest.util.metadata import PipelineMetadata
+from translator_ingest.util.synthetic import SyntheticGraphConfig, generate_synthetic_graph
+from translator_ingest.util.telemetry import record_stage_counts
+
+
+@pytest.fixture(scope="session")
+def synthetic_graph(request, tmp_path_factory):
+    """Paths to the nodes and edges files of the synthetic graph, and its node and edge counts."""
+    edge_count = request.config.getoption("benchmark_edges")
+    graph_dir = tmp_path_factory.mktemp("synthetic_graph")
+    nodes_path, edges_path = graph_dir / "nodes.jsonl", graph_dir / "edges.jsonl"
+    stats = generate_synthetic_graph(nodes_path, edges_path, SyntheticGraphConfig(edge_count=edge_count))
+    return nodes_path, edges_path, stats.nodes, stats.edges
+
+
+@pytest.fixture
+def context(synthetic_graph) -> dict:
+    return {"edges": synthetic_graph[3]}
+
+
+def test_normalize(synthetic_graph, context, benchmark, tmp_path, monkeypatch):
+    from orion.config import config as orion_config
+    from orion.normalization import NORMALIZATION_CODE_VERSION
+
+    from translator_ingest.normalize import normalize_kgx_files
+    from translator_ingest.util.biolink_snapshot import get_biolink_snapshot
+
+    nodes_path, edges_path, _, _ = synthetic_graph
+    pipeline_metadata = PipelineMetadata(
+        source="synthetic",
+        babel_version=BABEL_VERSION,
+        node_normalizer_version=NODE_NORMALIZER_VERSION,
+        normalization_code_version=NORMALIZATION_CODE_VERSION,
+        biolink_version=get_biolink_snapshot().get_model_version(),
+    )
+    with local_node_normalizer() as node_normalizer_url:
+        monkeypatch.setattr(orion_config, "NODE_NORMALIZATION_URL", node_normalizer_url)
+        with benchmark("normalize", context=context):
+            normalization_metadata = normalize_kgx_files(
+                input_nodes_file_path=str(nodes_path),
+                input_edges_file_path=str(edges_path),
+                nodes_output_file_path=str(tmp_path / "normalized_nodes.jsonl"),
+                node_norm_map_file_path=str(tmp_path / "normalization_map.json"),
+                node_norm_failures_file_path=str(tmp_path / "normalization_failures.txt"),
+                edges_output_file_path=str(tmp_path / "normalized_edges.jsonl"),
+                normalization_metadata_file_path=str(tmp_path / "normalization-metadata.json"),
+                pipeline_metadata=pipeline_metadata,
+            )
+            record_stage_counts(nodes=normalization_metadata["final_normalized_nodes"],
+                                edges=normalization_metadata["final_normalized_edges"])
+
+
+def test_merge(synthetic_graph, context, benchmark, tmp_path):
+    from translator_ingest.merging import merge_single
+
+    nodes_path, edges_path, _, _ = synthetic_graph
+    with benchmark("merge", context=context):
+        merge_metadata = merge_single(
+            source_id="synthetic",
+            input_nodes_file=nodes_path,
+            input_edges_file=edges_path,
+            output_nodes_file=tmp_path / "merged_nodes.jsonl",
+            output_edges_file=tmp_path / "merged_edges.jsonl",
+            output_metadata_file=tmp_path / "merge_metadata.json",
+        )
+        record_stage_counts(nodes=merge_metadata["final_node_count"], edges=merge_metadata["final_edge_count"])
+
+
+def test_validate(synthetic_graph, context, benchmark, tmp_path):
+    from translator_ingest.util.validate_biolink_kgx import validate_kgx
+
+    nodes_path, edges_path, node_count, edge_count = synthetic_graph
+    with benchmark("validate", context=context):
+        validate_kgx(nodes_file=nodes_path, edges_file=edges_path, output_dir=tmp_path, no_save=True)
+        record_stage_counts(nodes=node_count, edges=edge_count)
+
+
+def test_release_packaging(synthetic_graph, context, benchmark, tmp_path):
+    from translator_ingest.release import create_compressed_tar
+
+    nodes_path, edges_path, node_count, edge_count = synthetic_graph
+    graph_metadata_path = tmp_path / "graph-metadata.json"
+    graph_metadata_path.write_text(json.dumps({"name": "synthetic"}))
+    with benchmark("release_packaging", context=context):
+        create_compressed_tar(nodes_file=nodes_path,
+                              edges_file=edges_path,
+                              graph_metadata_path=graph_metadata_path,
+                              output_path=tmp_path / "synthetic.tar.zst")
+        record_stage_counts(nodes=node_count, edges=edge_count)
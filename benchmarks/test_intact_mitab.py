@@ -0,0 +1,38 @@
+"""Benchmark the IntAct PSI-MI field parsing: the original re.match per call helpers against the precompiled,
+memoized parser of translator_ingest.ingests.intact.mitab and its polars column splitting.
+
+Each parser extracts the fields the IntAct transform uses from the checked-in sample in
+tests/unit/ingests/intact/sample_data, REPEAT times over, so the memoized parser is measured both
+with its caches cleared for every pass and warm.
+"""
+
+import pytest
+
+from tests.unit.ingests.intact.legacy_mitab import SAMPLE_MITAB_FILE, parse_records, read_mitab_records
+from translator_ingest.ingests.intact.intact import clear_caches
+from translator_ingest.ingests.intact.mitab import scan_mitab, split_psi_mi_column
+from translator_ingest.util.telemetry import record_stage_counts
+
+REPEAT = 200
+COLUMNS = ["idA", "altIdsA", "aliasesA", "publicationIDs", "interactionTypes", "interactionDetectionMethod"]
+
+
+@pytest.mark.parametrize("parser", ["legacy", "memoized_cold", "memoized_warm", "polars"])
+def test_mitab_parsing(benchmark, parser):
+    records = read_mitab_records(SAMPLE_MITAB_FILE)
+    lazy = scan_mitab(SAMPLE_MITAB_FILE).select(*(split_psi_mi_column(column) for column in COLUMNS))
+    clear_caches()
+    if parser == "memoized_warm":
+        parse_records(records)
+    with benchmark(f"intact_mitab[{parser}]", context={"rows": len(records), "repeat": REPEAT}):
+        for _ in range(REPEAT):
+            if parser == "legacy":
+                parse_records(records, legacy=True)
+            elif parser == "memoized_cold":
+                clear_caches()
+                parse_records(records)
+            elif parser == "memoized_warm":
+                parse_records(records)
+            else:
+                lazy.collect()
+        record_stage_counts(edges=len(records) * REPEAT)
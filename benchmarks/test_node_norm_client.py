@@ -0,0 +1,39 @@
+"""Benchmark Node Normalizer lookups in concurrent batches against serial ones, as ORION looks nodes up.
+
+The lookups go to the local stand-in for the Node Normalizer (see node_normalizer.py), with a simulated latency per
+lookup, so they measure how much of the service's latency the concurrent batches hide rather than the service. The
+stand-in runs in the benchmark's process, so the latency is made to dominate its (GIL-bound) serialization.
+"""
+
+import pytest
+
+from benchmarks.node_normalizer import StandInBehavior, local_node_normalizer
+from translator_ingest.util.node_norm_client import NodeNormClient
+from translator_ingest.util.telemetry import record_stage_counts
+
+CURIE_COUNT = 50_000
+BATCH_SIZE = 1000
+LATENCY = 0.5
+
+
+@pytest.fixture(scope="module")
+def wall_times() -> dict[int, float]:
+    return {}
+
+
+@pytest.mark.parametrize("concurrency", [1, 8])
+def test_node_norm_lookup(benchmark, wall_times, concurrency):
+    curies = [f"NCBIGene:{number}" for number in range(CURIE_COUNT)]
+    context = {"curies": CURIE_COUNT, "batch_size": BATCH_SIZE, "latency": LATENCY}
+    # a fixed batch size, so only the concurrency differs; 1 looks the batches up one after the other, as ORION does
+    with (local_node_normalizer(StandInBehavior(latency=LATENCY)) as node_normalizer_url,
+          NodeNormClient(node_normalizer_url, concurrency=concurrency, batch_size=BATCH_SIZE,
+                         min_batch_size=BATCH_SIZE, max_batch_size=BATCH_SIZE) as client,
+          benchmark(f"node_norm_lookup_concurrency_{concurrency}", context=context) as metrics):
+        results = client.normalize_sync(curies)
+        record_stage_counts(nodes=len(results))
+    wall_times[concurrency] = metrics.wall_time_seconds
+    if 1 in wall_times and concurrency > 1:
+        speedup = wall_times[1] / wall_times[concurrency]
+        print(f"\n{concurrency} concurrent lookups are {speedup:.1f}x as fast as serial ones")
+        assert speedup > 2
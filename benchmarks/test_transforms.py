@@ -0,0 +1,78 @@
+"""Benchmark the koza transform of every ingest over a fixed-size sample of its source data.
+
+The sample is the first --benchmark-sample-rows rows of each file of the most recently downloaded source data in
+data/{source}/{version}/source_data (run ``make transform-{source}`` to download it), or else the checked-in sample
+in tests/unit/ingests/{source}/sample_data. Ingests without either are skipped. Results are only compared to the
+baseline for the same source version and sample size. As in the pipeline, the prepare_data functions which scan the
+files of their reader scan the same sample; ingests whose prepare_data reads the source files itself are not limited
+by the row limit, so their benchmark reads all of the source data.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from tests.util import ALL_SOURCE_IDS, find_project_root, get_ingest_config_yaml_path
+from translator_ingest import INGESTS_DATA_PATH
+from translator_ingest.util.polars_reader import KozaReaderData
+from translator_ingest.util.telemetry import record_stage_counts
+
+CHECKED_IN_SAMPLE_VERSION = "checked-in sample"
+
+
+def find_sample_data(source: str) -> tuple[Path, str] | None:
+    """Find source data to benchmark a transform with.
+
+    Returns:
+        The directory with the source data and its version, or None if there is no source data
+    """
+    downloads = [source_data_dir for source_data_dir in Path(INGESTS_DATA_PATH).glob(f"{source}/*/source_data")
+                 if any(source_data_dir.iterdir())]
+    if downloads:
+        latest_download = max(downloads, key=lambda source_data_dir: source_data_dir.stat().st_mtime)
+        return latest_download, latest_download.parent.name
+    checked_in_sample = find_project_root() / "tests" / "unit" / "ingests" / source / "sample_data"
+    if checked_in_sample.is_dir():
+        return checked_in_sample, CHECKED_IN_SAMPLE_VERSION
+    return None
+
+
+def _missing_input_files(config, input_files_dir: Path) -> list[str]:
+    readers = config.readers or {None: config.reader}
+    # koza resolves the file names of the readers against input_files_dir
+    return [Path(file_name).name for reader in readers.values() if reader is not None for file_name in reader.files
+            if "://" not in file_name and not (input_files_dir / file_name).exists()]
+
+
+@pytest.mark.parametrize("source", ALL_SOURCE_IDS)
+def test_transform(source, benchmark, tmp_path, request):
+    from koza.model.formats import OutputFormat as KozaOutputFormat
+    from koza.runner import KozaRunner
+
+    config_yaml_path = get_ingest_config_yaml_path(source)
+    if config_yaml_path is None:
+        pytest.skip(f"{source} has no koza config")
+    sample_data = find_sample_data(source)
+    if sample_data is None:
+        pytest.skip(f"No source data for {source}, run `make transform-{source}` to download it")
+    input_files_dir, source_version = sample_data
+    sample_rows = request.config.getoption("benchmark_sample_rows")
+
+    config, runner = KozaRunner.from_config_file(
+        str(config_yaml_path),
+        output_dir=str(tmp_path),
+        output_format=KozaOutputFormat.jsonl,
+        row_limit=sample_rows,
+        input_files_dir=str(input_files_dir),
+        # a sample produces fewer nodes and edges than the minimum counts configured for the full source
+        overrides={"writer": {"min_node_count": None, "min_edge_count": None}},
+    )
+    missing_input_files = _missing_input_files(config, input_files_dir)
+    if missing_input_files:
+        pytest.skip(f"{input_files_dir} is missing {missing_input_files}")
+    reader_configs = {reader.tag: reader.reader for reader in config.get_readers()}
+    runner.data = {tag: KozaReaderData(data, reader_configs[tag], config_yaml_path.parent, sample_rows)
+                   for tag, data in runner.data.items()}
+    with benchmark(f"transform[{source}]", context={"source_version": source_version, "sample_rows": sample_rows}):
+        runner.run()
+        record_stage_counts(nodes=runner.writer.node_count, edges=runner.writer.edge_count)
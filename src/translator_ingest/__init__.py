@@ -15,6 +15,9 @@ INGESTS_RELEASES_PATH = TRANSLATOR_INGEST_PATH / ".." / ".." / "releases"
 
 INGESTS_LOGS_PATH = TRANSLATOR_INGEST_PATH / ".." / ".." / "logs"
 
+# Derived artifacts which are expensive to rebuild but safe to delete (e.g. Biolink Model snapshots)
+INGESTS_CACHE_PATH = Path(os.environ.get("INGESTS_CACHE_DIR", TRANSLATOR_INGEST_PATH / ".." / ".." / "cache"))
+
 INGESTS_PARSER_PATH = TRANSLATOR_INGEST_PATH / "ingests"
 INGEST_PARSER_DIR = INGESTS_PARSER_PATH.absolute()
 
@@ -12,13 +12,13 @@ with richer data from other sources.
 import re
 from typing import Any
 
-import duckdb
 import koza
 from koza.model.graphs import KnowledgeGraph
 from loguru import logger
 from pathlib import Path
 
 from translator_ingest.util.biolink import build_association_knowledge_sources
+from translator_ingest.util.duckdb_utils import connect_duckdb
 from translator_ingest.util.transform_utils import entity_id
 from biolink_model.datamodel.pydanticmodel_v2 import (
     Gene,
@@ -101,7 +101,7 @@ def build_entity_lookup_db(data_dir: str = "data/alliance"):
 
     logger.info("Building gene ID lookup DB...")
 
-    conn = duckdb.connect(":memory:")
+    conn = connect_duckdb()
     data_path = Path(data_dir)
 
     try:
@@ -3,7 +3,6 @@ import os
 from typing import Any, Iterable
 import tarfile
 import sqlite3
-import json
 
 import biolink_model.datamodel.pydanticmodel_v2 as bm
 from biolink_model.datamodel.pydanticmodel_v2 import (
@@ -22,6 +21,7 @@ from koza.model.graphs import KnowledgeGraph
 
 from translator_ingest.util.biolink import build_association_knowledge_sources
 from translator_ingest.util.transform_utils import entity_id
+from translator_ingest.util.jsonio import read_json
 
 from translator_ingest import INGESTS_PARSER_PATH
 
@@ -296,21 +296,20 @@ QUALIFIER_CONFIG = {}
 
 def load_config():
     global QUALIFIER_CONFIG
-    with open(QUALIFIER_CONFIG_PATH, 'r') as f:
-        config = json.load(f)
-        for action_type, entry in config.items():
-            association = entry["association"]
-            predicate = entry["predicate"]
-            qualifiers = {}
-            for qualifier_type, qualifier_value in entry.get("qualifiers", {}).items():
-              # skip TODO qualifiers until biolink model supports them
-               if not qualifier_type.startswith("TODO:"): 
-                qualifiers[qualifier_type] = qualifier_value
-            QUALIFIER_CONFIG[action_type] = {
-                "association": association,
-                "predicate": predicate,
-                "qualifiers": qualifiers
-            }
+    config = read_json(QUALIFIER_CONFIG_PATH)
+    for action_type, entry in config.items():
+        association = entry["association"]
+        predicate = entry["predicate"]
+        qualifiers = {}
+        for qualifier_type, qualifier_value in entry.get("qualifiers", {}).items():
+          # skip TODO qualifiers until biolink model supports them
+           if not qualifier_type.startswith("TODO:"): 
+            qualifiers[qualifier_type] = qualifier_value
+        QUALIFIER_CONFIG[action_type] = {
+            "association": association,
+            "predicate": predicate,
+            "qualifiers": qualifiers
+        }
     # add default entry for action type ACTIVITY
     QUALIFIER_CONFIG["ACTIVITY"] = {
         "association": "ChemicalAffectsGeneAssociation",
@@ -10,32 +10,22 @@ from biolink_model.datamodel.pydanticmodel_v2 import (
     KnowledgeLevelEnum,
     AgentTypeEnum
 )
-from bmt.pydantic import get_node_class
 from translator_ingest.util.transform_utils import entity_id
 
 import koza
 from koza.model.graphs import KnowledgeGraph
 
-from translator_ingest.util.biolink import (
-    get_biolink_model_toolkit,
-    knowledge_sources_from_trapi
-)
+from translator_ingest.util.biolink import get_biolink_node_class, knowledge_sources_from_trapi
 
 from translator_ingest.ingests.cohd.cohd_util import (
     parse_node_properties,
     get_cohd_supporting_study
 )
 
-bmt = get_biolink_model_toolkit()
-
-
 def get_latest_version() -> str:
     return "2024-11-25"  # last Phase 2 release of COHD
 
 
-_cohd_nodes: dict[str, NamedThing] = {}
-
-
 @koza.transform_record(tag="cohd_nodes")
 def transform_cohd_node(
         koza_transform: koza.KozaTransform,
@@ -49,7 +39,7 @@ def transform_cohd_node(
     """
     node_id = record["id"]
     category = record.get("categories", [])
-    node_class: type[NamedThing] = get_node_class(node_id, category, bmt=bmt)
+    node_class: type[NamedThing] = get_biolink_node_class(node_id, category)
 
     # It currently seems that the COHD attributes block wraps a
     # complex representation of a simple database xref of the node
@@ -57,8 +47,6 @@ def transform_cohd_node(
 
     node = node_class(id=node_id, name=record["name"], **node_properties, **{})
 
-    _cohd_nodes[node_id] = node
-
     return KnowledgeGraph(nodes=[node])
 
 
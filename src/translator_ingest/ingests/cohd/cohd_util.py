@@ -5,11 +5,9 @@ from json import loads
 from typing import Any, Optional
 
 from biolink_model.datamodel.pydanticmodel_v2 import NamedThing, Study
-from bmt.pydantic import get_node_class
 
-from translator_ingest.util.biolink import get_biolink_model_toolkit
+from translator_ingest.util.biolink import get_biolink_node_class
 
-bmt = get_biolink_model_toolkit()
 
 def parse_attributes(attribute_list: list[str]) -> list[dict[str, Any]]:
     return [loads(entry) for entry in attribute_list]
@@ -77,7 +75,7 @@ def get_cohd_supporting_study(
                 study_id = sds[0] if sds else None
 
 
-        node_class: type[NamedThing] = get_node_class(node_id=edge_id, categories=[sa["value_type_id"]], bmt=bmt)
+        node_class: type[NamedThing] = get_biolink_node_class(node_id=edge_id, categories=[sa["value_type_id"]])
         study_result = node_class(id=edge_id, name=sa["value"], **{})
         study_results.append(study_result)
 
@@ -1,5 +1,4 @@
 import json
-import gzip
 import urllib.request
 from pathlib import Path
 from typing import Any
@@ -30,6 +29,7 @@ from biolink_model.datamodel.pydanticmodel_v2 import (
 from koza.model.graphs import KnowledgeGraph
 from translator_ingest.util.biolink import build_association_knowledge_sources
 from translator_ingest.util.transform_utils import entity_id
+from translator_ingest.util.node_registry import NodeRegistry
 
 from translator_ingest.util.logging_utils import get_logger
 
@@ -133,25 +133,15 @@ def get_latest_version() -> str:
 @koza.on_data_begin(tag="edges")
 def on_data_begin_edges(koza: koza.KozaTransform) -> None:
 
-    # Download files
+    # Index the nodes file on disk (reused on reruns) rather than loading every node into memory
     nodes_file_path = Path(koza.input_files_dir) / "clinical_trials_kg_nodes.jsonl.gz"
+    koza.state["nodes_lookup"] = NodeRegistry.from_jsonl(nodes_file_path)
 
-    # Load all nodes into memory
-    logger.info("Loading all nodes into memory...")
-    nodes_lookup = {}
-    node_count = 0
-
-    with gzip.open(nodes_file_path, 'rt') as f:
-        for line in f:
-            if line.strip():
-                node = json.loads(line)
-                node_id = node.get("id")
-                if node_id:
-                    nodes_lookup[node_id] = node
-                    node_count += 1
-
-    logger.info(f"Loaded {node_count} nodes into memory")
-    koza.state["nodes_lookup"] = nodes_lookup
+
+@koza.on_data_end(tag="edges")
+def on_data_end_edges(koza: koza.KozaTransform) -> None:
+    # Close the node index opened in on_data_begin_edges
+    koza.state["nodes_lookup"].close()
 
 
 @koza.transform_record(tag="edges")
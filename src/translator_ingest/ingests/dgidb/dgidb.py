@@ -1,6 +1,7 @@
 ## FROM template, modified for this ingest
 import koza
 import pandas as pd
+import polars as pl
 from typing import Any, Iterable
 from koza.model.graphs import KnowledgeGraph
 from translator_ingest.util.biolink import build_association_knowledge_sources
@@ -21,6 +22,7 @@ from translator_ingest.ingests.dgidb.mappings import (
 )
 from translator_ingest.util.biolink import INFORES_DGIDB
 from translator_ingest.util.http_utils import get_modify_date
+from translator_ingest.util.polars_reader import scan_koza_data
 
 
 ## HARD-CODED VALUES, see mapping.py for more
@@ -37,6 +39,8 @@ PREFIXES_TO_DROP = [
 ## interaction_types that map to plain "interacts_with" edge (no qualifiers, extra edge)
 ## "~NULL" is a placeholder for NA, see prepare_data for details
 plain_interact_types = {"other/unknown", "~NULL"}
+## mod_type value of the interaction_types above
+PLAIN_INTERACTS = "~PLAIN_INTERACTS"
 ## columns for drug-gene pair
 DRUG_GENE_COLS = ["drug_concept_id", "gene_concept_id"]
 
@@ -51,92 +55,85 @@ def get_latest_version() -> str:
 
 @koza.prepare_data()
 def prepare(koza: koza.KozaTransform, data: Iterable[dict[str, Any]]) -> Iterable[dict[str, Any]] | None:
-    df = pd.DataFrame.from_records(data)
-    ## data was loaded with empty values = "". Just in case, replace these empty strings with None so na methods will work
-    df.replace(to_replace="", value=None, inplace=True)
-    ## for debugging
-    # print(df[df["gene_concept_id"].notna()].shape)
-    # print(df[df["drug_concept_id"].notna()].shape)
-    # print(df[df["interaction_source_db_name"].isna()].shape)
-
-    ## log, drop rows with NA (no value) in gene ID OR drug ID (default dropna behavior)
-    n_have_values = df.dropna(subset=["gene_concept_id", "drug_concept_id"]).shape[0]
-    koza.log(f"{n_have_values} rows ({n_have_values / df.shape[0]:.1%}) kept (have both entity IDs)")
-    df.dropna(subset=["gene_concept_id", "drug_concept_id"], ignore_index=True, inplace=True)
+    ## read the source file straight into polars. all columns are strings; empty values = "".
+    ## Replace these empty strings with null so null methods will work
+    df = scan_koza_data(data).collect().select(pl.all().cast(pl.String))
+    df = df.with_columns(pl.when(pl.all() != "").then(pl.all()))
+
+    ## log, drop rows with null (no value) in gene ID OR drug ID
+    n_total = df.height
+    df = df.drop_nulls(subset=["gene_concept_id", "drug_concept_id"])
+    koza.log(f"{df.height} rows ({df.height / n_total:.1%}) kept (have both entity IDs)")
 
     ## remove rows with drug IDs from namespaces that NodeNorm currently doesn't recognize
-    n_before = df.shape[0]    ## save for log: calculating change
-    df["drug_prefix"] = [i.split(":")[0] for i in df["drug_concept_id"]]
-    ## set case=False so it isn't case-sensitive on matches!
-    df = df[~df.drug_prefix.str.contains('|'.join(PREFIXES_TO_DROP), case=False)].copy()
-    koza.log(f"{df.shape[0]} rows ({df.shape[0] / n_before:.1%}) after filtering out drug namespaces that can't be NodeNormed")
-    ## remove prefix column, not needed anymore
-    df.drop("drug_prefix", axis=1, inplace=True)
+    ## (?i) so it isn't case-sensitive on matches!
+    n_before = df.height    ## save for log: calculating change
+    drug_prefix = pl.col("drug_concept_id").str.split(":").list.first()
+    df = df.filter(~drug_prefix.str.contains(f"(?i){'|'.join(PREFIXES_TO_DROP)}"))
+    koza.log(f"{df.height} rows ({df.height / n_before:.1%}) after filtering out drug namespaces that can't be NodeNormed")
 
     ## change ID prefixes to Translator standard: mostly making all upper-case
-    df["drug_concept_id"] = df["drug_concept_id"].str.upper()
-    df["gene_concept_id"] = df["gene_concept_id"].str.upper()
     ## special handling for some prefixes: CHEMBL, NCBIGENE
-    df["drug_concept_id"] = df["drug_concept_id"].str.replace("CHEMBL:", "CHEMBL.COMPOUND:")
-    df["gene_concept_id"] = df["gene_concept_id"].str.replace("NCBIGENE:", "NCBIGene:")
+    df = df.with_columns(
+        pl.col("drug_concept_id").str.to_uppercase().str.replace_all("CHEMBL:", "CHEMBL.COMPOUND:", literal=True),
+        pl.col("gene_concept_id").str.to_uppercase().str.replace_all("NCBIGENE:", "NCBIGene:", literal=True),
+    )
 
     ## clean up interaction_type values
-    ## first replace NA with "~NULL" (will be at end alphabetically). then can use string methods on column
-    df["interaction_types"] = df["interaction_types"].fillna("~NULL")
+    ## first replace null with "~NULL" (will be at end alphabetically). then can use string methods on column
     ## some values are "|"-delimited. Want to split into separate rows
-    df["interaction_types"] = df["interaction_types"].str.split("|")
-    df = df.explode("interaction_types", ignore_index=True)
-    koza.log(f"{df.shape[0]} rows after expanding rows with multiple interaction_type values")
+    df = df.with_columns(pl.col("interaction_types").fill_null("~NULL").str.split("|")).explode("interaction_types")
+    koza.log(f"{df.height} rows after expanding rows with multiple interaction_type values")
     ## make new relationship-type column: mod_type
     ## where interaction_types values with the same data-modeling are set to the same value
     ##   currently, multiple values map to plain "interacts_with" edge modeling
-    df["mod_type"] = ["~PLAIN_INTERACTS" if i in plain_interact_types else i for i in df["interaction_types"]]
     ## (keeping original column interaction_types for trouble-shooting, maybe future use (original predicates?))
+    df = df.with_columns(
+        pl.when(pl.col("interaction_types").is_in(list(plain_interact_types)))
+        .then(pl.lit(PLAIN_INTERACTS))
+        .otherwise(pl.col("interaction_types"))
+        .alias("mod_type")
+    )
 
     ## group-by/merge rows by unique drug ID, gene ID, mod_type combo
-    ## then each row == 1 Translator edge
+    ## then each row == 1 Translator edge. "first" takes the first non-null value, like pandas does
     COLS_DEFINE_EDGE = ["drug_concept_id", "gene_concept_id", "mod_type"]
-    df = df.groupby(by=COLS_DEFINE_EDGE).agg(
-        {
-            "interaction_types": set, 
-            "interaction_source_db_name": set,
-            "interaction_score": "first",
-            "evidence_score": "first",
-            "drug_name": "first",
-            "gene_name": "first",
-
-        }
-    ).reset_index().copy()
-    koza.log(f"{df.shape[0]} rows after merging by unique drug ID, gene ID, mod_type combo")
-    koza.log(f"{df[df["mod_type"] == "~PLAIN_INTERACTS"].shape[0]} rows that map to plain 'interacts_with' edges")
+    df = df.group_by(COLS_DEFINE_EDGE).agg(
+        pl.col("interaction_types").unique(),
+        pl.col("interaction_source_db_name").unique(),
+        *[pl.col(c).drop_nulls().first() for c in ["interaction_score", "evidence_score", "drug_name", "gene_name"]],
+    ).sort(COLS_DEFINE_EDGE)
+    koza.log(f"{df.height} rows after merging by unique drug ID, gene ID, mod_type combo")
+    is_plain = pl.col("mod_type") == PLAIN_INTERACTS
+    koza.log(f"{df.filter(is_plain).height} rows that map to plain 'interacts_with' edges")
 
     ## SPECIAL sources logic: for plain "interacts_with" edges, include ALL sources for drug-gene pair
-    ## first create a mapping df: group-by drug-gene pair -> get set of all sources
-    drug_gene_sources = df.copy()
-    ## need to merge sets!
-    ## and keep multi-index, annoying but seems easier to retrieve values later
-    drug_gene_sources = drug_gene_sources.groupby(by=DRUG_GENE_COLS).agg(
-        {"interaction_source_db_name": lambda x: set.union(*x)}
+    ## first create a mapping df: group-by drug-gene pair -> union of all sources, then join it back
+    drug_gene_sources = (
+        df.select(*DRUG_GENE_COLS, pl.col("interaction_source_db_name").alias("all_sources"))
+        .explode("all_sources")
+        .group_by(DRUG_GENE_COLS)
+        .agg(pl.col("all_sources").unique())
     )
-    ## currently overwrite sources column
-    df["interaction_source_db_name"] = [
-        drug_gene_sources.loc[x.drug_concept_id, x.gene_concept_id].to_list()[0] if x.mod_type == "~PLAIN_INTERACTS"
-        else x.interaction_source_db_name
-        for x in df[["drug_concept_id", "gene_concept_id", "mod_type", "interaction_source_db_name"]].itertuples()
-    ]
+    df = df.join(drug_gene_sources, on=DRUG_GENE_COLS, how="left", maintain_order="left").with_columns(
+        pl.when(is_plain).then(pl.col("all_sources")).otherwise(pl.col("interaction_source_db_name"))
+        .alias("interaction_source_db_name")
+    ).drop("all_sources")
 
     ## SPECIAL scores logic: remove scores from rows that aren't plain "interacts_with" IF there's > 1 row (mod_type) for a drug-gene pair
-    grp = df.groupby(by=DRUG_GENE_COLS)
-    for name, group in grp:
-        if group.shape[0] > 1:
-            for idx,row in group.iterrows():
-                if row.mod_type != "~PLAIN_INTERACTS":
-                    df.at[idx, "interaction_score"] = pd.NA
-                    df.at[idx, "evidence_score"] = pd.NA
-    koza.log(f"Removed {df["interaction_score"].isna().sum()} scores from dataframe after special logic")
-
-    ## return updated dataset
-    return df.to_dict(orient="records")
+    drop_scores = (pl.len().over(DRUG_GENE_COLS) > 1) & ~is_plain
+    df = df.with_columns(
+        pl.when(~drop_scores).then(pl.col("interaction_score")).alias("interaction_score"),
+        pl.when(~drop_scores).then(pl.col("evidence_score")).alias("evidence_score"),
+    )
+    koza.log(f"Removed {df["interaction_score"].null_count()} scores from dataframe after special logic")
+
+    ## return updated dataset, one row at a time; the transform expects the merged columns as sets
+    return (
+        {**record, "interaction_types": set(record["interaction_types"]),
+         "interaction_source_db_name": set(record["interaction_source_db_name"])}
+        for record in df.iter_rows(named=True)
+    )
 
 
 @koza.transform_record()
@@ -5,7 +5,8 @@ from koza.model.graphs import KnowledgeGraph
 from translator_ingest.util.http_utils import get_modify_date
 from translator_ingest.util.biolink import INFORES_DISEASES, INFORES_MEDLINEPLUS, INFORES_AMYCO
 ## ADDED packages for this ingest
-import pandas as pd
+import polars as pl
+from translator_ingest.util.polars_reader import iter_records, scan_koza_data
 
 ## ADJUST based on what I am actually using
 from biolink_model.datamodel.pydanticmodel_v2 import (
@@ -37,25 +38,18 @@ def get_latest_version() -> str:
     return knowledge_modify_date
 
 
-def remove_duplicates(dataframe: pd.DataFrame):
+def remove_duplicates(dataframe: pl.DataFrame):
     """
     Removes completely duplicated rows
     Returns tuple of updated dataframe, count of rows removed
     """
-    ## will count all except first occurrence (default)
-    temp_duplicate_count = dataframe[dataframe.duplicated()].shape[0]
-
-    if temp_duplicate_count > 0:
-        ## remove duplicated rows in place
-        dataframe.drop_duplicates(inplace=True, ignore_index=True)
-        ## return count of rows removed
-        return dataframe, temp_duplicate_count
-    else:
-        ## to keep duplicate row count 0
-        return dataframe, 0
+    ## keeps the first occurrence, in the original row order
+    deduplicated = dataframe.unique(maintain_order=True)
+    ## return count of rows removed (0 if no duplicates)
+    return deduplicated, dataframe.height - deduplicated.height
 
 
-def keep_rows_with_IDs(dataframe: pd.DataFrame, starting_strings: dict):
+def keep_rows_with_IDs(dataframe: pl.DataFrame, starting_strings: dict):
     """
     starting_strings: key is column name, value is STARTING substring that means the row has an ID (we want to keep it)
 
@@ -63,29 +57,29 @@ def keep_rows_with_IDs(dataframe: pd.DataFrame, starting_strings: dict):
     Dict includes each starting_strings value + "total" rows removed
     """
     nrows_removed = dict()
-    nrows_start = dataframe.shape[0]
+    nrows_start = dataframe.height
 
     ## loop through starting_strings, get counts of rows that don't match criteria (don't have expected IDs, will be removed)
     ## this way, have independent counts for each criterion
     for k, v in starting_strings.items():
-        ## ~ means NOT
-        temp_count = dataframe[~dataframe[k].str.startswith(v)].shape[0]
+        ## ~ means NOT. missing values don't have an ID either
+        temp_count = dataframe.filter(~pl.col(k).str.starts_with(v).fill_null(False)).height
         ## include STARTING substring, count
         nrows_removed.update({v: temp_count})
 
     ## loop through starting_strings, only keep rows that match criteria
     for k, v in starting_strings.items():
-        dataframe = dataframe[dataframe[k].str.startswith(v)]
+        dataframe = dataframe.filter(pl.col(k).str.starts_with(v))
 
     ## calculate total rows removed, save
-    nrows_removed.update({"total": nrows_start - dataframe.shape[0]})
+    nrows_removed.update({"total": nrows_start - dataframe.height})
 
     return dataframe, nrows_removed
 
 
 @koza.prepare_data(tag="knowledge")
 def knowledge_prepare(koza: koza.KozaTransform, data: Iterable[dict[str, Any]]) -> Iterable[dict[str, Any]] | None:
-    ## remove rows we don't want to process, using pandas
+    ## remove rows we don't want to process, using polars
     ## set up counts for removed rows, save in state for later use
     koza.state["knowledge_row_counts"] = {
         "duplicate_rows": 0,
@@ -94,9 +88,10 @@ def knowledge_prepare(koza: koza.KozaTransform, data: Iterable[dict[str, Any]])
         "total_no_IDs": 0,
     }
 
-    df = pd.DataFrame.from_records(data)
-    ## data was loaded with empty values = "". Just in case, replace these empty strings with None so isna() methods will work
-    df.replace(to_replace="", value=None, inplace=True)
+    ## read the source file straight into a polars dataframe
+    df = scan_koza_data(data).collect()
+    ## data was loaded with empty values = "". Just in case, replace these empty strings with null so null methods will work
+    df = df.with_columns(pl.when(pl.col(pl.String) != "").then(pl.col(pl.String)))
     ## debugging: keep because it tells us how much was removed by filter
     koza.log(f"After filter, but before prepare_data: {df.shape}")
 
@@ -115,8 +110,8 @@ def knowledge_prepare(koza: koza.KozaTransform, data: Iterable[dict[str, Any]])
     # ## debugging
     # print(f"After removing rows without IDs: {df.shape}")
 
-    ## return updated dataset
-    return df.to_dict(orient="records")
+    ## return updated dataset, one row at a time
+    return iter_records(df)
 
 
 @koza.transform_record(tag="knowledge")
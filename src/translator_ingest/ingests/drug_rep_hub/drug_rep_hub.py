@@ -1,5 +1,4 @@
 import koza
-import json
 import re
 
 from typing import Any, Iterable
@@ -19,6 +18,7 @@ from biolink_model.datamodel.pydanticmodel_v2 import (
 from koza.model.graphs import KnowledgeGraph
 from translator_ingest.util.biolink import build_association_knowledge_sources
 from translator_ingest.util.transform_utils import entity_id
+from translator_ingest.util.jsonio import read_json
 
 
 inchikey_regex = re.compile('^[A-Z]{14}-[A-Z]{10}-[A-Z]$')
@@ -34,8 +34,7 @@ SAMPLES = defaultdict(dict)
 def load_json_config(filename: str) -> dict:
     """Load a JSON config file and return its contents."""
     path = INGESTS_PARSER_PATH / 'drug_rep_hub' / filename
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return read_json(path)
 
 
 INDICATIONS = load_json_config('indications_config.json')
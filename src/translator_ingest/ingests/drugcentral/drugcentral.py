@@ -5,11 +5,12 @@ from typing import Any, Iterable
 ## build_association_knowledge_sources should be able to handle source_record_urls
 from translator_ingest.util.biolink import build_association_knowledge_sources
 from translator_ingest.util.transform_utils import entity_id
-## using bmt to get UMLS semantic types for DiseaseOrPheno
+## using the Biolink Model to get UMLS semantic types for DiseaseOrPheno
 from translator_ingest.util.biolink import (
     INFORES_DRUGCENTRAL,
     ## getting other infores from my mapping py
-    get_biolink_model_toolkit
+    get_biolink_descendants,
+    get_biolink_element_by_mapping,
 )
 from biolink_model.datamodel.pydanticmodel_v2 import (
     ChemicalEntity,
@@ -27,7 +28,8 @@ from biolink_model.datamodel.pydanticmodel_v2 import (
 ## ADDED packages for this ingest
 import pandas as pd
 ## psycopg is underlying dependency
-from sqlalchemy import create_engine, URL, text
+from sqlalchemy import bindparam, create_engine, Engine, URL, text
+from translator_ingest.util.sql_reader import read_sql
 ## FYI: get bmt toolkit from util.biolink function, so not importing entire package here
 from translator_ingest.ingests.drugcentral.mappings import (
     OMOP_RELATION_MAPPING,
@@ -61,7 +63,7 @@ DOP_TO_FILTER = [
 ## only columns we're using right now - total 23 columns
 ACT_MAIN_COLUMNS = ["struct_id", "accession", "action_type", "act_source", "act_source_url"]
 ## removed because ingesting directly or licensing concerns
-## tuple so the f-string SQL query will have parentheses. Must be exact values
+## Must be exact values
 ACT_REMOVED_SOURCES = ("CHEMBL", "IUPHAR", "DRUGBANK", "KEGG DRUG")
 ## act_source values with same modeling (drugcentral primary)
 PRIMARY_DRUGCENTRAL = {"DRUG LABEL", "SCIENTIFIC LITERATURE", "UNKNOWN"}
@@ -86,16 +88,23 @@ def get_server_url(dialect, driver, user, password, host, port: int, dbname):
     )
 
 
+def get_engine() -> Engine:
+    """
+    SQLAlchemy engine for the public DrugCentral database. Doesn't connect until it's used.
+    """
+    server_url = get_server_url(
+        dialect=DIALECT, driver=DRIVER, user=USER, password=PASSWORD, host=HOST, port=PORT, dbname=DBNAME
+    )
+    return create_engine(server_url)
+
+
 ## PIPELINE MAIN FUNCTIONS
 def get_latest_version() -> str:
     """
     Returns database's version date in the format "%Y_%m_%d"
     """
     ## setup access to database
-    server_url = get_server_url(
-        dialect=DIALECT, driver=DRIVER, user=USER, password=PASSWORD, host=HOST, port=PORT, dbname=DBNAME
-    )
-    engine = create_engine(server_url)
+    engine = get_engine()
 
     ## closes connection automatically afterwards
     with engine.connect() as db_conn:
@@ -111,59 +120,59 @@ def get_latest_version() -> str:
 @koza.prepare_data(tag="omop_relationship")
 def omop_prepare(koza: koza.KozaTransform, data: Iterable[dict[str, Any]]) -> Iterable[dict[str, Any]] | None:
     """
-    Access database and load Drug - DiseaseOrPheno (DoP) table into pandas. Then process.
+    Stream the Drug - DiseaseOrPheno (DoP) rows from the database, with the filtering done in SQL.
+    Query results are snapshotted in the versioned source data directory, so reruns don't query the database.
     """
-    ## setup access to database
-    server_url = get_server_url(
-        dialect=DIALECT, driver=DRIVER, user=USER, password=PASSWORD, host=HOST, port=PORT, dbname=DBNAME
-    )
-    engine = create_engine(server_url)
-
-    ## load table into pandas: only the columns we're currently using
-    koza.log(f"Loading {OMOP_TABLE} into pandas...")
+    engine = get_engine()
     koza.log(f"Only working with these columns: {", ".join(OMOP_MAIN_COLUMNS)}")
-    with engine.connect() as db_conn:
-        df2 = pd.read_sql_table(table_name=OMOP_TABLE, con=db_conn, columns=OMOP_MAIN_COLUMNS)
-    koza.log(f"Successfully loaded {OMOP_TABLE}: {df2.shape[0]} rows")
 
-    ## FILTERING
+    ## FILTERING (in SQL)
     ## drop rows with NA values
     ##   for 2023_11_01 data, dropping NA only matters for umls_cui. But this way seems more foolproof
     ##   (no NA in struct_id or relationship_name, filtering done on cui_semantic_type)
-    df2.dropna(ignore_index=True, inplace=True)
-    koza.log(f"{df2.shape[0]} rows kept after filtering out missing values (NA).")
     ## drop rows with problematic umls_cui values - see variable above and its comments
-    df2 = df2[~ df2["umls_cui"].isin(DOP_TO_FILTER)].copy()
-    koza.log(f"{df2.shape[0]} rows kept after filtering out these IDs (not DoP): {", ".join(DOP_TO_FILTER)}")
+    omop_filter = f"""
+        FROM {OMOP_TABLE}
+        WHERE {" AND ".join(f"({i} IS NOT NULL)" for i in OMOP_MAIN_COLUMNS)} AND
+        (umls_cui NOT IN :dop_to_filter)
+    """
+    koza.log(f"Filtering out missing values (NA) and these IDs (not DoP): {", ".join(DOP_TO_FILTER)}")
 
     ## FILTERING: only keep rows where cui_semantic_type maps to DoP or its descendants
-    tk = get_biolink_model_toolkit()
-    ## get list of DoP and descendants (default returns self)
-    dop_descendants = tk.get_descendants("disease or phenotypic feature")
+    ## get set of DoP and descendants (includes self)
+    dop_descendants = get_biolink_descendants("disease or phenotypic feature")
     ## get UMLS cui_semantic_type values that map to these categories
     dop_semantic_types = list()
     koza.transform_metadata["dop_semantic_mapping"] = dict()    ## just in case, to see filter details
+    semantic_type_query = text(f"SELECT DISTINCT cui_semantic_type {omop_filter}").bindparams(
+        bindparam("dop_to_filter", expanding=True)
+    )
     ## easier to read/make both at same time, rather than list/dict comprehension
-    for i in df2["cui_semantic_type"].unique():
-        temp = tk.get_element_by_mapping("STY:" + i)
+    for row in read_sql(engine, semantic_type_query, name=f"{OMOP_TABLE}_semantic_types",
+                        parameters={"dop_to_filter": DOP_TO_FILTER}, snapshot_dir=koza.input_files_dir):
+        i = row["cui_semantic_type"]
+        temp = get_biolink_element_by_mapping("STY:" + i)
         if temp in dop_descendants:
             dop_semantic_types.append(i)
             koza.transform_metadata["dop_semantic_mapping"][i] = temp
-    ## filter - only rows with these cui_semantic_type values
-    df2 = df2[df2["cui_semantic_type"].isin(dop_semantic_types)].copy()
-    koza.log(f"{df2.shape[0]} rows kept - cui_semantic_type maps to DiseaseOrPheno or its descendants.")
+    koza.log(f"Only keeping rows where cui_semantic_type maps to DiseaseOrPheno or its descendants: "
+             f"{", ".join(sorted(dop_semantic_types))}")
 
-    ## PREPROCESS, REMOVE DUPLICATES
+    ## PREPROCESS, REMOVE DUPLICATES (in SQL)
     ## remove whitespace found during EDA. Good to do before removing duplicates, adding prefix
-    df2["umls_cui"] = df2["umls_cui"].str.strip()
     ## drop cui_semantic_type - no longer needed, don't want to consider when removing duplicates
-    df2.drop(columns="cui_semantic_type", inplace=True)
-    ## remove duplicates
-    df2.drop_duplicates(inplace=True, ignore_index=True)
-    koza.log(f"{df2.shape[0]} rows kept after removing duplicates.")
+    ## ordered, so the rows come in the same order every time: a checkpointed transform resumes by skipping rows
+    omop_query = text(f"""
+        SELECT DISTINCT struct_id, relationship_name, TRIM(umls_cui) AS umls_cui
+        {omop_filter} AND
+        (cui_semantic_type IN :dop_semantic_types)
+        ORDER BY struct_id, relationship_name, umls_cui
+    """).bindparams(bindparam("dop_to_filter", expanding=True), bindparam("dop_semantic_types", expanding=True))
 
-    ## DONE - output to transform step
-    return df2.to_dict(orient="records")
+    ## DONE - stream to transform step
+    return read_sql(engine, omop_query, name=OMOP_TABLE,
+                    parameters={"dop_to_filter": DOP_TO_FILTER, "dop_semantic_types": dop_semantic_types},
+                    snapshot_dir=koza.input_files_dir)
 
 
 @koza.transform_record(tag="omop_relationship")
@@ -195,60 +204,59 @@ def omop_transform(koza: koza.KozaTransform, record: dict[str, Any]) -> Knowledg
     return KnowledgeGraph(nodes=[chemical, dop], edges=[association])
 
 
+def _bioactivity_rows(koza: koza.KozaTransform, rows: Iterable[dict[str, Any]]) -> Iterable[dict[str, Any]]:
+    """
+    Split, reformat and deduplicate act_table_full rows as they are streamed from the database.
+    """
+    loaded = kept = 0
+    seen_triples = set()
+    for row in rows:
+        loaded += 1
+        ## PREPROCESS, REMOVE DUPLICATES
+        ## turn some urls into CURIEs, leaving rest as-is
+        if row["act_source_url"] is not None:
+            for k,v in URL_TO_PREFIX.items():
+                row["act_source_url"] = row["act_source_url"].replace(k, v)
+        ## multiple protein IDs, |-delimited. Split to individ lines
+        accessions = row["accession"].split("|") if row["accession"] is not None else [None]
+        for accession in accessions:
+            ## remove duplicates
+            ## currently, all action_type values have unique mappings. So using as-is when considering dups
+            ## using source: some have unique primary knowledge-source (KS)
+            ##   depending on pipeline's merge step to merge any edges with same triple and primary KS (drugcentral)
+            triple = (row["struct_id"], accession, row["action_type"], row["act_source"])
+            if triple in seen_triples:
+                continue
+            seen_triples.add(triple)
+            kept += 1
+            yield {**row, "accession": accession}
+    koza.log(f"Loaded {loaded} act_table_full rows, {kept} rows kept after splitting pipe-delimited accession "
+             f"values and removing duplicates.")
+
+
 ## act_table_full parsing
 @koza.prepare_data(tag="act_table_full")
 def bioactivity_prepare(koza: koza.KozaTransform, data: Iterable[dict[str, Any]]) -> Iterable[dict[str, Any]] | None:
     """
-    Access database and load bioactivity table into pandas. Then process.
+    Stream the bioactivity rows from the database, with the filtering done in SQL. Then process.
+    Query results are snapshotted in the versioned source data directory, so reruns don't query the database.
     """
-    ## setup access to database
-    server_url = get_server_url(
-        dialect=DIALECT, driver=DRIVER, user=USER, password=PASSWORD, host=HOST, port=PORT, dbname=DBNAME
-    )
-    engine = create_engine(server_url)
-
-    ## load table into pandas: do filtering in SQL query (faster, more efficient)
-    koza.log("Loading act_table_full into pandas...")
     koza.log(f"Only working with these columns: {", ".join(ACT_MAIN_COLUMNS)}")
     ## currently only ingesting rows with an action_type value (assertion of relationship)
     ## for reasoning behind other constraints, see comments where variables were defined
-    act_query = f"""
+    ## ordered, so the same duplicate is kept and a checkpointed transform can resume by skipping rows
+    act_query = text(f"""
         SELECT {", ".join(ACT_MAIN_COLUMNS)}
         FROM act_table_full
         WHERE (action_type IS NOT NULL) AND
-        (act_source NOT IN {ACT_REMOVED_SOURCES})
-    """
-    with engine.connect() as db_conn:
-        df1_qfilter = pd.read_sql_query(act_query, con=db_conn)
-    koza.log(f"Successfully loaded act_table_full: {df1_qfilter.shape[0]} rows")
-    ## logging for easy inspection of data - that filtered query worked as-intended
-    for i in df1_qfilter.columns:
-        if df1_qfilter[i].hasnans:
-            koza.log(f"{i} is present in {df1_qfilter[i].notna().sum()} rows")
-    koza.log("All other columns have no missing values")
-    for i in ["struct_id", "accession", "action_type"]:
-        koza.log(f"{i}: {df1_qfilter[i].nunique()} unique values")
-    ## diff for act_source: list values
-    koza.log(f"act_source has {df1_qfilter["act_source"].nunique()} unique values: {", ".join(sorted(df1_qfilter["act_source"].unique()))}")
-
-    ## PREPROCESS, REMOVE DUPLICATES
-    ## multiple protein IDs, |-delimited. Split, explode to individ lines
-    df1_qfilter["accession"] = df1_qfilter["accession"].str.split("|")
-    df1_qfilter = df1_qfilter.explode("accession", ignore_index=True)
-    koza.log(f"{df1_qfilter.shape[0]} rows after splitting pipe-delimited accession values")
-    ## turn some urls into CURIEs, leaving rest as-is
-    for k,v in URL_TO_PREFIX.items():
-        df1_qfilter["act_source_url"] = df1_qfilter["act_source_url"].str.replace(k, v)
-    ## remove duplicates
-    ## currently, all action_type values have unique mappings. So using as-is when considering dups
-    ## using source: some have unique primary knowledge-source (KS)
-    ##   depending on pipeline's merge step to merge any edges with same triple and primary KS (drugcentral)
-    ACT_MAIN_TRIPLE = ["struct_id", "accession", "action_type", "act_source"]
-    df1_qfilter.drop_duplicates(subset=ACT_MAIN_TRIPLE, inplace=True, ignore_index=True)
-    koza.log(f"{df1_qfilter.shape[0]} rows kept after removing duplicates.")
-
-    ## DONE - output to transform step
-    return df1_qfilter.to_dict(orient="records")
+        (act_source NOT IN :removed_sources)
+        ORDER BY {", ".join(ACT_MAIN_COLUMNS)}
+    """).bindparams(bindparam("removed_sources", expanding=True))
+    rows = read_sql(get_engine(), act_query, name="act_table_full",
+                    parameters={"removed_sources": list(ACT_REMOVED_SOURCES)}, snapshot_dir=koza.input_files_dir)
+
+    ## DONE - stream to transform step
+    return _bioactivity_rows(koza, rows)
 
 
 @koza.transform_record(tag="act_table_full")
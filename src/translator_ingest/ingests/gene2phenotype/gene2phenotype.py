@@ -17,7 +17,9 @@ from biolink_model.datamodel.pydanticmodel_v2 import (
 ## ADDED packages for this ingest
 from datetime import datetime
 import pandas as pd
-import requests
+import polars as pl
+from translator_ingest.util.ontology_lookup import get_ontology_lookup
+from translator_ingest.util.polars_reader import iter_records, scan_koza_data
 
 
 ## HARD-CODED VALUES
@@ -50,20 +52,10 @@ FORM_OR_VARIANT_QUALIFIER_MAPPINGS = {
 
 ## CUSTOM FUNCTIONS
 ## used in `on_data_begin` to build mapping of EBI G2P's allelic requirement values -> HP terms
-def build_allelic_req_mappings(allelic_req_val):
-    ## queries OLS to find what HP term has the allelic requirement value as an exact synonym (OLS uses the latest HPO release)
-    ols_request = (
-        f"https://www.ebi.ac.uk/ols4/api/search?q={allelic_req_val}&ontology=hp&queryFields=synonym&exact=true"
-    )
-    try:
-        response = requests.get(ols_request, timeout=5)
-        if response.status_code == 200:
-            temp = response.json()
-            return temp["response"]["docs"][0]["obo_id"]  ## only need the HP ID
-        else:
-            print(f"Error encountered on '{allelic_req_val}': {response.status_code}")
-    except requests.RequestException as e:
-        print(f"Request exemption encountered on '{allelic_req_val}': {e}")
+def build_allelic_req_mappings(allelic_req_vals: list[str]) -> dict[str, str | None]:
+    ## finds what HP terms have the allelic requirement values as exact synonyms (in OLS, which uses the latest HPO
+    ## release, or a local HPO file in offline mode). Cached per HPO release, so only a new release is looked up
+    return get_ontology_lookup("hp").find_by_exact_synonym(allelic_req_vals)
 
 
 ## PIPELINE MAIN FUNCTIONS
@@ -75,37 +67,38 @@ def get_latest_version() -> str:
 @koza.on_data_begin()
 def on_begin(koza: koza.KozaTransform) -> None:
     ## generate allelic req mappings
-    koza.transform_metadata["allelicreq_mappings"] = {i: build_allelic_req_mappings(i) for i in ALLELIC_REQ_TO_MAP}
+    koza.transform_metadata["allelicreq_mappings"] = build_allelic_req_mappings(ALLELIC_REQ_TO_MAP)
 
 
 @koza.prepare_data()
 def prepare(koza: koza.KozaTransform, data: Iterable[dict[str, Any]]) -> Iterable[dict[str, Any]] | None:
-    df = pd.DataFrame.from_records(data)
-    ## data was loaded with empty values = "". Replace these empty strings with None, so isna() methods will work
-    df.replace(to_replace="", value=None, inplace=True)
-    ## check that there's NAs, isna() methods work
-    koza.log(f"{df[df["disease mim"].isna() & df["disease MONDO"].isna()].shape[0]} rows are missing disease IDs (NA)")
-    koza.log(f"{df[df["publications"].isna()].shape[0]} rows are missing publications (NA).")
+    ## read the source file straight into a polars dataframe
+    df = scan_koza_data(data).collect()
+    ## data was loaded with empty values = "". Replace these empty strings with null, so null methods will work
+    df = df.with_columns(pl.when(pl.col(pl.String) != "").then(pl.col(pl.String)))
+    ## check that there's nulls, null methods work
+    koza.log(f"{df.filter(pl.col("disease mim").is_null() & pl.col("disease MONDO").is_null()).height} rows are missing disease IDs (NA)")
+    koza.log(f"{df["publications"].null_count()} rows are missing publications (NA).")
 
     ## check for orphanet IDs, duplicates just in case (currently not in data, so not handled)
-    koza.log(f"{df["disease mim"].str.contains("orpha", case=False, na=False).sum()} rows with orphanet ID in 'disease mim' column")
-    koza.log(f"{df.duplicated(keep=False).sum()} duplicate rows")
+    koza.log(f"{df["disease mim"].str.contains("(?i)orpha").sum()} rows with orphanet ID in 'disease mim' column")
+    koza.log(f"{df.is_duplicated().sum()} duplicate rows")
 
     ## FILTERING
     ## remove rows with specific confidence values: negated or likely-no relationship
-    df = df[~ df["confidence"].isin(CONFIDENCE_TO_FILTER)]
-    koza.log(f"{df.shape[0]} rows after removing confidence values: {", ".join(CONFIDENCE_TO_FILTER)}")
+    df = df.filter(~pl.col("confidence").is_in(CONFIDENCE_TO_FILTER).fill_null(False))
+    koza.log(f"{df.height} rows after removing confidence values: {", ".join(CONFIDENCE_TO_FILTER)}")
     ## remove rows that don't have a disease ID
-    df.dropna(how="all", subset=["disease mim", "disease MONDO"], inplace=True, ignore_index=True)
-    koza.log(f"{df.shape[0]} rows after removing rows with no disease ID")
+    df = df.filter(pl.col("disease mim").is_not_null() | pl.col("disease MONDO").is_not_null())
+    koza.log(f"{df.height} rows after removing rows with no disease ID")
     ## TEMPORARY filter for OMIM:188400
     ## NodeNorm incorrectly assigns this to a Gene when it's actually a Disease, causing an incorrect edge to be made
     TEMP_OMIM_FILTER = ["188400"]
-    df = df[~ df["disease mim"].isin(TEMP_OMIM_FILTER)]
-    koza.log(f"{df.shape[0]} rows after removing disease OMIM: {", ".join(TEMP_OMIM_FILTER)}") 
+    df = df.filter(~pl.col("disease mim").is_in(TEMP_OMIM_FILTER).fill_null(False))
+    koza.log(f"{df.height} rows after removing disease OMIM: {", ".join(TEMP_OMIM_FILTER)}")
 
-    ## return updated dataset
-    return df.to_dict(orient="records")
+    ## return updated dataset, one row at a time
+    return iter_records(df)
 
 
 @koza.transform_record()
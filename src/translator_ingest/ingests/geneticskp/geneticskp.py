@@ -9,9 +9,6 @@ The data comes as a tar.gz file containing:
 This ingest validates and transforms the KGX data through Pydantic classes.
 """
 
-import json
-import gzip
-import tarfile
 from pathlib import Path
 from typing import Any, Dict, Optional
 from datetime import datetime
@@ -34,6 +31,8 @@ from biolink_model.datamodel.pydanticmodel_v2 import (
 from koza.model.graphs import KnowledgeGraph
 from translator_ingest.util.biolink import build_association_knowledge_sources
 from translator_ingest.util.transform_utils import entity_id
+from translator_ingest.util.node_registry import NodeRegistry
+from translator_ingest.util.decompression import open_tar_gz
 
 from translator_ingest.util.logging_utils import get_logger
 
@@ -117,13 +116,13 @@ def create_node(node_data: dict) -> Any:
 
 @koza.on_data_begin(tag="edges")
 def on_data_begin_edges(koza: koza.KozaTransform) -> None:
-    """Extract tar.gz and load all nodes into memory before processing edges."""
+    """Extract tar.gz and index the nodes file before processing edges."""
 
     # First extract the tar.gz if it exists
     tar_path = Path(koza.input_files_dir) / "genetics_magma.tar.gz"
     if tar_path.exists():
         logger.info(f"Extracting {tar_path} to {koza.input_files_dir}")
-        with tarfile.open(tar_path, "r:gz") as tar:
+        with open_tar_gz(tar_path) as tar:
             tar.extractall(koza.input_files_dir)
         logger.info("Extraction complete")
 
@@ -133,32 +132,18 @@ def on_data_begin_edges(koza: koza.KozaTransform) -> None:
     if not nodes_file_path.exists():
         nodes_file_path = Path(koza.input_files_dir) / "nodes_geneticsKP_magma.jsonl.gz"
 
-    logger.info("Loading all nodes into memory...")
-    nodes_lookup = {}
+    # Index the nodes file on disk (reused on reruns) rather than loading every node into memory
     nodes_written = set()  # Track which nodes have been written
-    node_count = 0
-
-    if nodes_file_path.suffix == '.gz':
-        opener = gzip.open
-        mode = 'rt'
-    else:
-        opener = open
-        mode = 'r'
-
-    with opener(nodes_file_path, mode) as f:
-        for line in f:
-            if line.strip():
-                node = json.loads(line)
-                node_id = node.get("id")
-                if node_id:
-                    nodes_lookup[node_id] = node
-                    node_count += 1
-
-    logger.info(f"Loaded {node_count} nodes into memory")
-    koza.state["nodes_lookup"] = nodes_lookup
+    koza.state["nodes_lookup"] = NodeRegistry.from_jsonl(nodes_file_path)
     koza.state["nodes_written"] = nodes_written
 
 
+@koza.on_data_end(tag="edges")
+def on_data_end_edges(koza: koza.KozaTransform) -> None:
+    # Close the node index opened in on_data_begin_edges
+    koza.state["nodes_lookup"].close()
+
+
 @koza.transform_record(tag="edges")
 def transform(koza: koza.KozaTransform, record: Dict[str, Any]) -> Optional[KnowledgeGraph]:
     """Transform edge records into KnowledgeGraph objects with validated nodes and edges."""
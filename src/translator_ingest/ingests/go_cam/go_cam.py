@@ -1,5 +1,3 @@
-import json
-import tarfile
 import tempfile
 from pathlib import Path
 from typing import Any, Iterable
@@ -7,6 +5,8 @@ from typing import Any, Iterable
 import koza
 
 from translator_ingest.util.http_utils import get_geneontology_release_version
+from translator_ingest.util.decompression import open_tar_gz
+from translator_ingest.util.jsonio import read_json
 from translator_ingest.util.transform_utils import entity_id
 from biolink_model.datamodel.pydanticmodel_v2 import (
     Gene,
@@ -146,7 +146,7 @@ def extract_tar_gz(tar_path: str) -> str:
     extract_dir = tempfile.mkdtemp(prefix="go_cam_extract_")
 
     logger.info(f"Extracting {tar_path} to {extract_dir}")
-    with tarfile.open(tar_path, "r:gz") as tar:
+    with open_tar_gz(tar_path) as tar:
         tar.extractall(extract_dir)
 
     return extract_dir
@@ -191,8 +191,7 @@ def prepare_go_cam_data(koza: koza.KozaTransform, data: Iterable[dict[str, Any]]
     # Yield the content of each JSON file, filtering by species from config
     for json_file in json_files:
         try:
-            with open(json_file, "r") as f:
-                model_data = json.load(f)
+            model_data = read_json(json_file)
 
             models_processed += 1
 
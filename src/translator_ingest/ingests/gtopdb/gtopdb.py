@@ -1,5 +1,5 @@
 import koza
-import pandas as pd
+import polars as pl
 import requests
 import re
 from bs4 import BeautifulSoup
@@ -9,6 +9,7 @@ from typing import Any, Iterable
 from koza.model.graphs import KnowledgeGraph
 from translator_ingest.util.biolink import build_association_knowledge_sources
 from translator_ingest.util.transform_utils import entity_id
+from translator_ingest.util.polars_reader import iter_records, scan_koza_data
 
 from biolink_model.datamodel.pydanticmodel_v2 import (
     # Gene,
@@ -64,71 +65,61 @@ def prepare(koza: koza.KozaTransform, data: Iterable[dict[str, Any]]) -> Iterabl
 
     ## Load ligands mapping CSV directly
     ## skip the metadata row
-    ## Specify that 'Ligand ID' and "PubChem CID" should be read as a string
+    ## read all columns as strings, so 'Ligand ID' and "PubChem CID" keep their exact text
     ligands_file_path = Path(koza.input_files_dir) / "ligands.csv"
-    mapping_df = pd.read_csv(ligands_file_path, skiprows = 1, dtype={'Ligand ID': str, 'PubChem CID': str})
+    mapping_df = pl.scan_csv(ligands_file_path, skip_rows=1, infer_schema=False)
     ## used for debugging only
-    # print("Mapping CSV columns:", mapping_df.columns.tolist())
-
-    mapping_dict = dict(zip(
-        mapping_df["Ligand ID"].astype(str).str.strip(),
-        mapping_df["PubChem CID"].astype(str).str.strip()
-    ))
+    # print("Mapping CSV columns:", mapping_df.collect_schema().names())
+
+    ## ligands without a PubChem CID have no mapping; the last row wins for repeated ligand IDs, like a dict would
+    mapping_df = (
+        mapping_df.select(
+            pl.col("Ligand ID").str.strip_chars(),
+            pl.col("PubChem CID").str.strip_chars().alias("subject_id"),
+        )
+        .drop_nulls()
+        .unique(subset="Ligand ID", keep="last", maintain_order=True)
+    )
 
-    ## convert the input dataframe into pandas df format
-    source_df = pd.DataFrame(data)
+    ## read the source file straight into a polars LazyFrame (all values are strings, so 1102 stays 1102)
+    source_df = scan_koza_data(data)
 
     ## Only select needed columns
     sele_cols = ['Target', 'Target UniProt ID', 'Ligand ID', 'Ligand', 'Type', 'Action',
     'Endogenous', 'Ligand Context', 'PubMed ID']
-    source_subset_df = source_df[sele_cols].drop_duplicates()
-
-    ## Specify that 'Ligand ID' and "Target UniProt ID" should be read as a string ('object' dtype) to avoid pandas changing identifier from 1102 -> 1102.0
-    source_subset_df = source_subset_df.astype({
-        "Ligand ID": "string",
-        "Target UniProt ID": "string"
-    })
+    source_subset_df = source_df.select(sele_cols).unique(maintain_order=True)
 
     ## debugging usage
-    # koza.log(f"DataFrame columns: {source_df.columns.tolist()}")
+    # koza.log(f"DataFrame columns: {source_df.collect_schema().names()}")
 
-    ## Drop nan values
-    source_subset_df = source_subset_df.dropna(subset=["Target UniProt ID", "Ligand ID"])
+    ## Drop null values
+    source_subset_df = source_subset_df.drop_nulls(subset=["Target UniProt ID", "Ligand ID"])
 
     ## Implement logic to aggregate source records into a single edge based on SPO + qualifier pair (subject_name, subject_category, object_name, object_category, MECHANISM, EFFECT, DIRECT)
     group_cols = ['Target', 'Target UniProt ID', 'Ligand ID', 'Ligand', 'Type', 'Action', 'Endogenous']
 
     source_agg_df = (
-        ## In pandas, groupby() drops rows with NA in any grouping key by default, which can silently discard interaction rows (and makes downstream Type/Action is None handling unreachable).
-        ## use groupby(..., dropna=False) if intend to keep records with missing qualifiers
-        source_subset_df.groupby(group_cols, as_index=False, dropna=False)
-        .agg({
-            "PubMed ID": lambda x: "|".join(pd.unique(x.dropna().astype(str)))
-            })
+        ## polars group_by keeps groups with null keys (like pandas groupby(..., dropna=False)),
+        ## so records with missing qualifiers are not silently discarded
+        source_subset_df.group_by(group_cols, maintain_order=True)
+        .agg(
+            pl.col("PubMed ID").drop_nulls().cast(pl.String).unique(maintain_order=True).str.join("|")
+        )
     )
 
     ## rename those columns into desired format, note we need to obtain "pubchem CID" as subject id from "Ligand ID"
-    source_agg_df.rename(
-        columns={
+    source_agg_df = source_agg_df.rename(
+        {
             "Ligand": "subject_name",
             "Target": "object_name",
             "Target UniProt ID": "object_id",
-        },
-        inplace=True,
-    )
-
-    ## avoid mismatching by converting string ids into integer IDs
-    source_agg_df["subject_id"] = (
-        source_agg_df["Ligand ID"]
-        .astype(str)
-        .str.strip()
-        .map(mapping_dict)
+        }
     )
 
-    ## drop NA of those dont find a mapping
-    source_agg_df = source_agg_df.dropna(subset=["subject_id"])
+    ## map the ligand IDs to PubChem CIDs, and drop those we dont find a mapping for
+    source_agg_df = source_agg_df.join(mapping_df, on="Ligand ID", how="inner", maintain_order="left")
 
-    return source_agg_df.drop_duplicates().to_dict(orient="records")
+    return iter_records(source_agg_df.unique(maintain_order=True))
 
 
 @koza.transform(tag="gtopdb_interaction_parsing")
@@ -12,8 +12,6 @@ https://github.com/monarch-initiative/monarch-phenotype-profile-ingest
 from loguru import logger
 from typing import Optional, Any, Iterable
 
-import duckdb
-
 import koza
 from koza.utils.exceptions import MapItemException
 from koza.model.graphs import KnowledgeGraph
@@ -32,6 +30,7 @@ from biolink_model.datamodel.pydanticmodel_v2 import (
     AgentTypeEnum, GeneToPhenotypicFeaturePredicateEnum,
 )
 
+from translator_ingest.util.duckdb_utils import stream_query
 from translator_ingest.util.github import GitHubReleases
 from translator_ingest.util.biolink import build_association_knowledge_sources
 from translator_ingest.util.transform_utils import entity_id
@@ -63,9 +62,6 @@ and "inheritance" (aspect == 'I') annotation records.
 Association to "remarkable normality" may be added later.
 """
 
-# We need to track phenotype.hpoa Disease nodes to avoid
-# duplication but ensure proper inheritance mode annotation
-_disease_nodes: dict[str, Disease] = {}
 
 @koza.transform_record(tag="disease_to_phenotype_nodes")
 def transform_disease_to_phenotype_node_record(
@@ -75,11 +71,14 @@ def transform_disease_to_phenotype_node_record(
     Transform a 'phenotype.hpoa' data entry into a
     (Pydantic encapsulated) Biolink knowledge graph statement.
 
-    :param koza_transform: KozaTransform object (unused in this implementation)
+    :param koza_transform: KozaTransform object, whose state holds the Disease nodes seen so far
     :param record: Dict contents of a single input data record
     :return: koza.model.graphs.KnowledgeGraph wrapping nodes (NamedThing) and edges (Association)
     """
-    global _disease_nodes
+    # We need to track phenotype.hpoa Disease nodes to avoid
+    # duplication but ensure proper inheritance mode annotation.
+    # They are kept in koza.state, so a checkpointed transform resumes with them.
+    disease_nodes: dict[str, Disease] = koza_transform.state.setdefault("disease_nodes", {})
 
     if record["aspect"] not in ["P", "I"]:
         # We are only interested in phenotypic anomalies
@@ -92,7 +91,7 @@ def transform_disease_to_phenotype_node_record(
 
     disease_id = record["database_id"].replace("ORPHA:", "Orphanet:") # match `Orphanet` as used in Mondo SSSOM
 
-    if disease_id not in _disease_nodes:
+    if disease_id not in disease_nodes:
 
         disease_name = record["disease_name"]
         disease: Disease = Disease(
@@ -100,13 +99,13 @@ def transform_disease_to_phenotype_node_record(
             name=disease_name,
             **{},
         )
-        _disease_nodes[disease_id] = disease
+        disease_nodes[disease_id] = disease
 
         # newly encountered disease node, so we'll return it right away
         nodes.append(disease)
     else:
         # Retrieve and reuse previously encountered Disease Node
-        disease = _disease_nodes[disease_id]
+        disease = disease_nodes[disease_id]
 
     ## Object: PhenotypicFeature or Inheritance mode defined by an HPO term
     hpo_id = record["hpo_id"]
@@ -324,10 +323,10 @@ def prepare_gene_to_phenotype_data(
     genes_to_phenotype_file_path = hpoa_data_path / "genes_to_phenotype.txt"
     genes_to_disease_file_path = hpoa_data_path / "genes_to_disease.txt"
 
-    db = duckdb.connect(":memory:", read_only=False)
-    return (
-        db.execute(
-            f"""
+    # the joined rows are streamed to the transform as DuckDB produces them, in a deterministic order, as a
+    # checkpointed transform resumes by skipping the rows it had transformed (see util/checkpoint.py)
+    return stream_query(
+        f"""
     with
       hpoa as (select * from read_csv('{phenotype_file_path}')),
       g2p as (select * from read_csv('{genes_to_phenotype_file_path}')),
@@ -352,10 +351,8 @@ def prepare_gene_to_phenotype_data(
          left outer join g2d_grouped on g2p.ncbi_gene_id = g2d_grouped.ncbi_gene_id_clean
                      and g2p.disease_id = g2d_grouped.disease_id
     group by all
+    order by all
     """
-        )
-        .fetchdf()
-        .to_dict("records")
     )
 
 
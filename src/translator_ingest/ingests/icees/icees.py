@@ -1,5 +1,4 @@
 from typing import Optional, Any
-import json
 
 from loguru import logger
 import koza
@@ -11,18 +10,15 @@ from biolink_model.datamodel.pydanticmodel_v2 import (
     AgentTypeEnum
 )
 
-from bmt.pydantic import get_node_class
-from translator_ingest.util.biolink import build_association_knowledge_sources
+from translator_ingest.util.biolink import build_association_knowledge_sources, get_biolink_node_class
 from translator_ingest.util.transform_utils import entity_id
+from translator_ingest.util.jsonio import loads
 from koza.model.graphs import KnowledgeGraph
 from translator_ingest.ingests.icees.icees_util import (
     get_association_type,
     get_icees_supporting_study
 )
 
-from translator_ingest.util.biolink import get_biolink_model_toolkit
-bmt = get_biolink_model_toolkit()
-
 def get_latest_version() -> str:
     return "2024-08-20"  # last Phase 2 release of ICEES
 
@@ -57,7 +53,7 @@ def transform_icees_node(
     # along with the most specific type, but the Pydantic
     # class returned is only of the most specific type.
     category = record.get("category", [])
-    node_class: Optional[type[NamedThing]] = get_node_class(node_id, category, bmt=bmt)
+    node_class: Optional[type[NamedThing]] = get_biolink_node_class(node_id, category)
     if node_class is None:
         logger.warning(f"Pydantic class for node '{node_id}' could not be inferred from categories '{category}'")
         return None
@@ -128,7 +124,7 @@ def transform_icees_edge(koza_transform: koza.KozaTransform, record: dict[str, A
     attributes = record["attributes"]
     for attribute_string in attributes:
         # is 'attribute' a dict, or string serialized version of a dict?
-        attribute_data = json.loads(attribute_string)
+        attribute_data = loads(attribute_string)
         if attribute_data["attribute_type_id"] == "icees_cohort_identifier":
             study_id = attribute_data["value"]
             supporting_studies[study_id] = get_icees_supporting_study(
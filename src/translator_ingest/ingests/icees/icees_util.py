@@ -8,12 +8,11 @@ from biolink_model.datamodel.pydanticmodel_v2 import (
     IceesStudyResult
 )
 
-from translator_ingest.util.biolink import get_biolink_model_toolkit
-bmt = get_biolink_model_toolkit()
+from translator_ingest.util.biolink import get_biolink_ancestors
 
 def get_association_type(subject_category, object_category):
     # Specialized case of G2D Association
-    if "gene or gene product" in bmt.get_ancestors(subject_category) and \
+    if "gene or gene product" in get_biolink_ancestors(subject_category) and \
         object_category == "biolink:Disease":
         association = CorrelatedGeneToDiseaseAssociation
     else:
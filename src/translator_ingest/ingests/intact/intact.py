@@ -1,5 +1,5 @@
+from functools import lru_cache
 from typing import Any
-import re
 import koza
 
 from biolink_model.datamodel.pydanticmodel_v2 import (
@@ -10,7 +10,16 @@ from biolink_model.datamodel.pydanticmodel_v2 import (
     KnowledgeLevelEnum,
     AgentTypeEnum,
 )
+from translator_ingest.ingests.intact.mitab import (
+    DB_TO_PREFIX,
+    FIELD_CACHE_SIZE,
+    PsiMiValue,
+    clear_caches as clear_mitab_caches,
+    parse_psi_mi_field,
+    parse_psi_mi_value,
+)
 from translator_ingest.util.biolink import INFORES_INTACT
+from translator_ingest.util.curie import instrumented_cache
 from translator_ingest.util.http_utils import get_ftp_modify_date
 from translator_ingest.util.biolink import build_association_knowledge_sources
 from translator_ingest.util.transform_utils import entity_id
@@ -65,86 +74,33 @@ def get_latest_version() -> str:
                                ftp_file="intact.zip")
 
 
-def parse_psi_mi_field(field_value: str) -> dict[str, str]:
-    """
-    Parse a PSI-MI field value and extract the identifier and description.
-
-    PSI-MI fields are formatted as: database:identifier(description)
-    or database:"identifier"(description) for quoted identifiers
-    or database:identifier or just identifier
-
-    Examples:
-        - uniprotkb:P12345(gene_name) -> {'db': 'uniprotkb', 'id': 'P12345', 'desc': 'gene_name'}
-        - pubmed:12345678 -> {'db': 'pubmed', 'id': '12345678', 'desc': None}
-        - P12345 -> {'db': None, 'id': 'P12345', 'desc': None}
-    """
-    if not field_value or field_value == "-":
-        return {'db': None, 'id': None, 'desc': None}
-
-    # Remove quotes if present
-    field_value = field_value.replace('"', '')
-
-    # Try to match database:identifier(description) pattern
-    match = re.match(r'^([^:]+):([^(]+)(?:\(([^)]+)\))?$', field_value)
-    if match:
-        return {
-            'db': match.group(1).lower(),
-            'id': match.group(2),
-            'desc': match.group(3) if match.group(3) else None
-        }
-
-    # If no colon, treat the whole value as an identifier
-    return {'db': None, 'id': field_value, 'desc': None}
-
-
-def parse_multi_value_field(field_value: str) -> list[dict[str, str]]:
-    """
-    Parse a multi-value PSI-MI field (values separated by |).
-
-    Returns a list of parsed field dictionaries.
-    """
-    if not field_value or field_value == "-":
-        return []
-
-    values = field_value.split("|")
-    return [parse_psi_mi_field(v.strip()) for v in values if v.strip()]
-
-
-def extract_curie(parsed_field: dict[str, str], preferred_prefix: str = None) -> str | None:
+@instrumented_cache("intact.extract_curie")
+def extract_curie(parsed_field: PsiMiValue, preferred_prefix: str | None = None) -> str | None:
     """
     Extract a CURIE from a parsed PSI-MI field.
 
     Args:
-        parsed_field: Parsed field dictionary from parse_psi_mi_field
+        parsed_field: Parsed field value from parse_psi_mi_value
         preferred_prefix: Optional preferred CURIE prefix to use
 
     Returns:
         CURIE string or None
     """
-    if not parsed_field['id']:
+    if not parsed_field.id:
         return None
 
     # Use provided prefix, or the database from the field, or return bare ID
     if preferred_prefix:
-        return f"{preferred_prefix}:{parsed_field['id']}"
-    elif parsed_field['db']:
+        return f"{preferred_prefix}:{parsed_field.id}"
+    elif parsed_field.db:
         # Normalize common database names to standard CURIE prefixes
-        db_to_prefix = {
-            'uniprotkb': 'UniProtKB',
-            'uniprot': 'UniProtKB',
-            'chebi': 'CHEBI',
-            'pubmed': 'PMID',
-            'ensembl': 'ENSEMBL',
-            'entrez gene/locuslink': 'NCBIGene',
-            'refseq': 'RefSeq',
-            'psi-mi': 'MI',
-        }
-        prefix = db_to_prefix.get(parsed_field['db'].lower(), parsed_field['db'])
-        return f"{prefix}:{parsed_field['id']}"
+        prefix = DB_TO_PREFIX.get(parsed_field.db, parsed_field.db)
+        return f"{prefix}:{parsed_field.id}"
     else:
-        return parsed_field['id']
+        return parsed_field.id
 
 
+@lru_cache(maxsize=FIELD_CACHE_SIZE)
 def get_primary_identifier(id_field: str, alt_ids_field: str) -> tuple[str | None, str | None]:
     """
     Extract the primary identifier and determine entity type.
@@ -154,45 +110,37 @@ def get_primary_identifier(id_field: str, alt_ids_field: str) -> tuple[str | Non
     Returns:
         Tuple of (primary_id, entity_type) where entity_type is 'protein', 'gene', 'small_molecule', or None
     """
-    # Parse primary ID field
-    primary_parsed = parse_psi_mi_field(id_field)
-
-    # Parse alternative IDs
-    alt_ids = parse_multi_value_field(alt_ids_field)
-
     # Combine all IDs with primary first
-    all_ids = [primary_parsed] + alt_ids
+    all_ids = (parse_psi_mi_value(id_field), *parse_psi_mi_field(alt_ids_field))
 
     # Priority order: UniProtKB (protein), CHEBI (small molecule), gene databases
     for parsed in all_ids:
-        if not parsed['id']:
+        if not parsed.id:
             continue
-        db = parsed['db'].lower() if parsed['db'] else ''
 
         # UniProtKB indicates a protein
-        if db in ['uniprotkb', 'uniprot']:
+        if parsed.db in ('uniprotkb', 'uniprot'):
             return extract_curie(parsed, 'UniProtKB'), 'protein'
 
         # CHEBI indicates a small molecule
-        if db == 'chebi':
+        if parsed.db == 'chebi':
             return extract_curie(parsed, 'CHEBI'), 'small_molecule'
 
     # Second pass for gene databases
     for parsed in all_ids:
-        if not parsed['id']:
+        if not parsed.id:
             continue
-        db = parsed['db'].lower() if parsed['db'] else ''
 
-        if db in ['ensembl']:
+        if parsed.db == 'ensembl':
             return extract_curie(parsed, 'ENSEMBL'), 'gene'
-        if db in ['entrez gene/locuslink']:
+        if parsed.db == 'entrez gene/locuslink':
             return extract_curie(parsed, 'NCBIGene'), 'gene'
-        if db == 'refseq':
+        if parsed.db == 'refseq':
             return extract_curie(parsed, 'RefSeq'), 'gene'
 
     # Fallback: use primary ID or first alt ID
     for parsed in all_ids:
-        if parsed['id']:
+        if parsed.id:
             curie = extract_curie(parsed)
             if curie:
                 # Default to protein if we can't determine type
@@ -207,59 +155,52 @@ def extract_publications(publications_field: str) -> list[str] | None:
 
     Only PMIDs are included, as per RIG guidance.
     """
-    if not publications_field or publications_field == "-":
-        return None
-
-    parsed_pubs = parse_multi_value_field(publications_field)
-    pmids = []
+    pmids = [f"PMID:{pub.id}" for pub in parse_psi_mi_field(publications_field) if pub.db == 'pubmed' and pub.id]
+    return pmids if pmids else None
 
-    for pub in parsed_pubs:
-        if pub['db'] and pub['db'].lower() == 'pubmed' and pub['id']:
-            pmids.append(f"PMID:{pub['id']}")
 
-    return pmids if pmids else None
+@lru_cache(maxsize=FIELD_CACHE_SIZE)
+def get_interaction_types(interaction_types_field: str) -> frozenset[str]:
+    """
+    Return the (lower-cased) interaction type descriptions of the interactionTypes field.
+    """
+    return frozenset(parsed.desc.lower() for parsed in parse_psi_mi_field(interaction_types_field) if parsed.desc)
 
 
+@lru_cache(maxsize=FIELD_CACHE_SIZE)
 def get_predicate_from_interaction_type(interaction_types_field: str) -> str:
     """
     Map PSI-MI interaction type to Biolink predicate.
 
     Returns the most specific predicate found, or DEFAULT_PREDICATE.
     """
-    if not interaction_types_field or interaction_types_field == "-":
-        return DEFAULT_PREDICATE
-
-    parsed_types = parse_multi_value_field(interaction_types_field)
-
-    for parsed in parsed_types:
-        if parsed['desc']:
-            type_desc = parsed['desc'].lower()
+    for parsed in parse_psi_mi_field(interaction_types_field):
+        if parsed.desc:
+            type_desc = parsed.desc.lower()
             if type_desc in PSI_MI_TYPE_TO_PREDICATE:
                 return PSI_MI_TYPE_TO_PREDICATE[type_desc]
 
     return DEFAULT_PREDICATE
 
 
+@lru_cache(maxsize=FIELD_CACHE_SIZE)
 def extract_name_from_aliases(aliases_field: str) -> str | None:
     """
     Extract a human-readable name from the aliases field.
 
     Prefers gene names over other alias types.
     """
-    if not aliases_field or aliases_field == "-":
-        return None
-
-    parsed_aliases = parse_multi_value_field(aliases_field)
+    parsed_aliases = parse_psi_mi_field(aliases_field)
 
     # First pass: look for gene names
     for alias in parsed_aliases:
-        if alias['desc'] and 'gene name' in alias['desc'].lower() and alias['id']:
-            return alias['id']
+        if alias.desc and 'gene name' in alias.desc.lower() and alias.id:
+            return alias.id
 
     # Second pass: use first available alias
     for alias in parsed_aliases:
-        if alias['id']:
-            return alias['id']
+        if alias.id:
+            return alias.id
 
     return None
 
@@ -270,43 +211,48 @@ def extract_confidence_score(confidence_field: str) -> float | None:
 
     Returns the IntAct confidence value if found, None otherwise.
     """
-    if not confidence_field or confidence_field == "-":
-        return None
-
-    parsed_scores = parse_multi_value_field(confidence_field)
-
-    for score in parsed_scores:
+    for score in parse_psi_mi_field(confidence_field):
         # Look for intact-miscore
-        if score['db'] and 'intact' in score['db'].lower() and score['id']:
+        if score.db and 'intact' in score.db and score.id:
             try:
-                return float(score['id'])
+                return float(score.id)
             except ValueError:
                 continue
 
     return None
 
 
+@lru_cache(maxsize=FIELD_CACHE_SIZE)
+def _detection_methods(detection_method_field: str) -> tuple[str, ...]:
+    return tuple(
+        method.id if method.id.startswith('MI:') else f"MI:{method.id}"
+        for method in parse_psi_mi_field(detection_method_field)
+        if method.db == 'psi-mi' and method.id
+    )
+
+
 def extract_detection_methods(detection_method_field: str) -> list[str] | None:
     """
     Extract detection method identifiers from the interactionDetectionMethod field.
 
     Returns a list of PSI-MI identifiers for detection methods.
     """
-    if not detection_method_field or detection_method_field == "-":
-        return None
+    methods = _detection_methods(detection_method_field)
+    return list(methods) if methods else None
 
-    parsed_methods = parse_multi_value_field(detection_method_field)
-    methods = []
 
-    for method in parsed_methods:
-        if method['db'] and method['db'].lower() == 'psi-mi' and method['id']:
-            # Check if the ID already starts with "MI:"
-            if method['id'].startswith('MI:'):
-                methods.append(method['id'])
-            else:
-                methods.append(f"MI:{method['id']}")
-
-    return methods if methods else None
+def clear_caches() -> None:
+    """Drop all memoized field results of the transform and of the PSI-MI parser."""
+    clear_mitab_caches()
+    for cached_function in (
+        extract_curie,
+        get_primary_identifier,
+        get_interaction_types,
+        get_predicate_from_interaction_type,
+        extract_name_from_aliases,
+        _detection_methods,
+    ):
+        cached_function.cache_clear()
 
 
 @koza.transform_record()
@@ -342,15 +288,8 @@ def transform_record(koza: koza.KozaTransform, record: dict[str, Any]) -> Knowle
         koza.log("Skipping record with no interaction types", level="WARNING")
         return None
 
-    # Parse interaction types and check if any are allowed
-    parsed_types = parse_multi_value_field(interaction_types_field)
-    interaction_types_found = set()
-    for parsed in parsed_types:
-        if parsed['desc']:
-            interaction_types_found.add(parsed['desc'].lower())
-
     # Check if any of the interaction types are in the allowed list
-    if not interaction_types_found.intersection(ALLOWED_INTERACTION_TYPES):
+    if not get_interaction_types(interaction_types_field) & ALLOWED_INTERACTION_TYPES:
         # Silently skip records with disallowed interaction types (this is expected behavior)
         return None
 
@@ -1,11 +1,12 @@
 """
 Utility functions for Panther Orthology data processing
 """
-import tarfile
 from pathlib import Path
 
 import polars as pl
 
+from translator_ingest.util.decompression import open_tar_gz
+
 # These names should match pantherdb shorthand names for each species
 # Example... https://www.pantherdb.org/genomes/genome.jsp?taxonId=9606 --> Short Name: HUMAN
 panther_taxon_map = {
@@ -153,10 +154,9 @@ def extract_panther_data_polars(
         target_species = TARGET_SPECIES
 
     # Read the tar.gz archive — it contains a single TSV file
-    with tarfile.open(data_archive_path, "r:gz") as tar:
-        members = tar.getmembers()
+    with open_tar_gz(data_archive_path) as tar:
         # Find the TSV data file (skip directories, READMEs, etc.)
-        data_member = next(m for m in members if m.isfile() and not m.name.upper().endswith("README"))
+        data_member = next(m for m in tar if m.isfile() and not m.name.upper().endswith("README"))
         with tar.extractfile(data_member) as f:
             df = pl.read_csv(
                 f.read(),
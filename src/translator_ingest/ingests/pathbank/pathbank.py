@@ -31,6 +31,7 @@ from translator_ingest.util.transform_utils import entity_id
 from translator_ingest.ingests.pathbank.interaction_mapping import map_interaction_edge
 from translator_ingest.util.biolink import INFORES_PATHBANK
 from translator_ingest.util.http_utils import get_modify_date
+from translator_ingest.util.curie import instrumented_cache
 
 PATHBANK_SOURCES = build_association_knowledge_sources(primary=INFORES_PATHBANK)
 
@@ -1346,6 +1347,7 @@ def _normalize_xml_value(value: Any) -> str | None:
     return str(value) if value else None
 
 
+@instrumented_cache("pathbank.external_id")
 def _normalize_external_id(external_id: str | None, prefix: str) -> str | None:
     """Normalize external database ID by stripping any existing prefix.
 
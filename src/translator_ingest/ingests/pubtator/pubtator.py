@@ -160,11 +160,11 @@ def prepare(koza: koza.KozaTransform, data: Iterable[dict[str, Any]]) -> Iterabl
     ## koza accepts iterator/yield
     return df.iter_rows(named=True)  ## named=True returns each row as dict rather than tuple
 
-encountered_node_ids = set()
-
 @koza.transform_record()
 def transform_row(koza: koza.KozaTransform, record: dict[str, Any]) -> KnowledgeGraph | None:
     ## Nodes
+    ## kept in koza.state, so a checkpointed transform resumes with them
+    encountered_node_ids: set[str] = koza.state.setdefault("encountered_node_ids", set())
     entity1_id = record["entity1_id"]
     entity2_id = record["entity2_id"]
     nodes=[]
@@ -30,6 +30,7 @@ from biolink_model.datamodel.pydanticmodel_v2 import (
 from translator_ingest.util.biolink import build_association_knowledge_sources
 from translator_ingest.util.transform_utils import entity_id
 from translator_ingest.util.biolink import INFORES_SEMMEDDB
+from translator_ingest.util.curie import make_prefix_classifier
 
 SEMMEDDB_SOURCES = build_association_knowledge_sources(primary=INFORES_SEMMEDDB)
 
@@ -91,11 +92,9 @@ def get_latest_version() -> str:
     return "semmeddb-2023-kg2.10.3"
 
 
-def _get_node_class(curie: str) -> type[NamedThing]:
-    """Return the Biolink class for a CURIE based on its prefix."""
-    if ":" not in curie:
-        return NamedThing
-    return PREFIX_TO_CLASS.get(curie.split(":", 1)[0], NamedThing)
+# Return the Biolink class for a CURIE based on its prefix (memoized per prefix,
+# since every edge classifies its subject and object several times).
+_get_node_class = make_prefix_classifier("semmeddb.node_class", PREFIX_TO_CLASS, default=NamedThing)
 
 
 def _is_gene_or_protein(curie: str) -> bool:
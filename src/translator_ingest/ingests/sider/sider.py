@@ -1,6 +1,5 @@
 from typing import Any, Iterable
 from os.path import abspath
-import json
 import re
 
 import koza
@@ -15,6 +14,7 @@ from biolink_model.datamodel.pydanticmodel_v2 import (
 )
 from translator_ingest.util.biolink import build_association_knowledge_sources
 from translator_ingest.util.transform_utils import entity_id
+from translator_ingest.util.jsonio import read_json
 from translator_ingest import INGESTS_PARSER_PATH
 
 SIDER_INGEST_PATH = INGESTS_PARSER_PATH / "sider"
@@ -42,7 +42,7 @@ def to_object(parsed_json) -> Any:
 
 
 def load_config() -> tuple[str,...]:
-    config = json.load(open(abspath(SIDER_INGEST_CONFIG_PATH), "r"))
+    config = read_json(abspath(SIDER_INGEST_CONFIG_PATH))
     obj = to_object(config)
     return (obj.infores, obj.latest_version, obj.column, obj.curie_prefix, obj.predicate, obj.transformations)
 
@@ -1,5 +1,5 @@
 import koza
-import pandas as pd
+import polars as pl
 
 from typing import Any, Iterable
 
@@ -25,6 +25,7 @@ from biolink_model.datamodel.pydanticmodel_v2 import (
 )
 from translator_ingest.util.biolink import build_association_knowledge_sources
 from translator_ingest.util.transform_utils import entity_id
+from translator_ingest.util.polars_reader import iter_records, scan_koza_data
 from koza.model.graphs import KnowledgeGraph
 from translator_ingest.util.biolink import (
     INFORES_SIGNOR
@@ -65,49 +66,49 @@ def get_latest_version() -> str:
 @koza.prepare_data(tag="signor_parsing")
 def prepare(koza: koza.KozaTransform, data: Iterable[dict[str, Any]]) -> Iterable[dict[str, Any]] | None:
 
-    ## convert the input dataframe into pandas df format
-    source_df = pd.DataFrame(data)
+    ## read the source file straight into a polars LazyFrame
+    source_df = scan_koza_data(data)
 
     ## Only select needed columns
     sele_cols = ['ENTITYA', 'ENTITYB', 'TYPEA', 'TYPEB', 'IDA', 'IDB', 'EFFECT', 'MECHANISM', 'TAX_ID', 'CELL_DATA', 'TISSUE_DATA', 'DIRECT', 'SCORE', 'SENTENCE', 'PMID']
-    source_subset_df = source_df[sele_cols].drop_duplicates()
+    source_subset_df = source_df.select(sele_cols).unique(maintain_order=True)
 
     ## include some basic quality control steps here
-    ## Drop nan values
-    source_subset_df = source_subset_df.dropna(subset=['ENTITYA', 'ENTITYB'])
+    ## Drop null values
+    source_subset_df = source_subset_df.drop_nulls(subset=['ENTITYA', 'ENTITYB'])
 
     ## Implement logic to aggregate source records into a single edge based on SPO + qualifier pair (subject_name, subject_category, object_name, object_category, MECHANISM, EFFECT, DIRECT)
     group_cols = ['ENTITYA', 'ENTITYB', 'TYPEA', 'TYPEB', 'IDA', 'IDB', 'EFFECT', 'MECHANISM', 'TAX_ID', 'CELL_DATA', 'TISSUE_DATA', 'DIRECT', 'SCORE']
 
+    ## polars keeps groups with null keys, like pandas groupby(..., dropna=False)
     source_agg_df = (
-        source_subset_df.groupby(group_cols, as_index=False, dropna=False)
-          .agg({
-            "PMID": lambda x: "|".join(x.dropna().astype(str)),
-            "SENTENCE": lambda x: "|".join(x.dropna().astype(str))
-          })
+        source_subset_df.group_by(group_cols, maintain_order=True)
+          .agg(
+            pl.col("PMID").drop_nulls().cast(pl.String).str.join("|"),
+            pl.col("SENTENCE").drop_nulls().cast(pl.String).str.join("|"),
+          )
     )
 
     ## rename those columns into desired format
-    source_agg_df.rename(columns={'ENTITYA': 'subject_name', 'TYPEA': 'subject_category', 'ENTITYB': 'object_name', 'TYPEB': 'object_category'}, inplace=True)
+    source_agg_df = source_agg_df.rename({'ENTITYA': 'subject_name', 'TYPEA': 'subject_category', 'ENTITYB': 'object_name', 'TYPEB': 'object_category'})
 
-    ## replace all 'miR-34' to 'miR-34a' in two columns subject_category and object_category in the pandas dataframe
-    source_agg_df['subject_name'] = source_agg_df['subject_name'].replace('miR-34', 'miR-34a')
-    source_agg_df['object_name'] = source_agg_df['object_name'].replace('miR-34', 'miR-34a')
+    ## replace all 'miR-34' to 'miR-34a' in two columns subject_category and object_category in the dataframe
+    source_agg_df = source_agg_df.with_columns(
+        pl.col('subject_name').replace('miR-34', 'miR-34a'),
+        pl.col('object_name').replace('miR-34', 'miR-34a'),
+    )
 
     ## remove those rows with category in fusion protein or stimulus from source_df for now, and expecting biolink team to add those new categories
-    source_agg_df = source_agg_df[
-        (source_agg_df['subject_category'].str.lower() != 'fusion protein')
-        & (source_agg_df['object_category'].str.lower() != 'fusion protein')
-    ]
-    source_agg_df = source_agg_df[
-        (source_agg_df['subject_category'].str.lower() != 'stimulus')
-        & (source_agg_df['object_category'].str.lower() != 'stimulus')
-    ]
+    for category in ['fusion protein', 'stimulus']:
+        source_agg_df = source_agg_df.filter(
+            pl.col('subject_category').str.to_lowercase().ne_missing(category)
+            & pl.col('object_category').str.to_lowercase().ne_missing(category)
+        )
 
     ## only drop rows missing fields required to build a valid record
     required_cols = ['subject_name', 'object_name', 'IDA', 'IDB']
 
-    return source_agg_df.dropna(subset=required_cols).drop_duplicates().to_dict(orient="records")
+    return iter_records(source_agg_df.drop_nulls(subset=required_cols).unique(maintain_order=True))
 
 
 @koza.transform(tag="signor_parsing")
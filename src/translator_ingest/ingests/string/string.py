@@ -20,32 +20,36 @@ Reference implementations consulted:
   * RENCI Automat production graph: https://automat.renci.org/string-db/
 """
 
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
 import koza
+import polars as pl
 import requests
-from biolink_model.datamodel.pydanticmodel_v2 import Protein
+from biolink_model.datamodel.pydanticmodel_v2 import (
+    AgentTypeEnum,
+    KnowledgeLevelEnum,
+    Protein
+)
 
 from koza.model.graphs import KnowledgeGraph
 
 from translator_ingest.ingests.string.string_utils import (
-    load_string_to_entrez_mapping,
-    passes_combined_score,
-    parse_string_protein_id,
-    predicates_for_row,
-    sorted_pair_key,
-    knowledge_level_and_agent_type_for_row,
-    make_string_ppi_edge,
-    MI_PREDICATE
+    STRING_SCORE_COLUMNS,
+    scan_string_to_entrez_mapping,
+    prepare_string_ppi_edges,
+    check_string_ppi_edges,
+    make_string_ppi_edge
 )
+from translator_ingest.util.polars_reader import scan_koza_data
 
 
 STRING_VERSION_API_URL = "https://string-db.org/api/json/version"
 
 # Filename of the STRING ↔ Entrez gene-ID mapping (universal across species).
-# Downloaded by download.yaml into 'koza.input_files_dir'. Loaded once at the
-# start of the transform to populate 'equivalent_identifiers' on Protein nodes.
+# Downloaded by download.yaml into 'koza.input_files_dir'. Joined onto the link
+# rows in 'prepare_string_ppi' to populate 'equivalent_identifiers' on Protein nodes.
 ENTREZ_MAPPING_FILENAME = "all_organisms.entrez_2_string.tsv"
 
 
@@ -67,20 +71,43 @@ def get_latest_version() -> str:
     return f"v{response.json()[0]['string_version']}"
 
 
-@koza.on_data_begin(tag="string_ppi")
-def on_data_begin_string_ppi(koza_transform: koza.KozaTransform) -> None:
+@koza.prepare_data(tag="string_ppi")
+def prepare_string_ppi(
+        koza_transform: koza.KozaTransform,
+        data: Iterable[dict[str, Any]]
+) -> Iterable[dict[str, Any]] | None:
     """
-    Load the STRING ↔ Entrez mapping into 'koza_transform.state["string_to_entrez"]'
-    once per 'string_ppi' transform run. Used by 'transform_string_ppi' to
-    populate 'equivalent_identifiers' on Protein nodes with their NCBIGene
-    equivalents.
-
-    Tests bypass this hook by setting 'koza_transform.state["string_to_entrez"]'
-    directly to a small fixture dict.
+    Bypass the Koza row reader and build the STRING edge rows with polars.
+
+    The per-organism '.full.' link files of the 'string_ppi' reader in string.yaml
+    are scanned lazily (see 'scan_koza_data') and run through 'prepare_string_ppi_edges', which applies the
+    combined_score gate, STRING ID parsing, per-channel predicate selection,
+    per-row knowledge level / agent type, per (sorted_pair, predicate) dedup and
+    the join against the STRING ↔ Entrez mapping as columnar operations. Only the
+    surviving, already-deduplicated rows are handed to 'transform_string_ppi'.
+
+    :param koza_transform: The koza.KozaTransform context of the data processing.
+    :param data: Iterable[dict[str, Any]], the Koza reader rows, whose files are
+                 scanned rather than read row by row when the pipeline passes them
+                 with their reader config.
+
+    :return: Iterable[dict[str, Any]], one record per emitted row, with the columns
+             listed in 'STRING_EDGE_COLUMNS'. Malformed STRING IDs, unsupported taxa
+             and cross-species pairs raise a ValueError, aborting the ingest.
     """
     assert koza_transform.input_files_dir is not None, "Koza Transform 'input_files_dir' variable cannot be null!"
-    mapping_path = Path(koza_transform.input_files_dir) / ENTREZ_MAPPING_FILENAME
-    koza_transform.state["string_to_entrez"] = load_string_to_entrez_mapping(mapping_path)
+    input_files_dir = Path(koza_transform.input_files_dir)
+
+    links = scan_koza_data(data).with_columns(pl.col(STRING_SCORE_COLUMNS).cast(pl.Int64))
+    string_to_entrez = scan_string_to_entrez_mapping(input_files_dir / ENTREZ_MAPPING_FILENAME)
+    edges = prepare_string_ppi_edges(links, string_to_entrez).collect()
+    check_string_ppi_edges(edges)
+
+    koza_transform.log(
+        f"STRING: {edges.height} rows with {edges['predicates'].list.len().sum()} new "
+        f"(pair, predicate) edges after combined_score filtering and dedup"
+    )
+    return edges.iter_rows(named=True)
 
 
 @koza.transform_record(tag="string_ppi")
@@ -88,7 +115,7 @@ def transform_string_ppi(
     koza_transform: koza.KozaTransform, record: dict[str, Any]
 ) -> KnowledgeGraph | None:
     """
-    Transform one row of STRING's 'protein.links.full.v12.0.txt.gz' file into two
+    Transform one prepared STRING row (see 'prepare_string_ppi') into two
     'Protein' nodes and one or more per-channel edges.
 
     Predicate selection follows ORION's STRING parser: any evidence channel whose
@@ -103,67 +130,33 @@ def transform_string_ppi(
 
     Dedup is per (sorted_pair, predicate), so multiple predicates can fire for the
     same pair without colliding, while symmetric duplicate rows still collapse.
+    All of the above is computed upstream in 'prepare_string_ppi_edges'; the
+    record's 'predicates' are only those not already emitted for the pair.
     """
-    # NOTE: the combined_score > 500 gate is also applied as a reader-level filter
-    # in string.yaml (the production path — Koza skips sub-threshold rows before
-    # they reach here). This guard keeps the transform correct when called
-    # directly in unit tests, where rows aren't pre-filtered.
-    if not passes_combined_score(record["combined_score"]):
+    if not record["predicates"]:
         return None
 
-    subject_id, subject_taxon = parse_string_protein_id(record["protein1"])
-    object_id, object_taxon = parse_string_protein_id(record["protein2"])
-
-    # STRING's per-organism link files only contain intra-species pairs.
-    # Catch corrupt or cross-species rows loudly.
-    if subject_taxon != object_taxon:
-        raise ValueError(
-            f"Cross-species pair in STRING row: {record['protein1']!r} vs {record['protein2']!r}"
-        )
-
-    predicates = predicates_for_row(record)
-
-    # Per-pair-per-predicate dedup. The dedup set lives on koza_transform.state
-    # and grows with the number of unique (pair, predicate) tuples — bounded by
-    # the above-threshold edge count (~1-2M for human PPI). If memory becomes a
-    # constraint at the full multi-organism scale, swap for an on-disk set (sqlite)
-    # or an integer-keyed roaring bitmap; the key is already a hashable tuple.
-    seen_pairs: set = koza_transform.state.setdefault("seen_pairs", set())
-    new_predicates: list[MI_PREDICATE] = [
-        p for p in predicates
-        if sorted_pair_key(subject_id, object_id, p) not in seen_pairs
-    ]
-    if not new_predicates:
-        return None
-    for p in new_predicates:
-        seen_pairs.add(sorted_pair_key(subject_id, object_id, p))
-
-    # Look up NCBIGene equivalents from the entrez_2_string mapping. Loaded
-    # at transform start by on_data_begin; tests may inject a fixture dict.
     # Missing entries are normal (some STRING proteins have no Entrez mapping;
     # downstream NodeNormalizer still resolves most of them via UniProtKB).
-    entrez_map: dict[str, list[str]] = koza_transform.state.get("string_to_entrez", {})
-    subject_equivalents = entrez_map.get(record["protein1"]) or None
-    object_equivalents = entrez_map.get(record["protein2"]) or None
-
     subject_node = Protein(
-        id=subject_id,
+        id=record["subject"],
         category=["biolink:Protein"],
-        in_taxon=[subject_taxon],
-        equivalent_identifiers=subject_equivalents,
+        in_taxon=[record["subject_taxon"]],
+        equivalent_identifiers=record["subject_equivalent_identifiers"] or None,
     )
     object_node = Protein(
-        id=object_id,
+        id=record["object"],
         category=["biolink:Protein"],
-        in_taxon=[object_taxon],
-        equivalent_identifiers=object_equivalents,
+        in_taxon=[record["object_taxon"]],
+        equivalent_identifiers=record["object_equivalent_identifiers"] or None,
     )
 
     # KL/AT is a row-level property (derived from the dominant evidence channel),
     # shared by all edges emitted from this row.
-    knowledge_level, agent_type = knowledge_level_and_agent_type_for_row(record)
+    knowledge_level = KnowledgeLevelEnum(record["knowledge_level"])
+    agent_type = AgentTypeEnum(record["agent_type"])
     edges = [
-        make_string_ppi_edge(subject_id, predicate, object_id, knowledge_level, agent_type)
-        for predicate in new_predicates
+        make_string_ppi_edge(record["subject"], predicate, record["object"], knowledge_level, agent_type)
+        for predicate in record["predicates"]
     ]
     return KnowledgeGraph(nodes=[subject_node, object_node], edges=edges)
@@ -2,9 +2,12 @@
 Supporting variables and utility methods for the
 STRING protein–protein interaction ingest processing.
 """
-from typing import Any, Iterable, Literal
+from collections.abc import Iterable
+from typing import Any, Literal
 from pathlib import Path
 
+import polars as pl
+
 from biolink_model.datamodel.pydanticmodel_v2 import (
     GeneToGeneAssociation,
     GeneToGeneCoexpressionAssociation,
@@ -413,53 +416,55 @@ def make_string_ppi_edge(
     )
 
 
-def load_string_to_entrez_mapping(
+def scan_string_to_entrez_mapping(
     mapping_path: Path | str,
     supported_taxa: Iterable[str] = SUPPORTED_TAXA.keys(),
-) -> dict[str, list[str]]:
+) -> pl.LazyFrame:
     """
-    Load the STRING ↔ Entrez gene-ID mapping into a dict keyed by raw STRING ID.
+    Lazily scan the STRING ↔ Entrez gene-ID mapping into one row per raw STRING ID.
 
     The file is a tab-separated table with one header line ("# NCBI taxid / entrez
     / STRING") and three columns per data row: "taxid", "entrez_id", "string_id".
     Multiple Entrez genes can map to the same STRING protein (paralogs / overlapping
-    annotations), so values are lists of "NCBIGene:" CURIEs preserving STRING's
-    order. Rows for taxa outside "supported_taxa" are skipped to keep the
-    in-memory dict small.
-
-    >>> import io
-    >>> sample = io.StringIO(
-    ...     "# NCBI taxid / entrez / STRING\\n"
-    ...     "9606\\t381\\t9606.ENSP00000000233\\n"
-    ...     "9606\\t9606\\t9606.ENSP00000000412\\n"
-    ...     "4932\\t850001\\t4932.YAL001C\\n"
-    ... )
-    >>> # Helper to exercise the parser without touching disk:
-    >>> from io import StringIO
-    >>> def _parse(stream, taxa):
-    ...     m = {}
-    ...     next(stream)
-    ...     for entry in stream:
-    ...         taxon_id, entrez, sid = entry.rstrip().split("\\t")
-    ...         if taxon_id in taxa:
-    ...             m.setdefault(sid, []).append(f"NCBIGene:{entrez}")
-    ...     return m
-    >>> _parse(sample, {"9606"})
-    {'9606.ENSP00000000233': ['NCBIGene:381'], '9606.ENSP00000000412': ['NCBIGene:9606']}
+    annotations), so "equivalent_identifiers" is a list of "NCBIGene:" CURIEs
+    preserving STRING's order. Rows for taxa outside "supported_taxa", blank lines and
+    short lines are dropped before aggregation.
+
+    Returns a LazyFrame with columns "string_id" and "equivalent_identifiers", ready
+    to be joined onto the STRING link rows.
     """
-    supported = set(supported_taxa)
-    mapping: dict[str, list[str]] = {}
-    with open(mapping_path) as fh:
-        next(fh)  # discard header
-        for line in fh:
-            parts = line.rstrip("\n").split("\t")
-            if len(parts) != 3:
-                continue
-            taxid, entrez_id, string_id = parts
-            if taxid not in supported:
-                continue
-            mapping.setdefault(string_id, []).append(f"NCBIGene:{entrez_id}")
-    return mapping
+    return (
+        pl.scan_csv(
+            mapping_path,
+            separator="\t",
+            has_header=False,
+            skip_rows=1,  # discard header
+            new_columns=["taxid", "entrez_id", "string_id"],
+            schema={"taxid": pl.String, "entrez_id": pl.String, "string_id": pl.String},
+            truncate_ragged_lines=True,
+        )
+        .filter(
+            pl.col("taxid").is_in(list(supported_taxa))
+            & pl.col("entrez_id").is_not_null()
+            & pl.col("string_id").is_not_null()
+        )
+        .group_by("string_id", maintain_order=True)
+        .agg(pl.concat_str(pl.lit("NCBIGene:"), pl.col("entrez_id")).alias("equivalent_identifiers"))
+    )
+
+
+def load_string_to_entrez_mapping(
+    mapping_path: Path | str,
+    supported_taxa: Iterable[str] = SUPPORTED_TAXA.keys(),
+) -> dict[str, list[str]]:
+    """
+    Load the STRING ↔ Entrez gene-ID mapping into a dict keyed by raw STRING ID.
+
+    Eager, dict-shaped view of "scan_string_to_entrez_mapping", for callers that
+    need per-ID lookups outside of the polars pipeline.
+    """
+    mapping = scan_string_to_entrez_mapping(mapping_path, supported_taxa).collect()
+    return dict(mapping.iter_rows())
 
 
 def sorted_pair_key(p1: str, p2: str, predicate: str = "") -> tuple[str, str, str]:
@@ -480,3 +485,221 @@ def sorted_pair_key(p1: str, p2: str, predicate: str = "") -> tuple[str, str, st
     """
     a, b = sorted([p1, p2])
     return a, b, predicate
+
+
+# ──── Vectorized (polars) pipeline ───────────────────────────────────────────
+#
+# The helpers above operate on one STRING row at a time and document the edge
+# semantics. The functions below apply exactly the same rules to a whole links
+# table as polars lazy operations, so that the Koza record transform only sees
+# the final, deduplicated edge rows (see "prepare_string_ppi" in string.py).
+
+# All 13 per-channel score columns of the ".full" links files plus combined_score.
+STRING_SCORE_COLUMNS: list[str] = [
+    "neighborhood", "neighborhood_transferred",
+    "fusion", "cooccurence", "homology",
+    "coexpression", "coexpression_transferred",
+    "experiments", "experiments_transferred",
+    "database", "database_transferred",
+    "textmining", "textmining_transferred",
+    "combined_score",
+]
+
+# Columns of the rows handed from "prepare_string_ppi_edges" to the record transform.
+STRING_EDGE_COLUMNS: list[str] = [
+    "protein1",
+    "protein2",
+    "subject",
+    "object",
+    "subject_taxon",
+    "object_taxon",
+    "predicates",
+    "knowledge_level",
+    "agent_type",
+    "subject_equivalent_identifiers",
+    "object_equivalent_identifiers",
+]
+
+
+def scan_string_links(links_path: Path | str) -> pl.LazyFrame:
+    """
+    Lazily scan one STRING "protein.links.full" file (space-delimited, header row,
+    gzip-compressed) with integer-typed score columns.
+    """
+    return pl.scan_csv(
+        links_path,
+        separator=" ",
+        has_header=True,
+        schema_overrides={column: pl.Int64 for column in STRING_SCORE_COLUMNS},
+    )
+
+
+def _string_id_columns(string_id_column: str, prefix: str) -> list[pl.Expr]:
+    """
+    Vectorized "parse_string_protein_id": split "{taxid}.{ensp}" into an ENSEMBL
+    CURIE and an NCBITaxon CURIE. Malformed IDs and unsupported taxa yield a null
+    taxon, which "check_string_ppi_edges" turns into the same ValueError as
+    "parse_string_protein_id".
+    """
+    parts = pl.col(string_id_column).str.split_exact(".", 1)
+    taxid = parts.struct.field("field_0")
+    ensp = parts.struct.field("field_1")
+    return [
+        pl.concat_str(pl.lit("ENSEMBL:"), ensp).alias(prefix),
+        pl.when(ensp.str.len_chars() > 0)
+        .then(taxid.replace_strict(SUPPORTED_TAXA, default=None, return_dtype=pl.String))
+        .alias(f"{prefix}_taxon"),
+    ]
+
+
+def _predicates_expr(channel_threshold: int) -> pl.Expr:
+    """Vectorized "predicates_for_row": list of fired predicates, or the fallback."""
+    fired = pl.concat_list(
+        [
+            pl.when(pl.col(channel) > channel_threshold).then(pl.lit(predicate))
+            for channel, predicate in CHANNEL_PREDICATES.items()
+        ]
+    ).list.drop_nulls().list.unique(maintain_order=True)
+    return (
+        pl.when(fired.list.len() > 0)
+        .then(fired)
+        .otherwise(pl.concat_list(pl.lit(FALLBACK_PREDICATE)))
+        .alias("predicates")
+    )
+
+
+def _knowledge_level_and_agent_type_exprs(channel_threshold: int) -> list[pl.Expr]:
+    """Vectorized "knowledge_level_and_agent_type_for_row", as enum value strings."""
+    channels = list(CHANNEL_KL_AT)
+    max_score = pl.max_horizontal(channels)
+    high_conf_count = pl.sum_horizontal(
+        [(pl.col(channel) > channel_threshold).fill_null(False).cast(pl.Int32) for channel in channels]
+    )
+    any_manual_high_conf = pl.any_horizontal(
+        [
+            (pl.col(channel) > channel_threshold).fill_null(False)
+            for channel, (_, agent_type) in CHANNEL_KL_AT.items()
+            if agent_type == AgentTypeEnum.manual_agent
+        ]
+    )
+
+    def _dominant(position: int) -> pl.Expr:
+        # first channel (in CHANNEL_KL_AT order) attaining the row maximum, as in the row-wise loop
+        expr = pl.when(pl.lit(False)).then(pl.lit(None, dtype=pl.String))
+        for channel, kl_at in CHANNEL_KL_AT.items():
+            expr = expr.when(pl.col(channel) == max_score).then(pl.lit(kl_at[position].value))
+        return expr
+
+    knowledge_level = (
+        pl.when(max_score.fill_null(0) <= 0)
+        .then(pl.lit(KnowledgeLevelEnum.not_provided.value))
+        .when(high_conf_count > 1)
+        .then(pl.lit(KnowledgeLevelEnum.knowledge_assertion.value))
+        .otherwise(_dominant(0))
+        .alias("knowledge_level")
+    )
+    agent_type = (
+        pl.when(max_score.fill_null(0) <= 0)
+        .then(pl.lit(AgentTypeEnum.not_provided.value))
+        .when((high_conf_count > 1) & any_manual_high_conf)
+        .then(pl.lit(AgentTypeEnum.manual_agent.value))
+        .when(high_conf_count > 1)
+        .then(pl.lit(AgentTypeEnum.data_analysis_pipeline.value))
+        .otherwise(_dominant(1))
+        .alias("agent_type")
+    )
+    return [knowledge_level, agent_type]
+
+
+def prepare_string_ppi_edges(
+    links: pl.LazyFrame,
+    string_to_entrez: pl.LazyFrame | None = None,
+    combined_score_threshold: int = COMBINED_SCORE_THRESHOLD,
+    channel_threshold: int = CHANNEL_HIGH_CONF_THRESHOLD,
+) -> pl.LazyFrame:
+    """
+    Build the final STRING PPI edge rows from a (lazy) table of ".full" link rows.
+
+    Applies, as polars lazy operations, the same rules the row-wise helpers in this
+    module document:
+
+      1. combined_score gate ("passes_combined_score");
+      2. STRING ID parsing into ENSEMBL / NCBITaxon CURIEs ("parse_string_protein_id");
+      3. channel → predicate explosion ("predicates_for_row");
+      4. per-row knowledge level / agent type ("knowledge_level_and_agent_type_for_row");
+      5. per (sorted pair, predicate) dedup, keeping the first occurrence in file
+         order ("sorted_pair_key");
+      6. left join of the NCBIGene equivalents from "scan_string_to_entrez_mapping".
+
+    Returns one row per surviving input row (columns "STRING_EDGE_COLUMNS"), with the
+    predicates that are still new for that pair collected into "predicates".
+    """
+    channel_columns = [column for column in STRING_SCORE_COLUMNS if column in links.collect_schema()]
+    edges = (
+        links.with_columns(pl.col(channel_columns).cast(pl.Int64, strict=False))
+        .filter(pl.col("combined_score") > combined_score_threshold)
+        .with_row_index("row_index")
+        .with_columns(
+            *_string_id_columns("protein1", "subject"),
+            *_string_id_columns("protein2", "object"),
+            _predicates_expr(channel_threshold),
+            *_knowledge_level_and_agent_type_exprs(channel_threshold),
+        )
+        .with_columns(
+            pl.min_horizontal("subject", "object").alias("pair_a"),
+            pl.max_horizontal("subject", "object").alias("pair_b"),
+        )
+        .explode("predicates")
+        .unique(subset=["pair_a", "pair_b", "predicates"], keep="first", maintain_order=True)
+        .group_by("row_index", maintain_order=True)
+        .agg(
+            pl.col("predicates"),
+            pl.col(
+                "protein1", "protein2", "subject", "object", "subject_taxon", "object_taxon",
+                "knowledge_level", "agent_type",
+            ).first(),
+        )
+    )
+    if string_to_entrez is None:
+        return edges.with_columns(
+            pl.lit(None, dtype=pl.List(pl.String)).alias("subject_equivalent_identifiers"),
+            pl.lit(None, dtype=pl.List(pl.String)).alias("object_equivalent_identifiers"),
+        ).select(STRING_EDGE_COLUMNS)
+
+    return (
+        edges.join(
+            string_to_entrez.rename({"string_id": "protein1", "equivalent_identifiers": "subject_equivalent_identifiers"}),
+            on="protein1",
+            how="left",
+            maintain_order="left",
+        )
+        .join(
+            string_to_entrez.rename({"string_id": "protein2", "equivalent_identifiers": "object_equivalent_identifiers"}),
+            on="protein2",
+            how="left",
+            maintain_order="left",
+        )
+        .select(STRING_EDGE_COLUMNS)
+    )
+
+
+def check_string_ppi_edges(edges: pl.DataFrame) -> None:
+    """
+    Fail loudly on prepared edge rows that the row-wise transform would have rejected:
+    malformed STRING IDs or unsupported taxa (raised by "parse_string_protein_id")
+    and cross-species pairs (STRING's per-organism link files only contain
+    intra-species pairs).
+    """
+    unparsed = edges.filter(pl.col("subject_taxon").is_null() | pl.col("object_taxon").is_null())
+    if unparsed.height:
+        row = unparsed.row(0, named=True)
+        bad_id = row["protein1"] if row["subject_taxon"] is None else row["protein2"]
+        parse_string_protein_id(bad_id)  # raises a ValueError describing the problem
+        raise ValueError(f"Expected STRING ID format '{{taxid}}.{{ensp}}', got: {bad_id!r}")
+
+    cross_species = edges.filter(pl.col("subject_taxon") != pl.col("object_taxon"))
+    if cross_species.height:
+        row = cross_species.row(0, named=True)
+        raise ValueError(
+            f"Cross-species pair in STRING row: {row['protein1']!r} vs {row['protein2']!r}"
+        )
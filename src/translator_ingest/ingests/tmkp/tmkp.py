@@ -8,7 +8,6 @@ Data is provided as individual gzipped KGX files:
 
 """
 
-import json
 from functools import lru_cache
 from typing import Any, Dict, List, Set, Tuple
 from loguru import logger
@@ -39,6 +38,8 @@ from biolink_model.datamodel.pydanticmodel_v2 import (
 from translator_ingest.util.biolink import build_association_knowledge_sources
 from translator_ingest.util.transform_utils import entity_id
 from translator_ingest.util.biolink import INFORES_TEXT_MINING_KP, get_biolink_model_toolkit
+from translator_ingest.util.curie import instrumented_cache, parse_curie
+from translator_ingest.util.jsonio import loads
 
 TMKP_DEFAULT_SOURCES = build_association_knowledge_sources(
     primary=INFORES_TEXT_MINING_KP,
@@ -113,9 +114,7 @@ def _get_id_prefix(curie: str) -> str:
     >>> _get_id_prefix("invalid")
     ''
     """
-    if ":" in curie:
-        return curie.split(":")[0]
-    return ""
+    return parse_curie(curie).prefix
 
 
 def _normalize_publication_id(pub_id: str) -> str:
@@ -215,6 +214,7 @@ def _get_predicate_domain_range_prefixes(predicate: str) -> tuple[frozenset[str]
     return domain_prefixes, range_prefixes
 
 
+@instrumented_cache("tmkp.edge_prefixes")
 def _validate_edge_prefixes(subject_id: str, object_id: str, predicate: str) -> bool:
     """
     Validate that subject and object ID prefixes match the predicate's domain/range.
@@ -468,7 +468,7 @@ def transform_tmkp_edge(koza_transform: koza.KozaTransform, record: Dict[str, An
 
     # Parse attributes JSON - this populates has_supporting_studies and sources on the association
     if attributes_json := record.get("_attributes"):
-        attributes = json.loads(attributes_json)
+        attributes = loads(attributes_json)
         parse_attributes(attributes, association)
     else:
         # No attributes - set default sources
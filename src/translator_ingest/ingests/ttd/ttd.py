@@ -6,6 +6,7 @@ from koza.model.graphs import KnowledgeGraph
 from translator_ingest.util.transform_utils import entity_id
 from translator_ingest.util.biolink import INFORES_TTD
 from translator_ingest.util.http_utils import get_modify_date
+from translator_ingest.util.name_resolution import NameResolver, get_name_resolver
 from biolink_model.datamodel.pydanticmodel_v2 import (
     ChemicalEntity,
     ChemicalEntityToDiseaseOrPhenotypicFeatureAssociation,
@@ -20,11 +21,8 @@ from biolink_model.datamodel.pydanticmodel_v2 import (
 )
 
 ## ADDED packages for this ingest
-from translator_ingest.util.logging_utils import get_logger
 import re
-## batched was added in Python 3.12. Pipeline uses Python >=3.12
-from itertools import islice, batched
-import requests
+from itertools import islice
 # ## needed for pd.read_excel
 # import openpyxl
 from translator_ingest.ingests.ttd.mappings import CLINICAL_STATUS_MAP, STRINGS_TO_FILTER, MOA_MAPPING
@@ -107,6 +105,7 @@ def run_nameres(
     types: list | None = None,
     exclude_namespaces: str | None = None,
     score_threshold: int = 0,
+    resolver: NameResolver | None = None,
 ):
     """
     Parameters:
@@ -116,10 +115,10 @@ def run_nameres(
     - types (default None): list of biolink categories that NameRes hits should have (hierarchy expansion is supported)
     - exclude_namespaces (default None): |-delimited string of ID namespaces to exclude, for quality
     - score_threshold (default 0): only accept hit if its score is greater than this, for quality
+    - resolver (default None): NameResolver to look names up with, by default the shared (cached) one for url
 
     Returns: tuple of mapping dict and failure stats dict
     """
-    logger = get_logger(__name__)
     ## set up variables to collect output
     mapping = {}
     stats_failures = {
@@ -127,49 +126,45 @@ def run_nameres(
         "returned_empty": [],
         "score_under_threshold": [],
     }
-    ## for printing progress
-    counter = 0
-
-    for batch in batched(names, batch_size):
-        req_body = {
-            "strings": list(batch),  ## returns tuples -> cast to list
-            "autocomplete": False,   ## names are complete search term
-            "limit": 1,              ## only want to review top hit
-            "biolink_types": types,
-            "exclude_prefixes": exclude_namespaces,    ## try to increase quality of hits
-        }    
-        r = requests.post(url, json=req_body)
-        response = r.json()
-
-        ## not doing dict comprehension. allows easier review, logic writing
-        for k,v in response.items():
-            ## catch unexpected errors
-            try:
-                ## will catch if v is an empty list (aka NameRes didn't have info)
-                if v:
-                    ## v is a 1-element list, work with it directly
-                    temp = v[0]
-                    ## also throw out mapping if score < score_threshold: want better-matching hits
-                    if temp["score"] > score_threshold:
-                        mapping.update({
-                            k: temp["curie"]
-                        })
-                    else:
-                        stats_failures["score_under_threshold"].append(k)
+
+    ## names looked up before (for the same Babel version) come from the resolver's cache, the rest from NameRes
+    resolver = resolver or get_name_resolver(url)
+    response = resolver.resolve(names, types=types, exclude_prefixes=exclude_namespaces, batch_size=batch_size)
+
+    ## not doing dict comprehension. allows easier review, logic writing
+    for k,v in response.items():
+        ## catch unexpected errors
+        try:
+            ## will catch if v is an empty list (aka NameRes didn't have info)
+            if v:
+                ## v is a 1-element list, work with it directly
+                temp = v[0]
+                ## also throw out mapping if score < score_threshold: want better-matching hits
+                if temp["score"] > score_threshold:
+                    mapping.update({
+                        k: temp["curie"]
+                    })
                 else:
-                    stats_failures["returned_empty"].append(k)
-            except Exception as e:
-                stats_failures["unexpected_error"].update({k: e})
-
-        counter += batch_size
-        if counter < len(names):   ## will keep going, log where we're at
-            logger.info(f"{counter} names processed (out of {len(names)})")
-        else:   ## done: use actual length
-            logger.info(f"Finished processing {len(names)} names.")
-#         ## for debug: tracking progress, stopping early
-#         if counter >= 500:
-#             break
+                    stats_failures["score_under_threshold"].append(k)
+            else:
+                stats_failures["returned_empty"].append(k)
+        except Exception as e:
+            stats_failures["unexpected_error"].update({k: e})
+
+    return mapping, stats_failures
 
+
+def run_nameres_step(koza: koza.KozaTransform, cache_stats_key: str, **run_nameres_kwargs):
+    """
+    run_nameres with the shared resolver for NAMERES_URL, recording the NameRes cache hits and misses of this
+    lookup alone (not of the earlier ones in the run) in koza.transform_metadata[cache_stats_key].
+
+    Returns: tuple of mapping dict and failure stats dict, as run_nameres
+    """
+    resolver = get_name_resolver(NAMERES_URL)
+    hits, misses = resolver.hits, resolver.misses
+    mapping, stats_failures = run_nameres(url=NAMERES_URL, resolver=resolver, **run_nameres_kwargs)
+    koza.transform_metadata[cache_stats_key] = {"hits": resolver.hits - hits, "misses": resolver.misses - misses}
     return mapping, stats_failures
 
 
@@ -363,9 +358,10 @@ def p1_05_prepare(koza: koza.KozaTransform, data: Iterable[dict[str, Any]]) -> I
     indication_exclude_prefixes = "UMLS|MESH"
     indication_score_threshold = 300
     ## use NAMERES_URL initialized earlier, default batch_size
-    koza.transform_metadata["indication_mapping"], koza.transform_metadata["stats_indication_mapping_failures"] = run_nameres(
+    koza.transform_metadata["indication_mapping"], koza.transform_metadata["stats_indication_mapping_failures"] = run_nameres_step(
+        koza,
+        "stats_indication_nameres_cache",
         names=indication_names,
-        url=NAMERES_URL,
         types=indication_types,
         exclude_namespaces=indication_exclude_prefixes,
         score_threshold=indication_score_threshold,
@@ -463,9 +459,10 @@ def p1_07_prepare(koza: koza.KozaTransform, data: Iterable[dict[str, Any]]) -> I
     target_types = ["GeneOrGeneProduct"]
     # target_exclude_prefixes = "UMLS"    ## not using to speed up responses
     ## use NAMERES_URL initialized earlier, default batch_size
-    koza.transform_metadata["uniprot_name_to_id"], koza.transform_metadata["stats_target_mapping_failures"] = run_nameres(
+    koza.transform_metadata["uniprot_name_to_id"], koza.transform_metadata["stats_target_mapping_failures"] = run_nameres_step(
+        koza,
+        "stats_target_nameres_cache",
         names=all_uniprot_names,
-        url=NAMERES_URL, 
         types=target_types,
         # exclude_namespaces=target_exclude_prefixes,     ## not using to speed up responses 
     )
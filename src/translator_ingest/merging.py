@@ -1,7 +1,7 @@
 import click
-import json
 import hashlib
 import datetime
+from contextlib import ExitStack
 from pathlib import Path
 
 from orion import KGXFileMerger, KGXGraphMetadata, KGXKnowledgeSource, generate_schema, GraphSpec, SubGraphSource
@@ -12,7 +12,10 @@ from translator_ingest.util.metadata import PipelineMetadata, get_kgx_source_fro
     current_iso_date
 from translator_ingest.util.storage.local import get_versioned_file_paths, IngestFileType, IngestFileName, \
     write_ingest_file
+from translator_ingest.util.compression import plain_input_files
+from translator_ingest.util.jsonio import read_json, write_json
 from translator_ingest.util.logging_utils import get_logger, setup_logging
+from translator_ingest.util.telemetry import record_stage_counts, stage_metrics
 
 logger = get_logger(__name__)
 
@@ -24,7 +27,7 @@ def merge_single(
     output_nodes_file: Path,
     output_edges_file: Path,
     output_metadata_file: Path,
-    source_version: str = None
+    source_version: str | None = None
 ) -> dict:
     """Merge KGX files using ORION's KGXFileMerger. Note that merge_single is used in a different way than most of the
     rest of the functionality in this file.
@@ -47,6 +50,29 @@ def merge_single(
     output_dir = output_nodes_file.parent
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    # ORION reads plain jsonl only, so .zst inputs of an earlier run are decompressed for it
+    with plain_input_files(input_nodes_file, input_edges_file) as (plain_nodes_file, plain_edges_file):
+        merge_metadata = _merge_kgx_files(source_id, plain_nodes_file, plain_edges_file,
+                                          output_nodes_file, output_edges_file, source_version)
+
+    if "merge_error" in merge_metadata:
+        logger.error(f"Merging error occurred for {source_id}: {merge_metadata['merge_error']}")
+    else:
+        write_json(output_metadata_file, merge_metadata)
+        logger.info(f"Merge metadata written to {output_metadata_file}")
+
+    return merge_metadata
+
+
+def _merge_kgx_files(
+    source_id: str,
+    input_nodes_file: str,
+    input_edges_file: str,
+    output_nodes_file: Path,
+    output_edges_file: Path,
+    source_version: str | None = None
+) -> dict:
+    """Run KGXFileMerger on plain KGX files, and return its merge metadata."""
     graph_spec = GraphSpec(
         graph_id=source_id,
         graph_name=source_id,
@@ -70,22 +96,13 @@ def merge_single(
     logger.info(f"Running KGXFileMerger for {source_id}...")
     file_merger = KGXFileMerger(
         graph_spec=graph_spec,
-        output_directory=str(output_dir),
+        output_directory=str(output_nodes_file.parent),
         nodes_output_filename=output_nodes_file.name,
         edges_output_filename=output_edges_file.name,
         save_memory=True
     )
     file_merger.merge()
-
-    merge_metadata = file_merger.get_merge_metadata()
-    if "merge_error" in merge_metadata:
-        logger.error(f"Merging error occurred for {source_id}: {merge_metadata['merge_error']}")
-    else:
-        with open(output_metadata_file, "w") as metadata_file:
-            json.dump(merge_metadata, metadata_file, indent=4)
-        logger.info(f"Merge metadata written to {output_metadata_file}")
-
-    return merge_metadata
+    return file_merger.get_merge_metadata()
 
 
 """
@@ -103,8 +120,7 @@ def is_merged_graph_release_current(merged_graph_metadata: PipelineMetadata) ->
     release_metadata_path = get_versioned_file_paths(IngestFileType.LATEST_RELEASE_FILE, merged_graph_metadata)
     if not release_metadata_path.exists():
         return False
-    with release_metadata_path.open("r") as latest_release_file:
-        latest_release_metadata = PipelineMetadata.from_dict(json.load(latest_release_file))
+    latest_release_metadata = PipelineMetadata.from_dict(read_json(release_metadata_path))
     return merged_graph_metadata.build_version == latest_release_metadata.build_version
 
 
@@ -188,8 +204,7 @@ def merge(graph_id: str, sources: list[str], overwrite: bool = False) -> tuple[P
         if not latest_path.exists():
             raise IOError(f"Could not find latest release metadata for {source}")
 
-        with latest_path.open() as latest_pipeline_metadata_file:
-            pipeline_metadata = PipelineMetadata.from_dict(json.load(latest_pipeline_metadata_file))
+        pipeline_metadata = PipelineMetadata.from_dict(read_json(latest_path))
 
         # Validate that this source has all required version information
         if pipeline_metadata.biolink_version is None:
@@ -248,8 +263,7 @@ def merge(graph_id: str, sources: list[str], overwrite: bool = False) -> tuple[P
     )
     previous_release_version = None
     if previous_release_metadata_path.exists():
-        with previous_release_metadata_path.open("r") as previous_release_file:
-            previous_release_version = PipelineMetadata.from_dict(json.load(previous_release_file)).release_version
+        previous_release_version = PipelineMetadata.from_dict(read_json(previous_release_metadata_path)).release_version
 
     # Generate a build version based on the build versions of all source graphs
     build_version = hashlib.md5("".join(sorted(graph_source_versions)).encode()).hexdigest()[:12]
@@ -292,25 +306,33 @@ def merge(graph_id: str, sources: list[str], overwrite: bool = False) -> tuple[P
         logger.info(f"Graph {graph_id} ({build_version}) already exists..")
     else:
         output_dir.mkdir(parents=True, exist_ok=True)
-        file_merger = KGXFileMerger(
-            graph_spec=graph_spec,
-            output_directory=str(output_dir),
-            nodes_output_filename="nodes.jsonl",
-            edges_output_filename="edges.jsonl",
-            save_memory=True
-        )
-        file_merger.merge()
+        with stage_metrics("merge", source=graph_id), ExitStack() as plain_files:
+            # ORION reads plain jsonl only, so the merged files of the sources are decompressed for it
+            for graph_spec_source in graph_spec.sources:
+                graph_spec_source.file_paths = plain_files.enter_context(
+                    plain_input_files(*graph_spec_source.file_paths)
+                )
+            file_merger = KGXFileMerger(
+                graph_spec=graph_spec,
+                output_directory=str(output_dir),
+                nodes_output_filename="nodes.jsonl",
+                edges_output_filename="edges.jsonl",
+                save_memory=True
+            )
+            file_merger.merge()
 
-        merge_metadata = file_merger.get_merge_metadata()
+            merge_metadata = file_merger.get_merge_metadata()
+            record_stage_counts(nodes=merge_metadata.get("final_node_count"),
+                                edges=merge_metadata.get("final_edge_count"))
         if "merge_error" in merge_metadata:
             logger.error(f"Merging error occurred: {merge_metadata['merge_error']}")
         else:
             metadata_output = output_dir / "merge-metadata.json"
-            with open(metadata_output, "w") as metadata_file:
-                metadata_file.write(json.dumps(merge_metadata, indent=4))
+            write_json(metadata_output, merge_metadata)
 
     # Generate graph metadata after successful merge
-    merge_graph_metadata(pipeline_metadata=merged_graph_metadata, kgx_sources=kgx_sources, overwrite=overwrite)
+    with stage_metrics("graph_metadata", source=graph_id):
+        merge_graph_metadata(pipeline_metadata=merged_graph_metadata, kgx_sources=kgx_sources, overwrite=overwrite)
 
     return merged_graph_metadata, kgx_sources
 
@@ -401,7 +423,8 @@ def _warn_if_sources_diverge_from_declaration(graph_id: str, sources: list[str])
 @click.argument("sources", nargs=-1, required=True)
 @click.option("--overwrite", is_flag=True, help="Start fresh and overwrite previously generated files.")
 def main(graph_id, sources, overwrite):
-    setup_logging()
+    # log to logs/{graph_id}/{timestamp}/, which is also where the stage metrics (metrics.jsonl) are written
+    setup_logging(source=graph_id)
 
     _warn_if_sources_diverge_from_declaration(graph_id, list(sources))
 
@@ -1,12 +1,24 @@
-import json
+import os
 import tempfile
 
 from pathlib import Path
 
 from orion import KGXFileNormalizer, NormalizationScheme
-
+from orion.config import config as orion_config
+from orion.normalization import NodeNormalizer
+
+from translator_ingest.util.compression import open_file, plain_input_files
+from translator_ingest.util.edge_normalization import (
+    NORMALIZATION_EDGE_SHARDS,
+    SHARDED_NORMALIZATION_MIN_BYTES,
+    normalize_edges_sharded,
+    remove_unconnected_nodes,
+)
+from translator_ingest.util.fused_normalization import StreamingNormalizer
+from translator_ingest.util.jsonio import write_json
 from translator_ingest.util.metadata import PipelineMetadata
 from translator_ingest.util.logging_utils import get_logger
+from translator_ingest.util.node_norm_client import NODE_NORM_CONCURRENCY, NodeNormClient
 
 logger = get_logger(__name__)
 
@@ -23,6 +35,56 @@ def build_normalization_scheme(pipeline_metadata: PipelineMetadata) -> Normaliza
     )
 
 
+class PooledNodeNormalizer(NodeNormalizer):
+    """An ORION NodeNormalizer which looks nodes up in concurrent batches with a NodeNormClient, rather than serially.
+
+    The nodes ORION normalizes are all looked up at once first, and its batched lookups are then served from the
+    results; the rest of the normalization is ORION's. The client, with its threads and connections, only lives
+    through each normalize_node_data call, so none are left running once the nodes are normalized (the edges may be
+    normalized in forked processes next); lookups outside of one are ORION's own.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.request_options = {
+            # as ORION looks them up
+            "conflate": self.conflate_node_types,
+            "drug_chemical_conflate": self.conflate_node_types,
+            "description": True,
+            "include_taxa": self.include_taxa,
+        }
+        self._client: NodeNormClient | None = None
+        self._lookup_results: dict[str, dict | None] = {}
+
+    def normalize_node_data(self, node_list: list, batch_size: int = 5000) -> list:
+        with NodeNormClient(orion_config.NODE_NORMALIZATION_URL, request_options=self.request_options) as client:
+            self._client = client
+            try:
+                self._lookup_results = client.normalize_sync(node["id"] for node in node_list)
+                return super().normalize_node_data(node_list, batch_size=batch_size)
+            finally:
+                self._client = None
+                self._lookup_results = {}
+
+    def hit_node_norm_service(self, curies, retries=0):
+        if self._client is None:
+            return super().hit_node_norm_service(curies, retries=retries)
+        missing_curies = [curie for curie in curies if curie not in self._lookup_results]
+        if missing_curies:
+            self._lookup_results.update(self._client.normalize_sync(missing_curies))
+        return {curie: self._lookup_results[curie] for curie in curies}
+
+
+def create_node_normalizer(normalization_scheme: NormalizationScheme) -> NodeNormalizer:
+    """Create the ORION NodeNormalizer of a normalization scheme, looking nodes up concurrently unless configured not
+    to (NODE_NORM_CONCURRENCY=1)."""
+    node_normalizer_class = PooledNodeNormalizer if NODE_NORM_CONCURRENCY > 1 else NodeNormalizer
+    return node_normalizer_class(node_normalization_version=normalization_scheme.node_normalization_version,
+                                 strict_normalization=normalization_scheme.strict,
+                                 conflate_node_types=normalization_scheme.conflation,
+                                 biolink_version=normalization_scheme.edge_normalization_version)
+
+
 def normalize_kgx_files(
     input_nodes_file_path: str,
     input_edges_file_path: str,
@@ -32,7 +94,7 @@ def normalize_kgx_files(
     edges_output_file_path: str,
     normalization_metadata_file_path: str,
     pipeline_metadata: PipelineMetadata,
-):
+) -> dict:
     # Get max_edge_count from pipeline metadata if available
     max_edge_count = pipeline_metadata.koza_config.get("max_edge_count")
 
@@ -63,17 +125,92 @@ def normalize_kgx_files(
         "predicates_pre_normalized": True,
     })
 
-    file_normalizer = KGXFileNormalizer(**normalizer_kwargs)
-    normalization_metadata = file_normalizer.normalize_kgx_files()
+    # ORION reads plain jsonl only, so .zst inputs of an earlier run are decompressed for it
+    with plain_input_files(input_nodes_file_path, input_edges_file_path) as (plain_nodes_path, plain_edges_path):
+        file_normalizer = KGXFileNormalizer(**{
+            **normalizer_kwargs,
+            "source_nodes_file_path": plain_nodes_path,
+            "source_edges_file_path": plain_edges_path,
+        })
+        file_normalizer.node_normalizer = create_node_normalizer(file_normalizer.normalization_scheme)
+        # large edges files are normalized in shards in parallel, once ORION has normalized the nodes
+        if (max_edge_count != 0 and NORMALIZATION_EDGE_SHARDS > 1
+                and os.path.getsize(plain_edges_path) >= SHARDED_NORMALIZATION_MIN_BYTES):
+            normalization_metadata = normalize_kgx_files_sharded(file_normalizer)
+        else:
+            normalization_metadata = file_normalizer.normalize_kgx_files()
 
     # Clean up temp file if created
     if max_edge_count == 0:
         Path(input_edges_file_path).unlink(missing_ok=True)
         # Create empty output edges file for consistency
-        Path(edges_output_file_path).touch()
+        if not Path(edges_output_file_path).exists():
+            open_file(edges_output_file_path, "wb").close()
+
+    write_json(normalization_metadata_file_path, normalization_metadata)
+    return normalization_metadata
+
+
+def normalize_kgx_files_sharded(file_normalizer: KGXFileNormalizer, shards: int = NORMALIZATION_EDGE_SHARDS) -> dict:
+    """Normalize KGX files as KGXFileNormalizer.normalize_kgx_files does, with the edges normalized in shards.
 
-    with Path(normalization_metadata_file_path).open("w") as normalization_metadata_file:
-        normalization_metadata_file.write(json.dumps(normalization_metadata, indent=4))
+    The nodes are normalized by ORION, and the edges in a process pool with its node normalization map
+    (see util/edge_normalization.py), so the normalization metadata is the same.
+    """
+    file_normalizer.normalize_node_file()
+    edge_counts, connected_node_ids = normalize_edges_sharded(
+        file_normalizer.source_edges_file_path,
+        file_normalizer.edges_output_file_path,
+        file_normalizer.node_normalizer.node_normalization_lookup,
+        shards=shards,
+    )
+    normalization_metadata = file_normalizer.normalization_metadata
+    normalization_metadata.update({
+        "biolink_version": file_normalizer.normalization_scheme.edge_normalization_version,
+        **edge_counts,
+    })
+    unconnected_nodes_removed = remove_unconnected_nodes(file_normalizer.nodes_output_file_path, connected_node_ids)
+    normalization_metadata["unconnected_nodes_removed"] = unconnected_nodes_removed
+    normalization_metadata["final_normalized_nodes"] -= unconnected_nodes_removed
+    return normalization_metadata
+
+
+def create_streaming_normalizer(
+    nodes_output_file_path: str,
+    node_norm_map_file_path: str,
+    node_norm_failures_file_path: str,
+    edges_output_file_path: str,
+    pipeline_metadata: PipelineMetadata,
+) -> StreamingNormalizer:
+    """Create a StreamingNormalizer for a fused transform and normalization, normalizing as normalize_kgx_files does."""
+    return StreamingNormalizer(
+        create_node_normalizer(build_normalization_scheme(pipeline_metadata)),
+        nodes_output_file_path=nodes_output_file_path,
+        edges_output_file_path=edges_output_file_path,
+        node_norm_map_file_path=node_norm_map_file_path,
+        node_norm_failures_file_path=node_norm_failures_file_path,
+        # nodes-only ingests keep all their nodes
+        preserve_unconnected_nodes=pipeline_metadata.koza_config.get("max_edge_count") == 0,
+    )
+
+
+def write_streaming_normalization_metadata(
+    normalizer: StreamingNormalizer,
+    normalization_metadata_file_path: str,
+    pipeline_metadata: PipelineMetadata,
+) -> dict:
+    """Write the normalization metadata of a closed StreamingNormalizer, as KGXFileNormalizer reports it."""
+    normalization_scheme = build_normalization_scheme(pipeline_metadata)
+    normalization_metadata = {
+        **normalization_scheme.get_metadata_representation(),
+        **normalizer.counts,
+        "normalization_by_prefix": KGXFileNormalizer.compute_by_prefix_stats(
+            node_norm_lookup=normalizer.node_normalizer.node_normalization_lookup
+        ),
+        "biolink_version": normalization_scheme.edge_normalization_version,
+    }
+    write_json(normalization_metadata_file_path, normalization_metadata)
+    return normalization_metadata
 
 
 # TODO redo cli for this module?
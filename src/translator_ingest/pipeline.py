@@ -1,42 +1,44 @@
-import click
 import hashlib
-import json
+import os
 import time
-import shutil
-
-from dataclasses import is_dataclass, asdict
+from contextlib import contextmanager
+from dataclasses import asdict, is_dataclass
 from datetime import datetime
 from importlib import import_module
+from importlib.metadata import version
 from pathlib import Path
 from types import ModuleType
 
-from translator_ingest.util.biolink import get_current_biolink_version
-from translator_ingest.util.logging_utils import get_logger, setup_logging
-
-from kghub_downloader.main import main as kghub_download
-
-from koza.runner import KozaRunner
-from koza.model.formats import OutputFormat as KozaOutputFormat
-
-from orion import KGXGraphMetadata, generate_schema, MetaKnowledgeGraphBuilder, MERGING_CODE_VERSION
-from orion.normalization import get_current_node_norm_version, get_current_babel_version, NORMALIZATION_CODE_VERSION
+import click
+import requests
+from requests.adapters import Retry
 
+# Heavy dependencies (koza, kghub_downloader, ORION, LinkML validation and the Biolink pydantic model) are
+# imported inside the stages that use them, so that --transform-only runs never load ORION and a run which
+# finds its build already complete (see is_build_current) exits without loading any of them.
+# tests/unit/test_import_time.py keeps this module within its import time budget.
 from translator_ingest import INGESTS_PARSER_PATH, INGESTS_STORAGE_URL
-from translator_ingest.merging import merge_single
-from translator_ingest.normalize import normalize_kgx_files
-from translator_ingest.util.metadata import PipelineMetadata, get_kgx_source_from_rig, current_iso_date
+from translator_ingest.util.biolink_snapshot import get_biolink_snapshot
+from translator_ingest.util.compression import compress_kgx_files, copy_file, plain_file_path, plain_input_files
+from translator_ingest.util.curie import log_cache_stats
+from translator_ingest.util.decompression import threaded_koza_decompression
+from translator_ingest.util.download_utils import substitute_version_in_download_yaml
+from translator_ingest.util.http_utils import create_pooled_session
+from translator_ingest.util.jsonio import read_json, write_json
+from translator_ingest.util.logging_utils import get_logger, setup_logging
+from translator_ingest.util.metadata import PipelineMetadata, current_iso_date, get_kgx_source_from_rig
+from translator_ingest.util.profiling import ProfileMode, get_koza_hook_functions, profile_stage
 from translator_ingest.util.storage.local import (
+    IngestFileType,
+    get_normalization_directory,
     get_output_directory,
     get_source_data_directory,
     get_transform_directory,
-    get_normalization_directory,
     get_validation_directory,
     get_versioned_file_paths,
-    IngestFileType,
     write_ingest_file,
 )
-from translator_ingest.util.validate_biolink_kgx import ValidationStatus, get_validation_status, validate_kgx, validate_kgx_nodes_only
-from translator_ingest.util.download_utils import substitute_version_in_download_yaml
+from translator_ingest.util.telemetry import CountingIterable, get_stage_metrics, record_stage_counts, stage_metrics
 
 logger = get_logger(__name__)
 
@@ -44,9 +46,24 @@ logger = get_logger(__name__)
 # All sources default to strict normalization (True).
 NORMALIZATION_STRICT_OVERRIDES: dict[str, bool] = {}
 
+# Distribution name of ORION, whose installed version pins the normalization and merging code versions
+ORION_DISTRIBUTION = "robokop-orion"
+
+# Node Normalizer instance ORION normalizes against (ORION reads the same environment variable)
+NODE_NORMALIZATION_URL = os.environ.get("NODE_NORMALIZATION_URL", "https://nodenormalization-sri.renci.org").rstrip("/")
+# Timeout (seconds) and retries of the Node Normalizer version requests of is_build_current
+NODE_NORMALIZATION_STATUS_TIMEOUT = 30
+NODE_NORMALIZATION_STATUS_RETRIES = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+
+# Stages of run_pipeline, in order, as named in the stage metrics and accepted by --profile
+PIPELINE_STAGES = ["download", "transform", "normalize", "merge", "validate", "graph_metadata"]
+
 
 def load_koza_config(source: str, pipeline_metadata: PipelineMetadata):
     """Load koza config to get ingest-specific settings like max_edge_count."""
+    from koza.model.formats import OutputFormat as KozaOutputFormat
+    from koza.runner import KozaRunner
+
     source_config_yaml_path = INGESTS_PARSER_PATH / source / f"{source}.yaml"
     config, _ = KozaRunner.from_config_file(
         str(source_config_yaml_path),
@@ -75,9 +92,8 @@ def get_last_successful_source_version(source: str) -> str | None:
     if not latest_build_path.exists():
         return None
 
-    with open(latest_build_path, 'r') as f:
-        build_metadata = json.load(f)
-        return build_metadata.get("source_version")
+    build_metadata = read_json(latest_build_path)
+    return build_metadata.get("source_version")
 
 # Return an ingest module by source name so attributes from it can be accessed without explicit imports
 def get_ingest_module(source: str) -> ModuleType:
@@ -142,6 +158,8 @@ def get_transform_version(source: str) -> str:
 
 # Download the source data for a source from the original location
 def download(pipeline_metadata: PipelineMetadata):
+    from kghub_downloader.main import main as kghub_download
+
     # Find the path to the source-specific download yaml
     download_yaml_file = INGESTS_PARSER_PATH / pipeline_metadata.source / "download.yaml"
     # If the download yaml does not exist, assume it isn't needed for this source and back out
@@ -199,7 +217,19 @@ def is_transform_complete(pipeline_metadata: PipelineMetadata):
 
 
 # Transform original source data into KGX files using Koza and functions defined in the ingest module
-def transform(pipeline_metadata: PipelineMetadata):
+def transform(pipeline_metadata: PipelineMetadata, resume: bool = True, fused: bool = False, row_limit: int = 0):
+    from koza.model.formats import OutputFormat as KozaOutputFormat
+    from koza.runner import KozaRunner
+
+    from translator_ingest.util.checkpoint import (
+        CHECKPOINT_FILE_NAME,
+        SEGMENTS_DIR_NAME,
+        is_checkpointing_enabled,
+        run_checkpointed,
+    )
+    from translator_ingest.util.polars_reader import KozaReaderData
+    from translator_ingest.util.transform_writer import DeduplicatingJSONLWriter
+
     source = pipeline_metadata.source
     logger.info(f"Starting transform for {source}")
 
@@ -209,18 +239,72 @@ def transform(pipeline_metadata: PipelineMetadata):
     # the path for the versioned output subdirectory for this transform
     transform_output_dir = get_transform_directory(pipeline_metadata)
     Path.mkdir(transform_output_dir, parents=True, exist_ok=True)
+    # remove the KGX files of an earlier run, which may have been written with another compression setting;
+    # the segments and checkpoint a failed run left behind are kept to resume from, unless starting fresh
+    for previous_kgx_file in [*transform_output_dir.glob("*nodes.jsonl*"), *transform_output_dir.glob("*edges.jsonl*")]:
+        previous_kgx_file.unlink()
+    if not resume:
+        (transform_output_dir / CHECKPOINT_FILE_NAME).unlink(missing_ok=True)
 
     # use Koza to load the config and run the transform
     config, runner = KozaRunner.from_config_file(
         str(source_config_yaml_path),
         output_dir=str(transform_output_dir),
         output_format=KozaOutputFormat.jsonl,
+        row_limit=row_limit,
         input_files_dir=str(get_source_data_directory(pipeline_metadata)),
     )
+    # write the nodes with a writer which also merges conflicting duplicates of a node, and counts the duplicates,
+    # as segments with checkpoints to resume from if the transform fails (see util/checkpoint.py)
+    checkpointed = is_checkpointing_enabled() and not fused
+    if fused:
+        # which also normalizes what it writes, so the normalization is done when the transform is
+        # (see util/fused_normalization.py); a fused transform is not checkpointed, as it can't resume normalizing
+        from translator_ingest.normalize import create_streaming_normalizer
+        from translator_ingest.util.fused_normalization import FusedNormalizationWriter
+
+        logger.info(f"Normalizing the transform output for {source} as it is written")
+        normalizer = create_streaming_normalizer(**get_normalization_output_paths(pipeline_metadata),
+                                                 pipeline_metadata=pipeline_metadata)
+        runner.writer = FusedNormalizationWriter(output_dir=str(transform_output_dir), source_name=config.name,
+                                                 config=config.writer, normalizer=normalizer)
+    else:
+        segments_dir = str(transform_output_dir / SEGMENTS_DIR_NAME) if checkpointed else None
+        runner.writer = DeduplicatingJSONLWriter(output_dir=str(transform_output_dir), source_name=config.name,
+                                                 config=config.writer, segments_dir=segments_dir)
+    # count the records koza's readers yield (ingests whose prepare_data reads its own files consume none)
+    reader_data = {tag: CountingIterable(data) for tag, data in runner.data.items()}
+    # with the config of their reader and the row limit, so that prepare_data functions can scan as many rows of its
+    # files as koza would read (see util/polars_reader.py)
+    reader_configs = {reader.tag: reader.reader for reader in config.get_readers()}
+    runner.data = {tag: KozaReaderData(data, reader_configs[tag], source_config_yaml_path.parent, row_limit)
+                   for tag, data in reader_data.items()}
     start_time = time.perf_counter()
-    runner.run()
+    # koza's readers decompress gzipped source files in background threads, overlapped with the transform
+    with threaded_koza_decompression():
+        if checkpointed:
+            run_checkpointed(runner, checkpoint_dir=transform_output_dir)
+        else:
+            runner.run()
     elapsed_time = time.perf_counter() - start_time
+    record_stage_counts(nodes=runner.writer.node_count,
+                        edges=runner.writer.edge_count,
+                        koza_reader_records=sum(data.count for data in reader_data.values()),
+                        duplicate_nodes=runner.writer.duplicate_node_count)
     logger.info(f"Finished transform for {source} in {elapsed_time:.1f} seconds.")
+    log_cache_stats()
+    if fused:
+        from translator_ingest.normalize import write_streaming_normalization_metadata
+
+        normalization_metadata = write_streaming_normalization_metadata(
+            normalizer,
+            normalization_metadata_file_path=str(get_versioned_file_paths(
+                file_type=IngestFileType.NORMALIZATION_METADATA_FILE, pipeline_metadata=pipeline_metadata
+            )),
+            pipeline_metadata=pipeline_metadata,
+        )
+        logger.info(f"Normalized {normalization_metadata['final_normalized_nodes']} nodes and "
+                    f"{normalization_metadata['final_normalized_edges']} edges of the transform for {source}.")
 
     # Reload koza config after transform to ensure we have the latest values
     # This is important because the transform might have updated config values
@@ -244,10 +328,9 @@ def transform(pipeline_metadata: PipelineMetadata):
         "source_version": pipeline_metadata.source_version,
         "transform_version": pipeline_metadata.transform_version,
         "transform_duration": f"{elapsed_time:.1f}",
-        "transform_metadata": runner.transform_metadata
+        "transform_metadata": runner.transform_metadata,
+        "node_deduplication": runner.writer.dedup_counts,
     }
-    # we probably still want to do more here, maybe stuff like:
-    # transform_metadata.update(runner.writer.duplicate_node_count)
     write_ingest_file(file_type=IngestFileType.TRANSFORM_METADATA_FILE,
                       pipeline_metadata=pipeline_metadata,
                       data=transform_metadata)
@@ -297,7 +380,46 @@ def is_normalization_complete(pipeline_metadata: PipelineMetadata):
         return norm_nodes.exists() and norm_edges.exists() and norm_metadata.exists() and norm_map.exists()
 
 
+def load_normalization_settings(pipeline_metadata: PipelineMetadata):
+    """Set the versions and settings of the normalization to run on the pipeline metadata."""
+    # Note - ORION can use the biolink model to map predicates during normalization, but we decided not to do that.
+    # Here we still need the biolink model version populated before normalization so metadata outputs are
+    # consistent.
+    from orion.normalization import NORMALIZATION_CODE_VERSION, get_current_babel_version, get_current_node_norm_version
+
+    pipeline_metadata.biolink_version = get_biolink_snapshot().get_model_version()
+    pipeline_metadata.orion_version = version(ORION_DISTRIBUTION)
+    pipeline_metadata.babel_version = get_current_babel_version()
+    pipeline_metadata.node_normalizer_version = get_current_node_norm_version()
+    pipeline_metadata.normalization_code_version = NORMALIZATION_CODE_VERSION
+    pipeline_metadata.normalization_conflation = True
+    pipeline_metadata.normalization_strict = NORMALIZATION_STRICT_OVERRIDES.get(pipeline_metadata.source, True)
+
+
+def get_normalization_output_paths(pipeline_metadata: PipelineMetadata) -> dict[str, str]:
+    """The paths of the files the normalization writes, by the normalize_kgx_files argument they are passed as.
+
+    The KGX files are written plain, as ORION writes them, even where a compressed file of an earlier run is.
+    """
+    get_normalization_directory(pipeline_metadata=pipeline_metadata).mkdir(exist_ok=True)
+    norm_node_path, norm_edge_path = get_versioned_file_paths(
+        file_type=IngestFileType.NORMALIZED_KGX_FILES, pipeline_metadata=pipeline_metadata
+    )
+    return {
+        "nodes_output_file_path": str(plain_file_path(norm_node_path)),
+        "node_norm_map_file_path": str(get_versioned_file_paths(
+            file_type=IngestFileType.NORMALIZATION_MAP_FILE, pipeline_metadata=pipeline_metadata
+        )),
+        "node_norm_failures_file_path": str(get_versioned_file_paths(
+            file_type=IngestFileType.NORMALIZATION_FAILURES_FILE, pipeline_metadata=pipeline_metadata
+        )),
+        "edges_output_file_path": str(plain_file_path(norm_edge_path)),
+    }
+
+
 def normalize(pipeline_metadata: PipelineMetadata):
+    from translator_ingest.normalize import normalize_kgx_files
+
     logger.info(f"Starting normalization for {pipeline_metadata.source}...")
 
     # Check if this is a nodes-only ingest based on max_edge_count
@@ -305,8 +427,6 @@ def normalize(pipeline_metadata: PipelineMetadata):
     if max_edge_count == 0:
         logger.info(f"Running in nodes-only mode for {pipeline_metadata.source} (max_edge_count = 0)")
 
-    normalization_output_dir = get_normalization_directory(pipeline_metadata=pipeline_metadata)
-    normalization_output_dir.mkdir(exist_ok=True)
     input_nodes_path, input_edges_path = get_versioned_file_paths(
         file_type=IngestFileType.TRANSFORM_KGX_FILES, pipeline_metadata=pipeline_metadata
     )
@@ -316,33 +436,30 @@ def normalize(pipeline_metadata: PipelineMetadata):
         logger.info(f"Skipping edge processing for nodes-only ingest {pipeline_metadata.source}")
         input_edges_path = None
 
-    norm_node_path, norm_edge_path = get_versioned_file_paths(
-        file_type=IngestFileType.NORMALIZED_KGX_FILES, pipeline_metadata=pipeline_metadata
-    )
     norm_metadata_path = get_versioned_file_paths(
         file_type=IngestFileType.NORMALIZATION_METADATA_FILE, pipeline_metadata=pipeline_metadata
     )
-    norm_failures_path = get_versioned_file_paths(
-        file_type=IngestFileType.NORMALIZATION_FAILURES_FILE, pipeline_metadata=pipeline_metadata
-    )
-    node_norm_map_path = get_versioned_file_paths(
-        file_type=IngestFileType.NORMALIZATION_MAP_FILE, pipeline_metadata=pipeline_metadata
-    )
 
     # Call normalize_kgx_files with pipeline_metadata to handle nodes-only ingests
-    normalize_kgx_files(
+    normalization_metadata = normalize_kgx_files(
         input_nodes_file_path=str(input_nodes_path),
         input_edges_file_path=str(input_edges_path) if input_edges_path else None,
-        nodes_output_file_path=str(norm_node_path),
-        node_norm_map_file_path=str(node_norm_map_path),
-        node_norm_failures_file_path=str(norm_failures_path),
-        edges_output_file_path=str(norm_edge_path),
+        **get_normalization_output_paths(pipeline_metadata),
         normalization_metadata_file_path=str(norm_metadata_path),
         pipeline_metadata=pipeline_metadata,
     )
+    record_stage_counts(nodes=normalization_metadata.get("final_normalized_nodes"),
+                        edges=normalization_metadata.get("final_normalized_edges"))
     logger.info(f"Normalization complete for {pipeline_metadata.source}.")
 
 
+def load_merging_settings(pipeline_metadata: PipelineMetadata):
+    """Set the version of the merge to run on the pipeline metadata."""
+    from orion import MERGING_CODE_VERSION
+
+    pipeline_metadata.merging_code_version = MERGING_CODE_VERSION
+
+
 def is_merge_complete(pipeline_metadata: PipelineMetadata):
     merged_nodes, merged_edges = get_versioned_file_paths(
         file_type=IngestFileType.MERGED_KGX_FILES, pipeline_metadata=pipeline_metadata
@@ -357,13 +474,16 @@ def merge(pipeline_metadata: PipelineMetadata):
     """Merge post-normalization KGX files to deduplicate nodes and edges. After normalization,
     there may be duplicate edges (e.g., from nodes that normalized to the same identifier).
     """
+    from translator_ingest.merging import merge_single
+
     logger.info(f"Starting merge for {pipeline_metadata.source}...")
     normalized_nodes_file, normalized_edges_file = get_versioned_file_paths(
         file_type=IngestFileType.NORMALIZED_KGX_FILES, pipeline_metadata=pipeline_metadata
     )
-    output_nodes_file, output_edges_file = get_versioned_file_paths(
+    # written plain, as ORION writes them
+    output_nodes_file, output_edges_file = (plain_file_path(file_path) for file_path in get_versioned_file_paths(
         file_type=IngestFileType.MERGED_KGX_FILES, pipeline_metadata=pipeline_metadata
-    )
+    ))
     output_metadata_file = get_versioned_file_paths(
         file_type=IngestFileType.MERGE_METADATA_FILE, pipeline_metadata=pipeline_metadata
     )
@@ -375,14 +495,13 @@ def merge(pipeline_metadata: PipelineMetadata):
         # For nodes-only ingests, just copy the normalized files
         # make sure the merged directory exists because for nodes-only ingests it might not
         output_nodes_file.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(normalized_nodes_file, output_nodes_file)
+        copy_file(normalized_nodes_file, output_nodes_file)
         # Write empty merge metadata
-        with open(output_metadata_file, 'w') as f:
-            json.dump({}, f, indent=2)
+        write_json(output_metadata_file, {})
         logger.info(f"Merge complete for {pipeline_metadata.source} (nodes-only, copied without merging).")
         return
 
-    merge_single(
+    merge_metadata = merge_single(
         source_id=pipeline_metadata.source,
         input_nodes_file=normalized_nodes_file,
         input_edges_file=normalized_edges_file,
@@ -391,9 +510,23 @@ def merge(pipeline_metadata: PipelineMetadata):
         output_metadata_file=output_metadata_file,
         source_version=pipeline_metadata.source_version
     )
+    record_stage_counts(nodes=merge_metadata.get("final_node_count"), edges=merge_metadata.get("final_edge_count"))
 
     logger.info(f"Merge complete for {pipeline_metadata.source}.")
 
+
+def compress_stage_kgx_files(pipeline_metadata: PipelineMetadata, *file_types: IngestFileType):
+    """Compress the KGX files of pipeline stages into place, once no stage of the build reads them anymore.
+
+    The stages read and write them plain, as ORION does, so they are compressed for keeping and uploading only (see
+    util/compression.py): the transform and normalized files after the merge, the merged ones after the graph
+    metadata.
+    """
+    compress_kgx_files(*(file_path for file_type in file_types
+                         for file_path in get_versioned_file_paths(file_type=file_type,
+                                                                   pipeline_metadata=pipeline_metadata)))
+
+
 def is_validation_complete(pipeline_metadata: PipelineMetadata):
     validation_report_file_path = get_versioned_file_paths(
         file_type=IngestFileType.VALIDATION_REPORT_FILE, pipeline_metadata=pipeline_metadata
@@ -402,6 +535,8 @@ def is_validation_complete(pipeline_metadata: PipelineMetadata):
 
 
 def validate(pipeline_metadata: PipelineMetadata):
+    from translator_ingest.util.validate_biolink_kgx import validate_kgx, validate_kgx_nodes_only
+
     logger.info(f"Starting validation for {pipeline_metadata.source}... biolink: {pipeline_metadata.biolink_version}")
     nodes_file, edges_file = get_versioned_file_paths(
         file_type=IngestFileType.MERGED_KGX_FILES, pipeline_metadata=pipeline_metadata
@@ -434,6 +569,8 @@ def validate(pipeline_metadata: PipelineMetadata):
 
 
 def get_validation_result(pipeline_metadata: PipelineMetadata):
+    from translator_ingest.util.validate_biolink_kgx import ValidationStatus, get_validation_status
+
     if not is_validation_complete(pipeline_metadata):
         error_message = f"Validation report not found for {pipeline_metadata.source}."
         logger.error(error_message)
@@ -450,6 +587,8 @@ def get_validation_result(pipeline_metadata: PipelineMetadata):
 
 
 def test_data(pipeline_metadata: PipelineMetadata):
+    from orion import MetaKnowledgeGraphBuilder
+
     # TODO It'd be more efficient to generate the test data and example edges at the same time as the graph summary.
     #  ORION currently generates test data and example edges while building a metakg, so we still use that, even though
     #  we're not saving the metakg anymore.
@@ -471,9 +610,11 @@ def test_data(pipeline_metadata: PipelineMetadata):
                          data=[])
     else:
         # Generate the test data and example data
-        mkgb = MetaKnowledgeGraphBuilder(
-            nodes_file_path=graph_nodes_file_path, edges_file_path=graph_edges_file_path, logger=logger
-        )
+        # ORION reads plain jsonl only
+        with plain_input_files(graph_nodes_file_path, graph_edges_file_path) as (plain_nodes_path, plain_edges_path):
+            mkgb = MetaKnowledgeGraphBuilder(
+                nodes_file_path=plain_nodes_path, edges_file_path=plain_edges_path, logger=logger
+            )
         # write test data to file
         write_ingest_file(file_type=IngestFileType.TEST_DATA_FILE,
                           pipeline_metadata=pipeline_metadata,
@@ -499,10 +640,13 @@ def is_graph_metadata_complete(pipeline_metadata: PipelineMetadata):
 
 
 def generate_graph_metadata(pipeline_metadata: PipelineMetadata):
+    from orion import KGXGraphMetadata, generate_schema
+
     logger.info(f"Generating Graph Metadata for {pipeline_metadata.source}...")
 
     # Generate test data and example edges
-    test_data(pipeline_metadata)
+    with stage_metrics("test_data", source=pipeline_metadata.source):
+        test_data(pipeline_metadata)
 
     # Get KGXKnowledgeSource metadata from the rig file
     data_source_info = get_kgx_source_from_rig(pipeline_metadata.source)
@@ -511,7 +655,7 @@ def generate_graph_metadata(pipeline_metadata: PipelineMetadata):
     storage_url = (f"{INGESTS_STORAGE_URL}/{pipeline_metadata.source}/{pipeline_metadata.source_version}/"
                    f"transform_{pipeline_metadata.transform_version}/"
                    f"normalization_{pipeline_metadata.get_composite_normalization_version()}/"
-                   f"merge_{MERGING_CODE_VERSION}/")
+                   f"merge_{pipeline_metadata.merging_code_version}/")
     pipeline_metadata.data = storage_url
     source_metadata = KGXGraphMetadata(
         id=storage_url,
@@ -541,9 +685,10 @@ def generate_graph_metadata(pipeline_metadata: PipelineMetadata):
         graph_metadata = asdict(source_metadata)
     else:
         # construct the full graph_metadata by combining source_metadata from translator-ingests with an ORION analysis
-        source_metadata.schema = generate_schema(nodes_file_path=graph_nodes_file_path,
-                                                 edges_file_path=graph_edges_file_path,
-                                                 biolink_version=pipeline_metadata.biolink_version)
+        with plain_input_files(graph_nodes_file_path, graph_edges_file_path) as (plain_nodes_path, plain_edges_path):
+            source_metadata.schema = generate_schema(nodes_file_path=plain_nodes_path,
+                                                     edges_file_path=plain_edges_path,
+                                                     biolink_version=pipeline_metadata.biolink_version)
         graph_metadata = source_metadata.to_json()
     write_ingest_file(file_type=IngestFileType.GRAPH_METADATA_FILE,
                       pipeline_metadata=pipeline_metadata,
@@ -554,8 +699,7 @@ def generate_graph_metadata(pipeline_metadata: PipelineMetadata):
         file_type=IngestFileType.TRANSFORM_METADATA_FILE, pipeline_metadata=pipeline_metadata
     )
     if transform_metadata_file_path.exists():
-        with transform_metadata_file_path.open("r") as transform_metadata_file:
-            transform_metadata = json.load(transform_metadata_file)
+        transform_metadata = read_json(transform_metadata_file_path)
     else:
         logger.error(f"Transform metadata not found for {pipeline_metadata.source}...")
         transform_metadata = {"Transform metadata not found."}
@@ -563,8 +707,7 @@ def generate_graph_metadata(pipeline_metadata: PipelineMetadata):
         file_type=IngestFileType.NORMALIZATION_METADATA_FILE, pipeline_metadata=pipeline_metadata
     )
     if normalization_metadata_path.exists():
-        with normalization_metadata_path.open("r") as normalization_metadata_file:
-            normalization_metadata = json.load(normalization_metadata_file)
+        normalization_metadata = read_json(normalization_metadata_path)
     else:
         logger.error(f"Normalization metadata not found for {pipeline_metadata.source}...")
         normalization_metadata = {"Normalization metadata not found."}
@@ -572,15 +715,16 @@ def generate_graph_metadata(pipeline_metadata: PipelineMetadata):
         file_type=IngestFileType.MERGE_METADATA_FILE, pipeline_metadata=pipeline_metadata
     )
     if merge_metadata_path.exists():
-        with merge_metadata_path.open("r") as merge_metadata_file:
-            merge_metadata = json.load(merge_metadata_file)
+        merge_metadata = read_json(merge_metadata_path)
     else:
         logger.error(f"Merge metadata not found for {pipeline_metadata.source}...")
         merge_metadata = {"Merge metadata not found."}
     ingest_metadata = {
         "transform": transform_metadata,
         "normalization": normalization_metadata,
-        "merge": merge_metadata
+        "merge": merge_metadata,
+        # resource usage of the stages run by this process, the graph metadata stage itself is only in metrics.jsonl
+        "telemetry": [metrics.to_dict() for metrics in get_stage_metrics(pipeline_metadata.source)],
     }
     write_ingest_file(file_type=IngestFileType.INGEST_METADATA_FILE,
                       pipeline_metadata=pipeline_metadata,
@@ -595,8 +739,7 @@ def is_latest_build_metadata_current(pipeline_metadata: PipelineMetadata):
                                                      pipeline_metadata=pipeline_metadata)
     if not build_metadata_path.exists():
         return False
-    with build_metadata_path.open("r") as latest_build_file:
-        latest_build_metadata = PipelineMetadata.from_dict(json.load(latest_build_file))
+    latest_build_metadata = PipelineMetadata.from_dict(read_json(build_metadata_path))
     return pipeline_metadata.build_version == latest_build_metadata.build_version
 
 
@@ -607,19 +750,89 @@ def generate_latest_build_metadata(pipeline_metadata: PipelineMetadata):
                       data=pipeline_metadata.get_release_metadata())
 
 
-def run_pipeline(source: str, transform_only: bool = False, overwrite: bool = False):
+def get_current_normalization_service_versions() -> tuple[str, str]:
+    """Get the Babel and Node Normalizer versions currently served by the Node Normalizer.
+
+    These are the values ORION's get_current_babel_version() and get_current_node_norm_version() return,
+    retrieved without importing ORION.
+    """
+    with create_pooled_session(1, retries=NODE_NORMALIZATION_STATUS_RETRIES) as session:
+        status_response = session.get(f"{NODE_NORMALIZATION_URL}/status", timeout=NODE_NORMALIZATION_STATUS_TIMEOUT)
+        status_response.raise_for_status()
+        openapi_response = session.get(f"{NODE_NORMALIZATION_URL}/openapi.json",
+                                       timeout=NODE_NORMALIZATION_STATUS_TIMEOUT)
+        openapi_response.raise_for_status()
+    return status_response.json()["babel_version"], openapi_response.json()["info"]["version"]
+
+
+# Check whether the latest build of a source is still current, so that a pipeline run can skip every stage without
+# loading koza, ORION or the Biolink Model. A build is current when it was produced from the same source version,
+# transform code, ORION package, Biolink Model and Node Normalizer versions and normalization settings as this run,
+# and its validation report and graph metadata are still present.
+def is_build_current(pipeline_metadata: PipelineMetadata) -> bool:
+    build_metadata_path = get_versioned_file_paths(IngestFileType.LATEST_BUILD_FILE,
+                                                     pipeline_metadata=pipeline_metadata)
+    if not build_metadata_path.exists():
+        return False
+    latest_build = PipelineMetadata.from_dict(read_json(build_metadata_path))
+
+    if not (
+        latest_build.source_version == pipeline_metadata.source_version
+        and latest_build.transform_version == pipeline_metadata.transform_version
+        and latest_build.orion_version == version(ORION_DISTRIBUTION)
+        and latest_build.biolink_version == get_biolink_snapshot().get_model_version()
+        and latest_build.normalization_conflation == pipeline_metadata.normalization_conflation
+        and latest_build.normalization_strict == NORMALIZATION_STRICT_OVERRIDES.get(pipeline_metadata.source, True)
+    ):
+        return False
+
+    try:
+        babel_version, node_normalizer_version = get_current_normalization_service_versions()
+    except requests.RequestException as e:
+        logger.warning(f"Could not retrieve the current Node Normalizer versions: {e}")
+        return False
+    if (latest_build.babel_version, latest_build.node_normalizer_version) != (babel_version, node_normalizer_version):
+        return False
+
+    return is_validation_complete(latest_build) and is_graph_metadata_complete(latest_build)
+
+
+@contextmanager
+def pipeline_stage(stage: str, source: str, profile: str | None = None,
+                   profile_mode: ProfileMode = ProfileMode.SAMPLING):
+    """Run a pipeline stage with stage metrics, and under the profiler if it is the stage being profiled."""
+    with stage_metrics(stage, source=source):
+        if stage != profile:
+            yield
+            return
+        # the koza hooks only run during the transform, so only then are they broken down in the profile summary
+        hook_functions = get_koza_hook_functions(get_ingest_module(source)) if stage == "transform" else []
+        with profile_stage(stage, source=source, mode=profile_mode, hook_functions=hook_functions):
+            yield
+
+
+def run_pipeline(source: str, transform_only: bool = False, overwrite: bool = False, profile: str | None = None,
+                 profile_mode: ProfileMode = ProfileMode.SAMPLING, fused: bool = False):
     source_version = get_latest_source_version(source)
     pipeline_metadata: PipelineMetadata = PipelineMetadata(source, source_version=source_version)
-    Path.mkdir(get_output_directory(pipeline_metadata), parents=True, exist_ok=True)
 
-    # Download the source data
-    download(pipeline_metadata)
-
-    # Transform the source data into KGX files if needed
     # Transform version is auto-computed as a content hash of the ingest's source files
     # Set transform_version before load_koza_config since it uses get_transform_directory
     pipeline_metadata.transform_version = get_transform_version(source)
 
+    # If nothing changed since the latest build, there is nothing to do
+    if not (transform_only or overwrite) and is_build_current(pipeline_metadata):
+        logger.info(f"Latest build for {source} ({source_version}) is current, "
+                    f"transform: {pipeline_metadata.transform_version}. Nothing to do.")
+        return
+
+    Path.mkdir(get_output_directory(pipeline_metadata), parents=True, exist_ok=True)
+
+    # Download the source data
+    with pipeline_stage("download", source, profile, profile_mode):
+        download(pipeline_metadata)
+
+    # Transform the source data into KGX files if needed
     # Load koza config early to get max_edge_count for all pipeline stages
     load_koza_config(source, pipeline_metadata)
     if is_transform_complete(pipeline_metadata) and not overwrite:
@@ -628,20 +841,17 @@ def run_pipeline(source: str, transform_only: bool = False, overwrite: bool = Fa
             f"transform: {pipeline_metadata.transform_version}"
         )
     else:
-        transform(pipeline_metadata)
+        # a fused transform normalizes what it writes as it goes, which needs the normalization settings up front
+        fused = fused and not transform_only
+        if fused:
+            load_normalization_settings(pipeline_metadata)
+        with pipeline_stage("transform", source, profile, profile_mode):
+            transform(pipeline_metadata, resume=not overwrite, fused=fused)
     if transform_only:
         return
 
     # Normalize the post-transform KGX files
-    # Note - ORION can use the biolink model to map predicates during normalization, but we decided not to do that.
-    # Here we still need the biolink model version populated before normalization so metadata outputs are
-    # consistent.
-    pipeline_metadata.biolink_version = get_current_biolink_version()
-    pipeline_metadata.babel_version = get_current_babel_version()
-    pipeline_metadata.node_normalizer_version = get_current_node_norm_version()
-    pipeline_metadata.normalization_code_version = NORMALIZATION_CODE_VERSION
-    pipeline_metadata.normalization_conflation = True
-    pipeline_metadata.normalization_strict = NORMALIZATION_STRICT_OVERRIDES.get(source, True)
+    load_normalization_settings(pipeline_metadata)
     # Now pipeline_metadata has everything it needs to check if the currently desired normalization is done already,
     # and settings to provide to the normalization stage.
     if is_normalization_complete(pipeline_metadata) and not overwrite:
@@ -650,21 +860,25 @@ def run_pipeline(source: str, transform_only: bool = False, overwrite: bool = Fa
             f"normalization: {pipeline_metadata.get_composite_normalization_version()}"
         )
     else:
-        normalize(pipeline_metadata)
+        with pipeline_stage("normalize", source, profile, profile_mode):
+            normalize(pipeline_metadata)
 
     # Merge entities in post-normalization KGX files
-    pipeline_metadata.merging_code_version = MERGING_CODE_VERSION
+    load_merging_settings(pipeline_metadata)
     if is_merge_complete(pipeline_metadata) and not overwrite:
         logger.info(f"Merge already done for {pipeline_metadata.source}...")
     else:
-        merge(pipeline_metadata)
+        with pipeline_stage("merge", source, profile, profile_mode):
+            merge(pipeline_metadata)
+    compress_stage_kgx_files(pipeline_metadata, IngestFileType.TRANSFORM_KGX_FILES, IngestFileType.NORMALIZED_KGX_FILES)
 
     # Validate the post-normalization files
     if is_validation_complete(pipeline_metadata) and not overwrite:
         logger.info(f"Validation already done for {pipeline_metadata.source} ({pipeline_metadata.source_version}), "
                     f"biolink: {pipeline_metadata.biolink_version}")
     else:
-        validate(pipeline_metadata)
+        with pipeline_stage("validate", source, profile, profile_mode):
+            validate(pipeline_metadata)
 
     passed = get_validation_result(pipeline_metadata)
     if not passed:
@@ -678,7 +892,9 @@ def run_pipeline(source: str, transform_only: bool = False, overwrite: bool = Fa
             f"Graph metadata already completed for {pipeline_metadata.source} ({pipeline_metadata.source_version})."
         )
     else:
-        generate_graph_metadata(pipeline_metadata)
+        with pipeline_stage("graph_metadata", source, profile, profile_mode):
+            generate_graph_metadata(pipeline_metadata)
+    compress_stage_kgx_files(pipeline_metadata, IngestFileType.MERGED_KGX_FILES)
 
     if is_latest_build_metadata_current(pipeline_metadata) and not overwrite:
         logger.info(f"Latest build metadata already up to date for {pipeline_metadata.source}, "
@@ -691,9 +907,18 @@ def run_pipeline(source: str, transform_only: bool = False, overwrite: bool = Fa
 @click.argument("source", type=str)
 @click.option("--transform-only", is_flag=True, help="Only perform the transformation.")
 @click.option("--overwrite", is_flag=True, help="Start fresh and overwrite previously generated files.")
-def main(source, transform_only, overwrite):
-    setup_logging()
-    run_pipeline(source, transform_only=transform_only, overwrite=overwrite)
+@click.option("--profile", type=click.Choice(PIPELINE_STAGES), default=None,
+              help="Profile a stage and write the profile and a hotspot summary to the source's log directory.")
+@click.option("--profile-mode", type=click.Choice([mode.value for mode in ProfileMode]),
+              default=ProfileMode.SAMPLING.value, show_default=True,
+              help="sampling: low overhead, writes flame graph stacks. deterministic: cProfile, exact call counts.")
+@click.option("--fused", is_flag=True,
+              help="Normalize the transform's nodes and edges while it writes them, instead of in a separate stage.")
+def main(source, transform_only, overwrite, profile, profile_mode, fused):
+    # log to logs/{source}/{timestamp}/, which is also where the stage metrics (metrics.jsonl) are written
+    setup_logging(source=source)
+    run_pipeline(source, transform_only=transform_only, overwrite=overwrite, profile=profile,
+                 profile_mode=ProfileMode(profile_mode), fused=fused)
 
 
 if __name__ == "__main__":
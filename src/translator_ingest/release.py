@@ -1,11 +1,13 @@
-import json
 import shutil
 import tarfile
+import tempfile
 import click
 import zstandard as zstd
 from pathlib import Path
 
 from translator_ingest import INGESTS_RELEASES_PATH, INGESTS_RELEASES_URL
+from translator_ingest.util.compression import is_zstd_file, open_file
+from translator_ingest.util.jsonio import read_json, write_json
 from translator_ingest.util.metadata import PipelineMetadata, next_release_version, current_iso_date
 from translator_ingest.util.storage.local import get_versioned_file_paths, IngestFileType, write_ingest_file
 from translator_ingest.util.logging_utils import get_logger, setup_logging
@@ -56,12 +58,27 @@ def create_compressed_tar(nodes_file: Path,
     with open(output_path, 'wb') as fh:
         with cctx.stream_writer(fh) as compressor:
             with tarfile.open(fileobj=compressor, mode='w|') as tar:
-                tar.add(nodes_file, arcname="nodes.jsonl")
+                _add_kgx_file_to_tar(tar, nodes_file, arcname="nodes.jsonl")
                 if edges_file.exists():
-                    tar.add(edges_file, arcname="edges.jsonl")
+                    _add_kgx_file_to_tar(tar, edges_file, arcname="edges.jsonl")
                 tar.add(graph_metadata_path, arcname="graph-metadata.json")
 
 
+def _add_kgx_file_to_tar(tar: tarfile.TarFile, kgx_file: Path, arcname: str):
+    """Add a KGX file to a tar archive, decompressed if it is a .zst file, so releases always contain plain jsonl."""
+    if not is_zstd_file(kgx_file):
+        tar.add(kgx_file, arcname=arcname)
+        return
+    # the tar header needs the size up front, so the file is decompressed once to a temporary file next to it
+    with (open_file(kgx_file, "rb") as decompressed_file,
+          tempfile.TemporaryFile(dir=kgx_file.parent) as plain_file):
+        shutil.copyfileobj(decompressed_file, plain_file, 1024 * 1024)
+        tar_info = tar.gettarinfo(kgx_file, arcname=arcname)
+        tar_info.size = plain_file.tell()
+        plain_file.seek(0)
+        tar.addfile(tar_info, plain_file)
+
+
 def update_graph_metadata_for_release(source_graph_metadata_path: Path,
                                       release_dir: Path,
                                       release_url: str) -> Path:
@@ -78,15 +95,13 @@ def update_graph_metadata_for_release(source_graph_metadata_path: Path,
     Returns:
         Path to the updated graph-metadata.json in the release directory
     """
-    with open(source_graph_metadata_path, 'r') as f:
-        graph_metadata = json.load(f)
+    graph_metadata = read_json(source_graph_metadata_path)
 
     graph_metadata['@id'] = release_url
     graph_metadata['url'] = release_url
 
     output_path = release_dir / "graph-metadata.json"
-    with open(output_path, 'w') as f:
-        json.dump(graph_metadata, f, indent=2)
+    write_json(output_path, graph_metadata)
 
     logger.info(f"Updated graph-metadata.json with release URL: {release_url}")
     return output_path
@@ -101,9 +116,8 @@ def release_ingest(source: str):
     if not latest_build_metadata_file_path.exists():
         logger.info(f"No latest build metadata found for {source}, can not make a release.")
         return
-    with open(latest_build_metadata_file_path, 'r') as f:
-        latest_build_metadata = PipelineMetadata.from_dict(json.load(f))
-        latest_build = latest_build_metadata.build_version
+    latest_build_metadata = PipelineMetadata.from_dict(read_json(latest_build_metadata_file_path))
+    latest_build = latest_build_metadata.build_version
 
     # Locate and read the latest release metadata for the source
     latest_release_metadata_file_path = get_versioned_file_paths(
@@ -112,14 +126,13 @@ def release_ingest(source: str):
     )
     previous_release_version = None
     if latest_release_metadata_file_path.exists():
-        with open(latest_release_metadata_file_path, 'r') as f:
-            latest_release_metadata = PipelineMetadata.from_dict(json.load(f))
-            latest_released_build = latest_release_metadata.build_version
-            previous_release_version = latest_release_metadata.release_version
-            # if the latest release is already of the latest build, no need to do anything
-            if latest_released_build == latest_build:
-                logger.info(f"Release already current for {source}.")
-                return
+        latest_release_metadata = PipelineMetadata.from_dict(read_json(latest_release_metadata_file_path))
+        latest_released_build = latest_release_metadata.build_version
+        previous_release_version = latest_release_metadata.release_version
+        # if the latest release is already of the latest build, no need to do anything
+        if latest_released_build == latest_build:
+            logger.info(f"Release already current for {source}.")
+            return
 
     # Get all the file paths for the relevant files
     nodes_file_path, edges_file_path = get_versioned_file_paths(IngestFileType.MERGED_KGX_FILES, latest_build_metadata)
@@ -217,15 +230,13 @@ def generate_release_summary():
         )
 
         if latest_release_path.exists():
-            with open(latest_release_path, 'r') as f:
-                summary[source] = json.load(f)
+            summary[source] = read_json(latest_release_path)
         else:
             summary[source] = None
             logger.info(f"No latest release metadata found for {source}")
 
     summary_path = releases_path / "latest-release-summary.json"
-    with open(summary_path, 'w') as f:
-        json.dump(summary, f, indent=2)
+    write_json(summary_path, summary)
 
     logger.info("Release summary updated.")
 
@@ -5,10 +5,12 @@ from importlib.resources import files
 
 from linkml_runtime.utils.schemaview import SchemaView
 
-from biolink_model.datamodel.pydanticmodel_v2 import RetrievalSource, ResourceRoleEnum
+from biolink_model.datamodel import pydanticmodel_v2
+from biolink_model.datamodel.pydanticmodel_v2 import NamedThing, RetrievalSource, ResourceRoleEnum
 
 from bmt import Toolkit
 
+from translator_ingest.util.biolink_snapshot import get_biolink_snapshot
 from translator_ingest.util.logging_utils import get_logger
 logger = get_logger(__name__)
 
@@ -90,6 +92,59 @@ def get_biolink_model_toolkit() -> Toolkit:
     return Toolkit(schema=get_biolink_schema().schema)
 
 
+#
+# Memoized Biolink Model queries for the per-record code of ingests, to use instead of Toolkit methods.
+# They are answered from the precomputed closures of the Biolink snapshot (see biolink_snapshot.py),
+# and their results are cached, so repeated queries about the same element are dictionary lookups.
+#
+BIOLINK_QUERY_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=BIOLINK_QUERY_CACHE_SIZE)
+def get_biolink_ancestors(name: str, mixin: bool = True, formatted: bool = False) -> frozenset[str]:
+    """Ancestors of a Biolink class or slot (name, alias or CURIE), including itself; empty if it is unknown."""
+    return frozenset(get_biolink_snapshot().get_ancestors(name, mixin=mixin, formatted=formatted))
+
+
+@lru_cache(maxsize=BIOLINK_QUERY_CACHE_SIZE)
+def get_biolink_descendants(name: str, mixin: bool = True, formatted: bool = False) -> frozenset[str]:
+    """Descendants of a Biolink class or slot (name, alias or CURIE), including itself.
+
+    Raises ValueError if it is unknown, like Toolkit.get_descendants.
+    """
+    return frozenset(get_biolink_snapshot().get_descendants(name, mixin=mixin, formatted=formatted))
+
+
+@lru_cache(maxsize=BIOLINK_QUERY_CACHE_SIZE)
+def get_biolink_element_by_mapping(identifier: str, formatted: bool = False) -> Optional[str]:
+    """The Biolink element mapped to an external identifier (e.g. 'STY:T047'), like Toolkit.get_element_by_mapping."""
+    return get_biolink_snapshot().get_element_by_mapping(identifier, formatted=formatted)
+
+
+@lru_cache(maxsize=BIOLINK_QUERY_CACHE_SIZE)
+def _get_biolink_class(categories: tuple[str, ...]) -> Optional[type[NamedThing]]:
+    category = get_biolink_snapshot().get_most_specific_category(list(categories))
+    return getattr(pydanticmodel_v2, category.removeprefix("biolink:"), None)
+
+
+def get_biolink_node_class(node_id: str, categories: list[str]) -> type[NamedThing]:
+    """Most specific Biolink Model Pydantic class for the categories of a node, like bmt.pydantic.get_node_class.
+
+    Defaults to NamedThing for nodes without categories, or without a Pydantic class for their categories.
+    """
+    if not categories:
+        logger.warning(f"Node with id {node_id} has empty categories; defaulting to 'biolink:NamedThing'")
+        return NamedThing
+    node_class = _get_biolink_class(tuple(categories))
+    if node_class is None:
+        logger.warning(
+            f"No Biolink Model class found for categories {categories},"
+            f" for node with id {node_id}; defaulting to 'biolink:NamedThing'"
+        )
+        return NamedThing
+    return node_class
+
+
 def parse_attributes(attributes: Optional[dict]) -> Optional[dict]:
     return (
         attributes
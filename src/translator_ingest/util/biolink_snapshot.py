@@ -0,0 +1,393 @@
+"""Precomputed, pickled snapshot of the Biolink Model for fast startup.
+
+Building a LinkML ``SchemaView`` from the Biolink Model YAML (``util.biolink.get_biolink_schema``)
+and a bmt ``Toolkit`` on top of it takes several seconds, and every process pays that cost
+again: ingest modules that consult the model at import time (cohd, icees) as well as every
+transform or validation worker. The bmt ``Toolkit`` also fetches its predicate map over the
+network when it is constructed.
+
+This module flattens everything the ingests ask of the model - element records (is_a,
+mixins, id_prefixes, slot domain/range, mappings), reflexive ancestor and descendant
+closures, CURIE formatting and name resolution - into plain dicts and tuples. The snapshot
+is built once per Biolink Model version, pickled under the ingest cache directory and loaded
+in milliseconds afterwards, without importing LinkML or bmt at all.
+
+``BiolinkSnapshot`` answers the subset of the bmt ``Toolkit`` API used in this repository
+with the same semantics, so it can stand in for the toolkit:
+
+    >>> snapshot = get_biolink_snapshot()
+    >>> "gene or gene product" in snapshot.get_ancestors("biolink:Gene")
+    True
+    >>> snapshot.get_most_specific_category(["biolink:NamedThing", "biolink:Gene"])
+    'biolink:Gene'
+"""
+
+import os
+import pickle
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+from translator_ingest import INGESTS_CACHE_PATH
+from translator_ingest.util.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# bump whenever the layout of BiolinkSnapshot or BiolinkElement changes,
+# so that stale pickles written by older code are rebuilt rather than loaded
+SNAPSHOT_FORMAT_VERSION = 1
+
+BIOLINK_SNAPSHOT_PATH = INGESTS_CACHE_PATH / "biolink"
+
+NAMED_THING = "named thing"
+
+_CLASS = "class"
+_SLOT = "slot"
+
+
+@dataclass(frozen=True, slots=True)
+class BiolinkElement:
+    """The attributes of a Biolink Model element that the ingests look up."""
+
+    name: str
+    curie: str
+    element_type: str  # 'class', 'slot', 'type', 'enum' or 'subset'
+    is_a: str | None = None
+    mixin: bool = False
+    abstract: bool = False
+    mixins: tuple[str, ...] = ()
+    id_prefixes: tuple[str, ...] = ()
+    domain: str | None = None
+    range: str | None = None
+    uri: str | None = None
+    aliases: tuple[str, ...] = ()
+    mappings: tuple[str, ...] = ()
+
+    @property
+    def class_uri(self) -> str | None:
+        return self.uri if self.element_type == _CLASS else None
+
+    @property
+    def slot_uri(self) -> str | None:
+        return self.uri if self.element_type == _SLOT else None
+
+
+def _normalize_name(name: str) -> str:
+    name = name.removeprefix("biolink:")
+    return name.lower().replace(" ", "").replace("_", "")
+
+
+class BiolinkSnapshot:
+    """Read-only, picklable view of one version of the Biolink Model.
+
+    Method names and defaults mirror ``bmt.Toolkit``; elements may be given by name,
+    alias or Biolink CURIE (e.g. 'gene', 'Gene' or 'biolink:Gene').
+    """
+
+    def __init__(
+        self,
+        biolink_version: str,
+        elements: dict[str, BiolinkElement],
+        ancestors: dict[tuple[str, bool], tuple[str, ...]],
+        descendants: dict[tuple[str, bool], tuple[str, ...]],
+        class_names: tuple[str, ...],
+        mapping_index: dict[str, tuple[str, ...]],
+    ):
+        self.format_version = SNAPSHOT_FORMAT_VERSION
+        self.biolink_version = biolink_version
+        self.elements = elements
+        self.class_names = class_names
+        # reflexive closures keyed by (element name, include mixins)
+        self._ancestors = ancestors
+        self._descendants = descendants
+        # mapping CURIE -> names of the elements listing it as an exact/close/narrow/broad mapping
+        self._mapping_index = mapping_index
+        self._names: dict[str, str] = {}
+        self._aliases: dict[str, str] = {}
+        self._normalized_names: dict[str, str] = {}
+        for element in elements.values():
+            for key in (element.curie, element.curie.removeprefix("biolink:"), element.name.replace(" ", "_")):
+                self._names.setdefault(key, element.name)
+            for alias in element.aliases:
+                self._aliases[alias] = element.name
+            self._normalized_names[_normalize_name(element.name)] = element.name
+
+    # ──── Element lookup ─────────────────────────────────────────────────────
+
+    def _resolve(self, name: str) -> str | None:
+        if name in self.elements:
+            return name
+        resolved = self._names.get(name) or self._aliases.get(name) or self._aliases.get(name.replace("_", " "))
+        if resolved is None:
+            resolved = self._normalized_names.get(_normalize_name(name))
+        return resolved
+
+    def get_element(self, name: str) -> BiolinkElement | None:
+        """Element record for a name, alias or CURIE; None if the model does not define it."""
+        resolved = self._resolve(name)
+        return self.elements[resolved] if resolved else None
+
+    def get_model_version(self) -> str:
+        return self.biolink_version
+
+    def get_all_classes(self, formatted: bool = False) -> list[str]:
+        return self._format(self.class_names, formatted)
+
+    def _format(self, names: Iterable[str], formatted: bool) -> list[str]:
+        if formatted:
+            return [self.elements[name].curie for name in names]
+        return list(names)
+
+    # ──── Hierarchy ──────────────────────────────────────────────────────────
+
+    def get_ancestors(
+        self, name: str, reflexive: bool = True, formatted: bool = False, mixin: bool = True
+    ) -> list[str]:
+        """Names of the ancestors of a class or slot, nearest first; empty for unknown elements."""
+        resolved = self._resolve(name)
+        if resolved is None:
+            return []
+        ancestors = self._ancestors.get((resolved, mixin), ())
+        if not reflexive:
+            ancestors = (ancestor for ancestor in ancestors if ancestor != resolved)
+        return self._format(ancestors, formatted)
+
+    def get_descendants(
+        self, name: str, reflexive: bool = True, formatted: bool = False, mixin: bool = True
+    ) -> list[str]:
+        """Names of the descendants of a class or slot; raises ValueError for unknown elements."""
+        resolved = self._resolve(name)
+        if resolved is None:
+            raise ValueError("not a valid biolink component")
+        descendants = self._descendants.get((resolved, mixin), ())
+        if not reflexive:
+            descendants = (descendant for descendant in descendants if descendant != resolved)
+        return self._format(descendants, formatted)
+
+    def get_parent(self, name: str, formatted: bool = False) -> str | None:
+        element = self.get_element(name)
+        if element is None or element.is_a is None:
+            return None
+        return self.elements[element.is_a].curie if formatted else element.is_a
+
+    def get_element_depth(self, name: str) -> int:
+        """Number of is_a steps from an element up to the root of its hierarchy."""
+        depth = 0
+        parent = self.get_parent(name)
+        while parent:
+            depth += 1
+            parent = self.get_parent(parent)
+        return depth
+
+    def is_category(self, name: str, mixin: bool = True) -> bool:
+        return NAMED_THING in self.get_ancestors(name, mixin=mixin)
+
+    def get_most_specific_category(self, category_list: list[str], formatted: bool = True) -> str:
+        """Deepest category in the list, ignoring names that are not Biolink categories.
+
+        Falls back to 'named thing' when no valid category is given.
+        """
+        categories = [name for name in category_list if self.is_category(name)]
+        category = max(categories, key=self.get_element_depth) if categories else NAMED_THING
+        return self.get_element(category).curie if formatted else category
+
+    # ──── Mappings ───────────────────────────────────────────────────────────
+
+    def get_all_elements_by_mapping(self, identifier: str, formatted: bool = False) -> list[str]:
+        return self._format(self._mapping_index.get(identifier, ()), formatted)
+
+    def get_element_by_mapping(self, identifier: str, formatted: bool = False, mixin: bool = True) -> str | None:
+        """The element mapped to an external identifier (e.g. 'STY:T047').
+
+        If several elements list the identifier among their mappings,
+        their most specific common ancestor among those elements is returned.
+        """
+        mappings = self._mapping_index.get(identifier)
+        if not mappings:
+            return None
+        ancestor_lists = [
+            [ancestor for ancestor in reversed(self.get_ancestors(name, mixin=mixin)) if ancestor in mappings]
+            for name in mappings
+        ]
+        ancestor_lists = [ancestors for ancestors in ancestor_lists if ancestors]
+        if not ancestor_lists:
+            return None
+        common_ancestors = set(ancestor_lists[0]).intersection(*ancestor_lists[1:])
+        for ancestor in ancestor_lists[0]:
+            if ancestor in common_ancestors:
+                return self.elements[ancestor].curie if formatted else ancestor
+        return None
+
+    # ──── Pydantic classes ───────────────────────────────────────────────────
+
+    def get_node_class(self, node_id: str, categories: list[str]) -> type:
+        """Most specific Biolink Model Pydantic class for a node's categories.
+
+        Equivalent to ``bmt.pydantic.get_node_class``, which builds a networked Toolkit on import.
+        """
+        import biolink_model.datamodel.pydanticmodel_v2 as pyd
+
+        if not categories:
+            logger.warning(f"Node with id {node_id} has empty categories; defaulting to 'biolink:NamedThing'")
+            return pyd.NamedThing
+        category = self.get_most_specific_category(categories).replace("biolink:", "")
+        node_class = getattr(pyd, category, None)
+        if node_class is None:
+            logger.warning(
+                f"No Biolink Model class found for category '{category}',"
+                f" for node with id {node_id}; defaulting to 'biolink:NamedThing'"
+            )
+            return pyd.NamedThing
+        return node_class
+
+
+# ──── Building and caching ───────────────────────────────────────────────────
+
+
+def _without_secondary_slots(names: list[str], secondary_slots: set[str]) -> tuple[str, ...]:
+    # like bmt's Toolkit._filter_secondary: drop slot_usage artifacts, which are slots carrying an alias
+    return tuple(str(name) for name in names if name not in secondary_slots)
+
+
+def _string(value: Any) -> str | None:
+    return None if value is None else str(value)
+
+
+def _strings(values: Iterable[Any]) -> tuple[str, ...]:
+    return tuple(str(value) for value in values)
+
+
+def build_biolink_snapshot(schema_view: Any = None) -> BiolinkSnapshot:
+    """Flatten a Biolink Model ``SchemaView`` (the project schema by default) into a snapshot."""
+    from bmt.utils import format_element
+    from linkml_runtime.linkml_model.meta import (
+        ClassDefinition,
+        EnumDefinition,
+        SlotDefinition,
+        SubsetDefinition,
+        TypeDefinition,
+    )
+
+    if schema_view is None:
+        from translator_ingest.util.biolink import get_biolink_schema
+
+        schema_view = get_biolink_schema()
+
+    element_types = [
+        (ClassDefinition, _CLASS),
+        (SlotDefinition, _SLOT),
+        (TypeDefinition, "type"),
+        (EnumDefinition, "enum"),
+        (SubsetDefinition, "subset"),
+    ]
+    elements: dict[str, BiolinkElement] = {}
+    secondary_slots: set[str] = set()
+    mapping_index: dict[str, list[str]] = {}
+    for name, definition in schema_view.all_elements().items():
+        # LinkML names and CURIEs are str subclasses; store plain strings so that
+        # unpickling the snapshot does not have to import linkml_runtime
+        name = str(name)
+        element_type = next(label for cls, label in element_types if isinstance(definition, cls))
+        curie = format_element(definition)
+        uri = getattr(definition, "class_uri", None) or getattr(definition, "slot_uri", None)
+        mappings = _strings(
+            [
+                *getattr(definition, "exact_mappings", []),
+                *getattr(definition, "close_mappings", []),
+                *getattr(definition, "narrow_mappings", []),
+                *getattr(definition, "broad_mappings", []),
+            ]
+        )
+        is_slot = element_type == _SLOT
+        if is_slot and definition.alias:
+            secondary_slots.add(name)
+        elements[name] = BiolinkElement(
+            name=name,
+            curie=curie,
+            element_type=element_type,
+            is_a=_string(getattr(definition, "is_a", None)),
+            mixin=bool(getattr(definition, "mixin", False)),
+            abstract=bool(getattr(definition, "abstract", False)),
+            mixins=_strings(getattr(definition, "mixins", [])),
+            id_prefixes=_strings(getattr(definition, "id_prefixes", [])),
+            domain=_string(definition.domain) if is_slot else None,
+            range=_string(definition.range) if is_slot else None,
+            uri=_string(uri) or (curie if element_type in (_CLASS, _SLOT) else None),
+            aliases=_strings(getattr(definition, "aliases", [])),
+            mappings=mappings,
+        )
+        for mapping in dict.fromkeys(mappings):
+            mapping_index.setdefault(mapping, []).append(name)
+
+    ancestors: dict[tuple[str, bool], tuple[str, ...]] = {}
+    descendants: dict[tuple[str, bool], tuple[str, ...]] = {}
+    for name, element in elements.items():
+        for mixin in (True, False):
+            if element.element_type == _CLASS:
+                ancestors[name, mixin] = _strings(schema_view.class_ancestors(name, mixins=mixin, reflexive=True))
+                descendants[name, mixin] = _strings(schema_view.class_descendants(name, mixins=mixin, reflexive=True))
+            elif element.element_type == _SLOT:
+                ancestors[name, mixin] = _without_secondary_slots(
+                    schema_view.slot_ancestors(name, mixins=mixin, reflexive=True), secondary_slots
+                )
+                descendants[name, mixin] = _without_secondary_slots(
+                    schema_view.slot_descendants(name, mixins=mixin, reflexive=True), secondary_slots
+                )
+
+    return BiolinkSnapshot(
+        biolink_version=str(schema_view.schema.version),
+        elements=elements,
+        ancestors=ancestors,
+        descendants=descendants,
+        class_names=_strings(schema_view.schema.classes),
+        mapping_index={mapping: tuple(names) for mapping, names in mapping_index.items()},
+    )
+
+
+def get_biolink_snapshot_path(biolink_version: str, cache_dir: Path | None = None) -> Path:
+    cache_dir = Path(cache_dir) if cache_dir else BIOLINK_SNAPSHOT_PATH
+    return cache_dir / f"biolink-{biolink_version}.v{SNAPSHOT_FORMAT_VERSION}.pickle"
+
+
+def save_biolink_snapshot(snapshot: BiolinkSnapshot, snapshot_path: Path) -> Path:
+    """Pickle a snapshot, writing to a temporary file first so concurrent readers never see a partial file."""
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.tmp")
+    with open(temp_path, "wb") as snapshot_file:
+        pickle.dump(snapshot, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+    temp_path.replace(snapshot_path)
+    return snapshot_path
+
+
+def load_biolink_snapshot(snapshot_path: Path) -> BiolinkSnapshot | None:
+    """Load a pickled snapshot; None if it is missing, unreadable or of an older format."""
+    try:
+        with open(snapshot_path, "rb") as snapshot_file:
+            snapshot = pickle.load(snapshot_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError, AttributeError) as e:
+        logger.warning(f"Ignoring unreadable Biolink snapshot {snapshot_path}: {e}")
+        return None
+    if not isinstance(snapshot, BiolinkSnapshot) or snapshot.format_version != SNAPSHOT_FORMAT_VERSION:
+        return None
+    return snapshot
+
+
+@lru_cache(maxsize=1)
+def get_biolink_snapshot() -> BiolinkSnapshot:
+    """Get the Biolink snapshot of the installed biolink-model version, building and caching it on first use."""
+    snapshot_path = get_biolink_snapshot_path(version("biolink-model"))
+    snapshot = load_biolink_snapshot(snapshot_path)
+    if snapshot is None:
+        logger.info(f"Building Biolink snapshot {snapshot_path.name}...")
+        snapshot = build_biolink_snapshot()
+        try:
+            save_biolink_snapshot(snapshot, snapshot_path)
+        except OSError as e:
+            logger.warning(f"Could not cache Biolink snapshot at {snapshot_path}: {e}")
+    return snapshot
+
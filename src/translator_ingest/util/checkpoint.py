@@ -0,0 +1,280 @@
+"""Checkpointing of transforms, so a transform which dies after hours resumes where it was instead of from scratch.
+
+``run_checkpointed`` runs a koza runner as ``KozaRunner.run`` does, with its ``DeduplicatingJSONLWriter`` writing
+the nodes and edges as numbered segments (see util/transform_writer.py). Every ``TRANSFORM_CHECKPOINT_RECORDS``
+records, and at the end of each reader tag, the segment is closed and a checkpoint is saved next to the output:
+
+- the reader tags which are complete, and the position in the tag being transformed,
+- ``koza.state`` and ``koza.transform_metadata`` of that tag, and the ``transform_metadata`` of the complete ones,
+- the counts and node digests of the writer.
+
+When the transform runs again after a failure, the complete tags are replayed without writing anything, and the tag
+being transformed continues from the checkpoint, writing after the last complete segment. The segments are
+concatenated into the nodes and edges files once all the tags are done, and the checkpoint is removed:
+
+    >>> run_checkpointed(runner, checkpoint_dir=transform_output_dir)
+
+The complete tags are replayed rather than skipped as each tag has its own ``koza.state``, so tags can only share
+state through their module, e.g. icees keeps the nodes of its ``nodes`` tag to look the subjects and objects of its
+``edges`` tag up in. Their ``transform_metadata`` is the checkpoint's.
+
+How the tag being transformed continues depends on its transform:
+
+- ``@koza.transform_record`` functions are not called for the records before the position, which are read and
+  skipped, and ``koza.state`` is restored after the ``on_data_begin`` hooks. State entries which can't be pickled,
+  e.g. database connections and node registries, are not saved; the ``on_data_begin`` hooks recreate them.
+- A ``@koza.transform`` function keeps its state in the generator, which can't be saved, so the generator runs from
+  the start of the tag again and the position counts its results: nothing is written until it is past the results
+  the segments already hold.
+
+State within a tag must be kept in ``koza.state`` rather than in its module, as the records before the position of a
+``@koza.transform_record`` tag are skipped.
+
+Either way, resuming relies on the records of a tag coming in the same order on every run, as the ones before the
+position are skipped by count. Koza's readers read files in order, but the rows of a ``@koza.prepare_data`` query
+(DuckDB, SQL, ...) must be sorted with an ``ORDER BY`` which orders them completely: without one, the database may
+return them in any order (e.g. after a ``GROUP BY`` or ``DISTINCT``, or from a parallel scan), and a resumed tag would
+skip records it never transformed and transform others twice.
+
+Set ``TRANSFORM_CHECKPOINT_RECORDS=0`` to run transforms without checkpoints.
+"""
+
+import os
+import pickle
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from koza.model.graphs import KnowledgeGraph
+from koza.transform import KozaTransform
+from koza.utils.exceptions import NoTransformException
+
+from translator_ingest.util.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# records (results of a @koza.transform function) between checkpoints, 0 to disable checkpointing
+TRANSFORM_CHECKPOINT_RECORDS = int(os.environ.get("TRANSFORM_CHECKPOINT_RECORDS", "1000000"))
+
+CHECKPOINT_FILE_NAME = "transform-checkpoint.pickle"
+SEGMENTS_DIR_NAME = ".segments"
+
+
+def is_checkpointing_enabled() -> bool:
+    return TRANSFORM_CHECKPOINT_RECORDS > 0
+
+
+@dataclass
+class TransformCheckpoint:
+    """Where a transform is, as of the last segment it completed."""
+
+    tags: list[str | None]
+    completed_tags: list[str | None] = field(default_factory=list)
+    # records of the current tag (the one after the completed tags) transformed into the complete segments
+    position: int = 0
+    # pickled entries of koza.state of the current tag, by key
+    state: dict[Any, bytes] = field(default_factory=dict)
+    tag_transform_metadata: dict[str, Any] = field(default_factory=dict)
+    transform_metadata: dict[str, Any] = field(default_factory=dict)
+    writer_state: dict[str, Any] | None = None
+
+
+def load_checkpoint(checkpoint_path: Path) -> TransformCheckpoint | None:
+    if not checkpoint_path.exists():
+        return None
+    with checkpoint_path.open("rb") as checkpoint_file:
+        return pickle.load(checkpoint_file)
+
+
+def save_checkpoint(checkpoint_path: Path, checkpoint: TransformCheckpoint):
+    # written next to the checkpoint first, so a crash while saving leaves the previous one intact
+    partial_path = checkpoint_path.with_name(f"{checkpoint_path.name}.partial")
+    with partial_path.open("wb") as checkpoint_file:
+        pickle.dump(checkpoint, checkpoint_file, protocol=pickle.HIGHEST_PROTOCOL)
+    partial_path.replace(checkpoint_path)
+
+
+def _pickle_state(state: dict[Any, Any]) -> dict[Any, bytes]:
+    pickled_state = {}
+    for key, value in state.items():
+        try:
+            pickled_state[key] = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            logger.debug(f"Not checkpointing koza.state[{key!r}], which can't be pickled")
+    return pickled_state
+
+
+def _write_result(writer, result):
+    if result is None:
+        return
+    if isinstance(result, KnowledgeGraph):
+        writer.write_nodes(result.nodes)
+        writer.write_edges(result.edges)
+    else:
+        writer.write(result)
+
+
+class _DiscardingWriter:
+    """Stands in for the writer of a @koza.transform function while it is replayed up to the checkpoint."""
+
+    def write(self, entities: Iterable):
+        pass
+
+    def write_nodes(self, nodes: Iterable):
+        pass
+
+    def write_edges(self, edges: Iterable):
+        pass
+
+
+def _resumable_checkpoint(checkpoint: TransformCheckpoint | None, tags: list[str | None],
+                          segments_dir: Path) -> TransformCheckpoint | None:
+    if checkpoint is None:
+        return None
+    if checkpoint.tags != tags:
+        logger.warning(f"Ignoring the transform checkpoint of reader tags {checkpoint.tags}, not {tags}")
+        return None
+    if checkpoint.writer_state["segment"] and not segments_dir.exists():
+        logger.warning(f"Ignoring the transform checkpoint, whose segments are missing from {segments_dir}")
+        return None
+    return checkpoint
+
+
+def run_checkpointed(runner, checkpoint_dir: Path, checkpoint_records: int = TRANSFORM_CHECKPOINT_RECORDS):
+    """Run a koza runner with a DeduplicatingJSONLWriter, resuming from the checkpoint in checkpoint_dir if there
+    is one, and saving one every checkpoint_records records.
+
+    The writer must have been created with its segments_dir in checkpoint_dir/SEGMENTS_DIR_NAME.
+    """
+    writer = runner.writer
+    checkpoint_path = checkpoint_dir / CHECKPOINT_FILE_NAME
+    tags = list(runner.data)
+    checkpoint = _resumable_checkpoint(load_checkpoint(checkpoint_path), tags, Path(writer.segments_dir))
+    if checkpoint is None:
+        checkpoint = TransformCheckpoint(tags=tags)
+    else:
+        logger.info(f"Resuming the transform after reader tags {checkpoint.completed_tags} and {checkpoint.position} "
+                    f"records of the next one, from segment {checkpoint.writer_state['segment']}")
+    writer.restore_state(checkpoint.writer_state)
+    runner.transform_metadata.update(checkpoint.transform_metadata)
+
+    mappings = runner.load_mappings()
+    for tag in tags:
+        if tag in checkpoint.completed_tags:
+            logger.info(f"Replaying reader tag {tag}, which was written before the checkpoint, without writing it")
+            _replay_tag(runner, tag, mappings)
+            continue
+        _run_tag_checkpointed(runner, tag, mappings, checkpoint, checkpoint_path, checkpoint_records)
+        checkpoint.completed_tags.append(tag)
+        checkpoint.position = 0
+        checkpoint.state = {}
+        checkpoint.tag_transform_metadata = {}
+        checkpoint.transform_metadata = runner.transform_metadata
+        writer.end_segment()
+        checkpoint.writer_state = writer.get_state()
+        save_checkpoint(checkpoint_path, checkpoint)
+
+    writer.finalize()
+    writer.validate_counts()
+    checkpoint_path.unlink(missing_ok=True)
+    return writer
+
+
+def _get_hooks(runner, tag: str | None):
+    """The hooks of a reader tag, checked as KozaRunner.run_for_tag does."""
+    hooks = runner.hooks_by_tag.get(tag, None)
+    if hooks is None or (not hooks.transform and not hooks.transform_record):
+        raise NoTransformException("Must define one of `@koza.transform` or `@koza.transform_record`")
+    if hooks.transform and hooks.transform_record:
+        raise ValueError("Can only define one of `@koza.transform` or `@koza.transform_record`")
+    if not hooks.transform_record and len(hooks.transform) > 1:
+        raise ValueError("Can only define one `@koza.transform` function")
+    if hooks.prepare_data and len(hooks.prepare_data) > 1:
+        raise ValueError("Can only define one `@koza.prepare_data` function")
+    return hooks
+
+
+def _replay_tag(runner, tag: str | None, mappings):
+    """Run the transform of a reader tag with everything it writes discarded, for the state it leaves behind."""
+    data = runner.data[tag]
+    hooks = _get_hooks(runner, tag)
+    transform = KozaTransform(mappings=mappings,
+                              writer=_DiscardingWriter(),
+                              input_files_dir=runner.input_files_dir,
+                              extra_fields=runner.extra_transform_fields)
+    if hooks.prepare_data:
+        data = hooks.prepare_data[0](transform, data)
+    for fn in hooks.on_data_begin:
+        fn(transform)
+    if hooks.transform:
+        result = hooks.transform[0](transform, data)
+        for _ in result if result is not None else []:
+            pass
+    else:
+        for record in data:
+            for transform_record_fn in hooks.transform_record:
+                transform_record_fn(transform, record)
+    for fn in hooks.on_data_end:
+        fn(transform)
+
+
+def _run_tag_checkpointed(runner, tag: str | None, mappings, checkpoint: TransformCheckpoint, checkpoint_path: Path,
+                          checkpoint_records: int):
+    """Run the transform of a reader tag as KozaRunner.run_for_tag does, from the checkpoint's position in it."""
+    data = runner.data[tag]
+    hooks = _get_hooks(runner, tag)
+
+    writer = runner.writer
+    transform = KozaTransform(mappings=mappings,
+                              writer=writer,
+                              input_files_dir=runner.input_files_dir,
+                              extra_fields=runner.extra_transform_fields)
+    if hooks.prepare_data:
+        data = hooks.prepare_data[0](transform, data)
+    for fn in hooks.on_data_begin:
+        fn(transform)
+
+    def save(position: int):
+        writer.end_segment()
+        checkpoint.position = position
+        if hooks.transform_record:
+            checkpoint.state = _pickle_state(transform.state)
+            checkpoint.tag_transform_metadata = transform.transform_metadata
+        checkpoint.writer_state = writer.get_state()
+        save_checkpoint(checkpoint_path, checkpoint)
+        logger.info(f"Saved a transform checkpoint after {position} records of reader tag {tag}")
+
+    start = checkpoint.position
+    if hooks.transform:
+        result = hooks.transform[0](transform, data)
+        results = iter(result if result is not None else [])
+        if start:
+            # replay the transform up to the checkpoint, without writing what the segments already hold
+            transform.writer = _DiscardingWriter()
+            for _ in islice(results, start):
+                pass
+            transform.writer = writer
+        for position, result in enumerate(results, start=start + 1):
+            # a KnowledgeGraph, or an entity
+            _write_result(writer, result if isinstance(result, KnowledgeGraph) else [result])
+            if position % checkpoint_records == 0:
+                save(position)
+    else:
+        records = iter(data)
+        if start:
+            for _ in islice(records, start):
+                pass
+            for key, value in checkpoint.state.items():
+                transform.state[key] = pickle.loads(value)
+            transform.transform_metadata.update(checkpoint.tag_transform_metadata)
+        for position, record in enumerate(records, start=start + 1):
+            for transform_record_fn in hooks.transform_record:
+                _write_result(writer, transform_record_fn(transform, record))
+            if position % checkpoint_records == 0:
+                save(position)
+
+    for fn in hooks.on_data_end:
+        fn(transform)
+    runner.transform_metadata.update(transform.transform_metadata)
@@ -0,0 +1,134 @@
+"""Zstandard compression of the KGX files the pipeline stages keep.
+
+The transform, normalization and merge stages write their KGX files as plain ``.jsonl``, which ORION reads and writes
+in place. Once no stage of a build reads them anymore, they are compressed into place as ``.jsonl.zst`` by
+multi-threaded zstd at a fast level, with ``compress_kgx_files``: the transform and normalized files after the merge,
+and the merged files after the graph metadata, so the files kept on disk and uploaded to S3 are all compressed. The
+release archives are built from the compressed merged files. Set ``KGX_COMPRESSION=none`` to keep them as plain
+files, and ``ZSTD_LEVEL`` / ``ZSTD_THREADS`` to tune the compression. Whether a file is compressed is always told by
+its suffix, so builds of either kind can be read whatever the current setting is.
+
+Code the pipeline controls opens the files with ``open_file``, which (de)compresses transparently. ORION only reads
+plain files, so when it reads the compressed files of an earlier run, e.g. to merge a release of several sources or to
+run a stage again, it gets plain copies of them from ``plain_input_files``:
+
+    >>> with plain_input_files(nodes_path, edges_path) as (plain_nodes_path, plain_edges_path):
+    ...     orion_stage(plain_nodes_path, plain_edges_path, plain_file_path(output_nodes_path))
+    >>> compress_kgx_files(nodes_path, edges_path)
+"""
+
+import io
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import IO
+
+import zstandard
+
+from translator_ingest.util.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+ZSTD_SUFFIX = ".zst"
+
+# "zstd" to compress the KGX files of a build once its stages are done with them, "none" to keep them plain
+KGX_COMPRESSION = os.environ.get("KGX_COMPRESSION", "zstd")
+# a fast level: most of the size reduction of the higher levels, at several times their speed
+ZSTD_LEVEL = int(os.environ.get("ZSTD_LEVEL", "3"))
+# compression threads, -1 for one per CPU
+ZSTD_THREADS = int(os.environ.get("ZSTD_THREADS", "-1"))
+
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def is_compression_enabled() -> bool:
+    return KGX_COMPRESSION != "none"
+
+
+def is_zstd_file(file_path: Path | str) -> bool:
+    return str(file_path).endswith(ZSTD_SUFFIX)
+
+
+def plain_file_path(file_path: Path | str) -> Path:
+    """The path of the plain file a .zst file is compressed from, e.g. the path a stage writes an output to."""
+    return Path(str(file_path).removesuffix(ZSTD_SUFFIX))
+
+
+def get_kgx_file_path(directory: Path, file_name: str) -> Path:
+    """The path of a KGX file in a directory, the plain file unless only its compressed version exists."""
+    plain_path, compressed_path = directory / file_name, directory / f"{file_name}{ZSTD_SUFFIX}"
+    if not plain_path.exists() and compressed_path.exists():
+        return compressed_path
+    return plain_path
+
+
+def open_file(file_path: Path | str, mode: str = "rt") -> IO:
+    """Open a file for reading or writing, (de)compressing it if it is a .zst file.
+
+    :param file_path: path of the file
+    :param mode: "rt", "wt", "at", "rb", "wb" or "ab", as for open()
+    """
+    if not is_zstd_file(file_path):
+        return open(file_path, mode, encoding=None if "b" in mode else "utf-8")
+    if "r" in mode:
+        reader = zstandard.open(file_path, mode, dctx=zstandard.ZstdDecompressor())
+        # buffered, as zstandard's binary reader can't be iterated over by line
+        return io.BufferedReader(reader, _COPY_BUFFER_SIZE) if "b" in mode else reader
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=ZSTD_THREADS)
+    return zstandard.open(file_path, mode, cctx=compressor)
+
+
+def copy_file(source_path: Path | str, target_path: Path | str):
+    """Copy a file, compressing or decompressing it when only one of the two paths is a .zst file."""
+    if is_zstd_file(source_path) == is_zstd_file(target_path):
+        shutil.copyfile(source_path, target_path)
+        return
+    with open_file(source_path, "rb") as source_file, open_file(target_path, "wb") as target_file:
+        shutil.copyfileobj(source_file, target_file, _COPY_BUFFER_SIZE)
+
+
+@contextmanager
+def plain_input_files(*file_paths: Path | str | None) -> Iterator[list[str | None]]:
+    """Provide plain (uncompressed) paths to input files, for code which can't read .zst files.
+
+    Compressed files are decompressed to a temporary directory next to them, which is removed afterwards. Plain
+    files, and None, are passed through as they are.
+    """
+    with ExitStack() as stack:
+        plain_paths = []
+        for file_path in file_paths:
+            if file_path is None or not is_zstd_file(file_path):
+                plain_paths.append(None if file_path is None else str(file_path))
+                continue
+            file_path = Path(file_path)
+            temp_dir = stack.enter_context(tempfile.TemporaryDirectory(dir=file_path.parent, prefix=".plain_"))
+            plain_path = Path(temp_dir) / file_path.name.removesuffix(ZSTD_SUFFIX)
+            logger.info(f"Decompressing {file_path} to {plain_path}")
+            copy_file(file_path, plain_path)
+            plain_paths.append(str(plain_path))
+        yield plain_paths
+
+
+def compress_kgx_files(*file_paths: Path | str | None) -> list[Path | None]:
+    """Compress plain KGX files into place as .zst files, if compression is enabled, and return their paths.
+
+    Compressed files, missing files and None are passed through as they are.
+    """
+    compressed_paths = []
+    for file_path in file_paths:
+        if file_path is None or is_zstd_file(file_path) or not is_compression_enabled() or not Path(file_path).exists():
+            compressed_paths.append(None if file_path is None else Path(file_path))
+            continue
+        file_path = Path(file_path)
+        compressed_path = file_path.with_name(f"{file_path.name}{ZSTD_SUFFIX}")
+        logger.info(f"Compressing {file_path} to {compressed_path}")
+        # compressed next to the output first, so an interrupted compression never leaves a partial file behind
+        partial_path = file_path.with_name(f"{file_path.name}.partial{ZSTD_SUFFIX}")
+        copy_file(file_path, partial_path)
+        partial_path.replace(compressed_path)
+        file_path.unlink()
+        compressed_paths.append(compressed_path)
+    return compressed_paths
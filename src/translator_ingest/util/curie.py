@@ -0,0 +1,176 @@
+"""Memoized CURIE parsing and prefix classification for transform hot paths.
+
+Text-mined and interaction sources (semmeddb, tmkp, intact, pathbank, ...) classify the
+same handful of CURIEs and prefixes over and over: every edge asks for the prefix of its
+subject and object, sometimes several times. This module parses each distinct CURIE once
+into an interned ``Curie`` value and provides a registry of bounded LRU caches whose hit
+rates can be reported at the end of a transform.
+
+Usage:
+    >>> parse_curie("MONDO:0005148").prefix
+    'MONDO'
+    >>> get_node_class = make_prefix_classifier("example.node_class", {"MONDO": "Disease"}, default="NamedThing")
+    >>> get_node_class("MONDO:0005148")
+    'Disease'
+
+Any pure function with hashable arguments can be memoized and instrumented the same way:
+
+    @instrumented_cache("tmkp.edge_prefixes")
+    def _validate_edge_prefixes(subject_id: str, object_id: str, predicate: str) -> bool:
+        ...
+"""
+
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from translator_ingest.util.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# bound on the number of distinct arguments remembered by each cache
+DEFAULT_CACHE_SIZE = 1_000_000
+# sources use a few dozen prefixes at most, so prefix caches are small
+DEFAULT_PREFIX_CACHE_SIZE = 1024
+
+_caches: dict[str, Any] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    """Hit/miss counters of one registered cache."""
+
+    name: str
+    hits: int
+    misses: int
+    size: int
+    maxsize: int | None
+
+    @property
+    def calls(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.calls if self.calls else 0.0
+
+
+def _definition(function: Callable[..., Any]) -> tuple:
+    # by source file rather than module, as koza imports transforms from their files under other module names
+    code = function.__code__
+    return code.co_filename, code.co_qualname, [cell.cell_contents for cell in function.__closure__ or ()]
+
+
+def instrumented_cache[T](
+    name: str, maxsize: int | None = DEFAULT_CACHE_SIZE
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """``functools.lru_cache`` that also registers the cache under ``name`` for ``cache_stats()``.
+
+    Names are unique: registering another function under a name in use raises a ``ValueError``. The same definition
+    may register again (reloading its module, or importing it from its file, does), replacing its cache.
+    """
+
+    def decorator(function: Callable[..., T]) -> Callable[..., T]:
+        registered = _caches.get(name)
+        if registered is not None and _definition(registered.__wrapped__) != _definition(function):
+            raise ValueError(f"Cache name {name!r} is already registered by {registered.__wrapped__.__qualname__}")
+        cached_function = lru_cache(maxsize=maxsize)(function)
+        _caches[name] = cached_function
+        return cached_function
+
+    return decorator
+
+
+def cache_stats() -> list[CacheStats]:
+    """Current counters of every registered cache, in registration order."""
+    stats = []
+    for name, cached_function in _caches.items():
+        info = cached_function.cache_info()
+        stats.append(CacheStats(name, info.hits, info.misses, info.currsize, info.maxsize))
+    return stats
+
+
+def log_cache_stats() -> None:
+    """Log the hit rate of every registered cache that has been used."""
+    for stats in cache_stats():
+        if stats.calls:
+            logger.info(
+                f"Cache {stats.name}: {stats.hits} hits / {stats.calls} calls "
+                f"({stats.hit_rate:.1%} hit rate, {stats.size} entries)"
+            )
+
+
+def clear_caches() -> None:
+    """Empty every registered cache and reset its counters."""
+    for cached_function in _caches.values():
+        cached_function.cache_clear()
+
+
+@dataclass(frozen=True, slots=True)
+class Curie:
+    """A CURIE split into its prefix and local identifier.
+
+    Instances are interned by ``parse_curie``: parsing the same string twice returns the
+    same object, so repeated identifiers share a single parsed representation.
+    A string without a colon has an empty prefix and is its own local identifier.
+    """
+
+    curie: str
+    prefix: str
+    local_id: str
+
+    def __str__(self) -> str:
+        return self.curie
+
+    @property
+    def is_valid(self) -> bool:
+        return bool(self.prefix)
+
+
+@instrumented_cache("curie.parse")
+def parse_curie(curie: str) -> Curie:
+    """Parse (and intern) a CURIE string.
+
+    >>> parse_curie("DRUGBANK:DB01248")
+    Curie(curie='DRUGBANK:DB01248', prefix='DRUGBANK', local_id='DB01248')
+    >>> parse_curie("invalid").prefix
+    ''
+    """
+    prefix, colon, local_id = curie.partition(":")
+    if not colon:
+        return Curie(curie, "", curie)
+    return Curie(curie, prefix, local_id)
+
+
+def get_prefix(curie: str) -> str:
+    """Prefix of a CURIE, or an empty string if it has none."""
+    return parse_curie(curie).prefix
+
+
+def get_local_id(curie: str) -> str:
+    """Local identifier of a CURIE (the whole string if it has no prefix)."""
+    return parse_curie(curie).local_id
+
+
+def make_prefix_classifier[T](
+    name: str,
+    prefix_to_class: Mapping[str, T],
+    default: T,
+    maxsize: int | None = DEFAULT_PREFIX_CACHE_SIZE,
+) -> Callable[[str], T]:
+    """Build a memoized, instrumented ``curie -> class`` lookup from a prefix mapping.
+
+    CURIEs are parsed through ``parse_curie``'s cache, and the class of each prefix is
+    cached under ``name``, so classifying the endpoints of every edge costs two dict
+    probes per repeat CURIE without keeping a second entry per distinct CURIE.
+    """
+
+    @instrumented_cache(name, maxsize=maxsize)
+    def classify_prefix(prefix: str) -> T:
+        return prefix_to_class.get(prefix, default)
+
+    def classify(curie: str) -> T:
+        return classify_prefix(parse_curie(curie).prefix)
+
+    return classify
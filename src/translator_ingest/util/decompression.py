@@ -0,0 +1,287 @@
+"""Decompression of large gzip source files in background threads, overlapped with the code reading them.
+
+Python's ``gzip`` module inflates in the thread that reads the file, so a transform reading a multi-gigabyte ``.gz``
+spends a large part of its time waiting on inflate. ``open_gzip`` opens a gzip file whose content is decompressed by
+a background thread into a bounded queue of chunks instead, so the transform runs while the next chunks are inflated.
+Inflate releases the GIL, so the two really run in parallel.
+
+- BGZF files (blocked gzip, as written by bgzip, with the size of every block in its header) are inflated block by
+  block by a pool of ``DECOMPRESSION_THREADS`` threads.
+- Other gzip files, including the multi-member files of concatenated gzips or ``pigz --independent``, are inflated
+  by the one background thread, as the block boundaries of a gzip stream can't be found without inflating it.
+
+Inflate uses the fastest implementation installed: ISA-L (``isal``), zlib-ng (``zlib-ng``), or the standard library
+zlib. Neither of the first two is a dependency; installing one speeds up all the gzip reading done here.
+
+Koza readers use ``open_gzip`` for their gzipped files inside ``threaded_koza_decompression()``, which the pipeline
+enters for the transform. Ingests which open gzip files or tar.gz archives themselves use ``open_gzip`` and
+``open_tar_gz``:
+
+    >>> with open_gzip(Path(koza.input_files_dir) / "gene_info.gz", "rt") as gene_info:
+    ...     for line in gene_info:
+    ...         ...
+"""
+
+import io
+import os
+import queue
+import struct
+import tarfile
+import threading
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, BinaryIO
+
+from translator_ingest.util.logging_utils import get_logger
+
+try:
+    from isal import isal_zlib as zlib_backend
+except ImportError:
+    try:
+        from zlib_ng import zlib_ng as zlib_backend
+    except ImportError:
+        import zlib as zlib_backend
+
+logger = get_logger(__name__)
+
+# threads inflating the blocks of a BGZF file
+DECOMPRESSION_THREADS = int(os.environ.get("DECOMPRESSION_THREADS", str(min(4, os.cpu_count() or 1))))
+# decompressed chunks buffered ahead of the reader, which bounds the memory used to a few tens of MB
+DECOMPRESSION_QUEUE_SIZE = 16
+
+GZIP_MAGIC = b"\x1f\x8b"
+# wbits for zlib to read a gzip header and trailer
+_GZIP_WBITS = 16 + zlib_backend.MAX_WBITS
+_READ_SIZE = 1024 * 1024
+_BGZF_HEADER = struct.Struct("<4sIBBH")
+_END = object()
+
+
+def is_gzip_file(file_path: Path | str) -> bool:
+    with open(file_path, "rb") as file:
+        return file.read(2) == GZIP_MAGIC
+
+
+def is_bgzf_file(file_path: Path | str) -> bool:
+    """Whether a file is BGZF, i.e. gzip with the size of each member in a "BC" extra field of its header."""
+    with open(file_path, "rb") as file:
+        header = file.read(_BGZF_HEADER.size + 4)
+    if len(header) < _BGZF_HEADER.size + 4 or header[:3] != GZIP_MAGIC + b"\x08" or not header[3] & 0x04:
+        return False
+    return header[12:14] == b"BC"
+
+
+def _inflate_members(file: BinaryIO) -> Iterator[bytes]:
+    """Inflate a gzip stream of one or more members, a read at a time.
+
+    As with ``gzip``, NUL bytes padding the file after a member are skipped, and a file ending in the middle of a
+    member raises an ``EOFError``.
+    """
+    # None between members
+    decompressor = None
+    while compressed := file.read(_READ_SIZE):
+        while compressed:
+            if decompressor is None:
+                compressed = compressed.lstrip(b"\x00")
+                if not compressed:
+                    break
+                decompressor = zlib_backend.decompressobj(_GZIP_WBITS)
+            if chunk := decompressor.decompress(compressed):
+                yield chunk
+            if not decompressor.eof:
+                break
+            # the next member of a multi-member file starts after the end of this one
+            compressed = decompressor.unused_data
+            decompressor = None
+    if decompressor is not None:
+        if tail := decompressor.flush():
+            yield tail
+        raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+
+
+def _read_bgzf_blocks(file: BinaryIO) -> Iterator[bytes]:
+    """Read the compressed blocks of a BGZF file, each a complete gzip member."""
+    while header := file.read(_BGZF_HEADER.size):
+        if len(header) < _BGZF_HEADER.size or header[:2] != GZIP_MAGIC:
+            raise OSError(f"Invalid BGZF block header in {getattr(file, 'name', 'file')}")
+        extra = file.read(_BGZF_HEADER.unpack(header)[4])
+        block_size = None
+        position = 0
+        while position + 4 <= len(extra):
+            subfield_length = struct.unpack_from("<H", extra, position + 2)[0]
+            if extra[position:position + 2] == b"BC":
+                block_size = struct.unpack_from("<H", extra, position + 4)[0] + 1
+                break
+            position += 4 + subfield_length
+        if block_size is None:
+            raise OSError(f"BGZF block without a block size in {getattr(file, 'name', 'file')}")
+        yield header + extra + file.read(block_size - len(header) - len(extra))
+
+
+def _inflate_bgzf(file: BinaryIO, threads: int) -> Iterator[bytes]:
+    """Inflate the blocks of a BGZF file in parallel, yielding them in order."""
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="bgzf") as executor:
+        pending: deque[Future] = deque()
+        for block in _read_bgzf_blocks(file):
+            pending.append(executor.submit(zlib_backend.decompress, block, _GZIP_WBITS))
+            # a few blocks in flight per thread keeps them all busy without reading far ahead
+            if len(pending) >= threads * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class ThreadedDecompressionReader(io.RawIOBase):
+    """A raw binary reader of the chunks a generator yields in a background thread, through a bounded queue."""
+
+    def __init__(self, file: BinaryIO, inflate: Callable[[BinaryIO], Iterator[bytes]],
+                 queue_size: int = DECOMPRESSION_QUEUE_SIZE):
+        super().__init__()
+        self._file = file
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._chunk = memoryview(b"")
+        self._finished = False
+        self._thread = threading.Thread(target=self._produce, args=(inflate,), name="decompression", daemon=True)
+        self._thread.start()
+
+    @property
+    def name(self) -> str:
+        return self._file.name
+
+    def compressed_position(self) -> int:
+        """How far into the compressed file the background thread has read, e.g. for progress reporting."""
+        return self._file.tell() if not self._file.closed else 0
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self, inflate: Callable[[BinaryIO], Iterator[bytes]]):
+        try:
+            for chunk in inflate(self._file):
+                if not self._put(chunk):
+                    return
+            self._put(_END)
+        except Exception as error:  # noqa: BLE001 - raised in the reading thread instead
+            self._put(error)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._chunk:
+            if self._finished:
+                return 0
+            item = self._queue.get()
+            if item is _END:
+                self._finished = True
+                return 0
+            if isinstance(item, Exception):
+                self._finished = True
+                raise item
+            self._chunk = memoryview(item)
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+    def close(self):
+        if self.closed:
+            return
+        self._stop.set()
+        # unblock the background thread if it is waiting on a full queue
+        while self._thread.is_alive():
+            try:
+                self._queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        self._file.close()
+        super().close()
+
+
+def open_gzip(file_path: Path | str, mode: str = "rb", threads: int = DECOMPRESSION_THREADS) -> IO:
+    """Open a gzip file for reading, decompressed in background threads.
+
+    :param file_path: path of the gzip file
+    :param mode: "rb", or "rt" for utf-8 text
+    :param threads: number of threads inflating a BGZF file; other gzip files are inflated by one thread
+    """
+    if mode not in ("rb", "rt", "r"):
+        raise ValueError(f"open_gzip only reads, mode {mode} is not supported")
+    if threads > 1 and is_bgzf_file(file_path):
+        logger.debug(f"Decompressing BGZF file {file_path} with {threads} threads")
+
+        def inflate(file: BinaryIO) -> Iterator[bytes]:
+            return _inflate_bgzf(file, threads)
+    else:
+        inflate = _inflate_members
+    raw_reader = ThreadedDecompressionReader(open(file_path, "rb"), inflate)  # noqa: SIM115 - closed by the reader
+    reader = io.BufferedReader(raw_reader, _READ_SIZE)
+    return reader if mode == "rb" else io.TextIOWrapper(reader, encoding="utf-8")
+
+
+class _GzipStreamTarFile(tarfile.TarFile):
+    """A TarFile read as a stream from an open_gzip reader, which it closes when it is closed."""
+
+    gzip_reader: IO | None = None
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            if self.gzip_reader is not None:
+                self.gzip_reader.close()
+
+
+def open_tar_gz(file_path: Path | str) -> tarfile.TarFile:
+    """Open a tar.gz archive to read its members in order, e.g. to extract it or iterate over it, decompressed
+    in a background thread. The members can't be read out of order, as they are read as a stream.
+
+    Closing the archive, e.g. at the end of its with block, closes the file and stops the thread."""
+    gzip_reader = open_gzip(file_path, "rb")
+    try:
+        tar = _GzipStreamTarFile.open(fileobj=gzip_reader, mode="r|")
+    except BaseException:
+        gzip_reader.close()
+        raise
+    tar.gzip_reader = gzip_reader
+    return tar
+
+
+def _open_resource_threaded(open_resource: Callable) -> Callable:
+    from koza.io.utils import SizedResource
+
+    def open_resource_threaded(resource):
+        # only local plain gzip files: koza reads remote files, and zip and tar archives, itself
+        if isinstance(resource, str) and resource.startswith("http"):
+            return open_resource(resource)
+        path = Path(resource)
+        if not path.is_file() or not is_gzip_file(path) or tarfile.is_tarfile(path):
+            return open_resource(resource)
+        reader = open_gzip(path, "rt")
+        raw_reader = reader.buffer.raw
+        return SizedResource(str(resource), path.stat().st_size, reader, raw_reader.compressed_position)
+
+    return open_resource_threaded
+
+
+@contextmanager
+def threaded_koza_decompression() -> Iterator[None]:
+    """Make koza readers decompress the gzip files they read with open_gzip, inside the context."""
+    import koza.model.source
+
+    open_resource = koza.model.source.open_resource
+    koza.model.source.open_resource = _open_resource_threaded(open_resource)
+    try:
+        yield
+    finally:
+        koza.model.source.open_resource = open_resource
@@ -0,0 +1,68 @@
+"""DuckDB connections and streamed query results for ingests which join or filter their source files with DuckDB.
+
+Connections made with ``connect_duckdb`` are configured from the environment, like the other pipeline settings:
+
+    DUCKDB_THREADS          number of threads DuckDB runs a query with (DuckDB's default: the number of CPUs)
+    DUCKDB_MEMORY_LIMIT     memory DuckDB may use before spilling to disk, e.g. "8GB" (DuckDB's default: 80% of RAM)
+    DUCKDB_TEMP_DIRECTORY   where DuckDB spills to when it reaches the memory limit
+
+``stream_query`` runs a query on its own connection and yields the result rows as dicts, a batch at a time, so that a
+``@koza.prepare_data`` function can return it and the transform starts on the first batch while DuckDB is still
+producing the rest:
+
+    >>> @koza.prepare_data(tag="gene_to_phenotype")
+    ... def prepare(koza_transform: koza.KozaTransform, data: Iterable[dict[str, Any]]) -> Iterable[dict[str, Any]]:
+    ...     return stream_query(f"select * from read_csv('{koza_transform.input_files_dir / 'genes.txt'}')")
+"""
+
+import os
+from collections.abc import Iterator
+from typing import Any
+
+import duckdb
+
+from translator_ingest.util.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+DUCKDB_THREADS = os.environ.get("DUCKDB_THREADS")
+DUCKDB_MEMORY_LIMIT = os.environ.get("DUCKDB_MEMORY_LIMIT")
+DUCKDB_TEMP_DIRECTORY = os.environ.get("DUCKDB_TEMP_DIRECTORY")
+
+# Rows fetched from a streamed query result at a time
+DUCKDB_BATCH_SIZE = 10_000
+
+
+def get_duckdb_config() -> dict[str, Any]:
+    """The DuckDB configuration of the pipeline, with only the settings which were set."""
+    config: dict[str, Any] = {}
+    if DUCKDB_THREADS:
+        config["threads"] = int(DUCKDB_THREADS)
+    if DUCKDB_MEMORY_LIMIT:
+        config["memory_limit"] = DUCKDB_MEMORY_LIMIT
+    if DUCKDB_TEMP_DIRECTORY:
+        config["temp_directory"] = DUCKDB_TEMP_DIRECTORY
+    return config
+
+
+def connect_duckdb(database: str = ":memory:") -> duckdb.DuckDBPyConnection:
+    """Connect to a DuckDB database with the DuckDB configuration of the pipeline."""
+    return duckdb.connect(database, config=get_duckdb_config())
+
+
+def stream_query(
+    query: str, parameters: list[Any] | None = None, batch_size: int = DUCKDB_BATCH_SIZE
+) -> Iterator[dict[str, Any]]:
+    """Run a query on a new in-memory connection and yield its result rows as dicts, batch_size rows at a time.
+
+    The connection is closed when the rows are exhausted or the iterator is closed.
+    """
+    connection = connect_duckdb()
+    try:
+        result = connection.execute(query, parameters)
+        columns = [column[0] for column in result.description]
+        while batch := result.fetchmany(batch_size):
+            for row in batch:
+                yield dict(zip(columns, row))
+    finally:
+        connection.close()
@@ -0,0 +1,210 @@
+"""Normalization of KGX edges with a resolved node normalization map, serially or in shards in a process pool.
+
+Once the nodes are normalized, normalizing an edge only takes looking up its subject and object in the node
+normalization map: each edge is rewritten with the normalized ids, split in the rare case of an id normalizing to
+several, and dropped if one of its nodes failed to normalize. ``normalize_edge`` does this as ORION's
+KGXFileNormalizer does with pre-normalized predicates, which is how the pipeline runs it.
+
+As edges are independent, ``normalize_edges_sharded`` splits an edges file into line-aligned byte ranges, normalizes
+them in parallel in worker processes, and concatenates their outputs. The workers are forked when no other thread is
+running, sharing the node normalization map of the parent copy-on-write, rather than each getting a pickled copy of
+it. Forking while other threads run (e.g. a Node Normalizer client's) could leave the workers deadlocked on locks
+those threads held, so then the workers are started by a forkserver instead, and load the map from a pickle file:
+
+    >>> counts, connected_node_ids = normalize_edges_sharded(edges_path, output_edges_path, node_norm_lookup)
+
+The counts have the names ORION gives them in the normalization metadata.
+"""
+
+import multiprocessing
+import os
+import pickle
+import shutil
+import threading
+from collections.abc import Iterator
+from itertools import pairwise
+from pathlib import Path
+from typing import Any
+
+from translator_ingest.util.jsonio import BUFFER_SIZE, dumps, loads
+from translator_ingest.util.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# shards of an edges file normalized in parallel
+NORMALIZATION_EDGE_SHARDS = int(os.environ.get("NORMALIZATION_EDGE_SHARDS", str(min(8, os.cpu_count() or 1))))
+# edges files smaller than this are normalized by ORION in one process, as the workers aren't worth starting
+SHARDED_NORMALIZATION_MIN_BYTES = 64 * 1024 * 1024
+
+EDGE_COUNT_KEYS = ("source_edges", "edges_failed_due_to_nodes", "edge_splits", "subclass_loops_removed",
+                   "final_normalized_edges")
+
+_NEWLINE = b"\n"
+_WRITE_BATCH = 1000
+
+# the node normalization map of normalize_edges_sharded, inherited by its forked workers or loaded by the others
+_shared_node_norm_lookup: dict[str, list[str] | None] = {}
+
+
+def new_edge_counts() -> dict[str, int]:
+    return dict.fromkeys(EDGE_COUNT_KEYS, 0)
+
+
+def normalize_edge(edge: dict[str, Any], node_norm_lookup: dict[str, list[str] | None],
+                   counts: dict[str, int]) -> Iterator[dict[str, Any]]:
+    """Yield the normalized edges of an edge, counting the ones dropped and split in counts.
+
+    Edges with a node missing from the lookup, or which failed to normalize, are dropped.
+    """
+    subject_ids, object_ids = node_norm_lookup.get(edge["subject"]), node_norm_lookup.get(edge["object"])
+    if not (subject_ids and object_ids):
+        counts["edges_failed_due_to_nodes"] += 1
+        return
+    # ensure the edge has a primary knowledge source, as ORION does (with no default provenance)
+    if "sources" not in edge and "primary_knowledge_source" not in edge:
+        edge["primary_knowledge_source"] = None
+    edge_count = 0
+    for subject_id in subject_ids:
+        for object_id in object_ids:
+            # subclass_of self-loops are thrown out
+            if edge["predicate"] == "biolink:subclass_of" and subject_id == object_id:
+                counts["subclass_loops_removed"] += 1
+                continue
+            edge_count += 1
+            normalized_edge = edge.copy()
+            normalized_edge["original_subject"] = edge["subject"]
+            normalized_edge["original_object"] = edge["object"]
+            normalized_edge["subject"] = subject_id
+            normalized_edge["object"] = object_id
+            yield normalized_edge
+    counts["final_normalized_edges"] += edge_count
+    if edge_count > 1:
+        counts["edge_splits"] += edge_count - 1
+
+
+def _load_shared_node_norm_lookup(node_norm_lookup_path: str):
+    global _shared_node_norm_lookup
+    with open(node_norm_lookup_path, "rb") as lookup_file:
+        _shared_node_norm_lookup = pickle.load(lookup_file)
+
+
+def shard_byte_ranges(file_path: Path | str, shards: int) -> list[tuple[int, int]]:
+    """Split a file into at most shards (start, end) byte ranges, each starting at the beginning of a line."""
+    file_size = os.path.getsize(file_path)
+    boundaries = [0]
+    with open(file_path, "rb") as file:
+        for shard in range(1, shards):
+            position = max(file_size * shard // shards, boundaries[-1])
+            # the range ends after the line this position is in, unless it is at the start of one
+            if position > 0:
+                file.seek(position - 1)
+                file.readline()
+            boundaries.append(min(file.tell(), file_size))
+    boundaries.append(file_size)
+    return [(start, end) for start, end in pairwise(boundaries) if end > start]
+
+
+def _normalize_edge_range(edges_file_path: str, start: int, end: int,
+                          output_file_path: str) -> tuple[dict[str, int], set[str]]:
+    """Normalize the edges in a byte range of an edges file to an output file, with the shared node map."""
+    node_norm_lookup = _shared_node_norm_lookup
+    counts = new_edge_counts()
+    connected_node_ids = set()
+    lines = []
+    with open(edges_file_path, "rb") as edges_file, open(output_file_path, "wb", buffering=BUFFER_SIZE) as output_file:
+        edges_file.seek(start)
+        position = start
+        while position < end:
+            line = edges_file.readline()
+            if not line:
+                break
+            position += len(line)
+            if not line.strip():
+                continue
+            counts["source_edges"] += 1
+            for normalized_edge in normalize_edge(loads(line), node_norm_lookup, counts):
+                connected_node_ids.add(normalized_edge["subject"])
+                connected_node_ids.add(normalized_edge["object"])
+                lines.append(dumps(normalized_edge))
+                lines.append(_NEWLINE)
+            if len(lines) >= _WRITE_BATCH * 2:
+                output_file.write(b"".join(lines))
+                lines.clear()
+        output_file.write(b"".join(lines))
+    return counts, connected_node_ids
+
+
+def normalize_edges_sharded(edges_file_path: Path | str, output_file_path: Path | str,
+                            node_norm_lookup: dict[str, list[str] | None],
+                            shards: int = NORMALIZATION_EDGE_SHARDS) -> tuple[dict[str, int], set[str]]:
+    """Normalize a plain jsonl edges file to output_file_path, in shards normalized by a pool of processes.
+
+    :return: the edge counts, and the ids of the normalized nodes the normalized edges connect
+    """
+    global _shared_node_norm_lookup
+
+    edges_file_path, output_file_path = str(edges_file_path), str(output_file_path)
+    byte_ranges = shard_byte_ranges(edges_file_path, shards)
+    shard_paths = [f"{output_file_path}.shard-{index:03d}" for index in range(len(byte_ranges))]
+    tasks = [(edges_file_path, start, end, shard_path) for (start, end), shard_path in zip(byte_ranges, shard_paths)]
+    _shared_node_norm_lookup = node_norm_lookup
+    try:
+        if len(tasks) > 1:
+            logger.info(f"Normalizing the edges of {edges_file_path} in {len(tasks)} shards")
+            results = _normalize_edge_ranges_in_pool(tasks, node_norm_lookup, f"{output_file_path}.node-norm-lookup")
+        else:
+            results = [_normalize_edge_range(*tasks[0])] if tasks else []
+    finally:
+        _shared_node_norm_lookup = {}
+
+    counts = new_edge_counts()
+    connected_node_ids = set()
+    with open(output_file_path, "wb") as output_file:
+        for shard_path, (shard_counts, shard_connected_node_ids) in zip(shard_paths, results):
+            for key, count in shard_counts.items():
+                counts[key] += count
+            connected_node_ids.update(shard_connected_node_ids)
+            with open(shard_path, "rb") as shard_file:
+                shutil.copyfileobj(shard_file, output_file, BUFFER_SIZE)
+            os.remove(shard_path)
+    logger.info(f"Normalized {counts['source_edges']} edges into {counts['final_normalized_edges']}")
+    return counts, connected_node_ids
+
+
+def _normalize_edge_ranges_in_pool(tasks: list[tuple], node_norm_lookup: dict[str, list[str] | None],
+                                   node_norm_lookup_path: str) -> list[tuple[dict[str, int], set[str]]]:
+    start_methods = multiprocessing.get_all_start_methods()
+    if "fork" in start_methods and threading.active_count() == 1:
+        with multiprocessing.get_context("fork").Pool(processes=len(tasks)) as pool:
+            return pool.starmap(_normalize_edge_range, tasks)
+    logger.info("Starting the edge normalization workers with a pickled node normalization map, as other threads "
+                "are running")
+    with open(node_norm_lookup_path, "wb") as lookup_file:
+        pickle.dump(node_norm_lookup, lookup_file, protocol=pickle.HIGHEST_PROTOCOL)
+    try:
+        context = multiprocessing.get_context("forkserver" if "forkserver" in start_methods else "spawn")
+        with context.Pool(processes=len(tasks), initializer=_load_shared_node_norm_lookup,
+                          initargs=(node_norm_lookup_path,)) as pool:
+            return pool.starmap(_normalize_edge_range, tasks)
+    finally:
+        os.remove(node_norm_lookup_path)
+
+
+def remove_unconnected_nodes(nodes_file_path: Path | str, connected_node_ids: set[str]) -> int:
+    """Remove the nodes no normalized edge refers to from a plain jsonl nodes file, and return how many were removed.
+
+    Equivalent to ORION's remove_unconnected_nodes, with the connected nodes already known from the edges.
+    """
+    nodes_file_path = Path(nodes_file_path)
+    temp_file_path = nodes_file_path.with_name(f"{nodes_file_path.name}.temp")
+    removed_count = 0
+    with open(nodes_file_path, "rb") as nodes_file, open(temp_file_path, "wb", buffering=BUFFER_SIZE) as temp_file:
+        for line in nodes_file:
+            if not line.strip():
+                continue
+            if loads(line)["id"] in connected_node_ids:
+                temp_file.write(line)
+            else:
+                removed_count += 1
+    os.replace(temp_file_path, nodes_file_path)
+    return removed_count
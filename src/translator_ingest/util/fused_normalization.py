@@ -0,0 +1,276 @@
+"""Fused transform and normalization, which normalizes the nodes and edges of a transform while it writes them.
+
+By default the pipeline runs the transform to completion, and the normalization stage then reads the transform's KGX
+files back. Run with ``--fused``, the two overlap instead: ``FusedNormalizationWriter`` writes the transform's KGX
+files as ``DeduplicatingJSONLWriter`` does, and also puts batches of the nodes and edges it writes on a bounded queue
+for a ``StreamingNormalizer``, which normalizes them in a background thread:
+
+- node batches are normalized with ORION's Node Normalizer client as they come in, while the transform goes on,
+- edges are normalized and written as soon as both their subject and object are normalized; the (few) edges written
+  before one of their nodes are held until it is.
+
+When the transform is done, the normalizer writes the normalized nodes, the normalization map and the failures,
+the same files the normalization stage writes, so ``is_normalization_complete`` finds the normalization done:
+
+    >>> normalizer = StreamingNormalizer(node_normalizer, nodes_output_path, edges_output_path, map_path,
+    ...                                  failures_path)
+    >>> runner.writer = FusedNormalizationWriter(output_dir, source_name, config, normalizer=normalizer)
+    >>> runner.run()
+    >>> normalizer.counts["final_normalized_edges"]
+
+The normalization follows ORION's KGXFileNormalizer with pre-normalized predicates, as the normalization stage
+(normalize.py) runs it, and its counts have the same names as the ones in ORION's normalization metadata.
+"""
+
+import os
+import queue
+import threading
+from collections import defaultdict
+from typing import Any
+
+from translator_ingest.util.edge_normalization import new_edge_counts, normalize_edge
+from translator_ingest.util.jsonio import dumps, loads, open_binary, write_json, write_jsonl
+from translator_ingest.util.logging_utils import get_logger
+from translator_ingest.util.transform_writer import DeduplicatingJSONLWriter
+
+logger = get_logger(__name__)
+
+# nodes or edges put on the queue of the normalizer at a time
+FUSED_NORMALIZATION_BATCH_SIZE = int(os.environ.get("FUSED_NORMALIZATION_BATCH_SIZE", "50000"))
+# batches queued for the normalizer before the transform waits for it
+FUSED_NORMALIZATION_QUEUE_SIZE = 8
+
+_NEWLINE = b"\n"
+# edge lines buffered before they are written, as in JSONLWriter
+_WRITE_BATCH = 1000
+
+_NODES, _EDGES, _MERGED_NODES, _END = "nodes", "edges", "merged_nodes", "end"
+
+
+class StreamingNormalizer:
+    """Normalizes batches of KGX nodes and edges in a background thread, writing the normalization outputs.
+
+    :param node_normalizer: an ORION NodeNormalizer, which normalizes lists of node dicts in place and keeps the
+        normalized ids of the nodes in its node_normalization_lookup
+    :param preserve_unconnected_nodes: keep the nodes no edge refers to, as for nodes-only ingests
+    """
+
+    def __init__(self, node_normalizer, nodes_output_file_path: str, edges_output_file_path: str,
+                 node_norm_map_file_path: str, node_norm_failures_file_path: str,
+                 preserve_unconnected_nodes: bool = False, queue_size: int = FUSED_NORMALIZATION_QUEUE_SIZE):
+        self.node_normalizer = node_normalizer
+        self.nodes_output_file_path = nodes_output_file_path
+        self.edges_output_file_path = edges_output_file_path
+        self.node_norm_map_file_path = node_norm_map_file_path
+        self.node_norm_failures_file_path = node_norm_failures_file_path
+        self.preserve_unconnected_nodes = preserve_unconnected_nodes
+        self.counts: dict[str, int] = {
+            "node_count_pre_normalization": 0,
+            "node_count_post_normalization": 0,
+            "node_normalization_failures": 0,
+            "discarded_duplicate_node_count": 0,
+            "unconnected_nodes_removed": 0,
+            "final_normalized_nodes": 0,
+            **new_edge_counts(),
+        }
+        # the normalized nodes in the order they were written (None if they failed), and their index by original id
+        self._nodes: list[dict[str, Any] | None] = []
+        self._node_index: dict[str, int] = {}
+        # edges waiting for a node to be normalized, by its id
+        self._held_edges: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self._connected_node_ids: set[str] = set()
+        self._edge_lines: list[bytes] = []
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, name="fused-normalization", daemon=True)
+        self._thread.start()
+
+    def _put(self, kind: str, payload):
+        while True:
+            if self._error is not None:
+                raise self._error
+            try:
+                self._queue.put((kind, payload), timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def put_nodes(self, lines: list[bytes]):
+        """Queue serialized nodes to normalize, each with an id not queued before."""
+        self._put(_NODES, lines)
+
+    def put_edges(self, lines: list[bytes]):
+        """Queue serialized edges to normalize."""
+        self._put(_EDGES, lines)
+
+    def put_merged_nodes(self, nodes: list[dict[str, Any]]):
+        """Queue nodes which replace the nodes with the same id queued before, e.g. with properties merged into them."""
+        self._put(_MERGED_NODES, nodes)
+
+    def close(self) -> dict[str, int]:
+        """Finish normalizing what was queued, write the normalized nodes, map and failures, and return the counts."""
+        self._put(_END, None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self.counts
+
+    def _run(self):
+        try:
+            with open_binary(self.edges_output_file_path, "wb") as edges_file:
+                while (item := self._queue.get())[0] != _END:
+                    kind, payload = item
+                    if kind == _NODES:
+                        self._normalize_nodes([loads(line) for line in payload])
+                    elif kind == _EDGES:
+                        self.counts["source_edges"] += len(payload)
+                        for line in payload:
+                            self._normalize_edge(loads(line))
+                    else:
+                        self._replace_nodes(payload)
+                    self._write_edge_lines(edges_file)
+                # the nodes these edges are waiting for were never written
+                held_edges = [edge for edges in self._held_edges.values() for edge in edges]
+                if held_edges:
+                    logger.warning(f"{len(held_edges)} edges refer to nodes which are not in the nodes file")
+                self._held_edges.clear()
+                for edge in held_edges:
+                    self._normalize_edge(edge, final=True)
+                self._write_edge_lines(edges_file)
+            self._write_nodes()
+            self._write_normalization_map_and_failures()
+        except BaseException as error:  # noqa: BLE001 - raised in the transform's thread instead
+            self._error = error
+
+    def _normalize_nodes(self, nodes: list[dict[str, Any]]):
+        original_ids = [node["id"] for node in nodes]
+        self.counts["node_count_pre_normalization"] += len(nodes)
+        # normalized in place; with strict normalization, nodes which fail are removed from the list
+        self.node_normalizer.normalize_node_data(nodes)
+        self.counts["node_count_post_normalization"] += len(nodes)
+        lookup = self.node_normalizer.node_normalization_lookup
+        normalized_nodes = iter(nodes)
+        for original_id in original_ids:
+            self._node_index[original_id] = len(self._nodes)
+            self._nodes.append(next(normalized_nodes) if lookup.get(original_id) is not None else None)
+        for original_id in original_ids:
+            for edge in self._held_edges.pop(original_id, ()):
+                self._normalize_edge(edge)
+        logger.info(f"Normalized {self.counts['node_count_pre_normalization']} nodes so far...")
+
+    def _replace_nodes(self, nodes: list[dict[str, Any]]):
+        original_ids = [node["id"] for node in nodes]
+        self.node_normalizer.normalize_node_data(nodes)
+        lookup = self.node_normalizer.node_normalization_lookup
+        normalized_nodes = iter(nodes)
+        for original_id in original_ids:
+            if lookup.get(original_id) is not None:
+                self._nodes[self._node_index[original_id]] = next(normalized_nodes)
+
+    def _normalize_edge(self, edge: dict[str, Any], final: bool = False):
+        """Normalize an edge as ORION does with pre-normalized predicates, or hold it until its nodes are normalized."""
+        lookup = self.node_normalizer.node_normalization_lookup
+        if not final:
+            for node_id in (edge["subject"], edge["object"]):
+                if node_id not in lookup:
+                    self._held_edges[node_id].append(edge)
+                    return
+        for normalized_edge in normalize_edge(edge, lookup, self.counts):
+            self._connected_node_ids.add(normalized_edge["subject"])
+            self._connected_node_ids.add(normalized_edge["object"])
+            self._edge_lines.append(dumps(normalized_edge))
+            self._edge_lines.append(_NEWLINE)
+
+    def _write_edge_lines(self, edges_file):
+        if self._edge_lines:
+            edges_file.write(b"".join(self._edge_lines))
+            self._edge_lines.clear()
+
+    def _normalized_nodes_to_write(self):
+        """The normalized nodes, once per normalized id, without the ones no edge refers to unless they're kept."""
+        written_ids = set()
+        for node in self._nodes:
+            if node is None:
+                continue
+            if node["id"] in written_ids:
+                self.counts["discarded_duplicate_node_count"] += 1
+                continue
+            written_ids.add(node["id"])
+            if not self.preserve_unconnected_nodes and node["id"] not in self._connected_node_ids:
+                self.counts["unconnected_nodes_removed"] += 1
+                continue
+            yield node
+
+    def _write_nodes(self):
+        self.counts["final_normalized_nodes"] = write_jsonl(self.nodes_output_file_path,
+                                                            self._normalized_nodes_to_write())
+
+    def _write_normalization_map_and_failures(self):
+        write_json(self.node_norm_map_file_path,
+                   {"normalization_map": self.node_normalizer.node_normalization_lookup})
+        failed_ids = self.node_normalizer.failed_to_normalize_ids
+        self.counts["node_normalization_failures"] = len(failed_ids)
+        if failed_ids:
+            with open(self.node_norm_failures_file_path, "w") as failures_file:
+                failures_file.writelines(f"{failed_id}\n" for failed_id in failed_ids)
+
+
+class FusedNormalizationWriter(DeduplicatingJSONLWriter):
+    """A DeduplicatingJSONLWriter which also puts the nodes and edges it writes on the queue of a StreamingNormalizer.
+
+    The normalizer is closed when the writer is finalized, after the nodes with conflicting duplicates are replaced
+    with the merged ones.
+    """
+
+    def __init__(self, output_dir: str, source_name: str, config, normalizer: StreamingNormalizer,
+                 compressed: bool = False, batch_size: int = FUSED_NORMALIZATION_BATCH_SIZE):
+        super().__init__(output_dir=output_dir, source_name=source_name, config=config, compressed=compressed)
+        self.normalizer = normalizer
+        self.batch_size = batch_size
+        self._node_batch: list[bytes] = []
+        self._edge_batch: list[bytes] = []
+        self._merged_nodes: list[dict[str, Any]] = []
+
+    def _write_node_line(self, line: bytes):
+        super()._write_node_line(line)
+        self._node_batch.append(line)
+        if len(self._node_batch) >= self.batch_size:
+            self._put_batches()
+
+    def write_edges(self, edges, preconverted: bool = False):
+        if not edges:
+            return
+        self._ensure_edge_file_handle()
+        for edge in edges:
+            if self.sssom_config:
+                line = dumps(self.sssom_config.apply_mapping(self.converter.convert_association(edge)))
+            else:
+                line = self._serialize(edge)
+            self._edge_buf.append(line)
+            self._edge_buf.append(_NEWLINE)
+            self.edge_count += 1
+            if len(self._edge_buf) >= _WRITE_BATCH * 2:
+                self.edgeFH.write(b"".join(self._edge_buf))
+                self._edge_buf.clear()
+            self._edge_batch.append(line)
+        if len(self._edge_batch) >= self.batch_size:
+            self._put_batches()
+
+    def _put_batches(self):
+        # the nodes first, as the edges written after them may refer to them
+        if self._node_batch:
+            self.normalizer.put_nodes(self._node_batch)
+            self._node_batch = []
+        if self._edge_batch:
+            self.normalizer.put_edges(self._edge_batch)
+            self._edge_batch = []
+
+    def _node_merged(self, node: dict[str, Any]):
+        self._merged_nodes.append(node)
+
+    def finalize(self):
+        super().finalize()
+        self._put_batches()
+        if self._merged_nodes:
+            self.normalizer.put_merged_nodes(self._merged_nodes)
+        self.normalizer.close()
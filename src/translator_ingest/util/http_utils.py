@@ -3,6 +3,7 @@
 import re
 import requests
 import datetime
+from requests.adapters import HTTPAdapter, Retry
 from ftplib import FTP
 from json import JSONDecodeError
 from email.utils import parsedate_to_datetime
@@ -57,6 +58,21 @@ def get_geneontology_release_version(url: str = GENEONTOLOGY_RELEASE_METADATA_UR
     return version
 
 
+def create_pooled_session(pool_size: int, retries: Retry | int = 0) -> requests.Session:
+    """
+    Create a requests Session keeping up to pool_size connections per host open, for concurrent requests.
+
+    :param pool_size: connections kept open per host, at least the number of concurrent requests
+    :param retries: urllib3 retries of the session's requests (none by default)
+    :return: the session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 def post_query(url: str, query: dict, params=None, server: str = "") -> dict:
     """
     Post a JSON query to the specified URL and return the JSON response.
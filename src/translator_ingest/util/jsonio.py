@@ -0,0 +1,101 @@
+"""Fast JSON and JSON lines reading and writing, shared by the pipeline stages and ingests.
+
+JSON is parsed and serialized with orjson, which is several times faster than the standard library json module on the
+KGX records the pipeline handles. Files are read and written through large buffers, and .gz and .zst files are
+(de)compressed transparently, so the same functions read a downloaded ``nodes.jsonl.gz``, a transform's
+``nodes.jsonl.zst`` and a plain ``graph-metadata.json``:
+
+    >>> for edge in iter_jsonl(edges_file_path):
+    ...     ...
+    >>> write_jsonl(output_path, records)
+    >>> graph_metadata = read_json(graph_metadata_path)
+
+A few differences from the json module follow from orjson: ``dumps`` returns bytes, and the only indentation it
+supports is two spaces, which ``indent=True`` selects.
+"""
+
+import gzip
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, Any
+
+import orjson
+
+from translator_ingest.util.compression import open_file
+from translator_ingest.util.decompression import open_gzip
+
+# buffer size of reads and writes, large enough that a line by line loop rarely waits on the file system
+BUFFER_SIZE = 4 * 1024 * 1024
+# lines joined into a single write by write_jsonl
+WRITE_BATCH_SIZE = 10_000
+
+_NEWLINE = b"\n"
+
+loads = orjson.loads
+
+
+def dumps(data: Any, indent: bool = False) -> bytes:
+    """Serialize data to JSON, with two-space indentation if indent is set. Dict keys need not be strings."""
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(data, option=option)
+
+
+def open_binary(file_path: Path | str, mode: str = "rb") -> IO[bytes]:
+    """Open a file for binary reading ("rb") or writing ("wb", "ab"), (de)compressing .gz and .zst files."""
+    if str(file_path).endswith(".gz"):
+        # read with the decompression in a background thread
+        return open_gzip(file_path) if mode == "rb" else gzip.open(file_path, mode)
+    if str(file_path).endswith(".zst"):
+        return open_file(file_path, mode)
+    return open(file_path, mode, buffering=BUFFER_SIZE)
+
+
+def iter_jsonl_lines(file_path: Path | str) -> Iterator[bytes]:
+    """Yield the non-blank lines of a JSON lines file, without their line endings."""
+    with open_binary(file_path) as jsonl_file:
+        for line in jsonl_file:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def iter_jsonl(file_path: Path | str) -> Iterator[Any]:
+    """Yield the records of a JSON lines file one at a time."""
+    for line in iter_jsonl_lines(file_path):
+        yield loads(line)
+
+
+def read_jsonl(file_path: Path | str) -> list[Any]:
+    """Read all the records of a JSON lines file."""
+    return list(iter_jsonl(file_path))
+
+
+def write_jsonl(file_path: Path | str, records: Iterable[Any], append: bool = False) -> int:
+    """Write records to a JSON lines file, a batch of lines at a time, and return the number written."""
+    count = 0
+    batch: list[bytes] = []
+    with open_binary(file_path, "ab" if append else "wb") as jsonl_file:
+        for record in records:
+            batch.append(dumps(record))
+            batch.append(_NEWLINE)
+            count += 1
+            if len(batch) >= WRITE_BATCH_SIZE * 2:
+                jsonl_file.write(b"".join(batch))
+                batch.clear()
+        if batch:
+            jsonl_file.write(b"".join(batch))
+    return count
+
+
+def read_json(file_path: Path | str) -> Any:
+    """Read a JSON file."""
+    with open_binary(file_path) as json_file:
+        return loads(json_file.read())
+
+
+def write_json(file_path: Path | str, data: Any, indent: bool = True):
+    """Write data to a JSON file, indented by default as the pipeline's metadata files are."""
+    with open_binary(file_path, "wb") as json_file:
+        json_file.write(dumps(data, indent=indent))
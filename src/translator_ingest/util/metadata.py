@@ -2,12 +2,14 @@ import re
 import yaml
 from datetime import datetime, timezone
 from dataclasses import dataclass, field, fields, asdict
-from typing import Any, Dict
-
-from orion import KGXKnowledgeSource
+from typing import TYPE_CHECKING, Any, Dict
 
 from translator_ingest import INGESTS_PARSER_PATH
 
+if TYPE_CHECKING:
+    # ORION is only needed at runtime when rig metadata is converted (see get_kgx_source_from_rig)
+    from orion import KGXKnowledgeSource
+
 # Matches a semantic version of the form MAJOR.MINOR.PATCH (e.g. "1.0.0").
 SEMANTIC_VERSION_PATTERN = re.compile(r"^(\d+)\.(\d+)\.(\d+)$")
 
@@ -36,6 +38,9 @@ class PipelineMetadata:
     normalization_strict: bool = True
     # merging_code_version: version of the ORION code that performs the merging process.
     merging_code_version: str | None = None
+    # orion_version: version of the installed ORION package, which pins both normalization_code_version and
+    # merging_code_version, so that a completed build can be recognized without importing ORION
+    orion_version: str | None = None
     biolink_version: str | None = None
     # build_version: a composite version representing all the dependencies which should be considered when determining
     # whether the pipeline needs to be run, or if an ingest was already fully completed
@@ -118,8 +123,10 @@ def next_release_version(previous_release_version: str | None) -> str:
     return f"{major}.{minor}.{patch + 1}"
 
 
-def get_kgx_source_from_rig(source: str) -> KGXKnowledgeSource:
+def get_kgx_source_from_rig(source: str) -> "KGXKnowledgeSource":
     """Read a source's rig YAML file and create a KGXSource instance."""
+    from orion import KGXKnowledgeSource
+
     rig_yaml_file = INGESTS_PARSER_PATH / source / f"{source}_rig.yaml"
     if not rig_yaml_file.exists():
         raise FileNotFoundError(f"Rig YAML file not found for {source}")
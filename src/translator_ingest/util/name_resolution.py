@@ -0,0 +1,172 @@
+"""Name Resolver (NameRes) lookups of free-text names, with a persistent cache of the results.
+
+Ingests which map free-text names to identifiers (e.g. TTD's indication and target names) look the same names up in
+NameRes's bulk-lookup on every transform run, though most of them don't change between source versions.
+``NameResolver`` keeps the result of every lookup in a SQLite cache under the ingest cache directory, keyed by the
+name, the lookup parameters (biolink types, excluded prefixes and the number of hits) and the Babel version NameRes
+serves, so a re-run only looks up the names it hasn't seen, and a new Babel release looks everything up again.
+
+The names missing from the cache are looked up in concurrent batches, over a pooled session which retries failed
+requests:
+
+    >>> resolver = get_name_resolver("https://name-lookup.ci.transltr.io/bulk-lookup")
+    >>> results = resolver.resolve(names, types=["DiseaseOrPhenotypicFeature"], exclude_prefixes="UMLS|MESH")
+    >>> results["type 2 diabetes"][0]["curie"]
+    'MONDO:0005148'
+    >>> resolver.cache_stats()
+    CacheStats(name='nameres', hits=..., misses=..., size=..., maxsize=None)
+
+The results are NameRes's, by name: the list of its hits, best first (empty when it has none).
+"""
+
+import sqlite3
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import batched
+from pathlib import Path
+from typing import Any
+
+import requests
+from requests.adapters import Retry
+
+from translator_ingest import INGESTS_CACHE_PATH
+from translator_ingest.util.curie import CacheStats
+from translator_ingest.util.http_utils import create_pooled_session
+from translator_ingest.util.jsonio import dumps, loads
+from translator_ingest.util.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+NAMERES_CACHE_PATH = INGESTS_CACHE_PATH / "nameres" / "nameres-cache.sqlite"
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_CONCURRENCY = 4
+REQUEST_TIMEOUT = 300
+# failed requests are retried with exponential backoff, as ORION's Node Normalizer requests are
+REQUEST_RETRIES = Retry(total=5, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504],
+                        allowed_methods=["GET", "POST"])
+
+# names looked up in the cache at a time, within SQLite's limit on query parameters
+_CACHE_QUERY_SIZE = 500
+
+
+def get_babel_version(url: str, session: requests.Session | None = None) -> str:
+    """The Babel version a NameRes instance serves, from its status, given the URL of any of its endpoints."""
+    status_url = f"{url.rsplit('/', 1)[0]}/status"
+    response = (session or requests).get(status_url, timeout=60)
+    response.raise_for_status()
+    return response.json()["babel_version"]
+
+
+class NameResolver:
+    """Looks names up with NameRes's bulk-lookup, through a persistent cache of the results.
+
+    :param url: the bulk-lookup endpoint of NameRes
+    :param babel_version: the Babel version NameRes serves, which keys the cache; asked of NameRes if not given
+    :param cache_path: the SQLite cache, shared by the resolvers of all ingests by default
+    """
+
+    def __init__(self, url: str, babel_version: str | None = None, cache_path: Path | str = NAMERES_CACHE_PATH,
+                 concurrency: int = DEFAULT_CONCURRENCY, timeout: float = REQUEST_TIMEOUT):
+        self.url = url
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.session = create_pooled_session(concurrency, retries=REQUEST_RETRIES)
+        self.babel_version = babel_version or get_babel_version(url, self.session)
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # a long timeout, as other processes may be writing to the cache; WAL, so they can read while one writes
+        self.connection = sqlite3.connect(self.cache_path, timeout=60, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results (name TEXT NOT NULL, types TEXT NOT NULL, "
+            "exclude_prefixes TEXT NOT NULL, result_limit INTEGER NOT NULL, babel_version TEXT NOT NULL, "
+            "result TEXT NOT NULL, PRIMARY KEY (name, types, exclude_prefixes, result_limit, babel_version)) "
+            "WITHOUT ROWID"
+        )
+        self.connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self.connection.close()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def cache_stats(self) -> CacheStats:
+        """The hits and misses of the lookups so far, and the number of results in the cache (of any version)."""
+        size = self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return CacheStats("nameres", self.hits, self.misses, size, None)
+
+    def resolve(self, names: Iterable[str], types: list[str] | None = None, exclude_prefixes: str | None = None,
+                limit: int = 1, batch_size: int = DEFAULT_BATCH_SIZE) -> dict[str, list[dict[str, Any]]]:
+        """Look names up, returning NameRes's hits by name.
+
+        :param types: biolink categories the hits should have (hierarchy expansion is supported)
+        :param exclude_prefixes: |-delimited prefixes of identifiers to leave out of the hits
+        :param limit: the number of hits to return per name
+        :param batch_size: the number of names in a bulk-lookup
+        """
+        names = list(dict.fromkeys(names))
+        key = ("|".join(types or ()), exclude_prefixes or "", limit, self.babel_version)
+        results = self._read_cache(names, key)
+        missing_names = [name for name in names if name not in results]
+        self.hits += len(results)
+        self.misses += len(missing_names)
+        if missing_names:
+            logger.info(f"Looking up {len(missing_names)} of {len(names)} names in NameRes "
+                        f"({len(results)} were cached)")
+            request_body = {"autocomplete": False, "limit": limit, "biolink_types": types,
+                            "exclude_prefixes": exclude_prefixes}
+            for batch_results in self._lookup(missing_names, request_body, batch_size):
+                self._write_cache(batch_results, key)
+                results.update(batch_results)
+        stats = self.cache_stats()
+        logger.info(f"NameRes cache: {stats.hits} hits / {stats.calls} names ({stats.hit_rate:.1%} hit rate)")
+        return results
+
+    def _read_cache(self, names: list[str], key: tuple) -> dict[str, list[dict[str, Any]]]:
+        results = {}
+        for names_batch in batched(names, _CACHE_QUERY_SIZE):
+            rows = self.connection.execute(
+                f"SELECT name, result FROM results WHERE name IN ({', '.join('?' * len(names_batch))}) "
+                "AND types = ? AND exclude_prefixes = ? AND result_limit = ? AND babel_version = ?",
+                (*names_batch, *key),
+            )
+            results.update((name, loads(result)) for name, result in rows)
+        return results
+
+    def _write_cache(self, results: dict[str, list[dict[str, Any]]], key: tuple):
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                ((name, *key, dumps(result).decode()) for name, result in results.items()),
+            )
+
+    def _post(self, request_body: dict[str, Any]) -> dict[str, list[dict[str, Any]]]:
+        response = self.session.post(self.url, json=request_body, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _lookup(self, names: list[str], request_body: dict[str, Any],
+                batch_size: int) -> Iterator[dict[str, list[dict[str, Any]]]]:
+        """Look names up in concurrent batches, yielding the results of each batch as it is done."""
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="nameres") as executor:
+            looked_up = 0
+            for batch_results in executor.map(self._post, ({**request_body, "strings": list(batch)}
+                                                            for batch in batched(names, batch_size))):
+                looked_up += len(batch_results)
+                logger.info(f"{looked_up} names looked up (out of {len(names)})")
+                yield batch_results
+
+
+@lru_cache
+def get_name_resolver(url: str) -> NameResolver:
+    """The NameResolver of a bulk-lookup endpoint, shared by the ingests using it, with the default cache."""
+    return NameResolver(url)
@@ -0,0 +1,194 @@
+"""Asynchronous Node Normalizer client, which looks CURIEs up in concurrent, adaptively sized batches.
+
+ORION's NodeNormalizer posts its batches of CURIEs to the Node Normalizer one after the other, so normalization mostly
+waits on the service. ``NodeNormClient`` keeps up to ``concurrency`` batches in flight at a time instead, over a pool
+of kept-alive connections:
+
+- the batch size adapts to the service: it grows while batches come back well within ``target_latency``, shrinks
+  while they take longer, and halves when a batch fails,
+- failed batches (connection errors, timeouts, 429 and 5xx responses) are retried with exponential backoff and full
+  jitter, so concurrent retries don't hit the service in lockstep,
+- a CURIE requested while a batch with it is in flight, e.g. by another concurrent ``normalize`` call, waits for that
+  batch rather than being sent again.
+
+    >>> client = NodeNormClient(node_normalizer_url, concurrency=4)
+    >>> results = await client.normalize(curies)
+    >>> results = client.normalize_sync(curies)  # outside of an event loop
+    >>> results["MONDO:0005148"]["id"]["identifier"]
+
+The results are the Node Normalizer's, by CURIE (None for the ones it can't normalize). The normalization stage looks
+nodes up with the client through ORION (see ``PooledNodeNormalizer`` in normalize.py).
+"""
+
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import requests
+
+from translator_ingest.util.http_utils import create_pooled_session
+from translator_ingest.util.jsonio import dumps, loads
+from translator_ingest.util.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# batches in flight at a time; 1 looks the batches up one after the other, as ORION does
+NODE_NORM_CONCURRENCY = int(os.environ.get("NODE_NORM_CONCURRENCY", "4"))
+# CURIEs in the first batch, adapted between MIN_BATCH_SIZE and MAX_BATCH_SIZE from there
+NODE_NORM_BATCH_SIZE = int(os.environ.get("NODE_NORM_BATCH_SIZE", "2500"))
+MIN_BATCH_SIZE = 100
+MAX_BATCH_SIZE = 10_000
+# batches taking longer than this (in seconds) are made smaller, and ones taking less than half of it larger
+TARGET_BATCH_LATENCY = 5.0
+MAX_RETRIES = 8
+REQUEST_TIMEOUT = 120
+# responses of failed lookups which are retried, as by ORION
+RETRY_STATUS_CODES = frozenset({403, 429, 500, 502, 503, 504})
+
+
+class NodeNormalizationError(RuntimeError):
+    """A batch of CURIEs could not be looked up, after any retries."""
+
+
+class NodeNormClient:
+    """Looks CURIEs up with the Node Normalizer's get_normalized_nodes, in concurrent batches.
+
+    :param url: the base URL of the Node Normalizer
+    :param request_options: other parameters of the lookups, e.g. conflate
+    :param backoff: the base of the exponential backoff of retries, in seconds
+    """
+
+    def __init__(self, url: str, concurrency: int = NODE_NORM_CONCURRENCY, batch_size: int = NODE_NORM_BATCH_SIZE,
+                 min_batch_size: int = MIN_BATCH_SIZE, max_batch_size: int = MAX_BATCH_SIZE,
+                 target_latency: float = TARGET_BATCH_LATENCY, max_retries: int = MAX_RETRIES,
+                 backoff: float = 1.0, max_backoff: float = 60.0, timeout: float = REQUEST_TIMEOUT,
+                 request_options: dict[str, Any] | None = None):
+        self.endpoint = f"{url.rstrip('/')}/get_normalized_nodes"
+        self.concurrency = max(concurrency, 1)
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.batch_size = min(max(batch_size, min_batch_size), max_batch_size)
+        self.target_latency = target_latency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.request_options = request_options or {}
+        # requests blocks, so the lookups run in a thread per batch in flight, each with a pooled connection
+        self.session = create_pooled_session(self.concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="node-norm")
+        # CURIEs waiting for a batch, and the futures of their results until they're looked up
+        self._pending: deque[str] = deque()
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self._workers: set[asyncio.Task] = set()
+        self.stats = {"curies": 0, "deduplicated_curies": 0, "batches": 0, "retries": 0}
+
+    def close(self):
+        self._executor.shutdown()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def normalize_sync(self, curies: Iterable[str]) -> dict[str, dict[str, Any] | None]:
+        """Look CURIEs up, from outside of an event loop."""
+        return asyncio.run(self.normalize(curies))
+
+    async def normalize(self, curies: Iterable[str]) -> dict[str, dict[str, Any] | None]:
+        """Look CURIEs up, returning the Node Normalizer's result by CURIE (None if it can't normalize it)."""
+        loop = asyncio.get_running_loop()
+        futures: dict[str, asyncio.Future] = {}
+        for curie in curies:
+            if curie in futures:
+                continue
+            future = self._in_flight.get(curie)
+            if future is None:
+                future = self._in_flight[curie] = loop.create_future()
+                self._pending.append(curie)
+            else:
+                self.stats["deduplicated_curies"] += 1
+            futures[curie] = future
+        # a worker per batch, up to the concurrency; running workers take on the new CURIEs too
+        batches = -(-len(self._pending) // self.batch_size)
+        for _ in range(min(batches, self.concurrency - len(self._workers))):
+            worker = asyncio.create_task(self._work())
+            self._workers.add(worker)
+            worker.add_done_callback(self._workers.discard)
+        # gathered, rather than awaited one by one, so all the errors of failed lookups are retrieved
+        results = await asyncio.gather(*futures.values())
+        return dict(zip(futures, results, strict=True))
+
+    async def _work(self):
+        while self._pending:
+            batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+            try:
+                results = await self._lookup(batch)
+            except (Exception, asyncio.CancelledError) as error:
+                # the service is failing, so the CURIEs still waiting are failed too rather than retried all over
+                failure = error if isinstance(error, Exception) else NodeNormalizationError("Lookup cancelled")
+                self._fail(batch + list(self._pending), failure)
+                self._pending.clear()
+                if isinstance(error, asyncio.CancelledError):
+                    raise
+                return
+            for curie in batch:
+                self._in_flight.pop(curie).set_result(results.get(curie))
+
+    def _fail(self, curies: list[str], error: Exception):
+        for curie in curies:
+            future = self._in_flight.pop(curie, None)
+            if future is not None and not future.done():
+                future.set_exception(error)
+
+    def _post(self, batch: list[str]) -> requests.Response:
+        return self.session.post(self.endpoint, data=dumps({"curies": batch, **self.request_options}),
+                                 headers={"Content-Type": "application/json"}, timeout=self.timeout)
+
+    async def _lookup(self, batch: list[str]) -> dict[str, dict[str, Any] | None]:
+        """Look a batch up, retrying it with jittered exponential backoff, and adapt the batch size to how it went."""
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                response = await loop.run_in_executor(self._executor, self._post, batch)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                reason = repr(error)
+            else:
+                if response.status_code == 200 and (results := loads(response.content)):
+                    self._adapt_batch_size(time.perf_counter() - start, failed=False)
+                    self.stats["batches"] += 1
+                    self.stats["curies"] += len(batch)
+                    return results
+                if response.status_code != 200 and response.status_code not in RETRY_STATUS_CODES:
+                    raise NodeNormalizationError(f"Node Normalizer {self.endpoint} returned {response.status_code} "
+                                                 f"for a batch of {len(batch)} CURIEs")
+                reason = f"status {response.status_code}" if response.status_code != 200 else "an empty result"
+            self._adapt_batch_size(time.perf_counter() - start, failed=True)
+            if attempt == self.max_retries:
+                break
+            self.stats["retries"] += 1
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+            logger.warning(f"Node Normalizer lookup of {len(batch)} CURIEs failed with {reason}, "
+                           f"retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        raise NodeNormalizationError(f"Node Normalizer lookup of {len(batch)} CURIEs failed with {reason} "
+                                     f"after {self.max_retries} retries")
+
+    def _adapt_batch_size(self, latency: float, failed: bool):
+        if failed:
+            batch_size = self.batch_size // 2
+        elif latency > self.target_latency:
+            batch_size = int(self.batch_size * 0.75)
+        elif latency < self.target_latency / 2:
+            batch_size = int(self.batch_size * 1.25)
+        else:
+            return
+        self.batch_size = min(max(batch_size, self.min_batch_size), self.max_batch_size)
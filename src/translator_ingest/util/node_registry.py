@@ -0,0 +1,176 @@
+"""Disk-backed lookup of KGX node records by id.
+
+Several ingests (ctkp, dakp, geneticskp) receive their source data as a pair of KGX
+nodes/edges JSONL files and only iterate the edges with Koza, looking up the subject and
+object node records as they go. Holding every node record in a Python dict costs memory
+proportional to the whole node corpus, so instead the nodes file is indexed once into a
+compact SQLite table sitting next to it in the source data directory, and node payloads
+are decoded lazily on lookup.
+
+The index is keyed to the size and modification time of the nodes file it was built from,
+so it is reused on reruns of the same source version and rebuilt if the file changes.
+
+Usage:
+    >>> registry = NodeRegistry.from_jsonl(Path(koza.input_files_dir) / "nodes.jsonl.gz")
+    >>> koza.state["nodes_lookup"] = registry
+    >>> registry.get("MONDO:0005148")
+    {'id': 'MONDO:0005148', 'name': 'type 2 diabetes mellitus', ...}
+    >>> registry.close()  # e.g. in the @koza.on_data_end hook, or use the registry as a context manager
+"""
+
+import sqlite3
+from collections import OrderedDict
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Self
+
+from translator_ingest.util.jsonio import iter_jsonl_lines, loads
+from translator_ingest.util.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+NODE_INDEX_SUFFIX = ".node_index.sqlite"
+
+# number of decoded node records kept in memory for repeat lookups
+DEFAULT_CACHE_SIZE = 100_000
+
+_BATCH_SIZE = 10_000
+
+
+def get_node_index_path(nodes_file_path: Path) -> Path:
+    """Location of the SQLite node index built for ``nodes_file_path``."""
+    return nodes_file_path.with_name(nodes_file_path.name + NODE_INDEX_SUFFIX)
+
+
+def _source_signature(file_path: Path) -> str:
+    stat = file_path.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _iter_node_lines(nodes_file_path: Path) -> Iterator[tuple[str, str]]:
+    for line in iter_jsonl_lines(nodes_file_path):
+        node_id = loads(line).get("id")
+        if node_id:
+            yield node_id, line.decode()
+
+
+def build_node_index(nodes_file_path: Path, index_path: Path | None = None) -> Path:
+    """Index a (optionally gzipped) KGX nodes JSONL file into a SQLite table keyed by node id.
+
+    The index is written to a temporary file and moved into place once complete, so an
+    interrupted build never leaves a partial index behind. If a node id occurs more than once,
+    the last record wins, matching the behaviour of loading the file into a dict.
+
+    :param nodes_file_path: path to the KGX nodes JSONL (or JSONL.gz) file
+    :param index_path: where to write the index (defaults to a sibling of the nodes file)
+    :return: path to the completed index
+    """
+    nodes_file_path = Path(nodes_file_path)
+    index_path = Path(index_path) if index_path else get_node_index_path(nodes_file_path)
+    temp_index_path = index_path.with_name(index_path.name + ".tmp")
+    temp_index_path.unlink(missing_ok=True)
+
+    logger.info(f"Building node index for {nodes_file_path.name}...")
+    node_count = 0
+    connection = sqlite3.connect(temp_index_path)
+    try:
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        connection.execute("CREATE TABLE nodes (id TEXT PRIMARY KEY, payload TEXT NOT NULL) WITHOUT ROWID")
+        batch: list[tuple[str, str]] = []
+        for node_id, payload in _iter_node_lines(nodes_file_path):
+            batch.append((node_id, payload))
+            if len(batch) >= _BATCH_SIZE:
+                connection.executemany("INSERT OR REPLACE INTO nodes VALUES (?, ?)", batch)
+                node_count += len(batch)
+                batch.clear()
+        if batch:
+            connection.executemany("INSERT OR REPLACE INTO nodes VALUES (?, ?)", batch)
+            node_count += len(batch)
+        connection.execute("INSERT INTO meta VALUES ('source_signature', ?)", (_source_signature(nodes_file_path),))
+        connection.commit()
+    finally:
+        connection.close()
+
+    temp_index_path.replace(index_path)
+    logger.info(f"Indexed {node_count} node records into {index_path.name}")
+    return index_path
+
+
+def is_node_index_current(nodes_file_path: Path, index_path: Path | None = None) -> bool:
+    """Check whether an existing node index was built from the current version of ``nodes_file_path``."""
+    nodes_file_path = Path(nodes_file_path)
+    index_path = Path(index_path) if index_path else get_node_index_path(nodes_file_path)
+    if not index_path.exists():
+        return False
+    try:
+        connection = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+        try:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'source_signature'").fetchone()
+        finally:
+            connection.close()
+    except sqlite3.DatabaseError:
+        return False
+    return row is not None and row[0] == _source_signature(nodes_file_path)
+
+
+class NodeRegistry:
+    """Read-only mapping of node id to KGX node record, backed by a SQLite node index.
+
+    Supports the subset of the ``dict`` interface the ingests use on their node lookups
+    (``get``, ``in``, ``[]`` and ``len``), so it can be dropped into ``koza.state`` in place
+    of a fully materialized dict. Decoded records are kept in a bounded LRU cache so memory
+    stays proportional to the working set of nodes referenced by nearby edges.
+    """
+
+    def __init__(self, index_path: Path, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.index_path = Path(index_path)
+        self.cache_size = cache_size
+        self._connection = sqlite3.connect(f"file:{self.index_path}?mode=ro", uri=True)
+        self._cache: OrderedDict[str, dict[str, Any] | None] = OrderedDict()
+
+    @classmethod
+    def from_jsonl(cls, nodes_file_path: Path, cache_size: int = DEFAULT_CACHE_SIZE) -> "NodeRegistry":
+        """Open a registry over ``nodes_file_path``, building its index only if missing or stale."""
+        nodes_file_path = Path(nodes_file_path)
+        index_path = get_node_index_path(nodes_file_path)
+        if is_node_index_current(nodes_file_path, index_path):
+            logger.info(f"Reusing existing node index {index_path.name}")
+        else:
+            build_node_index(nodes_file_path, index_path)
+        return cls(index_path, cache_size=cache_size)
+
+    def get(self, node_id: str, default: Any = None) -> dict[str, Any] | Any:
+        if node_id in self._cache:
+            self._cache.move_to_end(node_id)
+            node = self._cache[node_id]
+        else:
+            row = self._connection.execute("SELECT payload FROM nodes WHERE id = ?", (node_id,)).fetchone()
+            node = loads(row[0]) if row else None
+            self._cache[node_id] = node
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return default if node is None else node
+
+    def __getitem__(self, node_id: str) -> dict[str, Any]:
+        node = self.get(node_id)
+        if node is None:
+            raise KeyError(node_id)
+        return node
+
+    def __contains__(self, node_id: object) -> bool:
+        return isinstance(node_id, str) and self.get(node_id) is not None
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+
+    def close(self) -> None:
+        self._connection.close()
+        self._cache.clear()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
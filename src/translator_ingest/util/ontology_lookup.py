@@ -0,0 +1,232 @@
+"""Lookups of ontology terms by exact synonym, through a persistent cache keyed by the ontology release.
+
+Some ingests map source values to ontology terms which have them as exact synonyms, e.g. gene2phenotype maps its
+allelic requirement values ("biallelic_autosomal", ...) to HPO terms. ``OntologyLookup`` searches for them in the
+Ontology Lookup Service (OLS), all at once in concurrent requests, and keeps the results in a SQLite cache under the
+ingest cache directory, keyed by the release of the ontology OLS serves. The release is asked of OLS once per lookup
+object, so a run against the same release is answered from the cache, and a new release is looked up again:
+
+    >>> lookup = get_ontology_lookup("hp")
+    >>> lookup.find_by_exact_synonym(["biallelic_autosomal", "monoallelic_autosomal"])
+    {'biallelic_autosomal': 'HP:0000007', 'monoallelic_autosomal': 'HP:0000006'}
+    >>> lookup.cache_stats()
+    CacheStats(name='ontology_lookup.hp', hits=..., misses=..., size=..., maxsize=None)
+
+In offline mode, the terms are found in a local copy of the ontology instead, in OBO or obographs JSON format: the
+file given, or the most recent ``{ontology}.obo`` or ``{ontology}.json`` downloaded by an ingest into the data
+directory. Offline mode is on when a file is given or ONTOLOGY_LOOKUP_OFFLINE is set:
+
+    >>> lookup = OntologyLookup("hp", ontology_file="data/hpoa/2025-05-06/source_data/hp.obo")
+
+Values no term has as an exact synonym map to None.
+"""
+
+import os
+import re
+import sqlite3
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from pathlib import Path
+
+from requests.adapters import Retry
+
+from translator_ingest import INGESTS_CACHE_PATH, INGESTS_DATA_PATH
+from translator_ingest.util.curie import CacheStats
+from translator_ingest.util.http_utils import create_pooled_session
+from translator_ingest.util.jsonio import read_json
+from translator_ingest.util.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+OLS_URL = os.environ.get("OLS_URL", "https://www.ebi.ac.uk/ols4/api")
+# look terms up in local copies of the ontologies instead of OLS
+ONTOLOGY_LOOKUP_OFFLINE = os.environ.get("ONTOLOGY_LOOKUP_OFFLINE", "").lower() in ("1", "true", "yes")
+ONTOLOGY_LOOKUP_CACHE_PATH = INGESTS_CACHE_PATH / "ontology_lookup" / "ontology-lookup-cache.sqlite"
+
+DEFAULT_CONCURRENCY = 8
+REQUEST_TIMEOUT = 30
+REQUEST_RETRIES = Retry(total=5, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+
+# the release date in an OBO data-version (hp/releases/2025-05-06/hp.obo) or an obographs version IRI
+_RELEASE_PATTERN = re.compile(r"releases/([^/]+)/")
+_OBO_SYNONYM_PATTERN = re.compile(r'^synonym: "(.*)" EXACT')
+
+
+def find_local_ontology_file(ontology: str, data_dir: Path = INGESTS_DATA_PATH) -> Path | None:
+    """The most recent copy of an ontology an ingest downloaded, as {ontology}.obo or {ontology}.json."""
+    candidates = [path for file_name in (f"{ontology}.obo", f"{ontology}.json")
+                  for path in Path(data_dir).glob(f"*/*/source_data/{file_name}")]
+    return max(candidates, key=lambda path: path.stat().st_mtime, default=None)
+
+
+def _release_of(version: str) -> str:
+    match = _RELEASE_PATTERN.search(version)
+    return match.group(1) if match else version
+
+
+def read_exact_synonyms(ontology_file: Path) -> tuple[str, dict[str, str]]:
+    """Read the release of an OBO or obographs JSON ontology, and its terms by (lowercase) exact synonym.
+
+    Obsolete terms are left out; a synonym of several terms maps to the first one.
+    """
+    ontology_file = Path(ontology_file)
+    version = ""
+    term_by_synonym: dict[str, str] = {}
+    if ontology_file.suffix == ".json":
+        graph = read_json(ontology_file)["graphs"][0]
+        version = graph.get("meta", {}).get("version", "")
+        for node in graph.get("nodes", []):
+            meta = node.get("meta", {})
+            if meta.get("deprecated"):
+                continue
+            # e.g. http://purl.obolibrary.org/obo/HP_0000007
+            term_id = node["id"].rsplit("/", 1)[-1].replace("_", ":", 1)
+            for synonym in meta.get("synonyms", []):
+                if synonym.get("pred") == "hasExactSynonym":
+                    term_by_synonym.setdefault(synonym["val"].lower(), term_id)
+        return _release_of(version), term_by_synonym
+
+    term_id, synonyms, obsolete, in_term = None, [], False, False
+    with open(ontology_file) as obo_file:
+        for line in obo_file:
+            line = line.rstrip("\n")
+            if line.startswith("data-version:") and not version:
+                version = line.split(":", 1)[1].strip()
+            elif line.startswith("["):
+                if term_id and not obsolete:
+                    for synonym in synonyms:
+                        term_by_synonym.setdefault(synonym, term_id)
+                term_id, synonyms, obsolete = None, [], False
+                in_term = line == "[Term]"
+            elif line.startswith("id: ") and in_term:
+                term_id = line[4:].strip()
+            elif line == "is_obsolete: true":
+                obsolete = True
+            elif match := _OBO_SYNONYM_PATTERN.match(line):
+                synonyms.append(match.group(1).lower())
+    if term_id and not obsolete:
+        for synonym in synonyms:
+            term_by_synonym.setdefault(synonym, term_id)
+    return _release_of(version), term_by_synonym
+
+
+class OntologyLookup:
+    """Finds the terms of an ontology with given exact synonyms, in OLS or a local file, through a persistent cache.
+
+    :param ontology: the OLS id of the ontology, e.g. hp
+    :param ontology_file: a local copy of the ontology to look terms up in, offline
+    :param offline: look terms up in ontology_file, or else the copy find_local_ontology_file finds, not OLS
+    :param cache_path: the SQLite cache, shared by all the ontologies by default
+    """
+
+    def __init__(self, ontology: str, ontology_file: Path | str | None = None,
+                 offline: bool = ONTOLOGY_LOOKUP_OFFLINE, cache_path: Path | str = ONTOLOGY_LOOKUP_CACHE_PATH,
+                 ols_url: str = OLS_URL, concurrency: int = DEFAULT_CONCURRENCY):
+        self.ontology = ontology
+        self.offline = offline or ontology_file is not None
+        self.ontology_file = Path(ontology_file) if ontology_file else None
+        if self.offline and self.ontology_file is None:
+            self.ontology_file = find_local_ontology_file(ontology)
+            if self.ontology_file is None:
+                raise FileNotFoundError(f"No local copy of {ontology} was found in {INGESTS_DATA_PATH} for an "
+                                        f"offline lookup")
+        self.ols_url = ols_url.rstrip("/")
+        self.concurrency = concurrency
+        self.session = create_pooled_session(concurrency, retries=REQUEST_RETRIES)
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.cache_path, timeout=60, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS exact_synonyms (ontology TEXT NOT NULL, version TEXT NOT NULL, "
+            "synonym TEXT NOT NULL, term_id TEXT, PRIMARY KEY (ontology, version, synonym)) WITHOUT ROWID"
+        )
+        self.connection.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self.connection.close()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @cached_property
+    def _local_ontology(self) -> tuple[str, dict[str, str]]:
+        logger.info(f"Reading the exact synonyms of {self.ontology} from {self.ontology_file}")
+        return read_exact_synonyms(self.ontology_file)
+
+    @cached_property
+    def version(self) -> str:
+        """The release of the ontology the terms are looked up in, resolved once."""
+        if self.offline:
+            # the version is in the header of OBO files, so they're only read if a synonym isn't cached
+            if self.ontology_file.suffix == ".obo":
+                with open(self.ontology_file) as obo_file:
+                    for line in obo_file:
+                        if line.startswith("data-version:"):
+                            return _release_of(line.split(":", 1)[1].strip())
+                        if line.startswith("["):
+                            break
+            return self._local_ontology[0]
+        response = self.session.get(f"{self.ols_url}/ontologies/{self.ontology}", timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        config = response.json()["config"]
+        return _release_of(config.get("version") or config["versionIri"])
+
+    def cache_stats(self) -> CacheStats:
+        size = self.connection.execute("SELECT COUNT(*) FROM exact_synonyms WHERE ontology = ?",
+                                       (self.ontology,)).fetchone()[0]
+        return CacheStats(f"ontology_lookup.{self.ontology}", self.hits, self.misses, size, None)
+
+    def find_by_exact_synonym(self, synonyms: Iterable[str]) -> dict[str, str | None]:
+        """Find the terms with the given exact synonyms, returning the term id (None if there's none) by synonym."""
+        synonyms = list(dict.fromkeys(synonyms))
+        key = (self.ontology, self.version)
+        terms: dict[str, str | None] = {}
+        for synonym in synonyms:
+            row = self.connection.execute(
+                "SELECT term_id FROM exact_synonyms WHERE ontology = ? AND version = ? AND synonym = ?",
+                (*key, synonym),
+            ).fetchone()
+            if row is not None:
+                terms[synonym] = row[0]
+        missing_synonyms = [synonym for synonym in synonyms if synonym not in terms]
+        self.hits += len(terms)
+        self.misses += len(missing_synonyms)
+        if missing_synonyms:
+            logger.info(f"Looking up {len(missing_synonyms)} exact synonyms in {self.ontology} {self.version}"
+                        f"{f' ({self.ontology_file})' if self.offline else ' (OLS)'}")
+            if self.offline:
+                term_by_synonym = self._local_ontology[1]
+                found = {synonym: term_by_synonym.get(synonym.lower()) for synonym in missing_synonyms}
+            else:
+                with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="ols") as executor:
+                    found = dict(zip(missing_synonyms, executor.map(self._search_ols, missing_synonyms), strict=True))
+            with self.connection:
+                self.connection.executemany("INSERT OR REPLACE INTO exact_synonyms VALUES (?, ?, ?, ?)",
+                                            ((*key, synonym, term_id) for synonym, term_id in found.items()))
+            terms.update(found)
+        not_found = [synonym for synonym in synonyms if terms[synonym] is None]
+        if not_found:
+            logger.warning(f"No {self.ontology} term has the exact synonyms {', '.join(not_found)}")
+        return {synonym: terms[synonym] for synonym in synonyms}
+
+    def _search_ols(self, synonym: str) -> str | None:
+        response = self.session.get(f"{self.ols_url}/search", timeout=REQUEST_TIMEOUT, params={
+            "q": synonym, "ontology": self.ontology, "queryFields": "synonym", "exact": "true",
+        })
+        response.raise_for_status()
+        docs = response.json()["response"]["docs"]
+        return docs[0]["obo_id"] if docs else None
+
+
+@lru_cache
+def get_ontology_lookup(ontology: str) -> OntologyLookup:
+    """The OntologyLookup of an ontology, shared by the ingests using it, configured by the environment."""
+    return OntologyLookup(ontology)
@@ -0,0 +1,197 @@
+"""Read the input of a ``@koza.prepare_data`` function as a polars LazyFrame.
+
+A prepare_data function gets the rows of its koza reader as an iterator of dicts. Ingests that process them as a
+table used to build a pandas DataFrame from the dicts and turn it back into dicts afterwards, holding the data in
+memory three times over. ``scan_koza_data`` instead scans the files of the reader with polars, with the delimiter,
+header, columns, types and filters of the reader config, so the rows are only ever held as one columnar table, and
+``iter_records`` hands the result to the transform one row at a time:
+
+    >>> @koza.prepare_data()
+    ... def prepare(koza_transform: koza.KozaTransform, data: Iterable[dict[str, Any]]) -> Iterable[dict[str, Any]]:
+    ...     frame = scan_koza_data(data).filter(pl.col("confidence") != "refuted")
+    ...     return iter_records(frame)
+
+The pipeline passes the data of each koza reader to the transform as ``KozaReaderData``, the records along with the
+config of the reader, which ``scan_koza_data`` scans the files of; the reader config can also be given to it directly.
+
+The rows of the LazyFrame are the rows koza would read: values are stripped, empty values are empty strings, rows
+whose first field starts with the comment character are left out (quoted or not), columns declared as int or float
+in the reader config are cast, and the filters and row limit of the reader are applied.
+
+Data without a CSV reader config for local files (e.g. rows passed in by a test, or the data of a JSON reader) is
+turned into a LazyFrame from the rows themselves.
+"""
+
+import csv
+import gzip
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+import polars as pl
+
+from translator_ingest.util.compression import open_file
+from translator_ingest.util.decompression import is_gzip_file
+from translator_ingest.util.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+_FIELD_TYPES = {"int": pl.Int64, "float": pl.Float64}
+
+
+@dataclass
+class KozaReaderData:
+    """The records of a koza reader, with the reader config, base directory and row limit of its Source.
+
+    Iterating over it iterates over the records; once it has been, scan_koza_data reads the rest of the records
+    rather than scanning the files.
+    """
+
+    records: Iterable[dict[str, Any]]
+    reader_config: Any
+    base_directory: Path | None = None
+    row_limit: int = 0
+    started: bool = False
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        self.started = True
+        return iter(self.records)
+
+
+def _unsupported(reader_config) -> str | None:
+    """Why a reader config can not be scanned with polars, or None if it can."""
+    from koza.model.formats import InputFormat
+
+    if reader_config.format != InputFormat.csv:
+        return f"{reader_config.format} format"
+    if reader_config.file_archive:
+        return "file archive"
+    if reader_config.header_prefix or reader_config.header_delimiter:
+        return "header prefix or delimiter"
+    if any("://" in file_name for file_name in reader_config.files):
+        return "remote files"
+    return None
+
+
+def _filter_expression(column_filter) -> pl.Expr:
+    """A polars expression for a koza ColumnFilter, with the semantics of koza's RowFilter."""
+    column = pl.col(column_filter.column)
+    value = column_filter.value
+    match column_filter.filter_code:
+        case "gt":
+            match = column > value
+        case "ge":
+            match = column >= value
+        case "lt":
+            match = column < value
+        case "le":
+            match = column <= value
+        case "eq":
+            match = column == value
+        case "ne":
+            match = column != value
+        case "in":
+            # koza also includes string values which contain any of the listed values
+            match = column.is_in(value)
+            for substring in (item for item in value if isinstance(item, str)):
+                match = match | column.cast(pl.String).str.contains(substring, literal=True)
+        case "in_exact":
+            match = column.is_in(value)
+        case _:
+            raise ValueError(f"No such operator for filter code `{column_filter.filter_code}`")
+    if column_filter.inclusion == "exclude":
+        match = ~match
+    # koza drops rows without a value for a filtered column
+    return column.is_not_null() & match.fill_null(False)
+
+
+def _open_text(file: Path) -> IO[str]:
+    return gzip.open(file, "rt", encoding="utf-8") if is_gzip_file(file) else open_file(file)
+
+
+def _leading_comment_lines(file: Path, reader_config, delimiter: str) -> int:
+    """The number of lines koza skips before the header of a file: blank lines and rows whose first field starts
+    with the comment character, as read by the csv module (so quoted comments, e.g. "# Version 1", are included)."""
+    comment_char = reader_config.comment_char
+    with _open_text(file) as text_file:
+        csv_reader = csv.reader(text_file, dialect=reader_config.dialect, delimiter=delimiter)
+        for row in csv_reader:
+            if row and not (comment_char and row[0].startswith(comment_char)):
+                return csv_reader.line_num - 1
+        return csv_reader.line_num
+
+
+def scan_reader(reader_config, base_directory: Path | None = None, row_limit: int = 0) -> pl.LazyFrame:
+    """Scan the files of a koza CSV reader config as a LazyFrame of the rows koza would read."""
+    files = [Path(file_name) for file_name in reader_config.files]
+    if base_directory is not None:
+        files = [file if file.is_absolute() else Path(base_directory) / file for file in files]
+    delimiter = " " if reader_config.delimiter == "\\s" else reader_config.delimiter
+    comment_char = reader_config.comment_char
+    field_types = reader_config.field_type_map or {}
+
+    def scan_options(file: Path) -> dict[str, Any]:
+        match reader_config.header_mode:
+            case "none":
+                return {"has_header": False, "new_columns": list(field_types)}
+            case "infer":
+                return {"has_header": True, "skip_lines": _leading_comment_lines(file, reader_config, delimiter)}
+            case int(header_row):
+                # koza counts the lines before the header as they are, comments included
+                return {"has_header": True, "skip_lines": header_row}
+        return {}
+
+    frames = []
+    for file in files:
+        file_frame = pl.scan_csv(
+            file,
+            separator=delimiter,
+            comment_prefix=comment_char or None,
+            infer_schema=False,
+            missing_utf8_is_empty_string=True,
+            **scan_options(file),
+        )
+        if comment_char:
+            # comment_prefix only skips the lines starting with it, not quoted comments, which koza skips too
+            first_column = file_frame.collect_schema().names()[0]
+            file_frame = file_frame.filter(~pl.col(first_column).str.starts_with(comment_char))
+        frames.append(file_frame)
+    frame = pl.concat(frames, how="vertical") if len(frames) > 1 else frames[0]
+    frame = frame.with_columns(pl.all().str.strip_chars())
+    typed_columns = {column: _FIELD_TYPES[field_type] for column, field_type in field_types.items()
+                     if field_type in _FIELD_TYPES}
+    if typed_columns:
+        frame = frame.with_columns(pl.col(column).cast(dtype) for column, dtype in typed_columns.items())
+    for column_filter in reader_config.filters:
+        frame = frame.filter(_filter_expression(column_filter))
+    if row_limit:
+        frame = frame.head(row_limit)
+    return frame
+
+
+def scan_koza_data(data: Iterable[dict[str, Any]], reader_config=None, base_directory: Path | None = None,
+                   row_limit: int = 0) -> pl.LazyFrame:
+    """The data given to a ``@koza.prepare_data`` function as a LazyFrame, scanned from the files of its reader.
+
+    :param data: the records of the reader, as KozaReaderData (with its config) from the pipeline
+    :param reader_config: the koza reader config to scan the files of, instead of the config of the KozaReaderData
+    """
+    if reader_config is None and isinstance(data, KozaReaderData) and not data.started:
+        reader_config, base_directory, row_limit = data.reader_config, data.base_directory, data.row_limit
+    if reader_config is not None:
+        reason = _unsupported(reader_config)
+        if reason is None:
+            return scan_reader(reader_config, base_directory, row_limit)
+        logger.info(f"Reading the rows of a koza reader with {reason} into a DataFrame")
+    rows = list(data)
+    if not rows:
+        return pl.LazyFrame()
+    return pl.from_dicts(rows, infer_schema_length=None).lazy()
+
+
+def iter_records(frame: pl.LazyFrame | pl.DataFrame) -> Iterator[dict[str, Any]]:
+    """Collect a frame and iterate over its rows as dicts, for the transform of a prepare_data function."""
+    if isinstance(frame, pl.LazyFrame):
+        frame = frame.collect()
+    return frame.iter_rows(named=True)
@@ -0,0 +1,206 @@
+"""Profile a pipeline stage to find where an ingest spends its time.
+
+``profile_stage`` runs the code inside it under one of two profilers and writes the results to the source's log
+directory (``logs/{source}/{timestamp}/``):
+
+- ``sampling`` (default): a statistical profiler which samples the Python stack of the main thread every few
+  milliseconds of CPU time, using ``SIGPROF``. The overhead is low enough to profile a full production run. It
+  writes ``profile-{stage}.collapsed``, one ``frame;frame;frame count`` line per distinct stack, which is the input
+  format of flamegraph.pl, speedscope and most other flame graph viewers.
+- ``deterministic``: ``cProfile``, which records every call with exact call counts at a much higher overhead. It
+  writes ``profile-{stage}.prof`` for pstats, snakeviz or flameprof.
+
+Both modes write ``profile-{stage}.txt``, a summary of the top hotspots. For a transform, the summary also has a
+breakdown for each of the ingest's koza hooks (``@koza.prepare_data``, ``@koza.transform_record``, ...), so a slow
+ingest can be narrowed down to the hook and the functions it spends its time in:
+
+    >>> with profile_stage("transform", source="pathbank", hook_functions=get_koza_hook_functions(module)):
+    ...     transform(pipeline_metadata)
+"""
+
+import cProfile
+import io
+import pstats
+import signal
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from enum import StrEnum
+from pathlib import Path
+from types import FrameType, ModuleType
+
+from translator_ingest import INGESTS_LOGS_PATH
+from translator_ingest.util.logging_utils import get_current_log_dir, get_logger
+
+logger = get_logger(__name__)
+
+# CPU seconds between two samples of the sampling profiler
+DEFAULT_SAMPLING_INTERVAL = 0.005
+DEFAULT_TOP_N = 25
+
+# A function as pstats identifies it: (filename, first line number, function name)
+FunctionKey = tuple[str, int, str]
+
+
+class ProfileMode(StrEnum):
+    SAMPLING = "sampling"
+    DETERMINISTIC = "deterministic"
+
+
+def _function_key(function: Callable) -> FunctionKey:
+    code = function.__code__
+    return code.co_filename, code.co_firstlineno, code.co_name
+
+
+def _label(key: FunctionKey) -> str:
+    filename, line_number, function_name = key
+    return f"{function_name} ({Path(filename).name}:{line_number})"
+
+
+def get_koza_hook_functions(module: ModuleType) -> list[Callable]:
+    """Get the functions of an ingest module decorated with a koza hook (@koza.transform_record etc.)."""
+    from koza.decorators import KozaTransformHook
+
+    return [hook.fn for hook in vars(module).values() if isinstance(hook, KozaTransformHook)]
+
+
+class SamplingProfiler:
+    """Statistical profiler which counts the Python stacks of the main thread at a fixed CPU time interval.
+
+    Only one can run at a time, and only in the main thread, because it is driven by the process-wide SIGPROF timer.
+    Time spent in other threads and in native code is attributed to the main thread's Python stack at that moment.
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLING_INTERVAL):
+        self.interval = interval
+        self.samples: Counter[tuple[FunctionKey, ...]] = Counter()
+        self._previous_handler = None
+
+    def _sample(self, signum: int, frame: FrameType | None):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        self.samples[tuple(reversed(stack))] += 1
+
+    def start(self):
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+
+    def write_collapsed_stacks(self, output_path: Path):
+        """Write the samples in the collapsed stack format used by flame graph tools."""
+        with output_path.open("w") as collapsed_file:
+            for stack, count in self.samples.most_common():
+                collapsed_file.write(f"{';'.join(_label(key) for key in stack)} {count}\n")
+
+    def hotspots(self, within: FunctionKey | None = None, top_n: int = DEFAULT_TOP_N) -> tuple[int, list]:
+        """Count the samples spent in each function itself, optionally only for samples taken inside ``within``.
+
+        Returns:
+            The number of samples considered and the top_n (function, samples) pairs
+        """
+        self_samples: Counter[FunctionKey] = Counter()
+        for stack, count in self.samples.items():
+            if within is None or within in stack:
+                self_samples[stack[-1]] += count
+        return self_samples.total(), self_samples.most_common(top_n)
+
+    def summary(self, hook_functions: list[Callable], top_n: int = DEFAULT_TOP_N) -> str:
+        total, hotspots = self.hotspots(top_n=top_n)
+        lines = [f"{total} samples, one every {self.interval * 1000:g} ms of CPU time", "",
+                 "Top functions by self time (samples, % of all samples):"]
+        lines += [f"  {count:>8} {count / total:6.1%}  {_label(key)}" for key, count in hotspots]
+
+        for hook_function in hook_functions:
+            hook_key = _function_key(hook_function)
+            hook_total, hook_hotspots = self.hotspots(within=hook_key, top_n=top_n)
+            lines += ["", f"{_label(hook_key)}: {hook_total} samples ({hook_total / max(total, 1):.1%})"]
+            lines += [f"  {count:>8} {count / hook_total:6.1%}  {_label(key)}" for key, count in hook_hotspots]
+        return "\n".join(lines) + "\n"
+
+
+def deterministic_summary(profiler: cProfile.Profile, hook_functions: list[Callable],
+                          top_n: int = DEFAULT_TOP_N) -> str:
+    """Summarize a cProfile run: the top functions overall and the top callees of each hook function."""
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top_n)
+    lines = [output.getvalue().rstrip()]
+
+    for hook_function in hook_functions:
+        hook_key = _function_key(hook_function)
+        if hook_key not in stats.stats:
+            lines += ["", f"{_label(hook_key)}: not called"]
+            continue
+        _, call_count, self_time, cumulative_time, _ = stats.stats[hook_key]
+        lines += ["",
+                  f"{_label(hook_key)}: {call_count} calls, {cumulative_time:.3f}s cumulative, {self_time:.3f}s self",
+                  "  Top callees by cumulative time when called from it (calls, seconds):"]
+        # pstats only keeps caller -> callee edges, so the callees are the functions listing the hook as a caller
+        callees = [(callers[hook_key], key) for key, (*_, callers) in stats.stats.items() if hook_key in callers]
+        callees.sort(key=lambda callee: callee[0][3], reverse=True)
+        lines += [f"  {calls:>10} {callee_cumulative_time:10.3f}  {_label(key)}"
+                  for (_, calls, _, callee_cumulative_time), key in callees[:top_n]]
+    return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def profile_stage(
+    stage: str,
+    source: str,
+    mode: ProfileMode = ProfileMode.SAMPLING,
+    hook_functions: list[Callable] | None = None,
+    output_dir: Path | None = None,
+    interval: float = DEFAULT_SAMPLING_INTERVAL,
+    top_n: int = DEFAULT_TOP_N,
+) -> Iterator[Path]:
+    """Profile the code run inside the context and write the profile and a hotspot summary.
+
+    The results are also written when the stage raises, to help with stages that fail after running for a long time.
+
+    Args:
+        stage: Name of the stage, used in the output file names
+        source: The source the stage is run for
+        mode: Which profiler to use, see ProfileMode
+        hook_functions: Functions to report hotspots for individually, e.g. from get_koza_hook_functions
+        output_dir: Where to write the results, by default the current log directory
+        interval: CPU seconds between two samples in sampling mode
+        top_n: How many functions to list in each part of the summary
+
+    Yields:
+        The directory the results are written to
+    """
+    hook_functions = hook_functions or []
+    if output_dir is None:
+        output_dir = get_current_log_dir() or Path(INGESTS_LOGS_PATH) / source
+    output_dir.mkdir(parents=True, exist_ok=True)
+    summary_path = output_dir / f"profile-{stage}.txt"
+
+    logger.info(f"Profiling {stage} for {source} ({mode} mode)...")
+    if mode == ProfileMode.DETERMINISTIC:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield output_dir
+        finally:
+            profiler.disable()
+            profile_path = output_dir / f"profile-{stage}.prof"
+            profiler.dump_stats(profile_path)
+            summary_path.write_text(deterministic_summary(profiler, hook_functions, top_n=top_n))
+            logger.info(f"Wrote the {stage} profile to {profile_path} and a summary to {summary_path}")
+    else:
+        sampler = SamplingProfiler(interval=interval)
+        sampler.start()
+        try:
+            yield output_dir
+        finally:
+            sampler.stop()
+            collapsed_path = output_dir / f"profile-{stage}.collapsed"
+            sampler.write_collapsed_stacks(collapsed_path)
+            summary_path.write_text(sampler.summary(hook_functions, top_n=top_n))
+            logger.info(f"Wrote the {stage} flame graph stacks to {collapsed_path} and a summary to {summary_path}")
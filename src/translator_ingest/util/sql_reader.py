@@ -0,0 +1,102 @@
+"""Stream the rows of an SQL query, for ingests whose source is a database rather than downloaded files.
+
+``read_sql`` runs a query with SQLAlchemy and yields the result rows as dicts. On Postgres (psycopg) the rows come
+from a named server-side cursor, ``itersize`` rows at a time, so a table is never loaded into memory as a whole.
+Other databases (e.g. SQLite in tests) stream the rows with a regular cursor.
+
+When given a ``snapshot_dir``, the rows are also written there as Parquet files while they are read. The snapshot is
+keyed by the query and its parameters, and as the snapshot directory is normally the versioned source data directory
+of the ingest (``koza_transform.input_files_dir``), by the source version too. Later reads of the same query are
+served from the snapshot without connecting to the database:
+
+    >>> rows = read_sql(engine, "SELECT struct_id, accession FROM act_table_full WHERE action_type IS NOT NULL",
+    ...                 name="act_table_full", snapshot_dir=koza_transform.input_files_dir)
+"""
+
+import hashlib
+import shutil
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+from sqlalchemy import Engine, TextClause, text
+
+from translator_ingest.util.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Rows fetched from the database, and written to a snapshot file, at a time
+DB_ITERSIZE = 10_000
+
+
+def stream_sql_rows(
+    engine: Engine, query: str | TextClause, parameters: dict[str, Any] | None = None, itersize: int = DB_ITERSIZE
+) -> Iterator[dict[str, Any]]:
+    """Run a query and yield its result rows as dicts, fetching itersize rows at a time from a server-side cursor."""
+    query = text(query) if isinstance(query, str) else query
+    with engine.connect() as connection:
+        result = connection.execution_options(stream_results=True, yield_per=itersize).execute(query, parameters or {})
+        for row in result.mappings():
+            yield dict(row)
+
+
+def get_snapshot_path(snapshot_dir: Path, name: str, query: str | TextClause,
+                      parameters: dict[str, Any] | None = None) -> Path:
+    """The directory of the Parquet snapshot of a query, named after the query and a hash of it and its parameters."""
+    key = hashlib.sha256(f"{query}\n{sorted((parameters or {}).items())}".encode()).hexdigest()[:16]
+    return Path(snapshot_dir) / f"{name}_{key}.parquet"
+
+
+def _write_snapshot(rows: Iterator[dict[str, Any]], snapshot_path: Path, itersize: int) -> Iterator[dict[str, Any]]:
+    """Yield rows while writing them to a snapshot, which only takes the place of snapshot_path once complete."""
+    partial_path = snapshot_path.with_name(f"{snapshot_path.name}.partial")
+    shutil.rmtree(partial_path, ignore_errors=True)
+    partial_path.mkdir(parents=True)
+    batch: list[dict[str, Any]] = []
+    part = 0
+    for row in rows:
+        batch.append(row)
+        yield row
+        if len(batch) == itersize:
+            pl.from_dicts(batch, infer_schema_length=None).write_parquet(partial_path / f"part-{part:05d}.parquet")
+            batch, part = [], part + 1
+    if batch:
+        pl.from_dicts(batch, infer_schema_length=None).write_parquet(partial_path / f"part-{part:05d}.parquet")
+    partial_path.rename(snapshot_path)
+    logger.info(f"Wrote snapshot {snapshot_path}")
+
+
+def _read_snapshot(snapshot_path: Path) -> Iterator[dict[str, Any]]:
+    # the parts are read one at a time, as their schemas can differ where a batch only had nulls for a column
+    for part_path in sorted(snapshot_path.glob("part-*.parquet")):
+        yield from pl.read_parquet(part_path).iter_rows(named=True)
+
+
+def read_sql(
+    engine: Engine,
+    query: str | TextClause,
+    name: str,
+    parameters: dict[str, Any] | None = None,
+    snapshot_dir: Path | None = None,
+    itersize: int = DB_ITERSIZE,
+) -> Iterator[dict[str, Any]]:
+    """Yield the result rows of a query as dicts, from its snapshot in snapshot_dir if there is one.
+
+    :param engine: SQLAlchemy engine of the database, only connected to when there is no snapshot
+    :param query: SQL query, with :name placeholders for its parameters
+    :param name: name of the query, used in the snapshot file name and log messages
+    :param parameters: values of the query parameters
+    :param snapshot_dir: directory to read the snapshot of the query from, or write it to; None to not snapshot
+    :param itersize: number of rows fetched from the database at a time
+    """
+    if snapshot_dir is None:
+        yield from stream_sql_rows(engine, query, parameters, itersize)
+        return
+    snapshot_path = get_snapshot_path(snapshot_dir, name, query, parameters)
+    if snapshot_path.is_dir():
+        logger.info(f"Reading {name} from snapshot {snapshot_path}")
+        yield from _read_snapshot(snapshot_path)
+        return
+    logger.info(f"Reading {name} from the database")
+    yield from _write_snapshot(stream_sql_rows(engine, query, parameters, itersize), snapshot_path, itersize)
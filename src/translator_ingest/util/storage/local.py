@@ -1,8 +1,9 @@
-import json
 from enum import Enum, StrEnum
 from pathlib import Path
 
 from translator_ingest import INGESTS_DATA_PATH, INGESTS_RELEASES_PATH
+from translator_ingest.util.compression import get_kgx_file_path
+from translator_ingest.util.jsonio import write_json
 from translator_ingest.util.metadata import PipelineMetadata
 
 
@@ -52,9 +53,10 @@ FILE_PATH_LOOKUP = {
     ),
     IngestFileType.TRANSFORM_METADATA_FILE: lambda pipeline_metadata: get_transform_directory(pipeline_metadata)
     / IngestFileName.TRANSFORM_METADATA,
+    # KGX files are .jsonl.zst or .jsonl depending on the KGX_COMPRESSION setting, see util/compression.py
     IngestFileType.NORMALIZED_KGX_FILES: lambda pipeline_metadata: (
-        get_normalization_directory(pipeline_metadata) / IngestFileName.NORMALIZED_NODES,
-        get_normalization_directory(pipeline_metadata) / IngestFileName.NORMALIZED_EDGES,
+        get_kgx_file_path(get_normalization_directory(pipeline_metadata), IngestFileName.NORMALIZED_NODES),
+        get_kgx_file_path(get_normalization_directory(pipeline_metadata), IngestFileName.NORMALIZED_EDGES),
     ),
     IngestFileType.NORMALIZATION_METADATA_FILE: lambda pipeline_metadata: get_normalization_directory(pipeline_metadata)
     / IngestFileName.NORMALIZATION_METADATA,
@@ -63,8 +65,8 @@ FILE_PATH_LOOKUP = {
     IngestFileType.NORMALIZATION_FAILURES_FILE: lambda pipeline_metadata: get_normalization_directory(pipeline_metadata)
     / IngestFileName.NORMALIZATION_FAILURES,
     IngestFileType.MERGED_KGX_FILES: lambda pipeline_metadata: (
-        get_merge_directory(pipeline_metadata) / IngestFileName.MERGED_NODES,
-        get_merge_directory(pipeline_metadata) / IngestFileName.MERGED_EDGES,
+        get_kgx_file_path(get_merge_directory(pipeline_metadata), IngestFileName.MERGED_NODES),
+        get_kgx_file_path(get_merge_directory(pipeline_metadata), IngestFileName.MERGED_EDGES),
     ),
     IngestFileType.MERGE_METADATA_FILE: lambda pipeline_metadata:
         get_merge_directory(pipeline_metadata) / IngestFileName.MERGE_METADATA_FILE,
@@ -140,6 +142,7 @@ def write_ingest_file(file_type: IngestFileType,
         file_type=file_type, pipeline_metadata=pipeline_metadata
     )
     if not isinstance(data, str):
-        data = json.dumps(data, indent=2)
+        write_json(output_file_path, data)
+        return
     with output_file_path.open("w") as output_file:
         output_file.write(data)
@@ -29,7 +29,6 @@ Usage:
     )
 """
 
-import json
 import os
 import shutil
 from pathlib import Path
@@ -38,6 +37,8 @@ import boto3
 from botocore.exceptions import ClientError
 
 from translator_ingest import INGESTS_DATA_PATH, INGESTS_RELEASES_PATH
+from translator_ingest.util.compression import is_zstd_file
+from translator_ingest.util.jsonio import read_json
 from translator_ingest.util.logging_utils import get_logger
 from translator_ingest.util.storage.local import IngestFileName
 
@@ -80,7 +81,9 @@ class S3Uploader:
         file_size_mb = local_path.stat().st_size / (1024 * 1024)
         self.logger.info(f"Uploading {local_path.name} ({file_size_mb:.2f} MB) to s3://{self.bucket_name}/{s3_key}")
 
-        self.s3_client.upload_file(str(local_path), self.bucket_name, s3_key)
+        # zstd-compressed KGX files and release archives are served as such, rather than as binary/octet-stream
+        extra_args = {"ContentType": "application/zstd"} if is_zstd_file(local_path) else None
+        self.s3_client.upload_file(str(local_path), self.bucket_name, s3_key, ExtraArgs=extra_args)
         self.logger.info(f"Uploaded: {s3_key}")
         return True
 
@@ -247,9 +250,8 @@ def cleanup_old_source_versions(source: str, keep_latest: bool = True) -> dict:
     current_version = None
 
     if keep_latest and latest_build_file.exists():
-        with open(latest_build_file, 'r') as f:
-            build_metadata = json.load(f)
-            current_version = build_metadata.get('source_version')
+        build_metadata = read_json(latest_build_file)
+        current_version = build_metadata.get('source_version')
 
     deleted = 0
     kept = 0
@@ -314,9 +316,8 @@ def cleanup_old_releases(source: str, keep_latest: bool = True) -> dict:
     current_release = None
 
     if keep_latest and latest_release_file.exists():
-        with open(latest_release_file, 'r') as f:
-            release_metadata = json.load(f)
-            current_release = release_metadata.get('release_version')
+        release_metadata = read_json(latest_release_file)
+        current_release = release_metadata.get('release_version')
 
     deleted = 0
     kept = 0
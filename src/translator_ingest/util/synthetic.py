@@ -0,0 +1,403 @@
+"""Synthetic KGX graphs for testing validation, merging and releasing at production scale.
+
+``generate_synthetic_graph`` writes a nodes and an edges JSONL file of any size. The graph's node categories, ID
+prefixes, predicates and primary knowledge sources follow a ``GraphProfile``, which can be read from the schema of
+one or more real ``graph-metadata.json`` files, so a synthetic graph has the shape of the sources it imitates:
+
+    >>> profile = GraphProfile.from_graph_metadata([Path("data/ctd/.../graph-metadata.json")])
+    >>> generate_synthetic_graph(nodes_path, edges_path, SyntheticGraphConfig(edge_count=100_000_000), profile)
+
+Node degrees are skewed, so that a few nodes have most of the edges like in real graphs. Duplicate nodes and edges
+and invalid records can be mixed in at a configurable rate to exercise merging and validation.
+
+The graph is generated in fixed-size chunks by a pool of processes, and each chunk is written as soon as it and all
+chunks before it are done, so memory use is bounded by the chunk size and the number of processes, not by the size
+of the graph. Every chunk has its own random seed, so the output only depends on the seed and the configuration and
+not on the number of processes.
+"""
+
+import bisect
+import itertools
+import os
+import random
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import click
+
+from translator_ingest.util.jsonio import dumps, read_json
+from translator_ingest.util.logging_utils import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+KNOWLEDGE_LEVEL = "knowledge_assertion"
+AGENT_TYPE = "manual_agent"
+DEFAULT_PRIMARY_KNOWLEDGE_SOURCE = "infores:translator-ingests"
+
+# Invalid records mixed in at SyntheticGraphConfig.error_rate, named by what is wrong with them
+NODE_ERRORS = ("invalid_category", "missing_category", "malformed_id")
+EDGE_ERRORS = ("invalid_predicate", "missing_knowledge_level", "dangling_object")
+INVALID_CATEGORY = "biolink:NotACategory"
+INVALID_PREDICATE = "biolink:not_a_predicate"
+DANGLING_PREFIX = "MISSING"
+
+
+@dataclass
+class NodeType:
+    categories: list[str]
+    count: int
+    id_prefixes: dict[str, int]
+
+
+@dataclass
+class EdgeType:
+    subject_categories: list[str]
+    predicate: str
+    object_categories: list[str]
+    count: int
+    primary_knowledge_sources: dict[str, int]
+
+
+@dataclass
+class GraphProfile:
+    """The node and edge types of a graph and how common each of them is."""
+
+    node_types: list[NodeType]
+    edge_types: list[EdgeType]
+
+    @classmethod
+    def from_graph_metadata(cls, graph_metadata: Iterable[Path | dict]) -> "GraphProfile":
+        """Build a profile from the schemas of graph-metadata.json files (paths or parsed JSON), adding up counts."""
+        node_types: dict[tuple[str, ...], NodeType] = {}
+        edge_types: dict[tuple, EdgeType] = {}
+        edge_id_prefixes: dict[tuple[str, ...], Counter] = {}
+        for metadata in graph_metadata:
+            if not isinstance(metadata, dict):
+                metadata = read_json(metadata)
+            schema = metadata.get("schema") or {}
+            for node in schema.get("nodes", []):
+                node_type = node_types.setdefault(tuple(node["category"]),
+                                                  NodeType(list(node["category"]), 0, Counter()))
+                node_type.count += node["count"]
+                node_type.id_prefixes.update(node["id_prefixes"])
+            for edge in schema.get("edges", []):
+                key = (tuple(edge["subject_category"]), edge["predicate"], tuple(edge["object_category"]))
+                edge_type = edge_types.setdefault(key, EdgeType(list(edge["subject_category"]), edge["predicate"],
+                                                                list(edge["object_category"]), 0, Counter()))
+                edge_type.count += edge["count"]
+                edge_type.primary_knowledge_sources.update(edge["primary_knowledge_sources"])
+                edge_id_prefixes.setdefault(key[0], Counter()).update(edge["subject_id_prefixes"])
+                edge_id_prefixes.setdefault(key[2], Counter()).update(edge["object_id_prefixes"])
+        if not edge_types:
+            raise ValueError("The graph metadata has no edges in its schema to build a profile from.")
+        # node types which only appear in edges (e.g. in a schema without nodes) get the prefixes used by the edges,
+        # and as many nodes per edge as the other node types have on average
+        counted = [categories for categories in edge_id_prefixes if categories in node_types]
+        counted_endpoints = sum(edge_id_prefixes[categories].total() for categories in counted)
+        nodes_per_endpoint = sum(node_types[categories].count for categories in counted) / (counted_endpoints or 1)
+        for categories, prefixes in edge_id_prefixes.items():
+            if categories not in node_types:
+                count = max(1, round(prefixes.total() * nodes_per_endpoint)) if counted else prefixes.total()
+                node_types[categories] = NodeType(list(categories), count, prefixes)
+        return cls(list(node_types.values()), list(edge_types.values()))
+
+
+# Used when no graph metadata is given
+DEFAULT_PROFILE = GraphProfile(
+    node_types=[
+        NodeType(["biolink:Gene"], 20, {"NCBIGene": 1}),
+        NodeType(["biolink:Disease"], 10, {"MONDO": 1}),
+        NodeType(["biolink:SmallMolecule"], 10, {"CHEBI": 1}),
+        NodeType(["biolink:PhenotypicFeature"], 10, {"HP": 1}),
+    ],
+    edge_types=[
+        EdgeType(["biolink:Gene"], "biolink:gene_associated_with_condition", ["biolink:Disease"], 20,
+                 {DEFAULT_PRIMARY_KNOWLEDGE_SOURCE: 1}),
+        EdgeType(["biolink:SmallMolecule"], "biolink:treats_or_applied_or_studied_to_treat", ["biolink:Disease"], 20,
+                 {DEFAULT_PRIMARY_KNOWLEDGE_SOURCE: 1}),
+        EdgeType(["biolink:Disease"], "biolink:has_phenotype", ["biolink:PhenotypicFeature"], 20,
+                 {DEFAULT_PRIMARY_KNOWLEDGE_SOURCE: 1}),
+        EdgeType(["biolink:SmallMolecule"], "biolink:affects", ["biolink:Gene"], 20,
+                 {DEFAULT_PRIMARY_KNOWLEDGE_SOURCE: 1}),
+        EdgeType(["biolink:Gene"], "biolink:interacts_with", ["biolink:Gene"], 20,
+                 {DEFAULT_PRIMARY_KNOWLEDGE_SOURCE: 1}),
+    ],
+)
+
+
+@dataclass
+class SyntheticGraphConfig:
+    edge_count: int
+    # average number of edges per node, which determines the number of nodes
+    edges_per_node: float = 5.0
+    # 1 gives every node of a type the same expected degree, higher values concentrate edges on fewer nodes
+    degree_skew: float = 3.0
+    # fraction of nodes and edges which are written twice
+    duplicate_rate: float = 0.0
+    # fraction of nodes and edges with one of NODE_ERRORS or EDGE_ERRORS
+    error_rate: float = 0.0
+    seed: int = 0
+    processes: int = field(default_factory=lambda: os.cpu_count() or 1)
+    chunk_size: int = 100_000
+
+
+@dataclass
+class SyntheticGraphStats:
+    nodes: int = 0
+    edges: int = 0
+    duplicate_nodes: int = 0
+    duplicate_edges: int = 0
+    errors: Counter = field(default_factory=Counter)
+
+
+@dataclass
+class _GraphPlan:
+    """A profile resolved to node ID ranges and cumulative weights, shared with the worker processes."""
+
+    config: SyntheticGraphConfig
+    node_count: int
+    # per node type: categories, first global node index, number of nodes, ID prefixes and their cumulative weights
+    node_categories: list[list[str]]
+    node_offsets: list[int]
+    node_counts: list[int]
+    node_prefixes: list[list[str]]
+    node_prefix_weights: list[list[float]]
+    # per edge type: subject node type, predicate, object node type, knowledge sources and their cumulative weights
+    edge_subject_types: list[int]
+    edge_predicates: list[str]
+    edge_object_types: list[int]
+    edge_sources: list[list[str]]
+    edge_source_weights: list[list[float]]
+    edge_type_weights: list[float]
+
+
+def _cumulative(weights: Iterable[float]) -> list[float]:
+    return list(itertools.accumulate(weights))
+
+
+def _plan_graph(profile: GraphProfile, config: SyntheticGraphConfig) -> _GraphPlan:
+    type_index = {tuple(node_type.categories): index for index, node_type in enumerate(profile.node_types)}
+    referenced_types = {type_index[tuple(categories)] for edge_type in profile.edge_types
+                        for categories in (edge_type.subject_categories, edge_type.object_categories)}
+
+    # share the nodes out by how common each node type is, with at least one node for each type used by edges
+    node_count = max(len(referenced_types), round(config.edge_count / config.edges_per_node))
+    total_weight = sum(node_type.count for node_type in profile.node_types) or 1
+    node_counts = [max(int(index in referenced_types), round(node_count * node_type.count / total_weight))
+                   for index, node_type in enumerate(profile.node_types)]
+    node_offsets = [0, *itertools.accumulate(node_counts)][:-1]
+
+    return _GraphPlan(
+        config=config,
+        node_count=sum(node_counts),
+        node_categories=[node_type.categories for node_type in profile.node_types],
+        node_offsets=node_offsets,
+        node_counts=node_counts,
+        node_prefixes=[list(node_type.id_prefixes) for node_type in profile.node_types],
+        node_prefix_weights=[_cumulative(node_type.id_prefixes.values()) for node_type in profile.node_types],
+        edge_subject_types=[type_index[tuple(edge_type.subject_categories)] for edge_type in profile.edge_types],
+        edge_predicates=[edge_type.predicate for edge_type in profile.edge_types],
+        edge_object_types=[type_index[tuple(edge_type.object_categories)] for edge_type in profile.edge_types],
+        edge_sources=[list(edge_type.primary_knowledge_sources) or [DEFAULT_PRIMARY_KNOWLEDGE_SOURCE]
+                      for edge_type in profile.edge_types],
+        edge_source_weights=[_cumulative(edge_type.primary_knowledge_sources.values()) or [1]
+                             for edge_type in profile.edge_types],
+        edge_type_weights=_cumulative(edge_type.count for edge_type in profile.edge_types),
+    )
+
+
+def _node_id(plan: _GraphPlan, node_type: int, index: int) -> str:
+    """The ID of a node, computed from its type and index so that edges can refer to nodes without a lookup."""
+    global_index = plan.node_offsets[node_type] + index
+    weights = plan.node_prefix_weights[node_type]
+    # a multiplicative hash of the index picks the prefix, weighted by how common each prefix is
+    position = (global_index * 2654435761 % 2**32) / 2**32 * weights[-1]
+    prefix = plan.node_prefixes[node_type][min(bisect.bisect_right(weights, position), len(weights) - 1)]
+    return f"{prefix}:{global_index}"
+
+
+# set in each worker process by _init_worker
+_plan: _GraphPlan | None = None
+
+
+def _init_worker(plan: _GraphPlan):
+    global _plan
+    _plan = plan
+
+
+def _chunk_random(kind: str, chunk: int) -> random.Random:
+    return random.Random(f"{_plan.config.seed}-{kind}-{chunk}")
+
+
+def _generate_nodes(chunk: int, start: int, stop: int) -> tuple[str, Counter]:
+    plan = _plan
+    config = plan.config
+    rng = _chunk_random("nodes", chunk)
+    stats = Counter()
+    lines = []
+    node_type = bisect.bisect_right(plan.node_offsets, start) - 1
+    for global_index in range(start, stop):
+        while global_index >= plan.node_offsets[node_type] + plan.node_counts[node_type]:
+            node_type += 1
+        node_id = _node_id(plan, node_type, global_index - plan.node_offsets[node_type])
+        node = {"id": node_id, "name": f"Synthetic node {global_index}", "category": plan.node_categories[node_type]}
+        if config.error_rate and rng.random() < config.error_rate:
+            error = rng.choice(NODE_ERRORS)
+            stats[error] += 1
+            if error == "invalid_category":
+                node["category"] = [INVALID_CATEGORY]
+            elif error == "missing_category":
+                del node["category"]
+            else:
+                node["id"] = node_id.replace(":", "_")
+        line = dumps(node).decode()
+        lines.append(line)
+        if config.duplicate_rate and rng.random() < config.duplicate_rate:
+            lines.append(line)
+            stats["duplicate_nodes"] += 1
+    stats["nodes"] = len(lines)
+    return "\n".join(lines) + "\n" if lines else "", stats
+
+
+def _pick_node(plan: _GraphPlan, rng: random.Random, node_type: int) -> str:
+    index = int(plan.node_counts[node_type] * rng.random() ** plan.config.degree_skew)
+    return _node_id(plan, node_type, index)
+
+
+def _generate_edges(chunk: int, start: int, stop: int) -> tuple[str, Counter]:
+    plan = _plan
+    config = plan.config
+    rng = _chunk_random("edges", chunk)
+    stats = Counter()
+    lines = []
+    for edge_index in range(start, stop):
+        edge_type = bisect.bisect_right(plan.edge_type_weights, rng.random() * plan.edge_type_weights[-1])
+        edge_type = min(edge_type, len(plan.edge_predicates) - 1)
+        sources, source_weights = plan.edge_sources[edge_type], plan.edge_source_weights[edge_type]
+        source = sources[min(bisect.bisect_right(source_weights, rng.random() * source_weights[-1]), len(sources) - 1)]
+        edge = {
+            "id": f"synthetic:{edge_index}",
+            "subject": _pick_node(plan, rng, plan.edge_subject_types[edge_type]),
+            "predicate": plan.edge_predicates[edge_type],
+            "object": _pick_node(plan, rng, plan.edge_object_types[edge_type]),
+            "primary_knowledge_source": source,
+            "knowledge_level": KNOWLEDGE_LEVEL,
+            "agent_type": AGENT_TYPE,
+        }
+        if config.error_rate and rng.random() < config.error_rate:
+            error = rng.choice(EDGE_ERRORS)
+            stats[error] += 1
+            if error == "invalid_predicate":
+                edge["predicate"] = INVALID_PREDICATE
+            elif error == "missing_knowledge_level":
+                del edge["knowledge_level"]
+            else:
+                edge["object"] = f"{DANGLING_PREFIX}:{edge_index}"
+        line = dumps(edge).decode()
+        lines.append(line)
+        if config.duplicate_rate and rng.random() < config.duplicate_rate:
+            lines.append(line)
+            stats["duplicate_edges"] += 1
+    stats["edges"] = len(lines)
+    return "\n".join(lines) + "\n" if lines else "", stats
+
+
+def _chunks(total: int, chunk_size: int) -> Iterator[tuple[int, int, int]]:
+    for chunk, start in enumerate(range(0, total, chunk_size)):
+        yield chunk, start, min(start + chunk_size, total)
+
+
+def _write_chunks(output_path: Path, generate, total: int, plan: _GraphPlan,
+                  executor: ProcessPoolExecutor | None) -> Counter:
+    config = plan.config
+    stats = Counter()
+    with output_path.open("w") as output_file:
+        if executor is None:
+            for chunk in _chunks(total, config.chunk_size):
+                text, chunk_stats = generate(*chunk)
+                output_file.write(text)
+                stats.update(chunk_stats)
+            return stats
+
+        # keep at most two chunks per process in flight, and write them in order as they finish
+        pending: list[Future] = []
+        for chunk in _chunks(total, config.chunk_size):
+            pending.append(executor.submit(generate, *chunk))
+            if len(pending) >= 2 * config.processes:
+                text, chunk_stats = pending.pop(0).result()
+                output_file.write(text)
+                stats.update(chunk_stats)
+        for future in pending:
+            text, chunk_stats = future.result()
+            output_file.write(text)
+            stats.update(chunk_stats)
+    return stats
+
+
+def generate_synthetic_graph(nodes_path: Path, edges_path: Path, config: SyntheticGraphConfig,
+                             profile: GraphProfile | None = None) -> SyntheticGraphStats:
+    """Write a synthetic KGX graph to nodes_path and edges_path.
+
+    Args:
+        nodes_path: Where to write the nodes JSONL
+        edges_path: Where to write the edges JSONL
+        config: Size, shape and seed of the graph
+        profile: Node and edge types of the graph, by default DEFAULT_PROFILE
+
+    Returns:
+        How many nodes and edges were written, including duplicates, and how many of each error were injected
+    """
+    plan = _plan_graph(profile or DEFAULT_PROFILE, config)
+    logger.info(f"Generating a synthetic graph with {plan.node_count:,} nodes and {config.edge_count:,} edges "
+                f"using {config.processes} processes...")
+
+    if config.processes > 1:
+        with ProcessPoolExecutor(config.processes, initializer=_init_worker, initargs=(plan,)) as executor:
+            node_stats = _write_chunks(nodes_path, _generate_nodes, plan.node_count, plan, executor)
+            edge_stats = _write_chunks(edges_path, _generate_edges, config.edge_count, plan, executor)
+    else:
+        _init_worker(plan)
+        node_stats = _write_chunks(nodes_path, _generate_nodes, plan.node_count, plan, None)
+        edge_stats = _write_chunks(edges_path, _generate_edges, config.edge_count, plan, None)
+
+    stats = node_stats + edge_stats
+    graph_stats = SyntheticGraphStats(
+        nodes=stats.pop("nodes", 0),
+        edges=stats.pop("edges", 0),
+        duplicate_nodes=stats.pop("duplicate_nodes", 0),
+        duplicate_edges=stats.pop("duplicate_edges", 0),
+        errors=stats,
+    )
+    logger.info(f"Synthetic graph written to {nodes_path} and {edges_path}: {graph_stats}")
+    return graph_stats
+
+
+@click.command()
+@click.argument("output_dir", type=click.Path(file_okay=False, path_type=Path))
+@click.option("--edges", "edge_count", type=int, required=True, help="Number of edges to generate.")
+@click.option("--graph-metadata", type=click.Path(exists=True, dir_okay=False, path_type=Path), multiple=True,
+              help="graph-metadata.json to take node and edge types from (repeatable). Default: a built-in profile.")
+@click.option("--edges-per-node", type=float, default=5.0, show_default=True)
+@click.option("--degree-skew", type=float, default=3.0, show_default=True,
+              help="1 for uniform degrees, higher to concentrate edges on fewer nodes.")
+@click.option("--duplicate-rate", type=float, default=0.0, show_default=True)
+@click.option("--error-rate", type=float, default=0.0, show_default=True)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--processes", type=int, default=os.cpu_count() or 1, show_default=True)
+def main(output_dir, edge_count, graph_metadata, edges_per_node, degree_skew, duplicate_rate, error_rate, seed,
+         processes):
+    """Write a synthetic KGX graph to OUTPUT_DIR/nodes.jsonl and OUTPUT_DIR/edges.jsonl."""
+    setup_logging()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    profile = GraphProfile.from_graph_metadata(graph_metadata) if graph_metadata else None
+    config = SyntheticGraphConfig(edge_count=edge_count, edges_per_node=edges_per_node, degree_skew=degree_skew,
+                                  duplicate_rate=duplicate_rate, error_rate=error_rate, seed=seed,
+                                  processes=processes)
+    generate_synthetic_graph(output_dir / "nodes.jsonl", output_dir / "edges.jsonl", config, profile)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Per-stage resource telemetry for the ingest pipeline and graph merges.
+
+Each pipeline stage runs inside ``stage_metrics``, which measures it and records a ``StageMetrics``:
+
+    >>> with stage_metrics("normalize", source="ctd"):
+    ...     normalize(pipeline_metadata)
+    ...     record_stage_counts(nodes=1200, edges=5400)
+
+Stage code reports what it processed with ``record_stage_counts``. That is a no-op when no stage is being measured,
+so stage functions can still be called directly. Finished stages are appended to ``metrics.jsonl`` in the log
+directory created by ``setup_logging(source=...)``. They are also kept in memory for the rest of the process, so
+that ``generate_graph_metadata`` can add them to ``ingest-metadata.json``.
+
+Peak RSS, bytes read/written and the per-stage reset of the peak RSS come from ``/proc/self`` and are only
+available on Linux. Elsewhere, peak RSS falls back to the peak of the whole process so far and the I/O counters are
+None.
+"""
+
+import os
+import resource
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from translator_ingest.util.jsonio import dumps
+from translator_ingest.util.logging_utils import get_current_log_dir, get_logger
+
+logger = get_logger(__name__)
+
+METRICS_FILENAME = "metrics.jsonl"
+
+# Counts which measure the records a stage produced; they add up to StageMetrics.records.
+# Any other count (e.g. koza_reader_records) is reported but not included in the records total.
+RECORD_COUNTS = ("nodes", "edges")
+
+_PROC_SELF = Path("/proc/self")
+
+
+@dataclass
+class StageMetrics:
+    stage: str
+    source: str | None = None
+    start_time: str | None = None
+    wall_time_seconds: float | None = None
+    cpu_time_seconds: float | None = None
+    peak_rss_bytes: int | None = None
+    bytes_read: int | None = None
+    bytes_written: int | None = None
+    records: int | None = None
+    records_per_second: float | None = None
+    counts: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class CountingIterable:
+    """Wrap an iterable and count the items taken from it, e.g. the records a koza reader yields."""
+
+    def __init__(self, iterable: Iterable):
+        self.iterable = iterable
+        self.count = 0
+
+    def __iter__(self) -> Iterator:
+        for item in self.iterable:
+            self.count += 1
+            yield item
+
+
+# stages currently being measured, innermost last (generate_graph_metadata runs test_data as a nested stage)
+_active_stages: list[StageMetrics] = []
+# peak RSS observed by each active stage before a nested stage reset the high-water mark
+_active_peaks: list[int] = []
+# stages finished in this process, by source
+_finished_stages: dict[str | None, list[StageMetrics]] = {}
+
+
+def _cpu_time() -> float:
+    """CPU time of this process and its finished child processes, user and system, in seconds."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def _read_io_counters() -> tuple[int, int] | None:
+    """Bytes this process passed through read and write system calls, page cache hits included."""
+    try:
+        counters = dict(line.split(": ") for line in (_PROC_SELF / "io").read_text().splitlines())
+        return int(counters["rchar"]), int(counters["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _read_peak_rss() -> int:
+    """Peak resident set size since the last reset, or since the process started where it can't be reset."""
+    try:
+        for line in (_PROC_SELF / "status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux but in bytes on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the peak RSS high-water mark to the current RSS (Linux only)."""
+    try:
+        (_PROC_SELF / "clear_refs").write_text("5")
+        return True
+    except OSError:
+        return False
+
+
+def record_stage_counts(**counts: int):
+    """Add counts (e.g. nodes=..., edges=...) to the innermost stage being measured, if any."""
+    if not _active_stages:
+        return
+    stage_counts = _active_stages[-1].counts
+    for name, count in counts.items():
+        if count is not None:
+            stage_counts[name] = stage_counts.get(name, 0) + int(count)
+
+
+def get_stage_metrics(source: str | None) -> list[StageMetrics]:
+    """Get the metrics of the stages finished for a source in this process, in the order they finished."""
+    return list(_finished_stages.get(source, []))
+
+
+def write_stage_metrics(metrics: StageMetrics, metrics_file: Path | None = None):
+    """Append stage metrics to a JSON lines file, by default metrics.jsonl in the current log directory."""
+    if metrics_file is None:
+        log_dir = get_current_log_dir()
+        if log_dir is None:
+            return
+        metrics_file = log_dir / METRICS_FILENAME
+    metrics_file.parent.mkdir(parents=True, exist_ok=True)
+    with metrics_file.open("a") as metrics_output:
+        metrics_output.write(dumps(metrics.to_dict()).decode() + "\n")
+
+
+@contextmanager
+def stage_metrics(stage: str, source: str | None = None, metrics_file: Path | None = None) -> Iterator[StageMetrics]:
+    """Measure the wall time, CPU time, peak RSS, I/O and throughput of the code run inside the context.
+
+    The metrics are recorded when the stage finishes, including when it raises, so that metrics.jsonl also
+    shows how far a failed stage got.
+
+    Args:
+        stage: Name of the stage, e.g. "transform"
+        source: The source or graph the stage is run for
+        metrics_file: Where to append the metrics, by default metrics.jsonl in the current log directory
+
+    Yields:
+        The StageMetrics of this stage, which is filled in when the context exits
+    """
+    metrics = StageMetrics(stage=stage, source=source, start_time=datetime.now().isoformat(timespec="seconds"))
+
+    # Resetting the high-water mark hides the memory used so far from the stages this one is nested in,
+    # so hand them the peak first.
+    if _active_peaks:
+        current_peak = _read_peak_rss()
+        _active_peaks[:] = [max(peak, current_peak) for peak in _active_peaks]
+    _reset_peak_rss()
+
+    _active_stages.append(metrics)
+    _active_peaks.append(0)
+    io_start = _read_io_counters()
+    cpu_start = _cpu_time()
+    wall_start = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        wall_time = time.perf_counter() - wall_start
+        cpu_time = _cpu_time() - cpu_start
+        io_end = _read_io_counters()
+        _active_stages.pop()
+        peak_rss = max(_active_peaks.pop(), _read_peak_rss())
+        _active_peaks[:] = [max(peak, peak_rss) for peak in _active_peaks]
+
+        metrics.wall_time_seconds = round(wall_time, 3)
+        metrics.cpu_time_seconds = round(cpu_time, 3)
+        metrics.peak_rss_bytes = peak_rss
+        if io_start and io_end:
+            metrics.bytes_read = io_end[0] - io_start[0]
+            metrics.bytes_written = io_end[1] - io_start[1]
+        if any(name in metrics.counts for name in RECORD_COUNTS):
+            metrics.records = sum(metrics.counts.get(name, 0) for name in RECORD_COUNTS)
+            metrics.records_per_second = round(metrics.records / wall_time, 1) if wall_time > 0 else None
+
+        _finished_stages.setdefault(source, []).append(metrics)
+        try:
+            write_stage_metrics(metrics, metrics_file)
+        except OSError as e:
+            logger.warning(f"Could not write metrics for stage {stage}: {e}")
+        logger.info(
+            f"Stage {stage}{f' for {source}' if source else ''} took {wall_time:.1f}s wall, {cpu_time:.1f}s CPU, "
+            f"peak RSS {peak_rss / 2**20:.0f} MiB"
+            + (f", {metrics.records} records ({metrics.records_per_second}/s)" if metrics.records is not None else "")
+        )
@@ -0,0 +1,198 @@
+"""KGX JSONL writer for the transform stage which deduplicates nodes by id as they are written.
+
+Record transforms emit the same nodes over and over: string returns both ``Protein`` nodes of every interaction,
+goa the gene and GO term of every annotation. koza's ``JSONLWriter`` only writes the first node with an id and
+silently drops the rest, even when a later one has properties the first doesn't.
+
+``DeduplicatingJSONLWriter`` also writes each node id once, but keeps a hash of the serialized node per id, so it
+can tell exact duplicates (the common case, which are dropped) from conflicting ones. Conflicting duplicates are
+merged with ``merge_node_properties`` and, as they are rare, the few affected lines of the nodes file are rewritten
+with the merged nodes when the writer is finalized. The counts of both are reported in ``dedup_counts``, which the
+pipeline adds to ``transform-metadata.json``.
+
+The nodes and edges files are written as plain ``.jsonl``, which ORION normalizes in place, or as ``.jsonl.zst`` when
+``compressed`` (see util/compression.py).
+
+For checkpointed transforms (see util/checkpoint.py) the writer is given a ``segments_dir``, and writes the nodes and
+edges to numbered segment files there instead, ending a segment at every checkpoint with ``end_segment``. The
+segments are concatenated into the nodes and edges files when the writer is finalized.
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+from collections.abc import Iterable
+from typing import Any
+
+from koza.io.writer.jsonl_writer import JSONLWriter
+
+from translator_ingest.util.compression import ZSTD_SUFFIX, open_file
+from translator_ingest.util.jsonio import dumps, loads
+from translator_ingest.util.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+_NEWLINE = b"\n"
+
+# node lines buffered before they are written, as in JSONLWriter
+_WRITE_BATCH = 1000
+
+
+def merge_node_properties(node: dict[str, Any], other: dict[str, Any]) -> dict[str, Any]:
+    """Merge the properties of a duplicate of a node into it.
+
+    List properties (e.g. category, xref, synonym) are combined, keeping the order of the values and dropping
+    repeats. Any other property keeps the value of ``node``, unless ``node`` has none.
+    """
+    merged = dict(node)
+    for key, value in other.items():
+        current = merged.get(key)
+        if current is None:
+            merged[key] = value
+        elif isinstance(current, list) and isinstance(value, list):
+            merged[key] = current + [item for item in value if item not in current]
+    return merged
+
+
+class DeduplicatingJSONLWriter(JSONLWriter):
+    """A koza JSONLWriter which merges, rather than drops, nodes written more than once with different properties."""
+
+    def __init__(self, output_dir: str, source_name: str, config, compressed: bool = False,
+                 segments_dir: str | None = None):
+        super().__init__(output_dir=output_dir, source_name=source_name, config=config)
+        # written as .jsonl.zst when compressed
+        self.suffix = ZSTD_SUFFIX if compressed else ""
+        self.nodes_path = f"{output_dir}/{source_name}_nodes.jsonl{self.suffix}"
+        self.edges_path = f"{output_dir}/{source_name}_edges.jsonl{self.suffix}"
+        # numbered segments of the nodes and edges files are written to segments_dir, when given
+        self.segments_dir = segments_dir
+        self.segment = 0
+        # digest of the serialized node, by (interned) node id, to tell exact duplicates from conflicting ones;
+        # not hash(), which differs between processes, as the digests are restored when a transform resumes
+        self.node_hashes: dict[str, bytes] = {}
+        # merged properties of the conflicting duplicates of a node, merged into its written line on finalize
+        self.conflicting_nodes: dict[str, dict[str, Any]] = {}
+        self.duplicate_node_count = 0
+
+    @property
+    def dedup_counts(self) -> dict[str, int]:
+        """Counts of the nodes written, and of the duplicates which were dropped or merged into them."""
+        return {
+            "nodes": self.node_count,
+            "duplicate_nodes": self.duplicate_node_count,
+            "merged_nodes": len(self.conflicting_nodes),
+        }
+
+    def _segment_path(self, kind: str, segment: int) -> str:
+        return f"{self.segments_dir}/{kind}-{segment:05d}.jsonl{self.suffix}"
+
+    def _ensure_node_file_handle(self):
+        if not hasattr(self, "nodeFH"):
+            self.nodeFH = open_file(self._segment_path("nodes", self.segment) if self.segments_dir
+                                    else self.nodes_path, "wb")
+
+    def _ensure_edge_file_handle(self):
+        if not hasattr(self, "edgeFH"):
+            self.edgeFH = open_file(self._segment_path("edges", self.segment) if self.segments_dir
+                                    else self.edges_path, "wb")
+
+    def _write_node_line(self, line: bytes):
+        self._node_buf.append(line)
+        self._node_buf.append(_NEWLINE)
+        self.node_count += 1
+        if len(self._node_buf) >= _WRITE_BATCH * 2:
+            self.nodeFH.write(b"".join(self._node_buf))
+            self._node_buf.clear()
+
+    def write_nodes(self, nodes: Iterable):
+        if not nodes:
+            return
+        self._ensure_node_file_handle()
+        for node in nodes:
+            line = self._serialize(node)
+            node_hash = hashlib.blake2b(line, digest_size=8).digest()
+            written_hash = self.node_hashes.get(node.id)
+            if written_hash is None:
+                self.node_hashes[sys.intern(node.id)] = node_hash
+                self._write_node_line(line)
+                continue
+            self.duplicate_node_count += 1
+            if written_hash != node_hash:
+                self.conflicting_nodes[node.id] = merge_node_properties(
+                    self.conflicting_nodes.get(node.id, {}), loads(line)
+                )
+
+    def end_segment(self):
+        """Write out and close the current segment files, so what was written so far survives a crash."""
+        super().finalize()
+        for file_handle in ("nodeFH", "edgeFH"):
+            if hasattr(self, file_handle):
+                delattr(self, file_handle)
+        self.segment += 1
+
+    def get_state(self) -> dict[str, Any]:
+        """The state to restore with restore_state when a transform resumes after the segments written so far."""
+        return {
+            "segment": self.segment,
+            "node_count": self.node_count,
+            "edge_count": self.edge_count,
+            "duplicate_node_count": self.duplicate_node_count,
+            "node_hashes": self.node_hashes,
+            "conflicting_nodes": self.conflicting_nodes,
+        }
+
+    def restore_state(self, state: dict[str, Any] | None):
+        """Continue from the state of get_state, or from scratch if None, removing any later (partial) segments."""
+        state = state or {"segment": 0, "node_count": 0, "edge_count": 0, "duplicate_node_count": 0,
+                          "node_hashes": {}, "conflicting_nodes": {}}
+        for key, value in state.items():
+            setattr(self, key, value)
+        os.makedirs(self.segments_dir, exist_ok=True)
+        for file_name in os.listdir(self.segments_dir):
+            # named <kind>-<segment>.jsonl[.zst]
+            if int(file_name.split("-")[1].split(".")[0]) >= self.segment:
+                os.remove(f"{self.segments_dir}/{file_name}")
+
+    def _concatenate_segments(self):
+        """Concatenate the segment files into the nodes and edges files. Concatenated zstd frames are a valid
+        zstd file, so compressed segments are concatenated without recompressing them."""
+        for kind, output_path in (("nodes", self.nodes_path), ("edges", self.edges_path)):
+            segment_paths = [self._segment_path(kind, segment) for segment in range(self.segment)
+                             if os.path.exists(self._segment_path(kind, segment))]
+            if not segment_paths:
+                continue
+            with open(output_path, "wb") as output_file:
+                for segment_path in segment_paths:
+                    with open(segment_path, "rb") as segment_file:
+                        shutil.copyfileobj(segment_file, output_file, 1024 * 1024)
+        shutil.rmtree(self.segments_dir)
+
+    def finalize(self):
+        if self.segments_dir:
+            self.end_segment()
+            self._concatenate_segments()
+        else:
+            super().finalize()
+        if self.conflicting_nodes:
+            self._merge_conflicting_nodes()
+        logger.info(f"Wrote {self.node_count} nodes, dropped {self.duplicate_node_count} duplicates "
+                    f"and merged the properties of conflicting duplicates into {len(self.conflicting_nodes)} nodes")
+
+    def _node_merged(self, node: dict[str, Any]):
+        """Called with each node rewritten with the properties of its conflicting duplicates merged into it."""
+
+    def _merge_conflicting_nodes(self):
+        """Rewrite the nodes file, with the conflicting duplicates of nodes merged into them."""
+        # named like the nodes file, so it is compressed the same way
+        merged_path = self.nodes_path.replace("_nodes.jsonl", "_nodes.merging.jsonl")
+        with open_file(self.nodes_path, "rb") as nodes_file, open_file(merged_path, "wb") as merged_file:
+            for line in nodes_file:
+                node = loads(line)
+                conflicting_node = self.conflicting_nodes.get(node["id"])
+                if conflicting_node is not None:
+                    merged_node = merge_node_properties(node, conflicting_node)
+                    self._node_merged(merged_node)
+                    line = dumps(merged_node) + _NEWLINE
+                merged_file.write(line)
+        os.replace(merged_path, self.nodes_path)
@@ -6,7 +6,6 @@ Validates KGX files against Biolink Model requirements using LinkML validation p
 
 """
 
-import json
 import random
 import sys
 from datetime import datetime
@@ -16,6 +15,7 @@ from typing import Optional, Dict, Any, List
 
 import click
 from translator_ingest.util.biolink import get_biolink_schema, get_current_biolink_version
+from translator_ingest.util.jsonio import iter_jsonl, read_json, read_jsonl, write_json
 from translator_ingest.util.storage.local import IngestFileName
 from translator_ingest.util.logging_utils import get_logger, setup_logging
 
@@ -37,26 +37,6 @@ class ValidationStatus(StrEnum):
     PENDING = "PENDING"
 
 
-def load_jsonl(file_path: Path) -> List[Dict[str, Any]]:
-    """Load JSONL file and return list of records."""
-    records = []
-    with open(file_path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                records.append(json.loads(line))
-    return records
-
-
-def load_jsonl_streaming(file_path: Path):
-    """Stream JSONL file line by line without loading all into memory."""
-    with open(file_path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                yield json.loads(line)
-
-
 def extract_ids(nodes: list[dict]) -> set[str]:
     """Extract all node IDs from nodes file."""
     return {node["id"] for node in nodes if "id" in node}
@@ -80,8 +60,7 @@ def save_validation_report(report: Dict[str, Any], output_dir: Path) -> Path:
     report_path = output_dir / IngestFileName.VALIDATION_REPORT_FILE
 
     # Save report
-    with open(report_path, "w") as f:
-        json.dump(report, f, indent=2)
+    write_json(report_path, report)
 
     logger.info(f"Validation report saved to: {report_path}")
     return report_path
@@ -103,7 +82,7 @@ def validate_large_kgx_files(nodes_file: Path, edges_file: Path) -> Dict[str, An
     nodes_dict = {}  # Store nodes by ID for later retrieval
     node_count = 0
 
-    for node in load_jsonl_streaming(nodes_file):
+    for node in iter_jsonl(nodes_file):
         node_count += 1
         if "id" in node:
             node_id = node["id"]
@@ -122,7 +101,7 @@ def validate_large_kgx_files(nodes_file: Path, edges_file: Path) -> Dict[str, An
     SAMPLE_PERCENTAGE = 0.10
     MIN_SAMPLE_SIZE = 1000    # Minimum sample size for meaningful validation
 
-    for edge in load_jsonl_streaming(edges_file):
+    for edge in iter_jsonl(edges_file):
         edge_count += 1
 
         # Calculate current target sample size (10% of edges seen so far)
@@ -284,11 +263,11 @@ def validate_kgx_consistency(nodes_file: Path, edges_file: Path) -> Dict[str, An
     Returns comprehensive validation report.
     """
     logger.info(f"Loading nodes from: {nodes_file}")
-    nodes = load_jsonl(nodes_file)
+    nodes = read_jsonl(nodes_file)
     logger.info(f"Found {len(nodes)} nodes")
 
     logger.info(f"Loading edges from: {edges_file}")
-    edges = load_jsonl(edges_file)
+    edges = read_jsonl(edges_file)
     logger.info(f"Found {len(edges)} edges")
 
     # Create combined KGX structure for validation
@@ -403,8 +382,8 @@ def find_kgx_files(data_dir: Path, nodes_only: bool = False) -> List[tuple]:
         if not subdir.is_dir():
             continue
 
-        # Look for *nodes.jsonl files
-        nodes_files = list(subdir.glob("*nodes.jsonl"))
+        # Look for *nodes.jsonl files, compressed or not
+        nodes_files = [*subdir.glob("*nodes.jsonl"), *subdir.glob("*nodes.jsonl.zst")]
         if not nodes_files:
             continue
 
@@ -415,8 +394,8 @@ def find_kgx_files(data_dir: Path, nodes_only: bool = False) -> List[tuple]:
             # For nodes-only mode, we don't require edges files
             kgx_pairs.append((subdir.name, nodes_files[0], None))
         else:
-            # Look for *edges.jsonl files
-            edges_files = list(subdir.glob("*edges.jsonl"))
+            # Look for *edges.jsonl files, compressed or not
+            edges_files = [*subdir.glob("*edges.jsonl"), *subdir.glob("*edges.jsonl.zst")]
             if not edges_files:
                 continue
 
@@ -551,7 +530,7 @@ def validate_kgx_nodes_only(nodes_file: Path, output_dir: Path, no_save: bool =
         raise IOError(error_message)
 
     logger.info(f"Loading nodes from: {nodes_file}")
-    nodes = load_jsonl(nodes_file)
+    nodes = read_jsonl(nodes_file)
     logger.info(f"Found {len(nodes)} nodes")
 
     # Create KGX structure with only nodes for validation
@@ -629,14 +608,13 @@ def validate_kgx_nodes_only(nodes_file: Path, output_dir: Path, no_save: bool =
 
 
 def get_validation_status(report_file_path: Path) -> Optional[str]:
-    with report_file_path.open("r") as validation_report_file:
-        validation_report = json.load(validation_report_file)
-        try:
-            return validation_report["summary"]["overall_status"]
-        except KeyError:
-            error_message = "Validation report file found but format was unexpected, validation status not found."
-            logger.error(error_message)
-            raise KeyError(error_message)
+    validation_report = read_json(report_file_path)
+    try:
+        return validation_report["summary"]["overall_status"]
+    except KeyError:
+        error_message = "Validation report file found but format was unexpected, validation status not found."
+        logger.error(error_message)
+        raise KeyError(error_message)
 
 
 @click.command()
@@ -1,6 +1,7 @@
+import pandas as pd
 import pytest
 from koza.runner import KozaRunner, KozaTransformHooks
-from tests.unit.ingests import MockKozaWriter
+from tests.unit.ingests import MockKozaTransform, MockKozaWriter
 from biolink_model.datamodel.pydanticmodel_v2 import (
     ChemicalAffectsGeneAssociation,    ## ONLY for affects
     ChemicalGeneInteractionAssociation,    ## ONLY for interacts_with
@@ -9,6 +10,10 @@ import translator_ingest.util.biolink as util
 
 ## import what I'm testing
 from translator_ingest.ingests.dgidb.dgidb import (
+    DRUG_GENE_COLS,
+    PREFIXES_TO_DROP,
+    plain_interact_types,
+    prepare,
     transform_row,
 )
 ## import from mapping file
@@ -291,3 +296,101 @@ def test_affects_extra(affects_extra):
     ## no scores: CX special logic decision
     assert association_extra.dgidb_interaction_score is None
     assert association_extra.dgidb_evidence_score is None
+
+
+## PREPARE STEP: polars pipeline vs the original pandas implementation
+def _reference_prepare(data):
+    ## the original pandas implementation of prepare (logging removed), kept to check the polars rewrite
+    df = pd.DataFrame.from_records(data)
+    df.replace(to_replace="", value=None, inplace=True)
+    df.dropna(subset=["gene_concept_id", "drug_concept_id"], ignore_index=True, inplace=True)
+    df["drug_prefix"] = [i.split(":")[0] for i in df["drug_concept_id"]]
+    df = df[~df.drug_prefix.str.contains('|'.join(PREFIXES_TO_DROP), case=False)].copy()
+    df.drop("drug_prefix", axis=1, inplace=True)
+    df["drug_concept_id"] = df["drug_concept_id"].str.upper()
+    df["gene_concept_id"] = df["gene_concept_id"].str.upper()
+    df["drug_concept_id"] = df["drug_concept_id"].str.replace("CHEMBL:", "CHEMBL.COMPOUND:")
+    df["gene_concept_id"] = df["gene_concept_id"].str.replace("NCBIGENE:", "NCBIGene:")
+    df["interaction_types"] = df["interaction_types"].fillna("~NULL")
+    df["interaction_types"] = df["interaction_types"].str.split("|")
+    df = df.explode("interaction_types", ignore_index=True)
+    df["mod_type"] = ["~PLAIN_INTERACTS" if i in plain_interact_types else i for i in df["interaction_types"]]
+    COLS_DEFINE_EDGE = ["drug_concept_id", "gene_concept_id", "mod_type"]
+    df = df.groupby(by=COLS_DEFINE_EDGE).agg(
+        {
+            "interaction_types": set,
+            "interaction_source_db_name": set,
+            "interaction_score": "first",
+            "evidence_score": "first",
+            "drug_name": "first",
+            "gene_name": "first",
+        }
+    ).reset_index().copy()
+    drug_gene_sources = df.copy().groupby(by=DRUG_GENE_COLS).agg(
+        {"interaction_source_db_name": lambda x: set.union(*x)}
+    )
+    df["interaction_source_db_name"] = [
+        drug_gene_sources.loc[x.drug_concept_id, x.gene_concept_id].to_list()[0] if x.mod_type == "~PLAIN_INTERACTS"
+        else x.interaction_source_db_name
+        for x in df[["drug_concept_id", "gene_concept_id", "mod_type", "interaction_source_db_name"]].itertuples()
+    ]
+    grp = df.groupby(by=DRUG_GENE_COLS)
+    for name, group in grp:
+        if group.shape[0] > 1:
+            for idx, row in group.iterrows():
+                if row.mod_type != "~PLAIN_INTERACTS":
+                    df.at[idx, "interaction_score"] = pd.NA
+                    df.at[idx, "evidence_score"] = pd.NA
+    return df.to_dict(orient="records")
+
+
+def _interaction(gene, drug, sources, types, interaction_score="", evidence_score="", drug_name="", gene_name=""):
+    ## raw reader record: every value is a string, missing values are ""
+    return {
+        "gene_name": gene_name, "gene_concept_id": gene, "drug_name": drug_name, "drug_concept_id": drug,
+        "interaction_source_db_name": sources, "interaction_types": types,
+        "interaction_score": interaction_score, "evidence_score": evidence_score,
+    }
+
+
+RAW_INTERACTIONS = [
+    ## plain + inhibitor for the same pair: sources union on plain edge, scores dropped on inhibitor edge
+    _interaction("hgnc:4445", "chembl:CHEMBL1", "ChEMBL", "", "0.5", "3", "DRUG1", "GENE1"),
+    _interaction("hgnc:4445", "chembl:CHEMBL1", "TTD", "inhibitor", "", "2", "DRUG1", "GENE1"),
+    _interaction("hgnc:4445", "chembl:CHEMBL1", "TALC", "inhibitor|other/unknown", "0.7", "", "DRUG1", "GENE1"),
+    ## single mod_type pair keeps its scores; scores come from the first non-empty value
+    _interaction("ncbigene:1017", "rxcui:9997", "MyCancerGenome", "binder", "", "", "", "CDK2"),
+    _interaction("ncbigene:1017", "rxcui:9997", "DTC", "binder", "0.1", "1", "DRUGX", ""),
+    ## two non-plain mod_types for a pair: both lose scores
+    _interaction("hgnc:7979", "drugbank:DB00001", "ChEMBL", "agonist", "0.2", "1"),
+    _interaction("hgnc:7979", "drugbank:DB00001", "", "antagonist|agonist", "0.3", "4"),
+    ## rows dropped: missing IDs, unsupported drug namespaces (case-insensitive)
+    _interaction("", "chembl:CHEMBL2", "ChEMBL", "inhibitor", "0.9", "9"),
+    _interaction("hgnc:1", "", "ChEMBL", "inhibitor", "0.9", "9"),
+    _interaction("hgnc:2", "NCIt:C1234", "ChEMBL", "inhibitor", "0.9", "9"),
+    _interaction("hgnc:2", "iuphar.ligand:123", "GuideToPharmacology", "inhibitor", "0.9", "9"),
+    _interaction("hgnc:2", "WIKIDATA:Q1", "ChEMBL", "", "0.9", "9"),
+    ## kept: the "." in "iuphar\\.ligand" is escaped, so it only drops literal "iuphar.ligand" IDs
+    _interaction("hgnc:3", "iupharXligand:5", "ChEMBL", "inhibitor", "0.9", "9"),
+]
+
+
+def _normalized(records):
+    return [{key: None if value is pd.NA else value for key, value in record.items()} for record in records]
+
+
+def test_prepare_matches_pandas_reference():
+    mock_koza = MockKozaTransform(extra_fields={}, writer=MockKozaWriter(), mappings={})
+    prepared = list(prepare(mock_koza, iter(RAW_INTERACTIONS)))
+    expected = _reference_prepare(RAW_INTERACTIONS)
+    assert len(prepared) == 6
+    assert _normalized(prepared) == _normalized(expected)
+
+    by_edge = {(r["drug_concept_id"], r["gene_concept_id"], r["mod_type"]): r for r in prepared}
+    plain = by_edge[("CHEMBL.COMPOUND:CHEMBL1", "HGNC:4445", "~PLAIN_INTERACTS")]
+    assert plain["interaction_source_db_name"] == {"ChEMBL", "TTD", "TALC"}
+    assert plain["interaction_types"] == {"~NULL", "other/unknown"}
+    assert plain["interaction_score"] == "0.5"
+    assert by_edge[("CHEMBL.COMPOUND:CHEMBL1", "HGNC:4445", "inhibitor")]["interaction_score"] is None
+    binder = by_edge[("RXCUI:9997", "NCBIGene:1017", "binder")]
+    assert (binder["interaction_score"], binder["evidence_score"], binder["drug_name"]) == ("0.1", "1", "DRUGX")
@@ -15,13 +15,13 @@ from translator_ingest.ingests.diseases.diseases import (
     keep_rows_with_IDs,
     knowledge_transform,
 )
-import pandas as pd
+import polars as pl
 
 
 ## NON-KOZA FUNCTIONS
 @pytest.fixture
 def starting_data():
-    df = pd.DataFrame.from_records(
+    df = pl.DataFrame(
         data=[
             ## real duplicate data, KNOWLEDGE
             (
@@ -54,7 +54,8 @@ def starting_data():
                 4.0,
             ),
         ],
-        columns=[
+        orient="row",
+        schema=[
             "protein_id",
             "protein_name",
             "disease_id",
@@ -81,7 +82,7 @@ def test_functions(starting_data):
     assert count_duplicates == 1
 
     ## then run keep_rows_with_IDs, see if output is as-expected
-    cleaned_df, dict_no_IDs = keep_rows_with_IDs(dataframe=starting_data[0], starting_strings=starting_data[1])
+    cleaned_df, dict_no_IDs = keep_rows_with_IDs(dataframe=cleaned_df, starting_strings=starting_data[1])
     assert cleaned_df.shape[0] == 1
     assert dict_no_IDs["ENSP"] == 1
     assert dict_no_IDs["DOID"] == 1
@@ -1,6 +1,7 @@
 import pytest
 from koza.runner import KozaRunner, KozaTransformHooks
-from tests.unit.ingests import MockKozaWriter
+from sqlalchemy import create_engine, text
+from tests.unit.ingests import MockKozaTransform, MockKozaWriter
 from biolink_model.datamodel.pydanticmodel_v2 import (
     ChemicalEntityToDiseaseOrPhenotypicFeatureAssociation,
     ChemicalAffectsGeneAssociation,    ## ONLY for affects
@@ -14,8 +15,11 @@ from biolink_model.datamodel.pydanticmodel_v2 import (
 import translator_ingest.util.biolink as util
 
 ## import what I'm testing
+from translator_ingest.ingests.drugcentral import drugcentral
 from translator_ingest.ingests.drugcentral.drugcentral import (
+    omop_prepare,
     omop_transform,
+    bioactivity_prepare,
     bioactivity_transform,
 )
 ## import from mapping file
@@ -335,3 +339,63 @@ def test_affects_extra(affects_extra):
     assert len(association_extra.sources) == 1
     assert association_extra.publications
     assert len(association_extra.publications) == 1
+
+
+## prepare functions: SQLite stand-in for the DrugCentral Postgres database
+@pytest.fixture
+def drugcentral_db(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'drugcentral.db'}")
+    with engine.begin() as db_conn:
+        db_conn.execute(text(
+            "CREATE TABLE omop_relationship_doid_view "
+            "(struct_id INTEGER, relationship_name TEXT, umls_cui TEXT, cui_semantic_type TEXT)"
+        ))
+        db_conn.execute(text("INSERT INTO omop_relationship_doid_view VALUES (:s, :r, :u, :t)"), [
+            {"s": 144, "r": "off-label use", "u": "C0022336", "t": "T047"},
+            {"s": 144, "r": "off-label use", "u": "C0022336 ", "t": "T047"},    ## duplicate, after stripping
+            {"s": 145, "r": "indication", "u": "C0018681", "t": "T184"},
+            {"s": 146, "r": "indication", "u": "C0085228", "t": "T047"},    ## filtered out ID
+            {"s": 147, "r": "indication", "u": "C0000001", "t": "T121"},    ## not DoP
+            {"s": 148, "r": "indication", "u": None, "t": "T047"},
+        ])
+        db_conn.execute(text(
+            "CREATE TABLE act_table_full "
+            "(struct_id INTEGER, accession TEXT, action_type TEXT, act_source TEXT, act_source_url TEXT)"
+        ))
+        db_conn.execute(text("INSERT INTO act_table_full VALUES (:s, :a, :t, :src, :url)"), [
+            {"s": 1, "a": "P1|P2", "t": "INHIBITOR", "src": "DRUG LABEL", "url": "https://pubmed.ncbi.nlm.nih.gov/1"},
+            {"s": 1, "a": "P2", "t": "INHIBITOR", "src": "DRUG LABEL", "url": None},    ## duplicate
+            {"s": 2, "a": "P3", "t": None, "src": "DRUG LABEL", "url": None},    ## no action_type
+            {"s": 3, "a": "P4", "t": "AGONIST", "src": "CHEMBL", "url": None},    ## removed source
+            {"s": 4, "a": "P5", "t": "AGONIST", "src": "SCIENTIFIC LITERATURE", "url": "https://doi.org/10.1/x"},
+        ])
+    monkeypatch.setattr(drugcentral, "get_engine", lambda: engine)
+    return engine
+
+
+def prepare_koza_transform(input_files_dir):
+    return MockKozaTransform(extra_fields={}, writer=MockKozaWriter(), mappings={}, input_files_dir=input_files_dir)
+
+
+def test_omop_prepare(drugcentral_db, tmp_path):
+    koza_transform = prepare_koza_transform(tmp_path / "source_data")
+    rows = sorted(omop_prepare(koza_transform, []), key=lambda row: row["struct_id"])
+    assert rows == [
+        {"struct_id": 144, "relationship_name": "off-label use", "umls_cui": "C0022336"},
+        {"struct_id": 145, "relationship_name": "indication", "umls_cui": "C0018681"},
+    ]
+    assert koza_transform.transform_metadata["dop_semantic_mapping"] == {"T047": "disease", "T184": "phenotypic feature"}
+
+    ## rerun from the snapshot, without the database
+    drugcentral_db.dispose()
+    (tmp_path / "drugcentral.db").unlink()
+    assert sorted(omop_prepare(koza_transform, []), key=lambda row: row["struct_id"]) == rows
+
+
+def test_bioactivity_prepare(drugcentral_db, tmp_path):
+    rows = list(bioactivity_prepare(prepare_koza_transform(tmp_path / "source_data"), []))
+    assert [(row["struct_id"], row["accession"], row["act_source_url"]) for row in rows] == [
+        (1, "P1", "PMID:1"),
+        (1, "P2", "PMID:1"),
+        (4, "P5", "DOI:10.1/x"),
+    ]
@@ -0,0 +1,178 @@
+"""The helpers intact.py parsed PSI-MI fields with before the mitab module existed, with a re.match per call.
+
+They are copies, kept as the reference implementation for the equivalence tests in test_intact.py and the
+parser benchmark in benchmarks/test_intact_mitab.py, which both run them with ``parse_records``.
+"""
+
+import csv
+import re
+from pathlib import Path
+
+from translator_ingest.ingests.intact.intact import (
+    extract_detection_methods,
+    extract_name_from_aliases,
+    extract_publications,
+    get_predicate_from_interaction_type,
+    get_primary_identifier,
+)
+from translator_ingest.ingests.intact.mitab import MITAB_COLUMNS
+
+SAMPLE_MITAB_FILE = Path(__file__).parent / "sample_data" / "intact_sample.txt"
+
+
+# ──── Legacy reference implementation ───────────────────────────────────────
+
+
+def legacy_parse_psi_mi_field(field_value: str) -> dict[str, str]:
+    if not field_value or field_value == "-":
+        return {'db': None, 'id': None, 'desc': None}
+    field_value = field_value.replace('"', '')
+    match = re.match(r'^([^:]+):([^(]+)(?:\(([^)]+)\))?$', field_value)
+    if match:
+        return {
+            'db': match.group(1).lower(),
+            'id': match.group(2),
+            'desc': match.group(3) if match.group(3) else None
+        }
+    return {'db': None, 'id': field_value, 'desc': None}
+
+
+def legacy_parse_multi_value_field(field_value: str) -> list[dict[str, str]]:
+    if not field_value or field_value == "-":
+        return []
+    values = field_value.split("|")
+    return [legacy_parse_psi_mi_field(v.strip()) for v in values if v.strip()]
+
+
+def legacy_extract_curie(parsed_field: dict[str, str], preferred_prefix: str | None = None) -> str | None:
+    if not parsed_field['id']:
+        return None
+    if preferred_prefix:
+        return f"{preferred_prefix}:{parsed_field['id']}"
+    elif parsed_field['db']:
+        db_to_prefix = {
+            'uniprotkb': 'UniProtKB',
+            'uniprot': 'UniProtKB',
+            'chebi': 'CHEBI',
+            'pubmed': 'PMID',
+            'ensembl': 'ENSEMBL',
+            'entrez gene/locuslink': 'NCBIGene',
+            'refseq': 'RefSeq',
+            'psi-mi': 'MI',
+        }
+        prefix = db_to_prefix.get(parsed_field['db'].lower(), parsed_field['db'])
+        return f"{prefix}:{parsed_field['id']}"
+    else:
+        return parsed_field['id']
+
+
+def legacy_get_primary_identifier(id_field: str, alt_ids_field: str) -> tuple[str | None, str | None]:
+    all_ids = [legacy_parse_psi_mi_field(id_field)] + legacy_parse_multi_value_field(alt_ids_field)
+    for parsed in all_ids:
+        if not parsed['id']:
+            continue
+        db = parsed['db'].lower() if parsed['db'] else ''
+        if db in ['uniprotkb', 'uniprot']:
+            return legacy_extract_curie(parsed, 'UniProtKB'), 'protein'
+        if db == 'chebi':
+            return legacy_extract_curie(parsed, 'CHEBI'), 'small_molecule'
+    for parsed in all_ids:
+        if not parsed['id']:
+            continue
+        db = parsed['db'].lower() if parsed['db'] else ''
+        if db in ['ensembl']:
+            return legacy_extract_curie(parsed, 'ENSEMBL'), 'gene'
+        if db in ['entrez gene/locuslink']:
+            return legacy_extract_curie(parsed, 'NCBIGene'), 'gene'
+        if db == 'refseq':
+            return legacy_extract_curie(parsed, 'RefSeq'), 'gene'
+    for parsed in all_ids:
+        if parsed['id']:
+            curie = legacy_extract_curie(parsed)
+            if curie:
+                return curie, 'protein'
+    return None, None
+
+
+def legacy_extract_publications(publications_field: str) -> list[str] | None:
+    if not publications_field or publications_field == "-":
+        return None
+    pmids = []
+    for pub in legacy_parse_multi_value_field(publications_field):
+        if pub['db'] and pub['db'].lower() == 'pubmed' and pub['id']:
+            pmids.append(f"PMID:{pub['id']}")
+    return pmids if pmids else None
+
+
+def legacy_get_predicate_from_interaction_type(interaction_types_field: str) -> str:
+    from translator_ingest.ingests.intact.intact import DEFAULT_PREDICATE, PSI_MI_TYPE_TO_PREDICATE
+
+    if not interaction_types_field or interaction_types_field == "-":
+        return DEFAULT_PREDICATE
+    for parsed in legacy_parse_multi_value_field(interaction_types_field):
+        if parsed['desc']:
+            type_desc = parsed['desc'].lower()
+            if type_desc in PSI_MI_TYPE_TO_PREDICATE:
+                return PSI_MI_TYPE_TO_PREDICATE[type_desc]
+    return DEFAULT_PREDICATE
+
+
+def legacy_extract_name_from_aliases(aliases_field: str) -> str | None:
+    if not aliases_field or aliases_field == "-":
+        return None
+    parsed_aliases = legacy_parse_multi_value_field(aliases_field)
+    for alias in parsed_aliases:
+        if alias['desc'] and 'gene name' in alias['desc'].lower() and alias['id']:
+            return alias['id']
+    for alias in parsed_aliases:
+        if alias['id']:
+            return alias['id']
+    return None
+
+
+def legacy_extract_detection_methods(detection_method_field: str) -> list[str] | None:
+    if not detection_method_field or detection_method_field == "-":
+        return None
+    methods = []
+    for method in legacy_parse_multi_value_field(detection_method_field):
+        if method['db'] and method['db'].lower() == 'psi-mi' and method['id']:
+            if method['id'].startswith('MI:'):
+                methods.append(method['id'])
+            else:
+                methods.append(f"MI:{method['id']}")
+    return methods if methods else None
+
+
+# ──── Field extraction ───────────────────────────────────────────────────────
+
+
+def read_mitab_records(mitab_path: Path) -> list[dict[str, str]]:
+    with open(mitab_path) as mitab_file:
+        rows = (line for line in mitab_file if not line.startswith("#"))
+        return list(csv.DictReader(rows, fieldnames=MITAB_COLUMNS, delimiter="\t", quoting=csv.QUOTE_NONE))
+
+
+def parse_records(records: list[dict[str, str]], legacy: bool = False) -> list[tuple]:
+    """Run the field extraction done by the IntAct transform over every record."""
+    if legacy:
+        primary, name, pubs, predicate, methods = (
+            legacy_get_primary_identifier, legacy_extract_name_from_aliases, legacy_extract_publications,
+            legacy_get_predicate_from_interaction_type, legacy_extract_detection_methods,
+        )
+    else:
+        primary, name, pubs, predicate, methods = (
+            get_primary_identifier, extract_name_from_aliases, extract_publications,
+            get_predicate_from_interaction_type, extract_detection_methods,
+        )
+    return [
+        (
+            primary(record["idA"], record["altIdsA"]),
+            primary(record["idB"], record["altIdsB"]),
+            name(record["aliasesA"]),
+            name(record["aliasesB"]),
+            pubs(record["publicationIDs"]),
+            predicate(record["interactionTypes"]),
+            methods(record["interactionDetectionMethod"]),
+        )
+        for record in records
+    ]
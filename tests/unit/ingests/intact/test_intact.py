@@ -1,13 +1,23 @@
 import pytest
-
 from biolink_model.datamodel.pydanticmodel_v2 import (
-    PairwiseMolecularInteraction,
-    KnowledgeLevelEnum,
     AgentTypeEnum,
-    RetrievalSource,
+    KnowledgeLevelEnum,
+    PairwiseMolecularInteraction,
     ResourceRoleEnum,
+    RetrievalSource,
 )
 
+from tests.unit.ingests import MockKozaTransform, MockKozaWriter
+from tests.unit.ingests.intact.legacy_mitab import SAMPLE_MITAB_FILE, parse_records, read_mitab_records
+from translator_ingest.ingests.intact import intact, mitab
+from translator_ingest.ingests.intact.intact import clear_caches, transform_record
+from translator_ingest.ingests.intact.mitab import (
+    PsiMiValue,
+    parse_psi_mi_field,
+    parse_psi_mi_value,
+    scan_mitab,
+    split_psi_mi_column,
+)
 
 INTACT_SOURCES = [
     RetrievalSource(
@@ -47,3 +57,73 @@ def test_pydantic_roundtrip(fixture):
     dumped = obj.model_dump()
     restored = cls.model_validate(dumped)
     assert restored == obj
+
+
+# ── PSI-MI MITAB parsing ──────────────────────────────────────────────────────
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("uniprotkb:P12345(gene name)", PsiMiValue("uniprotkb", "P12345", "gene name")),
+        ('psi-mi:"MI:0915"(physical association)', PsiMiValue("psi-mi", "MI:0915", "physical association")),
+        ("pubmed:12345678", PsiMiValue("pubmed", "12345678", None)),
+        ("P12345", PsiMiValue(None, "P12345", None)),
+        ("-", PsiMiValue(None, None, None)),
+        ("", PsiMiValue(None, None, None)),
+    ],
+)
+def test_parse_psi_mi_value(value, expected):
+    assert parse_psi_mi_value(value) == expected
+
+
+def test_parse_psi_mi_field_splits_and_memoizes():
+    field = 'psi-mi:"MI:0018"(two hybrid)| |psi-mi:"MI:0019"(coimmunoprecipitation)'
+    parsed = parse_psi_mi_field(field)
+    assert parsed == (
+        PsiMiValue("psi-mi", "MI:0018", "two hybrid"),
+        PsiMiValue("psi-mi", "MI:0019", "coimmunoprecipitation"),
+    )
+    assert parse_psi_mi_field(field) is parsed
+    assert parse_psi_mi_field("-") == ()
+
+
+@pytest.fixture(scope="module")
+def sample_records() -> list[dict[str, str]]:
+    return read_mitab_records(SAMPLE_MITAB_FILE)
+
+
+def test_field_helpers_match_legacy_parser(sample_records):
+    """The compiled, memoized helpers reproduce the original regex-per-call helpers."""
+    assert parse_records(sample_records) == parse_records(sample_records, legacy=True)
+
+
+def test_clear_caches_empties_every_field_cache(sample_records):
+    parse_records(sample_records)
+    clear_caches()
+    cached_functions = {
+        function for module in (intact, mitab) for function in vars(module).values() if hasattr(function, "cache_info")
+    }
+    assert len(cached_functions) == 8
+    assert all(function.cache_info().currsize == 0 for function in cached_functions)
+
+
+def test_split_psi_mi_column_matches_row_wise_parser(sample_records):
+    columns = ["idA", "altIdsA", "aliasesB", "publicationIDs", "interactionTypes", "interactionDetectionMethod"]
+    df = scan_mitab(SAMPLE_MITAB_FILE).select(*(split_psi_mi_column(column) for column in columns)).collect()
+    assert df.height == len(sample_records)
+    for column in columns:
+        expected = [[value._asdict() for value in parse_psi_mi_field(record[column])] for record in sample_records]
+        assert df[column].to_list() == expected
+
+
+def test_transform_record_from_sample(sample_records):
+    mock_koza = MockKozaTransform(extra_fields={}, writer=MockKozaWriter(), mappings={})
+    result = transform_record(mock_koza, sample_records[0])
+    assert result is not None
+    assert [node.id for node in result.nodes] == ["UniProtKB:P04637", "UniProtKB:Q00987"]
+    assert [node.name for node in result.nodes] == ["TP53", "MDM2"]
+    (edge,) = result.edges
+    assert edge.predicate == "biolink:physically_interacts_with"
+    assert edge.publications == ["PMID:1535557"]
+
+    # mouse-mouse interaction is filtered out
+    assert transform_record(mock_koza, sample_records[6]) is None
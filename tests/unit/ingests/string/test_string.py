@@ -1,8 +1,13 @@
 """Unit tests for STRING ingest helpers and transform."""
 
+import csv
+import gzip
+
+import polars as pl
 import pytest
 
 import koza
+from koza.model.graphs import KnowledgeGraph
 
 from biolink_model.datamodel.pydanticmodel_v2 import (
     Protein,
@@ -11,9 +16,12 @@ from biolink_model.datamodel.pydanticmodel_v2 import (
 )
 
 from tests.unit.ingests import MockKozaTransform, MockKozaWriter
+from tests.util import find_project_root, get_ingest_config_yaml_path
+from translator_ingest.util.polars_reader import KozaReaderData
 
 from translator_ingest.ingests.string.string import (
     get_latest_version,
+    prepare_string_ppi,
     transform_string_ppi
 
 )
@@ -22,11 +30,15 @@ from translator_ingest.ingests.string.string_utils import (
     CHANNEL_PREDICATES,
     FALLBACK_PREDICATE,
     PSI_MI_PHYSICAL_ASSOCIATION,
+    check_string_ppi_edges,
     knowledge_level_and_agent_type_for_row,
     load_string_to_entrez_mapping,
     parse_string_protein_id,
     passes_combined_score,
     predicates_for_row,
+    prepare_string_ppi_edges,
+    scan_string_links,
+    scan_string_to_entrez_mapping,
     sorted_pair_key
 )
 
@@ -55,8 +67,8 @@ def _full_row(
 
 
 # Fixture mapping for tests: covers the canonical pairs used in the transform
-# tests below. Real ingest loads this via on_data_begin from the 285 MB
-# all_organisms.entrez_2_string.tsv file; tests inject this small dict directly.
+# tests below. Real ingest joins the 285 MB all_organisms.entrez_2_string.tsv file
+# in prepare_string_ppi; tests join this small table directly.
 FIXTURE_STRING_TO_ENTREZ: dict[str, list[str]] = {
     "9606.ENSP00000478725":     ["NCBIGene:7157"],   # plausible TP53-like
     "9606.ENSP00000478289":     ["NCBIGene:4193"],   # plausible MDM2-like
@@ -70,14 +82,40 @@ FIXTURE_STRING_TO_ENTREZ: dict[str, list[str]] = {
 }
 
 
+FIXTURE_DIR = find_project_root() / "tests" / "unit" / "ingests" / "string" / "sample_data"
+
+
 @pytest.fixture
 def mock_koza() -> koza.KozaTransform:
-    """Fresh MockKozaTransform with empty state and fixture mapping for each test."""
+    """Fresh MockKozaTransform with empty state for each test."""
     mk = MockKozaTransform(extra_fields={}, writer=MockKozaWriter(), mappings={})
-    mk.state = {"string_to_entrez": FIXTURE_STRING_TO_ENTREZ}
+    mk.state = {}
     return mk
 
 
+def _transform_rows(mock_koza: koza.KozaTransform, *rows: dict) -> list[KnowledgeGraph]:
+    """Run raw STRING rows through the prepare_data pipeline (against the fixture
+    mapping) and then the record transform, the way the Koza runner does."""
+    links = pl.LazyFrame(list(rows), schema={column: pl.String for column in rows[0]})
+    string_to_entrez = pl.LazyFrame(
+        {
+            "string_id": list(FIXTURE_STRING_TO_ENTREZ),
+            "equivalent_identifiers": list(FIXTURE_STRING_TO_ENTREZ.values()),
+        }
+    )
+    edges = prepare_string_ppi_edges(links, string_to_entrez).collect()
+    check_string_ppi_edges(edges)
+    results = [transform_string_ppi(mock_koza, record) for record in edges.iter_rows(named=True)]
+    return [result for result in results if result is not None]
+
+
+def _transform_row(mock_koza: koza.KozaTransform, row: dict) -> KnowledgeGraph | None:
+    """Single-row variant of "_transform_rows": the row's graph, or None if dropped."""
+    results = _transform_rows(mock_koza, row)
+    assert len(results) <= 1
+    return results[0] if results else None
+
+
 @pytest.mark.parametrize(
     "string_id,expected_curie,expected_taxon",
     [
@@ -199,7 +237,7 @@ def test_transform_emits_protein_pair_above_threshold(mock_koza, p1, p2, expecte
     """Above-combined-score row with no high-confidence channels emits a single
     fallback edge ("physically_interacts_with"). PSI-MI MI:0915 (PSI_MI_PHYSICAL_ASSOCIATION)
     is attached only to the physical-interaction predicate."""
-    result = transform_string_ppi(
+    result = _transform_row(
         mock_koza,
         _full_row(p1, p2, combined_score=540),
     )
@@ -228,7 +266,7 @@ def test_transform_emits_protein_pair_above_threshold(mock_koza, p1, p2, expecte
 
 def test_transform_populates_equivalent_identifiers_from_mapping(mock_koza):
     """Each Protein node carries its NCBIGene equivalents from the mapping dict."""
-    result = transform_string_ppi(mock_koza, _full_row(H1, H2, combined_score=952))
+    result = _transform_row(mock_koza, _full_row(H1, H2, combined_score=952))
     assert result is not None and result.nodes is not None
     by_id = {n.id: n for n in list(result.nodes)}
     assert by_id["ENSEMBL:ENSP00000478725"].equivalent_identifiers == ["NCBIGene:7157"]
@@ -237,7 +275,7 @@ def test_transform_populates_equivalent_identifiers_from_mapping(mock_koza):
 
 def test_transform_preserves_multimapping(mock_koza):
     """Proteins with multiple Entrez mappings carry the full list."""
-    result = transform_string_ppi(mock_koza, _full_row(H1, H3, combined_score=952))
+    result = _transform_row(mock_koza, _full_row(H1, H3, combined_score=952))
     assert result is not None and result.nodes is not None
     by_id = {n.id: n for n in list(result.nodes)}
     # H3 (ENSP00000481152) maps to two genes in the fixture.
@@ -251,9 +289,7 @@ def test_transform_handles_missing_mapping(mock_koza):
     """A protein with no Entrez mapping yields "equivalent_identifiers=None",
     not a crash or empty list."""
     # "9606.ENSP00000000001" is deliberately absent from FIXTURE_STRING_TO_ENTREZ.
-    result = transform_string_ppi(
-        mock_koza, _full_row("9606.ENSP00000000001", H2, combined_score=952),
-    )
+    result = _transform_row(mock_koza, _full_row("9606.ENSP00000000001", H2, combined_score=952))
     assert result is not None and result.nodes is not None
     by_id = {n.id: n for n in result.nodes}
     assert by_id["ENSEMBL:ENSP00000000001"].equivalent_identifiers is None
@@ -334,9 +370,7 @@ def test_predicates_for_row_all_channels_fire():
 def test_transform_emits_predicate_per_high_confidence_channel(
     mock_koza, channel_scores, expected_predicates
 ):
-    result = transform_string_ppi(
-        mock_koza, _full_row(H1, H2, combined_score=952, **channel_scores),
-    )
+    result = _transform_row(mock_koza, _full_row(H1, H2, combined_score=952, **channel_scores))
     assert result is not None and result.edges is not None
     predicates = [e.predicate for e in result.edges]
     assert predicates == expected_predicates
@@ -345,7 +379,7 @@ def test_transform_emits_predicate_per_high_confidence_channel(
 def test_transform_emits_multiple_edges_for_multi_channel_row(mock_koza):
     """A row with three high-confidence channels emits three distinct edges
     (one per fired predicate), sharing the same subject/object."""
-    result = transform_string_ppi(
+    result = _transform_row(
         mock_koza,
         _full_row(H1, H2, combined_score=952,
                   experiments=800, coexpression=800, textmining=800),
@@ -368,23 +402,22 @@ def test_transform_emits_multiple_edges_for_multi_channel_row(mock_koza):
 def test_transform_dedupes_per_pair_per_predicate(mock_koza):
     """Symmetric duplicate row for the SAME predicate gets dropped; the same
     pair under a DIFFERENT predicate is independent and still emits."""
-    first = transform_string_ppi(
-        mock_koza, _full_row(H1, H2, combined_score=952, experiments=800),
-    )
-    # Same pair, reversed, same predicate → suppressed
-    second = transform_string_ppi(
-        mock_koza, _full_row(H2, H1, combined_score=952, experiments=800),
-    )
-    # Same pair, reversed, DIFFERENT predicate → emitted
-    third = transform_string_ppi(
-        mock_koza, _full_row(H2, H1, combined_score=952, coexpression=800),
+    results = _transform_rows(
+        mock_koza,
+        _full_row(H1, H2, combined_score=952, experiments=800),
+        # Same pair, reversed, same predicate → suppressed
+        _full_row(H2, H1, combined_score=952, experiments=800),
+        # Same pair, reversed, DIFFERENT predicate → emitted
+        _full_row(H2, H1, combined_score=952, coexpression=800),
     )
-    assert first is not None and first.edges is not None
+    assert len(results) == 2  # the full dup emits nothing
+    first, third = results
+    assert first.edges is not None
     assert len(list(first.edges)) == 1
-    assert second is None  # full dup
-    assert third is not None and third.edges is not None
+    assert next(iter(first.edges)).predicate == "biolink:physically_interacts_with"
+    assert third.edges is not None
     assert len(list(third.edges)) == 1
-    assert list(third.edges)[0].predicate == "biolink:coexpressed_with"
+    assert next(iter(third.edges)).predicate == "biolink:coexpressed_with"
 
 
 # ──── Per-channel knowledge-level / agent-type tests ─────────────────────────
@@ -444,7 +477,7 @@ def test_transform_propagates_channel_kl_at_to_edges(mock_koza):
     """Every edge from a row shares the row-level KL/AT derived from the dominant channel."""
     # experiments dominant → knowledge_assertion + manual_agent on all edges,
     # including the coexpression edge that also fires.
-    result = transform_string_ppi(
+    result = _transform_row(
         mock_koza,
         _full_row(H1, H2, combined_score=952, experiments=900, coexpression=800),
     )
@@ -456,12 +489,12 @@ def test_transform_propagates_channel_kl_at_to_edges(mock_koza):
 
 
 def test_transform_textmining_only_edge_carries_textmining_kl_at(mock_koza):
-    result = transform_string_ppi(
+    result = _transform_row(
         mock_koza,
         _full_row(H1, H2, combined_score=952, textmining=900),
     )
     assert result is not None and result.edges is not None
-    edge = list(result.edges)[0]
+    edge = next(iter(result.edges))
     assert edge.predicate == "biolink:interacts_with"
     assert edge.knowledge_level == KnowledgeLevelEnum.not_provided
     assert edge.agent_type == AgentTypeEnum.text_mining_agent
@@ -495,21 +528,23 @@ def test_load_string_to_entrez_mapping(tmp_path):
 
 @pytest.mark.parametrize("score", ["500", "499", "0"])
 def test_transform_drops_rows_at_or_below_threshold(mock_koza, score):
-    assert transform_string_ppi(mock_koza, _full_row(H1, H2, combined_score=score)) is None
+    assert _transform_row(mock_koza, _full_row(H1, H2, combined_score=score)) is None
 
 
 def test_transform_keeps_distinct_pairs(mock_koza):
     """Dedup is per-pair, not global."""
-    first = transform_string_ppi(mock_koza, _full_row(H1, H2, combined_score=952))
-    second = transform_string_ppi(mock_koza, _full_row(H1, H3, combined_score=952))
-    assert first is not None
-    assert second is not None
+    results = _transform_rows(
+        mock_koza,
+        _full_row(H1, H2, combined_score=952),
+        _full_row(H1, H3, combined_score=952),
+    )
+    assert len(results) == 2
 
 
 def test_transform_rejects_unsupported_taxon(mock_koza):
     """A row from a non-target species (e.g., yeast) should raise loudly."""
     with pytest.raises(ValueError, match="Unsupported taxon prefix"):
-        transform_string_ppi(
+        _transform_row(
             mock_koza,
             _full_row("4932.YAL001C", "4932.YAL002W", combined_score=952),
         )
@@ -518,4 +553,94 @@ def test_transform_rejects_unsupported_taxon(mock_koza):
 def test_transform_rejects_cross_species_pair(mock_koza):
     """Per-organism STRING files only contain intra-species rows; defend against corruption."""
     with pytest.raises(ValueError, match="Cross-species pair"):
-        transform_string_ppi(mock_koza, _full_row(H1, M1, combined_score=952))
+        _transform_row(mock_koza, _full_row(H1, M1, combined_score=952))
+
+
+# ──── Vectorized prepare_data pipeline ───────────────────────────────────────
+
+
+def _string_ppi_files() -> list[str]:
+    """The link files of the string_ppi reader in string.yaml."""
+    import yaml
+
+    with open(get_ingest_config_yaml_path("string")) as config_file:
+        config = yaml.safe_load(config_file)
+    return config["readers"]["string_ppi"]["files"]
+
+
+def _row_wise_edges(links_paths, mapping: dict[str, list[str]]) -> list[tuple]:
+    """Reference implementation: the original one-row-at-a-time transform logic."""
+    seen_pairs: set = set()
+    edges = []
+    for links_path in links_paths:
+        with gzip.open(links_path, "rt") as links_file:
+            for row in csv.DictReader(links_file, delimiter=" "):
+                if not passes_combined_score(row["combined_score"]):
+                    continue
+                subject_id, subject_taxon = parse_string_protein_id(row["protein1"])
+                object_id, _ = parse_string_protein_id(row["protein2"])
+                new_predicates = [
+                    p for p in predicates_for_row(row)
+                    if sorted_pair_key(subject_id, object_id, p) not in seen_pairs
+                ]
+                if not new_predicates:
+                    continue
+                seen_pairs.update(sorted_pair_key(subject_id, object_id, p) for p in new_predicates)
+                kl, at = knowledge_level_and_agent_type_for_row(row)
+                edges.append(
+                    (
+                        subject_id, object_id, subject_taxon, new_predicates, kl.value, at.value,
+                        mapping.get(row["protein1"]), mapping.get(row["protein2"]),
+                    )
+                )
+    return edges
+
+
+def test_prepare_string_ppi_edges_matches_row_wise_transform():
+    """The polars pipeline reproduces the row-wise helpers on the sample link files."""
+    links_paths = [FIXTURE_DIR / file_name for file_name in _string_ppi_files()]
+    mapping_path = FIXTURE_DIR / "all_organisms.entrez_2_string.tsv"
+
+    edges = prepare_string_ppi_edges(
+        pl.concat([scan_string_links(path) for path in links_paths]),
+        scan_string_to_entrez_mapping(mapping_path),
+    ).collect()
+    check_string_ppi_edges(edges)
+
+    vectorized = [
+        (
+            row["subject"], row["object"], row["subject_taxon"], row["predicates"],
+            row["knowledge_level"], row["agent_type"],
+            row["subject_equivalent_identifiers"], row["object_equivalent_identifiers"],
+        )
+        for row in edges.iter_rows(named=True)
+    ]
+    expected = _row_wise_edges(links_paths, load_string_to_entrez_mapping(mapping_path))
+    assert vectorized
+    assert vectorized == expected
+
+
+def test_prepare_string_ppi_scans_reader_files():
+    """prepare_string_ppi scans the files of the reader the pipeline passes with the
+    records, and yields the same rows as it does from the records themselves."""
+    from koza.runner import KozaRunner
+
+    config, runner = KozaRunner.from_config_file(
+        str(get_ingest_config_yaml_path("string")),
+        input_files_dir=str(FIXTURE_DIR),
+        output_format="passthrough",
+    )
+    (reader,) = config.get_readers()
+    koza_transform = MockKozaTransform(extra_fields={}, writer=MockKozaWriter(), mappings={},
+                                       input_files_dir=FIXTURE_DIR)
+
+    records = list(runner.data["string_ppi"])
+    scanned = list(prepare_string_ppi(koza_transform, KozaReaderData(iter(records), reader.reader)))
+    read = list(prepare_string_ppi(koza_transform, iter(records)))
+    assert scanned
+    assert scanned == read
+
+
+def test_check_string_ppi_edges_rejects_malformed_id(mock_koza):
+    with pytest.raises(ValueError, match="Expected STRING ID format"):
+        _transform_row(mock_koza, _full_row("ENSP00000478725", H2, combined_score=952))
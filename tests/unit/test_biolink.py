@@ -0,0 +1,56 @@
+"""Tests for the memoized Biolink Model queries of the biolink module."""
+
+import pytest
+from biolink_model.datamodel.pydanticmodel_v2 import Gene, NamedThing, Study, StudyResult
+
+from translator_ingest.util.biolink import (
+    get_biolink_ancestors,
+    get_biolink_descendants,
+    get_biolink_element_by_mapping,
+    get_biolink_node_class,
+)
+from translator_ingest.util.biolink_snapshot import get_biolink_snapshot
+
+
+@pytest.mark.parametrize("name", ["gene", "biolink:Gene", "Gene"])
+def test_get_biolink_ancestors(name):
+    ancestors = get_biolink_ancestors(name)
+    assert {"gene", "gene or gene product", "named thing"} <= ancestors
+    assert ancestors == frozenset(get_biolink_snapshot().get_ancestors(name))
+    assert "biolink:GeneOrGeneProduct" in get_biolink_ancestors(name, formatted=True)
+    assert get_biolink_ancestors("not a biolink class") == frozenset()
+
+
+def test_get_biolink_descendants():
+    descendants = get_biolink_descendants("disease or phenotypic feature")
+    assert {"disease or phenotypic feature", "disease", "phenotypic feature"} <= descendants
+    assert "gene" not in descendants
+    with pytest.raises(ValueError):
+        get_biolink_descendants("not a biolink class")
+
+
+def test_get_biolink_element_by_mapping():
+    assert get_biolink_element_by_mapping("STY:T047") == "disease"
+    assert get_biolink_element_by_mapping("STY:T047", formatted=True) == "biolink:Disease"
+    assert get_biolink_element_by_mapping("STY:not a semantic type") is None
+
+
+@pytest.mark.parametrize(
+    "categories,node_class",
+    [
+        (["biolink:NamedThing", "biolink:Gene"], Gene),
+        (["biolink:Study"], Study),
+        (["biolink:StudyResult"], StudyResult),
+        ([], NamedThing),
+        (["biolink:NotACategory"], NamedThing),
+    ],
+)
+def test_get_biolink_node_class(categories, node_class):
+    assert get_biolink_node_class("TEST:1", categories) is node_class
+
+
+def test_biolink_queries_are_cached():
+    get_biolink_ancestors.cache_clear()
+    for _ in range(3):
+        get_biolink_ancestors("biolink:Disease")
+    assert get_biolink_ancestors.cache_info().hits == 2
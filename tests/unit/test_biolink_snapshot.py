@@ -0,0 +1,120 @@
+"""Tests for the biolink_snapshot module."""
+
+import pickle
+
+import pytest
+from biolink_model.datamodel.pydanticmodel_v2 import NamedThing, SmallMolecule
+
+from translator_ingest.util.biolink import get_biolink_schema
+from translator_ingest.util.biolink_snapshot import (
+    SNAPSHOT_FORMAT_VERSION,
+    BiolinkSnapshot,
+    build_biolink_snapshot,
+    get_biolink_snapshot_path,
+    load_biolink_snapshot,
+    save_biolink_snapshot,
+)
+
+
+@pytest.fixture(scope="module")
+def snapshot() -> BiolinkSnapshot:
+    return build_biolink_snapshot(get_biolink_schema())
+
+
+def test_closures_match_schema_view(snapshot):
+    schema_view = get_biolink_schema()
+    for class_name in schema_view.all_classes():
+        for mixin in (True, False):
+            for reflexive in (True, False):
+                assert snapshot.get_ancestors(class_name, reflexive=reflexive, mixin=mixin) == list(
+                    schema_view.class_ancestors(class_name, mixins=mixin, reflexive=reflexive)
+                )
+                assert snapshot.get_descendants(class_name, reflexive=reflexive, mixin=mixin) == list(
+                    schema_view.class_descendants(class_name, mixins=mixin, reflexive=reflexive)
+                )
+    assert snapshot.get_ancestors("treats", reflexive=False) == list(
+        schema_view.slot_ancestors("treats", reflexive=False)
+    )
+
+
+@pytest.mark.parametrize("name", ["gene", "Gene", "biolink:Gene", "GENE"])
+def test_class_name_resolution(snapshot, name):
+    element = snapshot.get_element(name)
+    assert element.name == "gene"
+    assert element.class_uri == "biolink:Gene"
+    assert "NCBIGene" in element.id_prefixes
+
+
+@pytest.mark.parametrize("name", ["treats", "biolink:treats", "biolink:related_to", "related to", "related_to"])
+def test_slot_name_resolution(snapshot, name):
+    assert snapshot.get_element(name).element_type == "slot"
+
+
+def test_slot_domain_and_range(snapshot):
+    treats = snapshot.get_element("biolink:treats")
+    assert treats.slot_uri == "biolink:treats"
+    assert treats.domain == "chemical or drug or treatment"
+    assert treats.range == "disease or phenotypic feature"
+
+
+def test_unknown_elements(snapshot):
+    assert snapshot.get_element("biolink:NotAClass") is None
+    assert snapshot.get_ancestors("biolink:NotAClass") == []
+    with pytest.raises(ValueError):
+        snapshot.get_descendants("biolink:NotAClass")
+
+
+def test_formatted_names(snapshot):
+    assert snapshot.get_ancestors("biolink:Gene", formatted=True)[:2] == ["biolink:Gene", "biolink:GeneOrGeneProduct"]
+    assert "biolink:treats" in snapshot.get_descendants("related to", formatted=True)
+    assert "biolink:Gene" in snapshot.get_all_classes(formatted=True)
+
+
+def test_most_specific_category(snapshot):
+    assert snapshot.get_most_specific_category(["biolink:NamedThing", "biolink:Gene"]) == "biolink:Gene"
+    assert snapshot.get_most_specific_category(["biolink:ChemicalEntity", "biolink:SmallMolecule"]) == (
+        "biolink:SmallMolecule"
+    )
+    assert snapshot.get_most_specific_category(["biolink:NotAClass"]) == "biolink:NamedThing"
+    assert snapshot.get_most_specific_category(["Gene"], formatted=False) == "Gene"
+
+
+def test_node_class(snapshot):
+    assert snapshot.get_node_class("CHEBI:6801", ["biolink:ChemicalEntity", "biolink:SmallMolecule"]) is SmallMolecule
+    assert snapshot.get_node_class("X:1", []) is NamedThing
+
+
+def test_element_by_mapping(snapshot):
+    assert snapshot.get_element_by_mapping("STY:T047") == "disease"
+    assert snapshot.get_element_by_mapping("STY:T047", formatted=True) == "biolink:Disease"
+    assert snapshot.get_element_by_mapping("STY:NotAType") is None
+
+
+def test_pickle_round_trip(snapshot, tmp_path):
+    snapshot_path = get_biolink_snapshot_path(snapshot.get_model_version(), cache_dir=tmp_path)
+    save_biolink_snapshot(snapshot, snapshot_path)
+    assert list(tmp_path.iterdir()) == [snapshot_path]
+
+    loaded = load_biolink_snapshot(snapshot_path)
+    assert loaded.get_model_version() == snapshot.get_model_version()
+    assert loaded.elements == snapshot.elements
+    assert loaded.get_descendants("named thing") == snapshot.get_descendants("named thing")
+
+    # only plain Python values are pickled, so loading does not depend on LinkML classes
+    assert b"linkml" not in snapshot_path.read_bytes()
+
+
+def test_stale_or_missing_snapshots_are_ignored(snapshot, tmp_path):
+    assert load_biolink_snapshot(tmp_path / "missing.pickle") is None
+
+    corrupt_path = tmp_path / "corrupt.pickle"
+    corrupt_path.write_bytes(b"not a pickle")
+    assert load_biolink_snapshot(corrupt_path) is None
+
+    stale_path = tmp_path / "stale.pickle"
+    snapshot.format_version = 0
+    try:
+        stale_path.write_bytes(pickle.dumps(snapshot))
+    finally:
+        snapshot.format_version = SNAPSHOT_FORMAT_VERSION
+    assert load_biolink_snapshot(stale_path) is None
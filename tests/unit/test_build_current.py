@@ -0,0 +1,85 @@
+"""Tests for the pipeline's no-op path (is_build_current / run_pipeline)."""
+
+import json
+from importlib.metadata import version
+
+import pytest
+
+from translator_ingest import pipeline
+from translator_ingest.util.biolink_snapshot import get_biolink_snapshot
+from translator_ingest.util.metadata import PipelineMetadata
+from translator_ingest.util.storage import local as local_storage
+from translator_ingest.util.storage.local import IngestFileType, get_versioned_file_paths
+
+SOURCE = "testsrc"
+
+
+@pytest.fixture
+def latest_build(tmp_path, monkeypatch):
+    """Write a complete build of SOURCE under tmp_path and return its metadata."""
+    monkeypatch.setattr(local_storage, "INGESTS_DATA_PATH", tmp_path)
+    monkeypatch.setattr(pipeline, "get_current_normalization_service_versions", lambda: ("b1", "nn1"))
+
+    build = PipelineMetadata(
+        source=SOURCE,
+        source_version="v1",
+        transform_version="tv1",
+        babel_version="b1",
+        node_normalizer_version="nn1",
+        normalization_code_version="nc1",
+        merging_code_version="mc1",
+        orion_version=version(pipeline.ORION_DISTRIBUTION),
+        biolink_version=get_biolink_snapshot().get_model_version(),
+    )
+    for file_type in (IngestFileType.VALIDATION_REPORT_FILE, IngestFileType.GRAPH_METADATA_FILE,
+                      IngestFileType.TEST_DATA_FILE, IngestFileType.EXAMPLE_EDGES_FILE):
+        file_path = get_versioned_file_paths(file_type, pipeline_metadata=build)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text("{}")
+    latest_build_path = get_versioned_file_paths(IngestFileType.LATEST_BUILD_FILE, pipeline_metadata=build)
+    latest_build_path.write_text(json.dumps(build.get_release_metadata()))
+    return build
+
+
+def _current(**overrides) -> PipelineMetadata:
+    return PipelineMetadata(**{"source": SOURCE, "source_version": "v1", "transform_version": "tv1", **overrides})
+
+
+def test_build_current(latest_build):
+    assert pipeline.is_build_current(_current())
+
+
+@pytest.mark.parametrize("overrides", [{"source_version": "v2"}, {"transform_version": "tv2"}])
+def test_build_outdated_by_source_or_transform(latest_build, overrides):
+    assert not pipeline.is_build_current(_current(**overrides))
+
+
+def test_build_outdated_by_normalization_conflation(latest_build):
+    assert not pipeline.is_build_current(_current(normalization_conflation=False))
+
+
+def test_build_outdated_by_new_babel_version(latest_build, monkeypatch):
+    monkeypatch.setattr(pipeline, "get_current_normalization_service_versions", lambda: ("b2", "nn1"))
+    assert not pipeline.is_build_current(_current())
+
+
+def test_build_with_missing_outputs_is_not_current(latest_build):
+    get_versioned_file_paths(IngestFileType.GRAPH_METADATA_FILE, pipeline_metadata=latest_build).unlink()
+    assert not pipeline.is_build_current(_current())
+
+
+def test_no_previous_build(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_storage, "INGESTS_DATA_PATH", tmp_path)
+    assert not pipeline.is_build_current(_current())
+
+
+def test_run_pipeline_skips_all_stages_for_current_build(latest_build, monkeypatch):
+    monkeypatch.setattr(pipeline, "get_latest_source_version", lambda source: "v1")
+    monkeypatch.setattr(pipeline, "get_transform_version", lambda source: "tv1")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("no stage should run for a current build")
+
+    monkeypatch.setattr(pipeline, "download", fail)
+    monkeypatch.setattr(pipeline, "load_koza_config", fail)
+    pipeline.run_pipeline(SOURCE)
@@ -0,0 +1,175 @@
+import json
+import sqlite3
+
+import pytest
+from biolink_model.datamodel.pydanticmodel_v2 import Disease, GeneToDiseaseAssociation, Protein
+from koza.model.graphs import KnowledgeGraph
+from koza.model.writer import WriterConfig
+from koza.runner import KozaRunner, KozaTransformHooks
+
+from translator_ingest.util.checkpoint import CHECKPOINT_FILE_NAME, SEGMENTS_DIR_NAME, load_checkpoint, run_checkpointed
+from translator_ingest.util.duckdb_utils import stream_query
+from translator_ingest.util.jsonio import read_jsonl
+from translator_ingest.util.transform_writer import DeduplicatingJSONLWriter
+
+RECORDS = [{"subject": f"UniProtKB:P{number % 7}", "object": f"MONDO:{number % 5}"} for number in range(50)]
+
+
+class TransformFailure(Exception):
+    pass
+
+
+def interaction(record) -> KnowledgeGraph:
+    association = GeneToDiseaseAssociation(
+        id=f"{record['subject']}-{record['object']}",
+        subject=record["subject"],
+        predicate="biolink:associated_with",
+        object=record["object"],
+        knowledge_level="not_provided",
+        agent_type="not_provided",
+    )
+    return KnowledgeGraph(nodes=[Protein(id=record["subject"]), Disease(id=record["object"])], edges=[association])
+
+
+def record_hooks(fail_at: int | None = None) -> KozaTransformHooks:
+    def on_data_begin(koza):
+        koza.state["count"] = 0
+        # can't be pickled, so it is recreated by the hook rather than restored
+        koza.state["connection"] = sqlite3.connect(":memory:")
+
+    def transform_record(koza, record):
+        if koza.state["count"] == fail_at:
+            raise TransformFailure()
+        koza.state["count"] += 1
+        return interaction(record)
+
+    def on_data_end(koza):
+        koza.transform_metadata["count"] = koza.state["count"]
+
+    return KozaTransformHooks(on_data_begin=[on_data_begin], transform_record=[transform_record],
+                              on_data_end=[on_data_end])
+
+
+def generator_hooks(fail_at: int | None = None) -> KozaTransformHooks:
+    def transform(koza, data):
+        for number, record in enumerate(data):
+            if number == fail_at:
+                raise TransformFailure()
+            # written directly, which is discarded too while the generator is replayed
+            koza.write(Protein(id=record["subject"]))
+            yield interaction(record)
+
+    return KozaTransformHooks(transform=[transform])
+
+
+def query_hooks(source_path, fail_at: int | None = None) -> KozaTransformHooks:
+    def prepare_data(koza, data):
+        # in the order of the query, not of the source file, as hpoa's prepared rows
+        return stream_query(f"select * from read_csv('{source_path}') order by all")
+
+    hooks = record_hooks(fail_at)
+    hooks.prepare_data = [prepare_data]
+    return hooks
+
+
+def shared_state_hooks(fail_at: int | None = None) -> dict[str, KozaTransformHooks]:
+    """Hooks of two tags sharing state outside koza.state, as icees' edges look up the nodes of its nodes tag.
+
+    Called once per run, as the state of an ingest module starts empty in every process.
+    """
+    proteins = {}
+
+    def transform_node(koza, record):
+        proteins[record["subject"]] = Protein(id=record["subject"])
+        return KnowledgeGraph(nodes=[proteins[record["subject"]]])
+
+    edge_hooks = record_hooks(fail_at)
+    transform_record = edge_hooks.transform_record[0]
+
+    def transform_edge(koza, record):
+        if record["subject"] not in proteins:
+            return None
+        return transform_record(koza, record)
+
+    edge_hooks.transform_record = [transform_edge]
+    return {"first": KozaTransformHooks(transform_record=[transform_node]), "second": edge_hooks}
+
+
+def write_source(source_path, records):
+    source_path.write_text("subject,object\n" + "".join(f"{record['subject']},{record['object']}\n"
+                                                         for record in records))
+
+
+def run_transform(output_dir, hooks, checkpoint_records=10):
+    writer = DeduplicatingJSONLWriter(output_dir=str(output_dir), source_name="test", config=WriterConfig(),
+                                      segments_dir=str(output_dir / SEGMENTS_DIR_NAME))
+    runner = KozaRunner(data={"first": iter(RECORDS), "second": iter(RECORDS[::-1])}, writer=writer, hooks=hooks)
+    run_checkpointed(runner, checkpoint_dir=output_dir, checkpoint_records=checkpoint_records)
+    return runner
+
+
+def read_output(output_dir) -> tuple[list, list]:
+    kgx_files = sorted(output_dir.glob("test_*.jsonl*"))
+    assert [kgx_file.name.split(".")[0] for kgx_file in kgx_files] == ["test_edges", "test_nodes"]
+    return read_jsonl(kgx_files[1]), read_jsonl(kgx_files[0])
+
+
+@pytest.mark.parametrize("make_hooks", [record_hooks, generator_hooks])
+@pytest.mark.parametrize("fail_at", [3, 25])
+def test_resume_transform(tmp_path, make_hooks, fail_at):
+    uninterrupted = run_transform(tmp_path / "uninterrupted", {tag: make_hooks() for tag in ("first", "second")})
+
+    output_dir = tmp_path / "resumed"
+    # the second tag fails after two checkpoints when fail_at is 25, and before the first one when it is 3
+    with pytest.raises(TransformFailure):
+        run_transform(output_dir, {"first": make_hooks(), "second": make_hooks(fail_at=fail_at)})
+    checkpoint = load_checkpoint(output_dir / CHECKPOINT_FILE_NAME)
+    assert checkpoint.completed_tags == ["first"]
+    assert checkpoint.position == fail_at // 10 * 10
+    resumed = run_transform(output_dir, {tag: make_hooks() for tag in ("first", "second")})
+
+    assert read_output(output_dir) == read_output(tmp_path / "uninterrupted")
+    assert resumed.writer.dedup_counts == uninterrupted.writer.dedup_counts
+    assert resumed.transform_metadata == uninterrupted.transform_metadata
+    assert sorted(path.name for path in output_dir.iterdir()) == sorted(
+        path.name for path in (tmp_path / "uninterrupted").iterdir()
+    )
+
+
+def test_resume_over_reordered_source(tmp_path):
+    source_path = tmp_path / "source.csv"
+    write_source(source_path, RECORDS)
+    run_transform(tmp_path / "uninterrupted", {tag: query_hooks(source_path) for tag in ("first", "second")})
+
+    output_dir = tmp_path / "resumed"
+    with pytest.raises(TransformFailure):
+        run_transform(output_dir, {"first": query_hooks(source_path), "second": query_hooks(source_path, fail_at=25)})
+    # the source is read in another order when the transform resumes, e.g. re-downloaded or by a parallel scan
+    write_source(source_path, RECORDS[1::2] + RECORDS[::2])
+    run_transform(output_dir, {tag: query_hooks(source_path) for tag in ("first", "second")})
+    assert read_output(output_dir) == read_output(tmp_path / "uninterrupted")
+
+
+def test_resume_with_state_shared_by_tags(tmp_path):
+    run_transform(tmp_path / "uninterrupted", shared_state_hooks())
+
+    output_dir = tmp_path / "resumed"
+    with pytest.raises(TransformFailure):
+        run_transform(output_dir, shared_state_hooks(fail_at=25))
+    # the first tag is replayed, so the second one finds the proteins it looks up
+    run_transform(output_dir, shared_state_hooks())
+    nodes, edges = read_output(output_dir)
+    assert len(edges) == 50
+    assert (nodes, edges) == read_output(tmp_path / "uninterrupted")
+
+
+def test_resume_ignores_checkpoint_of_other_tags(tmp_path):
+    with pytest.raises(TransformFailure):
+        run_transform(tmp_path, {"first": record_hooks(), "second": record_hooks(fail_at=15)})
+    writer = DeduplicatingJSONLWriter(output_dir=str(tmp_path), source_name="test", config=WriterConfig(),
+                                      compressed=False, segments_dir=str(tmp_path / SEGMENTS_DIR_NAME))
+    runner = KozaRunner(data={"other": iter(RECORDS)}, writer=writer, hooks={"other": record_hooks()})
+    run_checkpointed(runner, checkpoint_dir=tmp_path, checkpoint_records=10)
+    assert runner.transform_metadata == {"count": 50}
+    with open(tmp_path / "test_edges.jsonl") as edges_file:
+        assert len([json.loads(line) for line in edges_file]) == 50
@@ -0,0 +1,70 @@
+from pathlib import Path
+
+from translator_ingest.util import compression
+from translator_ingest.util.compression import (
+    compress_kgx_files,
+    copy_file,
+    get_kgx_file_path,
+    open_file,
+    plain_file_path,
+    plain_input_files,
+)
+
+LINES = ['{"id": "HGNC:1"}\n', '{"id": "HGNC:2"}\n']
+
+
+def test_open_file_round_trip(tmp_path):
+    with open_file(tmp_path / "nodes.jsonl.zst", "wt") as nodes_file:
+        nodes_file.writelines(LINES)
+    assert (tmp_path / "nodes.jsonl.zst").read_bytes()[:4] == b"\x28\xb5\x2f\xfd"
+    with open_file(tmp_path / "nodes.jsonl.zst") as nodes_file:
+        assert list(nodes_file) == LINES
+    with open_file(tmp_path / "nodes.jsonl.zst", "rb") as nodes_file:
+        assert list(nodes_file) == [line.encode() for line in LINES]
+
+
+def test_get_kgx_file_path(tmp_path):
+    assert get_kgx_file_path(tmp_path, "merged_nodes.jsonl") == tmp_path / "merged_nodes.jsonl"
+    # the compressed file of an earlier build is used when there is no plain one
+    (tmp_path / "merged_nodes.jsonl.zst").touch()
+    assert get_kgx_file_path(tmp_path, "merged_nodes.jsonl") == tmp_path / "merged_nodes.jsonl.zst"
+    (tmp_path / "merged_nodes.jsonl").touch()
+    assert get_kgx_file_path(tmp_path, "merged_nodes.jsonl") == tmp_path / "merged_nodes.jsonl"
+    assert plain_file_path(tmp_path / "merged_nodes.jsonl.zst") == tmp_path / "merged_nodes.jsonl"
+
+
+def test_copy_file(tmp_path):
+    (tmp_path / "nodes.jsonl").write_text("".join(LINES))
+    copy_file(tmp_path / "nodes.jsonl", tmp_path / "copied_nodes.jsonl.zst")
+    copy_file(tmp_path / "copied_nodes.jsonl.zst", tmp_path / "copied_nodes.jsonl")
+    assert (tmp_path / "copied_nodes.jsonl").read_text() == "".join(LINES)
+
+
+def test_plain_input_files(tmp_path):
+    with open_file(tmp_path / "nodes.jsonl.zst", "wt") as nodes_file:
+        nodes_file.writelines(LINES)
+    (tmp_path / "edges.jsonl").write_text("")
+
+    with plain_input_files(tmp_path / "nodes.jsonl.zst", tmp_path / "edges.jsonl", None) as input_paths:
+        plain_nodes_path, plain_edges_path, no_path = input_paths
+        assert Path(plain_nodes_path).read_text() == "".join(LINES)
+        assert (plain_edges_path, no_path) == (str(tmp_path / "edges.jsonl"), None)
+    # the temporary plain file is gone
+    assert not Path(plain_nodes_path).exists()
+
+
+def test_compress_kgx_files(tmp_path, monkeypatch):
+    (tmp_path / "nodes.jsonl").write_text("".join(LINES))
+    (tmp_path / "edges.jsonl.zst").touch()
+    assert compress_kgx_files(tmp_path / "nodes.jsonl", tmp_path / "edges.jsonl.zst", tmp_path / "missing.jsonl",
+                              None) == [tmp_path / "nodes.jsonl.zst", tmp_path / "edges.jsonl.zst",
+                                        tmp_path / "missing.jsonl", None]
+    # compressed into place
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["edges.jsonl.zst", "nodes.jsonl.zst"]
+    with open_file(tmp_path / "nodes.jsonl.zst") as nodes_file:
+        assert list(nodes_file) == LINES
+
+    monkeypatch.setattr(compression, "KGX_COMPRESSION", "none")
+    (tmp_path / "other_nodes.jsonl").write_text("".join(LINES))
+    assert compress_kgx_files(tmp_path / "other_nodes.jsonl") == [tmp_path / "other_nodes.jsonl"]
+    assert (tmp_path / "other_nodes.jsonl").read_text() == "".join(LINES)
@@ -0,0 +1,100 @@
+"""Tests for the curie module."""
+
+import pytest
+
+from translator_ingest.util.curie import (
+    Curie,
+    cache_stats,
+    clear_caches,
+    get_local_id,
+    get_prefix,
+    instrumented_cache,
+    make_prefix_classifier,
+    parse_curie,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    clear_caches()
+    yield
+    clear_caches()
+
+
+def _stats(name: str):
+    return next(stats for stats in cache_stats() if stats.name == name)
+
+
+@pytest.mark.parametrize(
+    "curie,prefix,local_id",
+    [
+        ("MONDO:0005148", "MONDO", "0005148"),
+        ("KEGG.COMPOUND:C00031", "KEGG.COMPOUND", "C00031"),
+        ("PathBank:Compound:1", "PathBank", "Compound:1"),
+        ("invalid", "", "invalid"),
+    ],
+)
+def test_parse_curie(curie, prefix, local_id):
+    parsed = parse_curie(curie)
+    assert parsed == Curie(curie, prefix, local_id)
+    assert str(parsed) == curie
+    assert parsed.is_valid == bool(prefix)
+    assert get_prefix(curie) == prefix
+    assert get_local_id(curie) == local_id
+
+
+def test_parse_curie_interns_and_counts_hits():
+    first = parse_curie("CHEBI:6801")
+    assert parse_curie("CHEBI:6801") is first
+    stats = _stats("curie.parse")
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+    assert stats.hit_rate == 0.5
+
+
+def test_prefix_classifier():
+    classify = make_prefix_classifier("test.classifier", {"MONDO": "Disease", "HP": "PhenotypicFeature"}, "NamedThing")
+    assert classify("MONDO:0005148") == "Disease"
+    assert classify("HP:0000118") == "PhenotypicFeature"
+    assert classify("UMLS:C0011849") == "NamedThing"
+    assert classify("no_prefix") == "NamedThing"
+    assert classify("MONDO:0005148") == "Disease"
+    stats = _stats("test.classifier")
+    assert (stats.hits, stats.misses) == (1, 4)
+
+
+def test_instrumented_cache_is_bounded():
+    calls = []
+
+    @instrumented_cache("test.bounded", maxsize=2)
+    def square(value: int) -> int:
+        calls.append(value)
+        return value * value
+
+    assert [square(v) for v in (1, 2, 1, 3, 1)] == [1, 4, 1, 9, 1]
+    assert calls == [1, 2, 3]
+    stats = _stats("test.bounded")
+    assert stats.size == 2 and stats.maxsize == 2
+
+
+def test_instrumented_cache_names_are_unique():
+    @instrumented_cache("test.unique")
+    def double(value: int) -> int:
+        return 2 * value
+
+    with pytest.raises(ValueError, match="test.unique"):
+
+        @instrumented_cache("test.unique")
+        def triple(value: int) -> int:
+            return 3 * value
+
+    with pytest.raises(ValueError, match="test.prefix_classes"):
+        make_prefix_classifier("test.prefix_classes", {"MONDO": "Disease"}, "NamedThing")
+        make_prefix_classifier("test.prefix_classes", {"HP": "PhenotypicFeature"}, "NamedThing")
+
+
+def test_instrumented_cache_same_definition_registers_again():
+    # as a module's functions do when it is reloaded
+    for _ in range(2):
+        classify = make_prefix_classifier("test.reloaded", {"MONDO": "Disease"}, "NamedThing")
+        assert classify("MONDO:0005148") == "Disease"
+    assert _stats("test.reloaded").misses == 1
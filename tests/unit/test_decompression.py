@@ -0,0 +1,129 @@
+import gzip
+import io
+import struct
+import tarfile
+import zlib
+
+import pytest
+
+from translator_ingest.util.decompression import (
+    is_bgzf_file,
+    open_gzip,
+    open_tar_gz,
+    threaded_koza_decompression,
+)
+
+LINES = [f"NCBIGene:{number}\tgene {number}\n" for number in range(20_000)]
+CONTENT = "".join(LINES).encode()
+
+
+def write_bgzf(file_path, content: bytes, block_size: int = 60_000):
+    """Write content as BGZF: gzip members of at most block_size bytes, with their size in a BC extra field."""
+    with open(file_path, "wb") as bgzf_file:
+        for start in range(0, len(content) + 1, block_size):
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+            block = content[start:start + block_size]
+            deflated = compressor.compress(block) + compressor.flush()
+            header = b"\x1f\x8b\x08\x04" + b"\x00" * 4 + b"\x00\xff" + struct.pack("<H", 6)
+            extra = b"BC" + struct.pack("<HH", 2, len(header) + 6 + len(deflated) + 8 - 1)
+            trailer = struct.pack("<II", zlib.crc32(block), len(block))
+            bgzf_file.write(header + extra + deflated + trailer)
+
+
+def test_open_gzip(tmp_path):
+    with gzip.open(tmp_path / "gene_info.gz", "wb") as gzip_file:
+        gzip_file.write(CONTENT)
+    with open_gzip(tmp_path / "gene_info.gz", "rt") as gene_info:
+        assert list(gene_info) == LINES
+    with open_gzip(tmp_path / "gene_info.gz") as gene_info:
+        assert gene_info.read() == CONTENT
+
+
+def test_open_gzip_multi_member(tmp_path):
+    # concatenated gzip members, as written by pigz --independent or by appending to a gzip file
+    with open(tmp_path / "edges.tsv.gz", "wb") as gzip_file:
+        gzip_file.writelines(gzip.compress(CONTENT[start:start + 100_000]) for start in range(0, len(CONTENT), 100_000))
+    with open_gzip(tmp_path / "edges.tsv.gz") as edges:
+        assert edges.read() == CONTENT
+
+
+def test_open_gzip_bgzf(tmp_path):
+    write_bgzf(tmp_path / "edges.tsv.gz", CONTENT)
+    assert is_bgzf_file(tmp_path / "edges.tsv.gz")
+    # also readable by gzip, which treats the blocks as gzip members
+    assert gzip.decompress((tmp_path / "edges.tsv.gz").read_bytes()) == CONTENT
+    with open_gzip(tmp_path / "edges.tsv.gz", "rt", threads=3) as edges:
+        assert list(edges) == LINES
+
+
+def test_open_gzip_errors(tmp_path):
+    (tmp_path / "truncated.gz").write_bytes(gzip.compress(CONTENT)[:1000] + b"not deflate")
+    with pytest.raises(zlib.error), open_gzip(tmp_path / "truncated.gz") as truncated:
+        truncated.read()
+    # closing before the end stops the background thread
+    with gzip.open(tmp_path / "gene_info.gz", "wb") as gzip_file:
+        gzip_file.write(CONTENT * 20)
+    gene_info = open_gzip(tmp_path / "gene_info.gz")
+    gene_info.read(10)
+    gene_info.close()
+    assert not gene_info.raw._thread.is_alive()
+
+
+def test_open_gzip_truncated(tmp_path):
+    (tmp_path / "truncated.gz").write_bytes(gzip.compress(CONTENT)[:-100])
+    with pytest.raises(EOFError), gzip.open(tmp_path / "truncated.gz") as truncated:
+        truncated.read()
+    with pytest.raises(EOFError), open_gzip(tmp_path / "truncated.gz") as truncated:
+        truncated.read()
+
+
+def test_open_gzip_padded(tmp_path):
+    # NUL padding after a member, as tape or block devices leave, which gzip skips
+    content = gzip.compress(CONTENT[:100_000]) + b"\x00" * 1000 + gzip.compress(CONTENT[100_000:]) + b"\x00" * 512
+    (tmp_path / "padded.gz").write_bytes(content)
+    assert gzip.decompress(content) == CONTENT
+    with open_gzip(tmp_path / "padded.gz") as padded:
+        assert padded.read() == CONTENT
+
+
+def test_open_tar_gz(tmp_path):
+    with tarfile.open(tmp_path / "archive.tar.gz", "w:gz") as tar:
+        tar_info = tarfile.TarInfo("data/genes.tsv")
+        tar_info.size = len(CONTENT)
+        tar.addfile(tar_info, io.BytesIO(CONTENT))
+    with open_tar_gz(tmp_path / "archive.tar.gz") as tar:
+        tar.extractall(tmp_path / "extracted", filter="data")
+    assert (tmp_path / "extracted" / "data" / "genes.tsv").read_bytes() == CONTENT
+    # the gzip reader, its file and its decompression thread are closed with the archive
+    raw_reader = tar.gzip_reader.raw
+    assert tar.gzip_reader.closed and raw_reader._file.closed
+    assert not raw_reader._thread.is_alive()
+
+
+def test_open_tar_gz_closed_early(tmp_path):
+    with tarfile.open(tmp_path / "archive.tar.gz", "w:gz") as tar:
+        for number in range(3):
+            tar_info = tarfile.TarInfo(f"data/genes_{number}.tsv")
+            tar_info.size = len(CONTENT)
+            tar.addfile(tar_info, io.BytesIO(CONTENT))
+    # e.g. after finding the member it looks for, with the decompression thread blocked on a full queue
+    with open_tar_gz(tmp_path / "archive.tar.gz") as tar:
+        assert next(iter(tar)).name == "data/genes_0.tsv"
+    assert tar.gzip_reader.raw._file.closed
+    assert not tar.gzip_reader.raw._thread.is_alive()
+
+
+def test_threaded_koza_decompression(tmp_path):
+    import koza.model.source
+
+    with gzip.open(tmp_path / "gene_info.gz", "wb") as gzip_file:
+        gzip_file.write(CONTENT)
+    with threaded_koza_decompression():
+        resource = koza.model.source.open_resource(tmp_path / "gene_info.gz")
+        assert isinstance(resource.reader.buffer, io.BufferedReader)
+        assert list(resource.reader) == LINES
+        assert resource.tell() == (tmp_path / "gene_info.gz").stat().st_size
+        resource.reader.close()
+    # koza's own gzip reader once the context is left
+    with koza.model.source.open_resource(tmp_path / "gene_info.gz").reader as reader:
+        assert isinstance(reader.buffer, gzip.GzipFile)
@@ -0,0 +1,28 @@
+from translator_ingest.util import duckdb_utils
+from translator_ingest.util.duckdb_utils import connect_duckdb, get_duckdb_config, stream_query
+
+
+def test_stream_query():
+    rows = stream_query("select range as id, 'row ' || range as name from range(5) where range >= ?", [1], batch_size=2)
+    assert list(rows) == [{"id": number, "name": f"row {number}"} for number in range(1, 5)]
+    assert list(stream_query("select 1 as id where false")) == []
+
+
+def test_stream_query_starts_before_the_result_is_fetched(tmp_path):
+    table_path = tmp_path / "table.tsv"
+    table_path.write_text("id\tname\n" + "".join(f"{number}\tname {number}\n" for number in range(100)))
+    rows = stream_query(f"select * from read_csv('{table_path}') order by id", batch_size=10)
+    assert next(rows) == {"id": 0, "name": "name 0"}
+    # closing the iterator early closes the connection
+    rows.close()
+
+
+def test_duckdb_config(monkeypatch):
+    assert get_duckdb_config() == {}
+    monkeypatch.setattr(duckdb_utils, "DUCKDB_THREADS", "2")
+    monkeypatch.setattr(duckdb_utils, "DUCKDB_MEMORY_LIMIT", "1GB")
+    assert get_duckdb_config() == {"threads": 2, "memory_limit": "1GB"}
+    connection = connect_duckdb()
+    assert connection.execute("select current_setting('threads')").fetchone()[0] == 2
+    assert connection.execute("select current_setting('memory_limit')").fetchone()[0] in ("1.0 GB", "953.6 MiB")
+    connection.close()
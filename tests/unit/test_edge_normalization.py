@@ -0,0 +1,95 @@
+import threading
+from itertools import pairwise
+
+import pytest
+
+from translator_ingest.util.edge_normalization import (
+    new_edge_counts,
+    normalize_edge,
+    normalize_edges_sharded,
+    remove_unconnected_nodes,
+    shard_byte_ranges,
+)
+from translator_ingest.util.jsonio import read_jsonl, write_jsonl
+
+# as the Node Normalizer's lookup: HGNC:3 normalizes to two genes, and FAKE:1 failed to normalize
+NODE_NORM_LOOKUP = {
+    "HGNC:1": ["NCBIGene:1"],
+    "ENSEMBL:1": ["NCBIGene:1"],
+    "HGNC:2": ["NCBIGene:2"],
+    "HGNC:3": ["NCBIGene:3", "NCBIGene:4"],
+    "MONDO:1": ["MONDO:1"],
+    "FAKE:1": None,
+}
+SUBJECTS = ["HGNC:1", "ENSEMBL:1", "HGNC:3", "FAKE:1", "HGNC:9"]
+
+
+def edge(subject: str, object: str, predicate: str = "biolink:related_to") -> dict:
+    return {"subject": subject, "predicate": predicate, "object": object, "primary_knowledge_source": "infores:test"}
+
+
+@pytest.fixture
+def edges_path(tmp_path):
+    path = tmp_path / "edges.jsonl"
+    write_jsonl(path, [edge(SUBJECTS[number % len(SUBJECTS)], "MONDO:1") for number in range(100)]
+                + [edge("HGNC:1", "ENSEMBL:1", "biolink:subclass_of")])
+    return path
+
+
+def test_normalize_edge():
+    counts = new_edge_counts()
+    assert [(normalized["subject"], normalized["original_subject"])
+            for normalized in normalize_edge(edge("HGNC:3", "MONDO:1"), NODE_NORM_LOOKUP, counts)] == [
+        ("NCBIGene:3", "HGNC:3"), ("NCBIGene:4", "HGNC:3")
+    ]
+    assert list(normalize_edge(edge("FAKE:1", "MONDO:1"), NODE_NORM_LOOKUP, counts)) == []
+    assert list(normalize_edge(edge("HGNC:1", "ENSEMBL:1", "biolink:subclass_of"), NODE_NORM_LOOKUP, counts)) == []
+    assert counts == {"source_edges": 0, "edges_failed_due_to_nodes": 1, "edge_splits": 1,
+                      "subclass_loops_removed": 1, "final_normalized_edges": 2}
+
+
+@pytest.mark.parametrize("shards", [1, 3, 8, 200])
+def test_shard_byte_ranges(edges_path, shards):
+    byte_ranges = shard_byte_ranges(edges_path, shards)
+    assert len(byte_ranges) <= shards
+    content = edges_path.read_bytes()
+    # contiguous, covering the file, and split only at line ends
+    assert byte_ranges[0][0] == 0 and byte_ranges[-1][1] == len(content)
+    for (_, end), (start, _) in pairwise(byte_ranges):
+        assert end == start and content[end - 1:end] == b"\n"
+
+
+def test_normalize_edges_sharded(tmp_path, edges_path):
+    serial_counts, serial_connected_ids = normalize_edges_sharded(edges_path, tmp_path / "serial.jsonl",
+                                                                  NODE_NORM_LOOKUP, shards=1)
+    counts, connected_ids = normalize_edges_sharded(edges_path, tmp_path / "sharded.jsonl", NODE_NORM_LOOKUP,
+                                                    shards=4)
+    # in the same order as normalized serially
+    assert read_jsonl(tmp_path / "sharded.jsonl") == read_jsonl(tmp_path / "serial.jsonl")
+    assert counts == serial_counts == {"source_edges": 101, "edges_failed_due_to_nodes": 40, "edge_splits": 20,
+                                       "subclass_loops_removed": 1, "final_normalized_edges": 80}
+    assert connected_ids == serial_connected_ids == {"NCBIGene:1", "NCBIGene:3", "NCBIGene:4", "MONDO:1"}
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["edges.jsonl", "serial.jsonl", "sharded.jsonl"]
+
+
+def test_normalize_edges_sharded_with_other_threads_running(tmp_path, edges_path):
+    normalize_edges_sharded(edges_path, tmp_path / "serial.jsonl", NODE_NORM_LOOKUP, shards=1)
+    # the workers aren't forked then, but get the node map from a file
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait)
+    thread.start()
+    try:
+        counts, _ = normalize_edges_sharded(edges_path, tmp_path / "sharded.jsonl", NODE_NORM_LOOKUP, shards=4)
+    finally:
+        stop.set()
+        thread.join()
+    assert read_jsonl(tmp_path / "sharded.jsonl") == read_jsonl(tmp_path / "serial.jsonl")
+    assert counts["final_normalized_edges"] == 80
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["edges.jsonl", "serial.jsonl", "sharded.jsonl"]
+
+
+def test_remove_unconnected_nodes(tmp_path):
+    nodes_path = tmp_path / "nodes.jsonl"
+    write_jsonl(nodes_path, [{"id": "NCBIGene:1"}, {"id": "NCBIGene:2"}, {"id": "MONDO:1"}])
+    assert remove_unconnected_nodes(nodes_path, {"NCBIGene:1", "MONDO:1"}) == 1
+    assert read_jsonl(nodes_path) == [{"id": "NCBIGene:1"}, {"id": "MONDO:1"}]
@@ -0,0 +1,89 @@
+from biolink_model.datamodel.pydanticmodel_v2 import Disease, Gene, GeneToDiseaseAssociation
+from koza.model.writer import WriterConfig
+
+from translator_ingest.util.fused_normalization import FusedNormalizationWriter, StreamingNormalizer
+from translator_ingest.util.jsonio import read_json, read_jsonl
+
+# identifiers as the Node Normalizer would normalize them, None for the ones it doesn't know
+NORMALIZED_IDS = {"HGNC:1": "NCBIGene:1", "ENSEMBL:1": "NCBIGene:1", "HGNC:2": "NCBIGene:2", "MONDO:1": "MONDO:1",
+                  "MONDO:2": "MONDO:2", "FAKE:1": None}
+
+
+class NodeNormalizer:
+    """Normalizes nodes in place as ORION's NodeNormalizer does with strict normalization, from NORMALIZED_IDS."""
+
+    def __init__(self):
+        self.node_normalization_lookup = {}
+        self.failed_to_normalize_ids = set()
+        self.normalized_batches = []
+
+    def normalize_node_data(self, node_list: list) -> list:
+        self.normalized_batches.append([node["id"] for node in node_list])
+        failed = []
+        for node in node_list:
+            normalized_id = NORMALIZED_IDS[node["id"]]
+            self.node_normalization_lookup[node["id"]] = [normalized_id] if normalized_id else None
+            if normalized_id:
+                node["id"] = normalized_id
+            else:
+                failed.append(node["id"])
+        self.failed_to_normalize_ids.update(failed)
+        node_list[:] = [node for node in node_list if node["id"] not in failed]
+        return failed
+
+
+def association(subject: str, object: str) -> GeneToDiseaseAssociation:
+    return GeneToDiseaseAssociation(id=f"{subject}-{object}", subject=subject, predicate="biolink:associated_with",
+                                    object=object, knowledge_level="not_provided", agent_type="not_provided")
+
+
+def test_fused_normalization(tmp_path):
+    node_normalizer = NodeNormalizer()
+    normalizer = StreamingNormalizer(node_normalizer, nodes_output_file_path=str(tmp_path / "nodes.jsonl.zst"),
+                                     edges_output_file_path=str(tmp_path / "edges.jsonl"),
+                                     node_norm_map_file_path=str(tmp_path / "map.json"),
+                                     node_norm_failures_file_path=str(tmp_path / "failures.txt"))
+    writer = FusedNormalizationWriter(output_dir=str(tmp_path), source_name="test", config=WriterConfig(),
+                                      normalizer=normalizer, compressed=False, batch_size=2)
+    # the edge to MONDO:2 is written before its node, so it is held until the node is normalized
+    writer.write_nodes([Gene(id="HGNC:1"), Disease(id="MONDO:1")])
+    writer.write_edges([association("HGNC:1", "MONDO:1"), association("HGNC:1", "MONDO:2")])
+    writer.write_nodes([Disease(id="MONDO:2"), Gene(id="ENSEMBL:1"), Gene(id="FAKE:1"), Gene(id="HGNC:2")])
+    writer.write_edges([association("ENSEMBL:1", "MONDO:2"), association("FAKE:1", "MONDO:1"),
+                        association("HGNC:1", "MONDO:3")])
+    # a conflicting duplicate, merged into the normalized node too
+    writer.write_nodes([Gene(id="HGNC:1", name="A1BG")])
+    writer.finalize()
+
+    assert len(read_jsonl(tmp_path / "test_nodes.jsonl")) == 6
+    # normalized in batches as they were written, and the merged HGNC:1 node once more at the end
+    assert node_normalizer.normalized_batches == [
+        ["HGNC:1", "MONDO:1"], ["MONDO:2", "ENSEMBL:1"], ["FAKE:1", "HGNC:2"], ["HGNC:1"]
+    ]
+    # HGNC:1 and ENSEMBL:1 are the same gene, FAKE:1 didn't normalize, and no edge refers to HGNC:2
+    assert read_jsonl(tmp_path / "nodes.jsonl.zst") == [
+        {"id": "NCBIGene:1", "name": "A1BG", "category": ["biolink:Gene"]},
+        {"id": "MONDO:1", "category": ["biolink:Disease"]},
+        {"id": "MONDO:2", "category": ["biolink:Disease"]},
+    ]
+    edges = read_jsonl(tmp_path / "edges.jsonl")
+    assert sorted((edge["subject"], edge["object"], edge["original_subject"]) for edge in edges) == [
+        ("NCBIGene:1", "MONDO:1", "HGNC:1"),
+        ("NCBIGene:1", "MONDO:2", "ENSEMBL:1"),
+        ("NCBIGene:1", "MONDO:2", "HGNC:1"),
+    ]
+    assert normalizer.counts == {
+        "node_count_pre_normalization": 6,
+        "node_count_post_normalization": 5,
+        "node_normalization_failures": 1,
+        "discarded_duplicate_node_count": 1,
+        "unconnected_nodes_removed": 1,
+        "final_normalized_nodes": 3,
+        "source_edges": 5,
+        "edges_failed_due_to_nodes": 2,
+        "edge_splits": 0,
+        "subclass_loops_removed": 0,
+        "final_normalized_edges": 3,
+    }
+    assert read_json(tmp_path / "map.json")["normalization_map"]["ENSEMBL:1"] == ["NCBIGene:1"]
+    assert (tmp_path / "failures.txt").read_text() == "FAKE:1\n"
@@ -0,0 +1,63 @@
+"""Import time budget of the CLI entry points.
+
+The Makefile runs ``translator_ingest.graphs`` and ``translator_ingest.ingest_config`` while it is being parsed,
+and every pipeline run starts by importing ``translator_ingest.pipeline``, so these modules must not pull in
+koza, ORION, LinkML or the Biolink pydantic model at import time. Each module is imported in a fresh
+interpreter under ``python -X importtime``, which reports the cumulative import time of every module.
+"""
+
+import re
+import subprocess
+import sys
+
+import pytest
+
+# Generous compared to the ~0.1-0.3 s these imports take, so that only a real regression
+# (a heavy dependency imported at module level costs several seconds) trips the budget.
+IMPORT_TIME_BUDGET_SECONDS = 1.5
+
+HEAVY_MODULES = [
+    "orion",
+    "koza",
+    "kghub_downloader",
+    "linkml_runtime",
+    "bmt",
+    "biolink_model.datamodel.pydanticmodel_v2",
+    "pandas",
+    "polars",
+]
+
+CLI_MODULES = [
+    "translator_ingest.graphs",
+    "translator_ingest.ingest_config",
+    "translator_ingest.pipeline",
+]
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds of every module loaded by ``import module``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            import_times[match.group(3)] = int(match.group(1))
+    return import_times
+
+
+@pytest.mark.parametrize("module", CLI_MODULES)
+def test_import_time_budget(module):
+    import_times = _import_times(module)
+
+    heavy_imports = [name for name in HEAVY_MODULES if name in import_times]
+    assert not heavy_imports, f"{module} imports {heavy_imports} at module level"
+
+    seconds = import_times[module] / 1_000_000
+    assert seconds < IMPORT_TIME_BUDGET_SECONDS, f"importing {module} took {seconds:.2f}s"
@@ -0,0 +1,31 @@
+import gzip
+import json
+
+import pytest
+
+from translator_ingest.util.jsonio import dumps, iter_jsonl, read_json, read_jsonl, write_json, write_jsonl
+
+RECORDS = [{"id": "HGNC:1", "name": "α-1-B glycoprotein"}, {"id": "HGNC:2", "xref": ["NCBIGene:2"]}]
+
+
+@pytest.mark.parametrize("file_name", ["nodes.jsonl", "nodes.jsonl.gz", "nodes.jsonl.zst"])
+def test_jsonl_round_trip(tmp_path, file_name):
+    assert write_jsonl(tmp_path / file_name, iter(RECORDS)) == 2
+    assert read_jsonl(tmp_path / file_name) == RECORDS
+    write_jsonl(tmp_path / file_name, RECORDS[:1], append=True)
+    assert list(iter_jsonl(tmp_path / file_name)) == [*RECORDS, RECORDS[0]]
+
+
+def test_iter_jsonl_skips_blank_lines(tmp_path):
+    with gzip.open(tmp_path / "edges.jsonl.gz", "wt") as edges_file:
+        edges_file.write("\n".join(json.dumps(record) for record in RECORDS) + "\n\n  \n")
+    assert read_jsonl(tmp_path / "edges.jsonl.gz") == RECORDS
+
+
+def test_json_round_trip(tmp_path):
+    metadata = {"source": "test", "counts": {1: 10}, "sources": RECORDS}
+    write_json(tmp_path / "metadata.json", metadata)
+    # indented as with json.dump(indent=2), with non-string keys converted as the json module does
+    assert (tmp_path / "metadata.json").read_text(encoding="utf-8").startswith('{\n  "source": "test"')
+    assert read_json(tmp_path / "metadata.json") == json.loads(json.dumps(metadata))
+    assert dumps(RECORDS[1]) == b'{"id":"HGNC:2","xref":["NCBIGene:2"]}'
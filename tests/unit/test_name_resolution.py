@@ -0,0 +1,102 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from translator_ingest.ingests.ttd import ttd
+from translator_ingest.ingests.ttd.ttd import run_nameres, run_nameres_step
+from translator_ingest.util.name_resolution import NameResolver, get_babel_version
+
+NAMES = [f"disease {number}" for number in range(120)] + ["unknown thing"]
+
+
+class NameResHandler(BaseHTTPRequestHandler):
+    """A stand-in for NameRes, whose hits for "disease <n>" are MONDO:<n>, with a score of 10 * n."""
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._send_json({"status": "ok", "babel_version": "2025jan23"})
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.lookups.append(request)
+        self._send_json({
+            name: [{"curie": f"MONDO:{name.split()[-1]}", "score": 10 * int(name.split()[-1])}]
+            if name.startswith("disease") else []
+            for name in request["strings"]
+        })
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def nameres():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), NameResHandler)
+    server.lookups = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}/bulk-lookup"
+    server.shutdown()
+    server.server_close()
+
+
+def test_resolve_caches_results(nameres, tmp_path):
+    server, url = nameres
+    cache_path = tmp_path / "nameres.sqlite"
+    assert get_babel_version(url) == "2025jan23"
+    with NameResolver(url, cache_path=cache_path) as resolver:
+        results = resolver.resolve(NAMES + NAMES[:10], types=["Disease"], batch_size=50)
+        assert results["disease 7"] == [{"curie": "MONDO:7", "score": 70}]
+        assert results["unknown thing"] == []
+        assert len(results) == len(NAMES)
+        # the batches are looked up concurrently, so in any order
+        assert sorted(len(lookup["strings"]) for lookup in server.lookups) == [21, 50, 50]
+        assert server.lookups[0]["biolink_types"] == ["Disease"]
+        assert (resolver.hits, resolver.misses) == (0, 121)
+
+    # looked up from the cache by another resolver, e.g. in the next run
+    server.lookups.clear()
+    with NameResolver(url, cache_path=cache_path) as resolver:
+        assert resolver.resolve(NAMES, types=["Disease"], batch_size=50) == results
+        assert server.lookups == []
+        stats = resolver.cache_stats()
+        assert (stats.hits, stats.misses, stats.size, stats.hit_rate) == (121, 0, 121, 1.0)
+        # different lookup parameters aren't cached
+        resolver.resolve(NAMES[:5], types=["Disease"], exclude_prefixes="UMLS")
+        assert len(server.lookups) == 1
+
+    # nor are the results of another Babel version
+    server.lookups.clear()
+    with NameResolver(url, babel_version="2025sep1", cache_path=cache_path) as resolver:
+        resolver.resolve(NAMES, types=["Disease"])
+        assert (resolver.hits, resolver.misses) == (0, 121)
+        assert len(server.lookups) == 1
+
+
+def test_ttd_run_nameres(nameres, tmp_path):
+    _, url = nameres
+    with NameResolver(url, cache_path=tmp_path / "nameres.sqlite") as resolver:
+        mapping, stats_failures = run_nameres(NAMES, url, types=["Disease"], score_threshold=300, resolver=resolver)
+    assert mapping == {f"disease {number}": f"MONDO:{number}" for number in range(31, 120)}
+    assert stats_failures["returned_empty"] == ["unknown thing"]
+    assert len(stats_failures["score_under_threshold"]) == 31
+
+
+def test_ttd_nameres_steps_record_their_own_cache_stats(nameres, tmp_path, monkeypatch):
+    _, url = nameres
+    koza = SimpleNamespace(transform_metadata={})
+    with NameResolver(url, cache_path=tmp_path / "nameres.sqlite") as resolver:
+        monkeypatch.setattr(ttd, "get_name_resolver", lambda url: resolver)
+        run_nameres_step(koza, "stats_indication_nameres_cache", names=NAMES[:20], types=["Disease"])
+        run_nameres_step(koza, "stats_target_nameres_cache", names=NAMES[10:40], types=["Disease"])
+    assert koza.transform_metadata["stats_indication_nameres_cache"] == {"hits": 0, "misses": 20}
+    assert koza.transform_metadata["stats_target_nameres_cache"] == {"hits": 10, "misses": 20}
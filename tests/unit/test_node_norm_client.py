@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from benchmarks.node_normalizer import StandInBehavior, local_node_normalizer, normalized_node
+from translator_ingest.util.node_norm_client import NodeNormalizationError, NodeNormClient
+
+CURIES = [f"NCBIGene:{number}" for number in range(500)] + ["UNNORMALIZABLE:1", "MONDO:1", "NCBIGene:1"]
+
+
+def client_options(**options) -> dict:
+    # small batches, and retries without waiting
+    return {"concurrency": 4, "batch_size": 50, "min_batch_size": 10, "max_batch_size": 50, "backoff": 0.001,
+            **options}
+
+
+def test_normalize():
+    behavior = StandInBehavior(latency=0.02)
+    with local_node_normalizer(behavior) as url, NodeNormClient(url, **client_options()) as client:
+        results = client.normalize_sync(CURIES)
+    assert results == {curie: normalized_node(curie) for curie in CURIES}
+    assert results["UNNORMALIZABLE:1"] is None
+    # each CURIE is looked up once, in batches of up to 50, several at a time
+    looked_up = [curie for lookup in behavior.lookups for curie in lookup]
+    assert sorted(looked_up) == sorted(set(CURIES))
+    assert max(len(lookup) for lookup in behavior.lookups) == 50
+    assert behavior.max_concurrent_lookups == 4
+    assert client.stats == {"curies": 502, "deduplicated_curies": 0, "batches": 11, "retries": 0}
+
+
+def test_retries_failed_lookups():
+    behavior = StandInBehavior(fail_every=3)
+    with local_node_normalizer(behavior) as url, NodeNormClient(url, **client_options()) as client:
+        results = client.normalize_sync(CURIES)
+    assert results == {curie: normalized_node(curie) for curie in CURIES}
+    assert client.stats["retries"] == len(behavior.lookups) // 3
+
+
+def test_fails_after_retries():
+    behavior = StandInBehavior(fail_every=1)
+    with (local_node_normalizer(behavior) as url,
+          NodeNormClient(url, **client_options(concurrency=1, max_retries=2)) as client):
+        with pytest.raises(NodeNormalizationError, match="after 2 retries"):
+            client.normalize_sync(CURIES)
+        # the lookup is tried three times, and the other CURIEs are failed with it
+        assert len(behavior.lookups) == 3
+        assert client._in_flight == {}
+
+
+def test_deduplicates_curies_in_flight():
+    behavior = StandInBehavior(latency=0.02)
+
+    async def normalize_concurrently(client):
+        return await asyncio.gather(client.normalize(CURIES[:300]), client.normalize(CURIES[200:]))
+
+    with local_node_normalizer(behavior) as url, NodeNormClient(url, **client_options()) as client:
+        first, second = asyncio.run(normalize_concurrently(client))
+    assert first == {curie: normalized_node(curie) for curie in CURIES[:300]}
+    assert second == {curie: normalized_node(curie) for curie in CURIES[200:]}
+    assert sorted(curie for lookup in behavior.lookups for curie in lookup) == sorted(set(CURIES))
+    assert client.stats["deduplicated_curies"] == 101
+
+
+@pytest.mark.parametrize("target_latency,batch_size", [(10.0, 50), (0.001, 10)])
+def test_adapts_batch_size(target_latency, batch_size):
+    # lookups take well under a target latency of 10s, and over one of 1ms
+    with (local_node_normalizer(StandInBehavior(latency=0.005)) as url,
+          NodeNormClient(url, **client_options(batch_size=20, target_latency=target_latency)) as client):
+        client.normalize_sync(CURIES)
+    assert client.batch_size == batch_size
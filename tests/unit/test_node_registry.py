@@ -0,0 +1,92 @@
+"""Tests for the node_registry module."""
+
+import gzip
+import importlib
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from tests.unit.ingests import MockKozaTransform, MockKozaWriter
+from translator_ingest.util.node_registry import (
+    NodeRegistry,
+    build_node_index,
+    get_node_index_path,
+    is_node_index_current,
+)
+
+NODES = [
+    {"id": "MONDO:0005148", "name": "type 2 diabetes mellitus", "category": ["biolink:Disease"]},
+    {"id": "CHEBI:6801", "name": "metformin", "category": ["biolink:SmallMolecule"]},
+    {"id": "CLINICALTRIALS:NCT00000001", "name": "a trial", "clinical_trial_phase": "phase_3"},
+]
+
+
+def _write_nodes(path: Path, nodes: list[dict]) -> Path:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "wt") as nodes_file:
+        for node in nodes:
+            nodes_file.write(json.dumps(node) + "\n")
+        nodes_file.write("\n")
+    return path
+
+
+@pytest.mark.parametrize("file_name", ["nodes.jsonl", "nodes.jsonl.gz"])
+def test_registry_lookups(tmp_path, file_name):
+    nodes_file = _write_nodes(tmp_path / file_name, NODES)
+    with NodeRegistry.from_jsonl(nodes_file) as registry:
+        assert len(registry) == 3
+        assert registry.get("CHEBI:6801") == NODES[1]
+        assert registry["CLINICALTRIALS:NCT00000001"]["clinical_trial_phase"] == "phase_3"
+        assert "MONDO:0005148" in registry
+        assert "MONDO:9999999" not in registry
+        assert registry.get("MONDO:9999999") is None
+        assert registry.get("MONDO:9999999", {}) == {}
+        with pytest.raises(KeyError):
+            _ = registry["MONDO:9999999"]
+    assert get_node_index_path(nodes_file).exists()
+
+
+def test_duplicate_ids_keep_last_record(tmp_path):
+    nodes_file = _write_nodes(tmp_path / "nodes.jsonl", [NODES[0], {**NODES[0], "name": "T2D"}])
+    with NodeRegistry.from_jsonl(nodes_file) as registry:
+        assert len(registry) == 1
+        assert registry["MONDO:0005148"]["name"] == "T2D"
+
+
+def test_bounded_cache(tmp_path):
+    nodes_file = _write_nodes(tmp_path / "nodes.jsonl", NODES)
+    with NodeRegistry.from_jsonl(nodes_file, cache_size=2) as registry:
+        for node in NODES:
+            assert registry.get(node["id"]) == node
+        assert len(registry._cache) == 2
+        assert NODES[0]["id"] not in registry._cache
+
+
+def test_index_reused_until_source_changes(tmp_path):
+    nodes_file = _write_nodes(tmp_path / "nodes.jsonl", NODES)
+    index_path = build_node_index(nodes_file)
+    assert is_node_index_current(nodes_file)
+
+    built_at = index_path.stat().st_mtime_ns
+    NodeRegistry.from_jsonl(nodes_file).close()
+    assert index_path.stat().st_mtime_ns == built_at
+
+    _write_nodes(nodes_file, NODES[:1])
+    os.utime(nodes_file, ns=(built_at + 10**9, built_at + 10**9))
+    assert not is_node_index_current(nodes_file)
+    with NodeRegistry.from_jsonl(nodes_file) as registry:
+        assert len(registry) == 1
+
+
+@pytest.mark.parametrize("ingest", ["ctkp", "dakp", "geneticskp"])
+def test_ingest_closes_registry_at_data_end(tmp_path, ingest):
+    module = importlib.import_module(f"translator_ingest.ingests.{ingest}.{ingest}")
+    koza_transform = MockKozaTransform(extra_fields={}, writer=MockKozaWriter(), mappings={})
+    registry = NodeRegistry.from_jsonl(_write_nodes(tmp_path / "nodes.jsonl", NODES))
+    koza_transform.state["nodes_lookup"] = registry
+    module.on_data_end_edges(koza_transform)
+    with pytest.raises(sqlite3.ProgrammingError):
+        registry.get("CHEBI:6801")
@@ -0,0 +1,146 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from translator_ingest.util.ontology_lookup import OntologyLookup, find_local_ontology_file, read_exact_synonyms
+
+SYNONYMS = {"biallelic_autosomal": "HP:0000007", "monoallelic_autosomal": "HP:0000006", "mitochondrial": "HP:0001427"}
+
+HP_OBO = """format-version: 1.2
+data-version: hp/releases/2025-05-06/hp.obo
+ontology: hp
+
+[Term]
+id: HP:0000006
+name: Autosomal dominant inheritance
+synonym: "Monoallelic_autosomal" EXACT []
+synonym: "Autosomal dominant" RELATED []
+
+[Term]
+id: HP:0000007
+name: Autosomal recessive inheritance
+synonym: "biallelic_autosomal" EXACT []
+
+[Term]
+id: HP:0099999
+name: obsolete inheritance
+synonym: "mitochondrial" EXACT []
+is_obsolete: true
+
+[Term]
+id: HP:0001427
+name: Mitochondrial inheritance
+synonym: "mitochondrial" EXACT []
+
+[Typedef]
+id: part_of
+synonym: "part of" EXACT []
+"""
+
+
+def hp_json() -> dict:
+    def node(term_id: str, synonyms: list[tuple[str, str]], deprecated: bool = False) -> dict:
+        return {"id": f"http://purl.obolibrary.org/obo/{term_id.replace(':', '_')}",
+                "meta": {"deprecated": deprecated,
+                         "synonyms": [{"pred": pred, "val": value} for pred, value in synonyms]}}
+
+    return {"graphs": [{
+        "meta": {"version": "http://purl.obolibrary.org/obo/hp/releases/2025-05-06/hp.json"},
+        "nodes": [
+            node("HP:0000006", [("hasExactSynonym", "Monoallelic_autosomal"), ("hasRelatedSynonym", "AD")]),
+            node("HP:0000007", [("hasExactSynonym", "biallelic_autosomal")]),
+            node("HP:0099999", [("hasExactSynonym", "mitochondrial")], deprecated=True),
+            node("HP:0001427", [("hasExactSynonym", "mitochondrial")]),
+        ],
+    }]}
+
+
+class OLSHandler(BaseHTTPRequestHandler):
+    """A stand-in for OLS, serving the HPO release of the server and a search for terms by exact synonym."""
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/api/ontologies/hp":
+            self._send_json({"ontologyId": "hp", "config": {"version": self.server.version}})
+            return
+        query = parse_qs(url.query)
+        assert query["ontology"] == ["hp"] and query["exact"] == ["true"]
+        self.server.searches.append(query["q"][0])
+        term_id = SYNONYMS.get(query["q"][0])
+        self._send_json({"response": {"docs": [{"obo_id": term_id}] if term_id else []}})
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def ols():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OLSHandler)
+    server.version, server.searches = "2025-05-06", []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}/api"
+    server.shutdown()
+    server.server_close()
+
+
+def test_find_by_exact_synonym_in_ols(ols, tmp_path):
+    server, ols_url = ols
+    cache_path = tmp_path / "cache.sqlite"
+    queries = [*SYNONYMS, "unknown_value"]
+    expected = {**SYNONYMS, "unknown_value": None}
+    with OntologyLookup("hp", ols_url=ols_url, cache_path=cache_path, offline=False) as lookup:
+        assert lookup.find_by_exact_synonym(queries) == expected
+        assert lookup.version == "2025-05-06"
+        assert sorted(server.searches) == sorted(queries)
+
+    # the next run is answered from the cache, unknown values included
+    server.searches.clear()
+    with OntologyLookup("hp", ols_url=ols_url, cache_path=cache_path, offline=False) as lookup:
+        assert lookup.find_by_exact_synonym(queries) == expected
+        assert server.searches == []
+        stats = lookup.cache_stats()
+        assert (stats.hits, stats.misses, stats.size) == (4, 0, 4)
+
+    # until there's a new HPO release
+    server.version = "2025-09-01"
+    with OntologyLookup("hp", ols_url=ols_url, cache_path=cache_path, offline=False) as lookup:
+        assert lookup.find_by_exact_synonym(queries) == expected
+        assert len(server.searches) == 4
+
+
+@pytest.mark.parametrize("file_name", ["hp.obo", "hp.json"])
+def test_find_by_exact_synonym_offline(tmp_path, file_name):
+    ontology_file = tmp_path / file_name
+    ontology_file.write_text(HP_OBO if file_name == "hp.obo" else json.dumps(hp_json()))
+    version, term_by_synonym = read_exact_synonyms(ontology_file)
+    assert version == "2025-05-06"
+    # lowercase, without related synonyms, obsolete terms or typedefs
+    assert term_by_synonym == {synonym.lower(): term_id for synonym, term_id in SYNONYMS.items()}
+
+    with OntologyLookup("hp", ontology_file=ontology_file, cache_path=tmp_path / "cache.sqlite") as lookup:
+        assert lookup.offline
+        assert lookup.find_by_exact_synonym([*SYNONYMS, "unknown_value"]) == {**SYNONYMS, "unknown_value": None}
+        assert lookup.version == "2025-05-06"
+
+
+def test_find_local_ontology_file(tmp_path):
+    assert find_local_ontology_file("hp", data_dir=tmp_path) is None
+    older = tmp_path / "hpoa" / "2025-01-01" / "source_data" / "hp.obo"
+    newer = tmp_path / "upheno" / "2025-05-06" / "source_data" / "hp.json"
+    for path, mtime in ((older, 1_000_000), (newer, 2_000_000)):
+        path.parent.mkdir(parents=True)
+        path.write_text("")
+        os.utime(path, (mtime, mtime))
+    assert find_local_ontology_file("hp", data_dir=tmp_path) == newer
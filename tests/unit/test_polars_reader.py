@@ -0,0 +1,126 @@
+import gzip
+from pathlib import Path
+
+import polars as pl
+import pytest
+from koza.model.reader import CSVReaderConfig, JSONLReaderConfig
+from koza.model.source import Source
+
+from translator_ingest.util.polars_reader import KozaReaderData, iter_records, scan_koza_data
+
+ROWS = [
+    ("ENSP1", " Protein 1 ", "DOID:1", "MedlinePlus", "5"),
+    ("ENSP2", "", "DOID:2", "UniProtKB-KW", "3"),
+    ("ENSP3", "Protein 3", "DOID:3", "AmyCo", "4.5"),
+    ("ENSP4", "Protein 4", "DOID:4", "AmyCo-extra", "1"),
+]
+COLUMNS = ["protein_id", "protein_name", "disease_id", "source_db", "confidence_score"]
+
+
+def write_table(path: Path, header_lines: list[str], rows=ROWS, delimiter="\t"):
+    lines = [*header_lines, *(delimiter.join(row) for row in rows)]
+    text = "\n".join(lines) + "\n"
+    if path.suffix == ".gz":
+        with gzip.open(path, "wt") as table_file:
+            table_file.write(text)
+    else:
+        path.write_text(text)
+
+
+def koza_rows(reader_config, row_limit=0) -> list[dict]:
+    return list(iter(Source(reader_config, Path("."), row_limit=row_limit)))
+
+
+def scanned_rows(reader_config, row_limit=0) -> list[dict]:
+    # as the pipeline passes the data of a reader to prepare_data
+    data = KozaReaderData(iter(Source(reader_config, Path("."), row_limit=row_limit)), reader_config, Path("."),
+                          row_limit)
+    return list(iter_records(scan_koza_data(data)))
+
+
+@pytest.mark.parametrize(
+    "header_lines,reader_options",
+    [
+        (["#version: 1", "\t".join(COLUMNS)], {"header_mode": "infer"}),
+        (["#version: 1", "#date: today", "\t".join(COLUMNS)], {"header_mode": 2}),
+        ([], {"header_mode": "none"}),
+    ],
+)
+def test_scan_matches_koza_rows(tmp_path, header_lines, reader_options):
+    table_path = tmp_path / "table.tsv"
+    write_table(table_path, header_lines)
+    reader_config = CSVReaderConfig(files=[str(table_path)], columns=COLUMNS, **reader_options)
+    assert scanned_rows(reader_config) == koza_rows(reader_config)
+    assert scanned_rows(reader_config)[1]["protein_name"] == ""
+
+
+def test_scan_skips_quoted_comments(tmp_path):
+    # as GtoPdb's interactions.csv starts with "# GtoPdb Version: ..."
+    table_path = tmp_path / "interactions.csv"
+    write_table(table_path, ['"# GtoPdb Version: 2025.3 - published: 2025-06-01"', "", ",".join(COLUMNS)],
+                rows=[*ROWS[:2], ('"#ENSP9"', "Protein 9", "DOID:9", "AmyCo", "2"), *ROWS[2:]], delimiter=",")
+    reader_config = CSVReaderConfig(files=[str(table_path)], delimiter=",", comment_char="#", header_mode="infer",
+                                    columns=COLUMNS)
+    rows = scanned_rows(reader_config)
+    assert rows == koza_rows(reader_config)
+    assert [row["protein_id"] for row in rows] == ["ENSP1", "ENSP2", "ENSP3", "ENSP4"]
+
+
+def test_scan_with_explicit_reader_config(tmp_path):
+    table_path = tmp_path / "table.tsv"
+    write_table(table_path, ["\t".join(COLUMNS)])
+    reader_config = CSVReaderConfig(files=[table_path.name], columns=COLUMNS)
+    frame = scan_koza_data(iter([]), reader_config, base_directory=tmp_path, row_limit=2)
+    assert list(iter_records(frame)) == koza_rows(CSVReaderConfig(files=[str(table_path)], columns=COLUMNS))[:2]
+
+
+def test_scan_types_filters_and_row_limit(tmp_path):
+    table_path = tmp_path / "table.csv.gz"
+    write_table(table_path, [",".join(COLUMNS)], delimiter=",")
+    reader_config = CSVReaderConfig(
+        files=[str(table_path)],
+        delimiter=",",
+        columns=[*COLUMNS[:-1], {"confidence_score": "float"}],
+        filters=[
+            {"inclusion": "exclude", "column": "source_db", "filter_code": "eq", "value": "UniProtKB-KW"},
+            {"inclusion": "include", "column": "source_db", "filter_code": "in", "value": ["AmyCo", "MedlinePlus"]},
+            {"inclusion": "include", "column": "confidence_score", "filter_code": "gt", "value": 2},
+        ],
+    )
+    rows = scanned_rows(reader_config)
+    assert rows == koza_rows(reader_config)
+    assert [row["protein_id"] for row in rows] == ["ENSP1", "ENSP3"]
+    assert rows[1]["confidence_score"] == 4.5
+    assert scanned_rows(reader_config, row_limit=1) == koza_rows(reader_config, row_limit=1)
+
+
+def test_scan_multiple_files(tmp_path):
+    file_paths = [tmp_path / "part1.tsv", tmp_path / "part2.tsv"]
+    write_table(file_paths[0], ["\t".join(COLUMNS)], ROWS[:2])
+    write_table(file_paths[1], ["\t".join(COLUMNS)], ROWS[2:])
+    reader_config = CSVReaderConfig(files=[str(file_path) for file_path in file_paths], columns=COLUMNS)
+    assert scanned_rows(reader_config) == koza_rows(reader_config)
+
+
+def test_rows_which_are_not_scanned(tmp_path):
+    ## rows which don't come from a koza reader, e.g. in tests
+    records = [{"a": "1", "b": ""}, {"a": "2", "b": "x"}]
+    assert list(iter_records(scan_koza_data(iter(records)))) == records
+    assert scan_koza_data(iter([])).collect().is_empty()
+
+    ## readers which can't be scanned with polars
+    jsonl_path = tmp_path / "records.jsonl"
+    jsonl_path.write_text('{"a": "1", "b": ""}\n{"a": "2", "b": "x"}\n')
+    reader_config = JSONLReaderConfig(files=[str(jsonl_path)])
+    assert scanned_rows(reader_config) == records
+
+    ## a koza reader which has already been read from
+    table_path = tmp_path / "table.tsv"
+    write_table(table_path, ["\t".join(COLUMNS)])
+    reader_config = CSVReaderConfig(files=[str(table_path)], columns=COLUMNS)
+    data = KozaReaderData(iter(Source(reader_config, Path("."))), reader_config)
+    records = iter(data)
+    first_row = next(records)
+    frame = scan_koza_data(data)
+    assert isinstance(frame, pl.LazyFrame)
+    assert [first_row, *iter_records(frame)] == koza_rows(reader_config)
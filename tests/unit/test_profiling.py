@@ -0,0 +1,77 @@
+"""Tests for the profiling module."""
+
+import time
+from types import ModuleType
+
+import koza
+import pytest
+
+from translator_ingest.util.profiling import ProfileMode, get_koza_hook_functions, profile_stage
+
+
+def _busy_helper(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+@koza.transform_record()
+def busy_transform(koza_transform, record):
+    return _busy_helper(record["n"])
+
+
+def undecorated(record):
+    return record
+
+
+@pytest.fixture
+def ingest_module() -> ModuleType:
+    module = ModuleType("fake_ingest")
+    module.busy_transform = busy_transform
+    module.undecorated = undecorated
+    return module
+
+
+def _run_transform(seconds: float = 0.3):
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        busy_transform.fn(None, {"n": 10_000})
+
+
+def test_koza_hook_functions(ingest_module):
+    assert get_koza_hook_functions(ingest_module) == [busy_transform.fn]
+
+
+def test_sampling_profile(ingest_module, tmp_path):
+    hook_functions = get_koza_hook_functions(ingest_module)
+    with profile_stage("transform", "testsrc", hook_functions=hook_functions, output_dir=tmp_path) as output_dir:
+        _run_transform()
+    assert output_dir == tmp_path
+
+    collapsed_stacks = (tmp_path / "profile-transform.collapsed").read_text().splitlines()
+    assert collapsed_stacks
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed_stacks)
+    assert any("busy_transform (test_profiling.py:" in line and "_busy_helper" in line for line in collapsed_stacks)
+
+    summary = (tmp_path / "profile-transform.txt").read_text()
+    assert "busy_transform (test_profiling.py:" in summary
+    assert "<genexpr> (test_profiling.py:" in summary
+
+
+def test_deterministic_profile(ingest_module, tmp_path):
+    hook_functions = get_koza_hook_functions(ingest_module)
+    with profile_stage("transform", "testsrc", mode=ProfileMode.DETERMINISTIC, hook_functions=hook_functions,
+                       output_dir=tmp_path):
+        for _ in range(3):
+            busy_transform.fn(None, {"n": 1000})
+    assert (tmp_path / "profile-transform.prof").stat().st_size > 0
+
+    summary = (tmp_path / "profile-transform.txt").read_text()
+    assert "busy_transform (test_profiling.py:" in summary
+    assert "3 calls" in summary
+    assert "_busy_helper (test_profiling.py:" in summary
+
+
+def test_profile_is_written_when_the_stage_fails(tmp_path):
+    with pytest.raises(RuntimeError), profile_stage("normalize", "testsrc", output_dir=tmp_path):
+        raise RuntimeError("normalization failed")
+    assert (tmp_path / "profile-normalize.txt").exists()
+    assert (tmp_path / "profile-normalize.collapsed").exists()
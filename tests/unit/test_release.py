@@ -1,12 +1,14 @@
 """Tests for the release write path (release_ingest)."""
 import datetime
 import json
+import tarfile
 
 import pytest
 
 import translator_ingest.release
 import translator_ingest.util.storage.local as local_storage
-from translator_ingest.release import release_ingest
+from translator_ingest.release import create_compressed_tar, release_ingest
+from translator_ingest.util.compression import open_file
 from translator_ingest.util.metadata import PipelineMetadata
 
 # Version fields used to build the on-disk directory tree. The merge directory path is derived
@@ -123,4 +125,21 @@ def test_release_ingest_same_build_is_noop(release_env):
     release_ingest(SOURCE)
     release_ingest(SOURCE)
 
-    assert _read_latest_release(releases_path)["release_version"] == "1.0.0"
\ No newline at end of file
+    assert _read_latest_release(releases_path)["release_version"] == "1.0.0"
+
+
+def test_create_compressed_tar_decompresses_kgx_files(tmp_path):
+    """Compressed KGX files are archived as plain nodes.jsonl and edges.jsonl."""
+    nodes = '{"id": "X:1"}\n' * 1000
+    with open_file(tmp_path / "merged_nodes.jsonl.zst", "wt") as nodes_file:
+        nodes_file.write(nodes)
+    (tmp_path / "merged_edges.jsonl").write_text('{"subject": "X:1", "object": "X:2"}\n')
+    _write_json(tmp_path / "graph-metadata.json", {"@id": "original"})
+
+    create_compressed_tar(tmp_path / "merged_nodes.jsonl.zst", tmp_path / "merged_edges.jsonl",
+                          tmp_path / "graph-metadata.json", tmp_path / "graph.tar.zst")
+
+    with open_file(tmp_path / "graph.tar.zst", "rb") as archive, tarfile.open(fileobj=archive, mode="r|") as tar:
+        members = {member.name: tar.extractfile(member).read().decode() for member in tar}
+    assert members["nodes.jsonl"] == nodes
+    assert members["edges.jsonl"] == '{"subject": "X:1", "object": "X:2"}\n'
@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import bindparam, create_engine, text
+
+from translator_ingest.util.sql_reader import get_snapshot_path, read_sql, stream_sql_rows
+
+ROWS = [
+    {"struct_id": 1, "accession": "P1|P2", "act_source_url": "https://pubmed.ncbi.nlm.nih.gov/123"},
+    {"struct_id": 2, "accession": "P3", "act_source_url": None},
+    {"struct_id": 3, "accession": "P4", "act_source_url": None},
+    {"struct_id": 4, "accession": "P5", "act_source_url": "https://doi.org/10.1/x"},
+    {"struct_id": 5, "accession": None, "act_source_url": None},
+]
+QUERY = text("SELECT * FROM act_table WHERE struct_id NOT IN :removed ORDER BY struct_id").bindparams(
+    bindparam("removed", expanding=True)
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE act_table (struct_id INTEGER, accession TEXT, act_source_url TEXT)"))
+        connection.execute(text("INSERT INTO act_table VALUES (:struct_id, :accession, :act_source_url)"), ROWS)
+    return engine
+
+
+def test_stream_sql_rows(engine):
+    assert list(stream_sql_rows(engine, QUERY, {"removed": [2]}, itersize=2)) == [ROWS[0], *ROWS[2:]]
+    assert list(stream_sql_rows(engine, "SELECT struct_id FROM act_table WHERE struct_id > 4")) == [{"struct_id": 5}]
+
+
+def test_read_sql_snapshot(engine, tmp_path):
+    snapshot_dir = tmp_path / "source_data"
+    rows = list(read_sql(engine, QUERY, "act_table", {"removed": [2]}, snapshot_dir=snapshot_dir, itersize=2))
+    assert rows == [ROWS[0], *ROWS[2:]]
+    snapshot_path = get_snapshot_path(snapshot_dir, "act_table", QUERY, {"removed": [2]})
+    # written a batch at a time, in batches whose column types differ (act_source_url is all null in the second)
+    assert len(list(snapshot_path.glob("part-*.parquet"))) == 2
+
+    # the snapshot is read instead of the database, which is gone
+    engine.dispose()
+    (tmp_path / "test.db").unlink()
+    assert list(read_sql(engine, QUERY, "act_table", {"removed": [2]}, snapshot_dir=snapshot_dir)) == rows
+
+
+def test_read_sql_snapshot_keys(engine, tmp_path):
+    snapshot_dir = tmp_path / "source_data"
+    assert list(read_sql(engine, QUERY, "act_table", {"removed": [1, 2, 3, 4, 5]}, snapshot_dir=snapshot_dir)) == []
+    # a query with other parameters has another snapshot
+    assert len(list(read_sql(engine, QUERY, "act_table", {"removed": [1]}, snapshot_dir=snapshot_dir))) == 4
+
+    # a snapshot which was not read to the end is not used
+    rows = read_sql(engine, QUERY, "act_table", {"removed": [2]}, snapshot_dir=snapshot_dir, itersize=2)
+    next(rows)
+    rows.close()
+    assert not get_snapshot_path(snapshot_dir, "act_table", QUERY, {"removed": [2]}).exists()
+    assert len(list(read_sql(engine, QUERY, "act_table", {"removed": [2]}, snapshot_dir=snapshot_dir))) == 4
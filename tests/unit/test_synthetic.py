@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from translator_ingest.util.synthetic import (
+    DANGLING_PREFIX,
+    EDGE_ERRORS,
+    NODE_ERRORS,
+    GraphProfile,
+    SyntheticGraphConfig,
+    generate_synthetic_graph,
+)
+
+GRAPH_METADATA = {
+    "name": "test graph",
+    "schema": {
+        "nodes": [
+            {"category": ["biolink:Gene"], "count": 30, "id_prefixes": {"NCBIGene": 20, "HGNC": 10}, "attributes": {}},
+            {"category": ["biolink:Disease"], "count": 10, "id_prefixes": {"MONDO": 10}, "attributes": {}},
+        ],
+        "edges": [
+            {
+                "subject_category": ["biolink:Gene"],
+                "predicate": "biolink:gene_associated_with_condition",
+                "object_category": ["biolink:Disease"],
+                "count": 75,
+                "primary_knowledge_sources": {"infores:ctd": 75},
+                "qualifiers": {},
+                "attributes": {},
+                "subject_id_prefixes": {"NCBIGene": 75},
+                "object_id_prefixes": {"MONDO": 75},
+            },
+            {
+                "subject_category": ["biolink:SmallMolecule"],
+                "predicate": "biolink:treats",
+                "object_category": ["biolink:Disease"],
+                "count": 25,
+                "primary_knowledge_sources": {"infores:drugcentral": 25},
+                "qualifiers": {},
+                "attributes": {},
+                "subject_id_prefixes": {"CHEBI": 25},
+                "object_id_prefixes": {"MONDO": 25},
+            },
+        ],
+    },
+}
+
+
+def read_jsonl(path):
+    with path.open() as jsonl_file:
+        return [json.loads(line) for line in jsonl_file]
+
+
+def generate(tmp_path, name="graph", profile=None, **config):
+    nodes_path, edges_path = tmp_path / f"{name}_nodes.jsonl", tmp_path / f"{name}_edges.jsonl"
+    config = SyntheticGraphConfig(**{"edge_count": 1000, "processes": 1, "chunk_size": 300, **config})
+    stats = generate_synthetic_graph(nodes_path, edges_path, config, profile)
+    return nodes_path, edges_path, stats
+
+
+def test_synthetic_graph(tmp_path):
+    nodes_path, edges_path, stats = generate(tmp_path)
+    nodes, edges = read_jsonl(nodes_path), read_jsonl(edges_path)
+    assert stats.nodes == len(nodes) == 200
+    assert stats.edges == len(edges) == 1000
+    assert not stats.errors
+
+    node_ids = {node["id"] for node in nodes}
+    assert len(node_ids) == len(nodes)
+    assert all(edge["subject"] in node_ids and edge["object"] in node_ids for edge in edges)
+    assert all(edge["knowledge_level"] and edge["agent_type"] and edge["primary_knowledge_source"] for edge in edges)
+
+
+def test_synthetic_graph_degree_skew(tmp_path):
+    _, edges_path, _ = generate(tmp_path, degree_skew=4.0)
+    degrees = {}
+    for edge in read_jsonl(edges_path):
+        degrees[edge["subject"]] = degrees.get(edge["subject"], 0) + 1
+    # the most connected nodes have far more than the average of 5 edges per node
+    assert max(degrees.values()) > 50
+
+
+def test_synthetic_graph_is_independent_of_processes(tmp_path):
+    nodes_1, edges_1, _ = generate(tmp_path, "serial", duplicate_rate=0.1, error_rate=0.1)
+    nodes_2, edges_2, _ = generate(tmp_path, "parallel", duplicate_rate=0.1, error_rate=0.1, processes=2)
+    assert nodes_1.read_text() == nodes_2.read_text()
+    assert edges_1.read_text() == edges_2.read_text()
+
+
+def test_synthetic_graph_duplicates_and_errors(tmp_path):
+    nodes_path, edges_path, stats = generate(tmp_path, edge_count=5000, duplicate_rate=0.1, error_rate=0.1)
+    edges = read_jsonl(edges_path)
+    assert stats.edges == len(edges)
+    assert stats.duplicate_edges == len(edges) - len({edge["id"] for edge in edges})
+    assert 350 < stats.duplicate_edges < 650
+    assert set(stats.errors) == set(NODE_ERRORS) | set(EDGE_ERRORS)
+    # duplicates are copies of invalid records too, so count distinct records
+    dangling_edges = {edge["id"] for edge in edges if edge["object"].startswith(f"{DANGLING_PREFIX}:")}
+    assert stats.errors["dangling_object"] == len(dangling_edges)
+    uncategorized_nodes = {node["id"] for node in read_jsonl(nodes_path) if "category" not in node}
+    assert stats.errors["missing_category"] == len(uncategorized_nodes)
+
+
+def test_graph_profile_from_graph_metadata(tmp_path):
+    graph_metadata_path = tmp_path / "graph-metadata.json"
+    graph_metadata_path.write_text(json.dumps(GRAPH_METADATA))
+    profile = GraphProfile.from_graph_metadata([graph_metadata_path, GRAPH_METADATA])
+    # SmallMolecule only appears in the edges, so its prefixes come from them, and its number of nodes is estimated
+    # from the 80 Gene and Disease nodes in 350 Gene and Disease edge endpoints
+    assert [node_type.count for node_type in profile.node_types] == [60, 20, 11]
+    assert profile.node_types[2].id_prefixes == {"CHEBI": 50}
+
+    nodes_path, edges_path, _ = generate(tmp_path, profile=profile, edge_count=2000)
+    prefixes = {node["id"].split(":")[0] for node in read_jsonl(nodes_path)}
+    assert prefixes == {"NCBIGene", "HGNC", "MONDO", "CHEBI"}
+    edges = read_jsonl(edges_path)
+    treats = [edge for edge in edges if edge["predicate"] == "biolink:treats"]
+    assert 350 < len(treats) < 650
+    assert {edge["primary_knowledge_source"] for edge in treats} == {"infores:drugcentral"}
+    assert all(edge["subject"].startswith("CHEBI:") for edge in treats)
+
+
+def test_graph_profile_without_edges():
+    with pytest.raises(ValueError):
+        GraphProfile.from_graph_metadata([{"schema": {"nodes": [], "edges": []}}])
@@ -0,0 +1,93 @@
+"""Tests for the telemetry module."""
+
+import json
+import sys
+
+import pytest
+
+from translator_ingest.util import telemetry
+from translator_ingest.util.telemetry import (
+    CountingIterable,
+    get_stage_metrics,
+    record_stage_counts,
+    stage_metrics,
+)
+
+
+@pytest.fixture(autouse=True)
+def finished_stages(monkeypatch):
+    monkeypatch.setattr(telemetry, "_finished_stages", {})
+
+
+def _read_metrics(metrics_file) -> list[dict]:
+    return [json.loads(line) for line in metrics_file.read_text().splitlines()]
+
+
+def test_stage_metrics(tmp_path):
+    metrics_file = tmp_path / "metrics.jsonl"
+    with stage_metrics("transform", source="testsrc", metrics_file=metrics_file) as metrics:
+        sum(range(100_000))
+        (tmp_path / "out.txt").write_text("x" * 10_000)
+        record_stage_counts(nodes=10, edges=30, koza_reader_records=25)
+        record_stage_counts(edges=10)
+
+    assert metrics.wall_time_seconds >= 0
+    assert metrics.cpu_time_seconds >= 0
+    assert metrics.peak_rss_bytes > 0
+    assert metrics.counts == {"nodes": 10, "edges": 40, "koza_reader_records": 25}
+    assert metrics.records == 50
+    if sys.platform == "linux":
+        assert metrics.bytes_written >= 10_000
+
+    assert _read_metrics(metrics_file) == [metrics.to_dict()]
+    assert get_stage_metrics("testsrc") == [metrics]
+    assert get_stage_metrics("othersrc") == []
+
+
+def test_stage_without_record_counts(tmp_path):
+    with stage_metrics("download", metrics_file=tmp_path / "metrics.jsonl") as metrics:
+        pass
+    assert metrics.records is None
+    assert metrics.records_per_second is None
+
+
+def test_failed_stage_is_recorded(tmp_path):
+    metrics_file = tmp_path / "metrics.jsonl"
+    with pytest.raises(RuntimeError), stage_metrics("normalize", source="testsrc", metrics_file=metrics_file):
+        record_stage_counts(nodes=5)
+        raise RuntimeError("normalization failed")
+    assert [metrics["stage"] for metrics in _read_metrics(metrics_file)] == ["normalize"]
+    assert get_stage_metrics("testsrc")[0].counts == {"nodes": 5}
+
+
+def test_nested_stages(tmp_path):
+    metrics_file = tmp_path / "metrics.jsonl"
+    with stage_metrics("graph_metadata", source="testsrc", metrics_file=metrics_file) as outer:
+        with stage_metrics("test_data", source="testsrc", metrics_file=metrics_file) as inner:
+            ballast = bytearray(64 * 2**20)
+            record_stage_counts(edges=3)
+        del ballast
+
+    # counts go to the innermost stage, and the outer stage's peak includes the inner stage's
+    assert inner.counts == {"edges": 3}
+    assert outer.counts == {}
+    assert outer.peak_rss_bytes >= inner.peak_rss_bytes >= 64 * 2**20
+    assert [metrics.stage for metrics in get_stage_metrics("testsrc")] == ["test_data", "graph_metadata"]
+
+
+def test_metrics_go_to_the_log_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(telemetry, "get_current_log_dir", lambda: tmp_path)
+    with stage_metrics("merge", source="testsrc"):
+        pass
+    assert [metrics["stage"] for metrics in _read_metrics(tmp_path / telemetry.METRICS_FILENAME)] == ["merge"]
+
+
+def test_record_stage_counts_outside_a_stage():
+    record_stage_counts(nodes=1)
+    assert get_stage_metrics(None) == []
+
+
+def test_counting_iterable():
+    records = CountingIterable({"id": i} for i in range(7))
+    assert len(list(records)) == 7
+    assert records.count == 7
@@ -0,0 +1,79 @@
+import json
+
+from biolink_model.datamodel.pydanticmodel_v2 import Disease, Gene, GeneToDiseaseAssociation, Protein
+from koza.model.graphs import KnowledgeGraph
+from koza.model.writer import WriterConfig
+from koza.runner import KozaRunner, KozaTransformHooks
+
+from translator_ingest.util.compression import open_file
+from translator_ingest.util.transform_writer import DeduplicatingJSONLWriter, merge_node_properties
+
+
+def test_merge_node_properties():
+    node = {"id": "HGNC:1", "name": "A1BG", "category": ["biolink:Gene"], "xref": ["ENSEMBL:1"]}
+    other = {"id": "HGNC:1", "name": "alpha-1-B glycoprotein", "category": ["biolink:Gene", "biolink:Protein"],
+             "xref": ["NCBIGene:1"], "symbol": "A1BG"}
+    assert merge_node_properties(node, other) == {
+        "id": "HGNC:1",
+        "name": "A1BG",
+        "category": ["biolink:Gene", "biolink:Protein"],
+        "xref": ["ENSEMBL:1", "NCBIGene:1"],
+        "symbol": "A1BG",
+    }
+
+
+def transform_interaction(koza_transform, record):
+    subject = Protein(id=record["subject"])
+    disease = Disease(id=record["object"], name=record.get("name"))
+    association = GeneToDiseaseAssociation(
+        id=f"{record['subject']}-{record['object']}",
+        subject=subject.id,
+        predicate="biolink:associated_with",
+        object=disease.id,
+        knowledge_level="not_provided",
+        agent_type="not_provided",
+    )
+    return KnowledgeGraph(nodes=[subject, disease], edges=[association])
+
+
+def test_deduplicating_writer(tmp_path):
+    records = [
+        {"subject": "UniProtKB:P1", "object": "MONDO:1"},
+        {"subject": "UniProtKB:P1", "object": "MONDO:2"},
+        {"subject": "UniProtKB:P2", "object": "MONDO:1", "name": "disease 1"},
+        {"subject": "UniProtKB:P2", "object": "MONDO:2"},
+    ]
+    writer = DeduplicatingJSONLWriter(output_dir=str(tmp_path), source_name="test", config=WriterConfig(),
+                                      compressed=False)
+    KozaRunner(data=iter(records), writer=writer,
+               hooks=KozaTransformHooks(transform_record=[transform_interaction])).run()
+
+    with open(tmp_path / "test_nodes.jsonl") as nodes_file:
+        nodes = [json.loads(line) for line in nodes_file]
+    assert [node["id"] for node in nodes] == ["UniProtKB:P1", "MONDO:1", "MONDO:2", "UniProtKB:P2"]
+    # the name of the second MONDO:1 node is merged into the first, which was written without one
+    assert nodes[1]["name"] == "disease 1"
+    assert writer.dedup_counts == {"nodes": 4, "duplicate_nodes": 4, "merged_nodes": 1}
+    with open(tmp_path / "test_edges.jsonl") as edges_file:
+        assert len(edges_file.readlines()) == 4
+
+
+def test_deduplicating_writer_without_conflicts(tmp_path):
+    writer = DeduplicatingJSONLWriter(output_dir=str(tmp_path), source_name="test", config=WriterConfig(),
+                                      compressed=False)
+    writer.write_nodes([Gene(id="HGNC:1", name="A1BG"), Gene(id="HGNC:1", name="A1BG"), Gene(id="HGNC:2")])
+    writer.finalize()
+    assert writer.dedup_counts == {"nodes": 2, "duplicate_nodes": 1, "merged_nodes": 0}
+    assert not list(tmp_path.glob("*.merging"))
+    assert len((tmp_path / "test_nodes.jsonl").read_text().splitlines()) == 2
+
+
+def test_deduplicating_writer_compressed(tmp_path):
+    writer = DeduplicatingJSONLWriter(output_dir=str(tmp_path), source_name="test", config=WriterConfig(),
+                                      compressed=True)
+    writer.write_nodes([Gene(id="HGNC:1"), Gene(id="HGNC:1", name="A1BG"), Gene(id="HGNC:2")])
+    writer.finalize()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["test_nodes.jsonl.zst"]
+    with open_file(tmp_path / "test_nodes.jsonl.zst") as nodes_file:
+        nodes = [json.loads(line) for line in nodes_file]
+    assert [(node["id"], node.get("name")) for node in nodes] == [("HGNC:1", "A1BG"), ("HGNC:2", None)]